@@ -0,0 +1,281 @@
+# ARQUIVO: benchmarks/ajuste_perfil_solver.py
+"""
+Ajuste dos parâmetros do CP-SAT sobre as configurações salvas.
+
+Resolve os Estágios 1 e 2 de cada configuração de configuracoes_otimizacao/ e de variantes sintéticas
+(turmas reduzidas e ampliadas, portfólios sorteados) com cada candidato de CANDIDATOS, em paralelo.
+Para cada estágio mede o tempo até a primeira solução, o tempo até provar o ótimo, o gap final e o
+excesso do objetivo sobre o melhor encontrado por algum candidato na mesma instância (com poucas
+threads o limitante do CP-SAT quase não sobe e o gap sozinho não separa os candidatos). O Estágio 2 de
+todos os candidatos parte do mesmo cronograma (o do Estágio 1 com 'equilibrado').
+Cada candidato é medido com o seu teto de threads (limitado aos núcleos da máquina), com tantas tarefas
+simultâneas quantas cabem nos núcleos; cada tarefa resolve os subproblemas no próprio processo, para
+que todas as resoluções entrem na coleta. O arquivo grava as threads efetivamente medidas.
+
+O vencedor de cada estágio é gravado no arquivo do perfil 'ajustado', o perfil padrão dos dois estágios:
+vale para toda execução que não pedir outro perfil (--perfil ou perfil_solver na configuração).
+
+Uso: python benchmarks/ajuste_perfil_solver.py [--timeout 20] [--processos N] [--sem-variantes] [--nao-gravar]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from statistics import mean
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from otimizador import registro
+from otimizador.data_models import ParametrosOtimizacao
+from otimizador.io import config_manager
+from otimizador.utils import gerar_lista_meses, converter_projetos_para_modelo, nucleos_disponiveis
+from otimizador.core import stage_1, stage_2, viabilidade, backends
+from benchmark_motor_estagio1 import gerar_portfolio
+
+# Candidatos: os perfis de uso geral e variações de um parâmetro do CP-SAT sobre o 'equilibrado'
+CANDIDATOS = {
+    **{nome: backends.CONFIGURACAO_PERFIS[nome] for nome in ('rapido', 'equilibrado', 'completo')},
+    'linearizacao_0': {'max_threads': 8, 'cpsat': {'linearization_level': 0}},
+    'simetria_4': {'max_threads': 8, 'cpsat': {'symmetry_level': 4}},
+    'sem_probing': {'max_threads': 8, 'cpsat': {'cp_model_probing_level': 0}},
+    'nucleo_insatisfativel': {'max_threads': 8, 'cpsat': {'optimize_with_core': True}},
+}
+# Candidato que fornece o cronograma do Estágio 2 e fica com o posto em caso de empate
+REFERENCIA = 'equilibrado'
+FATORES_TURMAS = (0.5, 1.5)
+PORTFOLIOS_SORTEADOS = ((24, 12, 11), (24, 24, 23))  # (meses, projetos, semente)
+VERSAO_AJUSTE = 1
+
+
+def _variantes(nome, parametros, projetos):
+    """Mesma configuração com o número de turmas de cada projeto escalado."""
+    for fator in FATORES_TURMAS:
+        try:
+            yield (f"{nome}_turmas_x{fator}", parametros,
+                   [replace(p, num_turmas=max(1, round(p.num_turmas * fator))) for p in projetos])
+        except ValueError:
+            continue
+
+
+def carregar_instancias(variantes: bool):
+    """(nome, parametros, projetos) das configurações salvas e, com `variantes`, das sintéticas."""
+    instancias = []
+    with registro.capturar_registros():
+        for arquivo in config_manager.listar_configuracoes_salvas():
+            parametros, projetos = config_manager.carregar_configuracao(arquivo)
+            if projetos: instancias.append((arquivo.stem, parametros, projetos))
+    if variantes:
+        for instancia in list(instancias):
+            instancias.extend(_variantes(*instancia))
+        for horizonte, num_projetos, semente in PORTFOLIOS_SORTEADOS:
+            anos = range(26, 26 + horizonte // 12)
+            parametros = ParametrosOtimizacao(meses_ferias=[f'{mes}/{ano}' for ano in anos for mes in ('Jul', 'Dez')])
+            instancias.append((f"sorteado_{horizonte}m_{num_projetos}p", parametros,
+                               gerar_portfolio(horizonte, num_projetos, semente)))
+    return instancias
+
+
+def preparar_instancia(nome, parametros, projetos, timeout: int):
+    """Meses, férias e projetos do modelo; None se a pré-verificação de viabilidade acusar conflito."""
+    parametros = replace(parametros, timeout_segundos=timeout, perfil_solver='ajustado',
+                         backend_solver='cpsat', estrategia_estagio2='monolitico', horizonte_janela_meses=0,
+                         log_solver=False)
+    datas = [datetime.strptime(data, "%d/%m/%Y") for p in projetos for data in (p.data_inicio, p.data_termino)]
+    meses = gerar_lista_meses(min(datas).strftime("%d/%m/%Y"), max(datas).strftime("%d/%m/%Y"))
+    ferias = [meses.index(m) for m in parametros.meses_ferias if m in meses]
+    with registro.capturar_registros():
+        if viabilidade.verificar_viabilidade(projetos, meses, ferias, parametros):
+            return None
+        projetos_modelo = converter_projetos_para_modelo(projetos, meses, ferias, parametros)
+    return {"nome": nome, "parametros": parametros, "projetos": projetos_modelo, "meses": meses, "ferias": ferias}
+
+
+def _resumir_coleta(coleta):
+    """Indicadores de um estágio a partir das resoluções coletadas (uma por subproblema, em sequência)."""
+    resolvido = bool(coleta) and all(e['gap'] is not None for e in coleta)
+    primeiras = [e['tempo_primeira_solucao'] for e in coleta]
+    return {
+        "resolvido": resolvido,
+        "otimo": resolvido and all(e['status'] == 'OPTIMAL' for e in coleta),
+        "tempo_primeira_solucao": sum(primeiras) if resolvido and None not in primeiras else None,
+        "tempo_otimo": sum(e['tempo'] for e in coleta) if resolvido and all(
+            e['status'] == 'OPTIMAL' for e in coleta) else None,
+        "gap": max(e['gap'] for e in coleta) if resolvido else None,
+        "objetivo": sum(e['objetivo'] for e in coleta) if resolvido else None,
+        "tempo": sum(e['tempo'] for e in coleta),
+    }
+
+
+def threads_candidato(candidato: str, nucleos: int) -> int:
+    """Threads com que o candidato é medido: o seu teto (0 = sem teto), limitado aos núcleos."""
+    teto = CANDIDATOS[candidato]['max_threads']
+    return min(teto, nucleos) if teto else nucleos
+
+
+def _executar_tarefa(args):
+    """
+    Um estágio de uma instância com um candidato, em processo próprio. Os subproblemas são resolvidos
+    neste processo (sem subprocessos), senão as resoluções ficariam fora da coleta. Retorna a medição.
+    """
+    candidato, arquivo_candidato, estagio, instancia, cronograma, threads = args
+    os.environ[backends.VARIAVEL_PERFIL_AJUSTADO] = arquivo_candidato
+    parametros = replace(instancia['parametros'], threads_solver=threads)
+    with backends.coletar_estatisticas() as coleta, registro.capturar_registros():
+        if estagio == 1:
+            resultado = stage_1.otimizar_curva_demanda(instancia['projetos'], instancia['meses'], parametros,
+                                                       max_processos=1)
+        else:
+            resultado = stage_2.otimizar_atribuicao_e_carga(cronograma, instancia['projetos'], instancia['meses'],
+                                                            instancia['ferias'], parametros, num_workers=threads)
+    medicao = {"candidato": candidato, "instancia": instancia['nome'], "estagio": estagio,
+               **_resumir_coleta(coleta)}
+    if estagio == 1:
+        medicao.update(pico_max=resultado['pico_max'] if resultado else None,
+                       cronograma=resultado['cronograma'] if resultado else None)
+    return medicao
+
+
+def _executar(tarefas, processos: int, nucleos: int):
+    """
+    Executa as tarefas agrupadas pelas threads do candidato: em cada grupo, só tantas tarefas simultâneas
+    quantas cabem nos núcleos (e no máximo `processos`).
+    """
+    medicoes = []
+    for threads in sorted({tarefa[-1] for tarefa in tarefas}):
+        grupo = [tarefa for tarefa in tarefas if tarefa[-1] == threads]
+        with ProcessPoolExecutor(max_workers=max(1, min(processos, nucleos // threads))) as pool:
+            medicoes += pool.map(_executar_tarefa, grupo)
+    return medicoes
+
+
+def classificar(medicoes, estagio: int, timeout: int):
+    """
+    Resumo por candidato, do melhor para o pior: menos instâncias sem solução, menor excesso médio do
+    objetivo, menor gap médio, menor tempo médio até o ótimo e até a primeira solução (instâncias sem ótimo
+    ou sem solução contam o timeout; sem solução, excesso e gap contam 100%).
+    """
+    melhores = {}
+    for m in medicoes:
+        if m['estagio'] == estagio and m['objetivo'] is not None:
+            melhores[m['instancia']] = min(melhores.get(m['instancia'], m['objetivo']), m['objetivo'])
+    resumos = []
+    for candidato in CANDIDATOS:
+        doestagio = [m for m in medicoes if m['candidato'] == candidato and m['estagio'] == estagio]
+        if not doestagio: continue
+        resumos.append({
+            "candidato": candidato,
+            "instancias": len(doestagio),
+            "sem_solucao": sum(not m['resolvido'] for m in doestagio),
+            "otimos": sum(m['otimo'] for m in doestagio),
+            "excesso_medio": mean(1.0 if m['objetivo'] is None else
+                                  (m['objetivo'] - melhores[m['instancia']]) / max(1.0, abs(melhores[m['instancia']]))
+                                  for m in doestagio),
+            "gap_medio": mean(1.0 if m['gap'] is None else m['gap'] for m in doestagio),
+            "tempo_otimo_medio": mean(timeout if m['tempo_otimo'] is None else m['tempo_otimo'] for m in doestagio),
+            "tempo_primeira_medio": mean(timeout if m['tempo_primeira_solucao'] is None
+                                         else m['tempo_primeira_solucao'] for m in doestagio),
+        })
+    return sorted(resumos, key=lambda r: (r['sem_solucao'], round(r['excesso_medio'], 4), round(r['gap_medio'], 4),
+                                          round(r['tempo_otimo_medio'], 1), round(r['tempo_primeira_medio'], 1),
+                                          r['candidato'] != REFERENCIA))
+
+
+def exibir_classificacao(resumos, estagio: int):
+    print(f"\n--- Estágio {estagio} ---")
+    print(f"{'Candidato':>22} | {'Inst.':>5} | {'Sem sol.':>8} | {'Ótimos':>6} | {'1ª solução (s)':>14} | "
+          f"{'Até ótimo (s)':>13} | {'Excesso obj.':>12} | {'Gap médio':>9}")
+    print("-" * 115)
+    for r in resumos:
+        print(f"{r['candidato']:>22} | {r['instancias']:>5} | {r['sem_solucao']:>8} | {r['otimos']:>6} | "
+              f"{r['tempo_primeira_medio']:>14.2f} | {r['tempo_otimo_medio']:>13.2f} | {r['excesso_medio']:>12.2%} | "
+              f"{r['gap_medio']:>9.2%}")
+
+
+def gravar_perfil_ajustado(vencedores, instancias, timeout: int, nucleos: int) -> Path:
+    """
+    Grava o vencedor de cada estágio como perfil 'ajustado' (troca atômica), com o teto de threads igual
+    às threads com que foi medido.
+    """
+    caminho = backends.caminho_perfil_ajustado()
+    dados = {
+        "versao": VERSAO_AJUSTE,
+        "data": datetime.now().isoformat(timespec='seconds'),
+        "timeout_segundos": timeout,
+        "instancias": instancias,
+        **{f"estagio{estagio}": {**CANDIDATOS[resumo['candidato']], **resumo,
+                                 "max_threads": threads_candidato(resumo['candidato'], nucleos)}
+           for estagio, resumo in vencedores.items()},
+    }
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix('.tmp')
+    temporario.write_text(json.dumps(dados, indent=2, ensure_ascii=False), encoding='utf-8')
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste dos parâmetros do CP-SAT sobre as configurações salvas")
+    parser.add_argument("--timeout", type=int, default=20, help="timeout de cada estágio em segundos (mín. 10)")
+    parser.add_argument("--processos", type=int, default=0, help="tarefas simultâneas (padrão: núcleos disponíveis)")
+    parser.add_argument("--sem-variantes", action="store_true", help="só as configurações salvas, sem as sintéticas")
+    parser.add_argument("--nao-gravar", action="store_true", help="só exibe a classificação")
+    args = parser.parse_args()
+
+    nucleos = nucleos_disponiveis()
+    processos = max(1, min(args.processos or nucleos, nucleos))
+    instancias = []
+    for nome, parametros, projetos in carregar_instancias(not args.sem_variantes):
+        preparada = preparar_instancia(nome, parametros, projetos, args.timeout)
+        if preparada is None:
+            print(f"[AVISO] '{nome}' ignorada: inviável na pré-verificação")
+        else:
+            instancias.append(preparada)
+    if not instancias:
+        print("[ERRO] Nenhuma instância para o ajuste. Salve configurações em configuracoes_otimizacao/.")
+        sys.exit(1)
+    print(f"[INFO] {len(instancias)} instâncias x {len(CANDIDATOS)} candidatos | até {processos} processos | "
+          f"threads por candidato: " + ", ".join(f"{c} {threads_candidato(c, nucleos)}" for c in CANDIDATOS)
+          + f" | timeout {args.timeout}s por estágio")
+
+    inicio = time.perf_counter()
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivos = {}
+        for candidato, configuracao in CANDIDATOS.items():
+            arquivos[candidato] = str(Path(diretorio) / f"{candidato}.json")
+            Path(arquivos[candidato]).write_text(json.dumps({"estagio1": configuracao, "estagio2": configuracao}))
+
+        medicoes = _executar([(c, arquivos[c], 1, inst, None, threads_candidato(c, nucleos))
+                              for inst in instancias for c in CANDIDATOS], processos, nucleos)
+        cronogramas = {}
+        for m in sorted(medicoes, key=lambda m: (m['candidato'] != REFERENCIA, m['pico_max'] is None,
+                                                 m['pico_max'] or 0)):
+            if m['cronograma'] is not None: cronogramas.setdefault(m['instancia'], m['cronograma'])
+        medicoes += _executar([(c, arquivos[c], 2, inst, cronogramas[inst['nome']], threads_candidato(c, nucleos))
+                               for inst in instancias if inst['nome'] in cronogramas for c in CANDIDATOS],
+                              processos, nucleos)
+    print(f"[INFO] Ajuste concluído em {time.perf_counter() - inicio:.0f}s")
+
+    vencedores = {}
+    for estagio in (1, 2):
+        resumos = classificar(medicoes, estagio, args.timeout)
+        exibir_classificacao(resumos, estagio)
+        if resumos:
+            vencedores[estagio] = resumos[0]
+            print(f"[✓] Vencedor do Estágio {estagio}: {resumos[0]['candidato']}")
+
+    if args.nao_gravar or not vencedores:
+        return
+    caminho = gravar_perfil_ajustado(vencedores, [inst['nome'] for inst in instancias], args.timeout, nucleos)
+    print(f"\n[✓] Perfil 'ajustado' (padrão dos Estágios 1 e 2) gravado em '{caminho}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# ARQUIVO: benchmarks/benchmark_backend_solver.py
+"""
+Benchmark dos backends de solver (CP-SAT x SCIP x CBC) nos Estágios 1 e 2.
+Para cada backend mede montagem do modelo, tempo do solver, status e qualidade
+(pico no Estágio 1; instrutores e spread no Estágio 2) em portfólios sintéticos.
+
+Uso: python benchmarks/benchmark_backend_solver.py [timeout_segundos] [num_projetos]
+"""
+
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from otimizador import registro
+from otimizador.data_models import ParametrosOtimizacao, BACKENDS_SOLVER
+from otimizador.utils import gerar_lista_meses, converter_projetos_para_modelo
+from otimizador.core import stage_1, stage_2
+from benchmark_motor_estagio1 import gerar_portfolio
+
+
+def _medir(funcao, *args):
+    """Executa um estágio em silêncio e retorna (resultado, montagem_s, solver_s)."""
+    inicio = time.perf_counter()
+    with registro.capturar_registros():
+        resultado = funcao(*args)
+    total = time.perf_counter() - inicio
+    solver = resultado.get('tempo_solver', float('nan')) if resultado else float('nan')
+    return resultado, total - solver, solver
+
+
+def executar(horizonte: int, num_projetos: int, timeout: int):
+    anos = range(26, 26 + horizonte // 12)
+    base = ParametrosOtimizacao(meses_ferias=[f'{mes}/{ano}' for ano in anos for mes in ('Jul', 'Dez')],
+                                timeout_segundos=timeout)
+    meses = gerar_lista_meses('01/01/2026', f'31/12/{2026 + horizonte // 12 - 1}')
+    ferias = [meses.index(m) for m in base.meses_ferias if m in meses]
+    with registro.capturar_registros():
+        projetos = converter_projetos_para_modelo(gerar_portfolio(horizonte, num_projetos), meses, ferias, base)
+
+    linhas = []
+    for backend in BACKENDS_SOLVER:
+        parametros = replace(base, backend_solver=backend)
+        resultado1, montagem, solver = _medir(stage_1.otimizar_curva_demanda, projetos, meses, parametros)
+        linhas.append((horizonte, backend, 'E1', montagem, solver,
+                       resultado1['status_solver'] if resultado1 else 'FALHA',
+                       f"pico {resultado1['pico_max']}" if resultado1 else '-'))
+        if not resultado1: continue
+
+        resultado2, montagem, solver = _medir(stage_2.otimizar_atribuicao_e_carga, resultado1['cronograma'],
+                                              projetos, meses, ferias, parametros)
+        sucesso = resultado2.get('status') == 'sucesso'
+        linhas.append((horizonte, backend, 'E2', montagem, solver, resultado2['status_solver'],
+                       f"{resultado2['total_instrutores_flex']} instr. / spread {resultado2['spread_carga']}"
+                       if sucesso else '-'))
+    return linhas
+
+
+def main():
+    timeout = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    num_projetos = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"{'Meses':>5} | {'Backend':>7} | {'Est.':>4} | {'Montagem (s)':>12} | {'Solver (s)':>10} | "
+          f"{'Status':>10} | Qualidade")
+    print("-" * 90)
+    for horizonte in (24, 36):
+        for linha in executar(horizonte, num_projetos, timeout):
+            print(f"{linha[0]:>5} | {linha[1]:>7} | {linha[2]:>4} | {linha[3]:>12.2f} | {linha[4]:>10.2f} | "
+                  f"{linha[5]:>10} | {linha[6]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# ARQUIVO: benchmarks/benchmark_horizonte_rolante.py
+"""
+Benchmark do horizonte rolante x resolução monolítica em horizontes de 2 a 6 anos.
+O portfólio cresce com o horizonte (um projeto por mês), então o tempo do modo rolante
+deve crescer de forma aproximadamente linear, enquanto o monolítico cresce mais rápido.
+
+Uso: python benchmarks/benchmark_horizonte_rolante.py [timeout_segundos] [janela_meses]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from otimizador import registro
+from otimizador.data_models import ParametrosOtimizacao
+from otimizador.utils import gerar_lista_meses, converter_projetos_para_modelo
+from otimizador.core import stage_1, stage_2, horizonte_rolante
+from benchmark_motor_estagio1 import gerar_portfolio
+
+
+def executar(horizonte: int, timeout: int, janela: int):
+    anos = range(26, 26 + horizonte // 12)
+    parametros = ParametrosOtimizacao(meses_ferias=[f'{mes}/{ano}' for ano in anos for mes in ('Jul', 'Dez')],
+                                      timeout_segundos=timeout, horizonte_janela_meses=janela,
+                                      horizonte_sobreposicao_meses=janela // 3)
+    meses = gerar_lista_meses('01/01/2026', f'31/12/{2026 + horizonte // 12 - 1}')
+    ferias = [meses.index(m) for m in parametros.meses_ferias if m in meses]
+    with registro.capturar_registros():
+        projetos = converter_projetos_para_modelo(gerar_portfolio(horizonte, horizonte), meses, ferias, parametros)
+
+    linhas = []
+    for modo, estagio1, estagio2 in [
+            ('rolante', horizonte_rolante.otimizar_curva_demanda_rolante, horizonte_rolante.otimizar_atribuicao_rolante),
+            ('monolitico', stage_1.otimizar_curva_demanda, stage_2.otimizar_atribuicao_e_carga)]:
+        inicio = time.perf_counter()
+        with registro.capturar_registros():
+            resultado1 = estagio1(projetos, meses, parametros)
+        meio = time.perf_counter()
+        with registro.capturar_registros():
+            resultado2 = estagio2(resultado1['cronograma'], projetos, meses, ferias, parametros) if resultado1 else None
+        fim = time.perf_counter()
+        sucesso = bool(resultado2) and resultado2.get('status') == 'sucesso'
+        linhas.append((horizonte, modo, meio - inicio, fim - meio, resultado1['pico_max'] if resultado1 else '-',
+                       resultado2['total_instrutores_flex'] if sucesso else '-'))
+    return linhas
+
+
+def main():
+    timeout = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    janela = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    print(f"{'Meses':>5} | {'Modo':>10} | {'Estágio 1 (s)':>13} | {'Estágio 2 (s)':>13} | {'Pico':>4} | "
+          f"{'Instrutores':>11}")
+    print("-" * 72)
+    for horizonte in (24, 48, 72):
+        for linha in executar(horizonte, timeout, janela):
+            print(f"{linha[0]:>5} | {linha[1]:>10} | {linha[2]:>13.2f} | {linha[3]:>13.2f} | {linha[4]:>4} | "
+                  f"{linha[5]:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# ARQUIVO: benchmarks/benchmark_motor_estagio1.py
+"""
+Benchmark dos motores do Estágio 1: somas mensais ('linear') x intervalos/cumulativa ('intervalos').
+Usa portfólios sintéticos em horizontes longos (36, 48 e 60 meses), onde as somas por mês crescem.
+
+Uso: python benchmarks/benchmark_motor_estagio1.py [timeout_segundos] [num_projetos]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from otimizador import registro
+from otimizador.data_models import ConfiguracaoProjeto, ParametrosOtimizacao
+from otimizador.utils import gerar_lista_meses, converter_projetos_para_modelo
+from otimizador.core import stage_1
+
+
+def gerar_portfolio(horizonte: int, num_projetos: int, semente: int = 11):
+    """Projetos com início, duração e folga sorteados dentro de um horizonte de `horizonte` meses."""
+    rng = random.Random(semente)
+    configs = []
+    for k in range(num_projetos):
+        duracao = rng.randint(2, 8)
+        inicio = rng.randint(0, horizonte - duracao - 4)
+        fim = min(horizonte - 1, inicio + duracao + rng.randint(4, 24))
+        configs.append(ConfiguracaoProjeto(
+            nome=f'P{k:02d}', data_inicio=f'01/{inicio % 12 + 1:02d}/{2026 + inicio // 12}',
+            data_termino=f'28/{fim % 12 + 1:02d}/{2026 + fim // 12}', num_turmas=rng.randint(6, 30),
+            duracao_curso=duracao, ondas=rng.choice([1, 1, 2]), percentual_prog=rng.choice([30.0, 50.0, 70.0])))
+    return configs
+
+
+def executar(horizonte: int, num_projetos: int, timeout: int):
+    anos = range(26, 26 + horizonte // 12)
+    parametros = ParametrosOtimizacao(meses_ferias=[f'{mes}/{ano}' for ano in anos for mes in ('Jul', 'Dez')],
+                                      timeout_segundos=timeout)
+    meses = gerar_lista_meses('01/01/2026', f'31/12/{2026 + horizonte // 12 - 1}')
+    ferias = [meses.index(m) for m in parametros.meses_ferias if m in meses]
+    with registro.capturar_registros():
+        projetos = converter_projetos_para_modelo(gerar_portfolio(horizonte, num_projetos), meses, ferias,
+                                                  parametros)
+    linhas = []
+    for motor in stage_1.MOTORES_ESTAGIO1:
+        inicio = time.perf_counter()
+        with registro.capturar_registros():
+            resultado = stage_1.otimizar_curva_demanda(projetos, meses, parametros, motor=motor)
+        total = time.perf_counter() - inicio
+        solver = resultado['tempo_solver'] if resultado else float('nan')
+        linhas.append((horizonte, motor, total - solver, solver, resultado['status_solver'] if resultado else 'FALHA',
+                       resultado['pico_max'] if resultado else '-'))
+    return linhas
+
+
+def main():
+    timeout = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    num_projetos = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    print(f"{'Meses':>5} | {'Motor':>10} | {'Montagem (s)':>12} | {'Solver (s)':>10} | {'Status':>8} | {'Pico':>4}")
+    print("-" * 66)
+    for horizonte in (36, 48, 60):
+        for linha in executar(horizonte, num_projetos, timeout):
+            print(f"{linha[0]:>5} | {linha[1]:>10} | {linha[2]:>12.2f} | {linha[3]:>10.2f} | {linha[4]:>8} | "
+                  f"{linha[5]:>4}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# ARQUIVO: benchmarks/benchmark_simetria_ondas.py
+"""
+Benchmark do agrupamento das ondas no Estágio 1 (quebrar_simetria_ondas).
+Compara o modelo com cada onda resolvida separadamente e com as ondas de cada projeto resolvidas como um
+único bloco, para portfólios com projetos de 2, 4 e 8 ondas.
+
+Uso: python benchmarks/benchmark_simetria_ondas.py [timeout_segundos]
+"""
+
+import random
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from otimizador import registro
+from otimizador.data_models import ConfiguracaoProjeto, ParametrosOtimizacao
+from otimizador.utils import gerar_lista_meses, converter_projetos_para_modelo
+from otimizador.core import stage_1
+
+
+def gerar_portfolio(ondas: int, num_projetos: int = 16, semente: int = 7):
+    """Portfólio sintético de 48 meses com janelas sobrepostas, todos os projetos divididos em `ondas` ondas."""
+    rng = random.Random(semente)
+    configs = []
+    for k in range(num_projetos):
+        inicio = rng.randint(0, 24)
+        duracao = rng.randint(2, 6)
+        fim = inicio + duracao + rng.randint(3, 16)
+        configs.append(ConfiguracaoProjeto(
+            nome=f'P{k:02d}', data_inicio=f'01/{inicio % 12 + 1:02d}/{2026 + inicio // 12}',
+            data_termino=f'28/{fim % 12 + 1:02d}/{2026 + fim // 12}',
+            num_turmas=rng.randint(40, 120), duracao_curso=duracao,
+            ondas=ondas, percentual_prog=rng.choice([30.0, 50.0, 65.0, 80.0])))
+    return configs
+
+
+def conferir_totais(cronograma, projetos) -> bool:
+    """Confere se cada projeto/onda recebeu exatamente o seu total de turmas por habilidade."""
+    for proj in projetos:
+        entradas = cronograma.get(proj.nome, [])
+        for hab, total in proj.turmas.items():
+            if sum(e['num_turmas'] for e in entradas if e['habilidade'] == hab) != total: return False
+    return True
+
+
+def executar(ondas: int, parametros: ParametrosOtimizacao):
+    configs = gerar_portfolio(ondas)
+    meses = gerar_lista_meses('01/01/2026', '31/12/2029')
+    ferias = [meses.index(m) for m in parametros.meses_ferias if m in meses]
+    with registro.capturar_registros():
+        projetos = converter_projetos_para_modelo(configs, meses, ferias, parametros)
+    linhas = []
+    for bloco in (False, True):
+        params = replace(parametros, quebrar_simetria_ondas=bloco)
+        inicio = time.perf_counter()
+        with registro.capturar_registros():
+            resultado = stage_1.otimizar_curva_demanda(projetos, meses, params)
+        duracao = time.perf_counter() - inicio
+        linhas.append((ondas, 'sim' if bloco else 'não', duracao,
+                       resultado['status_solver'] if resultado else 'FALHA',
+                       resultado['pico_max'] if resultado else '-',
+                       'sim' if resultado and conferir_totais(resultado['cronograma'], projetos) else 'não'))
+    return linhas
+
+
+def main():
+    timeout = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    ferias = [f'{mes}/{ano}' for ano in range(26, 30) for mes in ('Jul', 'Dez')]
+    parametros = ParametrosOtimizacao(meses_ferias=ferias, timeout_segundos=timeout)
+    print(f"{'Ondas':>5} | {'Bloco':>8} | {'Tempo (s)':>9} | {'Status':>8} | {'Pico':>4} | {'Totais':>6}")
+    print("-" * 57)
+    for ondas in (2, 4, 8):
+        for linha in executar(ondas, parametros):
+            print(f"{linha[0]:>5} | {linha[1]:>8} | {linha[2]:>9.2f} | {linha[3]:>8} | {linha[4]:>4} | {linha[5]:>6}")
+
+
+if __name__ == "__main__":
+    main()
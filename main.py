@@ -5,26 +5,100 @@ Versão 2.6 - Corrigida
 Autor: Sistema Idear
 """
 
+import argparse
 import sys
-import os
-from datetime import datetime
+from dataclasses import replace
 from pathlib import Path
-import pandas as pd
+from typing import Optional
 
 # Importações dos módulos internos
-from otimizador.io import user_input, config_manager
-from otimizador.utils import (
-    gerar_lista_meses,
-    converter_projetos_para_modelo,
-    renumerar_instrutores_ativos,
-    analisar_distribuicao_instrutores_por_projeto
-)
-from otimizador.core import stage_1, stage_2
-from otimizador.reporting import plotting, spreadsheets, pdf_generator
+from otimizador import pipeline, registro
+from otimizador.data_models import PERFIS_SOLVER, MOTORES_ESTAGIO1
+from otimizador.io import user_input, config_manager, importacao_projetos, arquivo_execucao, historico_execucoes
 
 
-def main():
-    """Função principal do sistema de otimização."""
+def executar_otimizacao(parametros, projetos_config, arquivo_replanejamento: Optional[str] = None):
+    """
+    Executa as Etapas 2 a 7 (preparação, otimização, pós-processamento e relatórios) para uma
+    configuração já obtida. Planilhas e PDF são gravados no diretório corrente. Encerra o programa se
+    a configuração for inviável ou algum estágio falhar.
+    """
+    try:
+        execucao = pipeline.otimizar(parametros, projetos_config, arquivo_replanejamento)
+    except pipeline.ErroOtimizacao as e:
+        print(f"\n[ERRO] {e}")
+        sys.exit(1)
+
+    output_dir = pipeline.DIRETORIO_SAIDA
+    pipeline.arquivar_execucao(execucao, output_dir)
+
+    # ===========================
+    # ETAPA 7: GERAÇÃO DE RELATÓRIOS
+    # ===========================
+    pipeline.gerar_relatorios(execucao, output_dir)
+
+    print("\n" + "=" * 80)
+    print("✓✓✓ PROCESSO CONCLUÍDO COM SUCESSO! ✓✓✓")
+    print("=" * 80)
+
+
+def regerar_relatorios(arquivo: str):
+    """Modo só relatório: regera planilhas, gráficos e PDF de um arquivo de execução, sem otimizar."""
+    output_dir = pipeline.DIRETORIO_SAIDA
+    caminho = Path(arquivo) if arquivo else arquivo_execucao.execucao_mais_recente(output_dir)
+    if caminho is None:
+        print(f"[ERRO] Nenhum arquivo de execução em {output_dir}.")
+        sys.exit(1)
+    try:
+        execucao = arquivo_execucao.carregar_execucao(caminho)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"[ERRO] Arquivo de execução inválido ({caminho}): {e}")
+        sys.exit(1)
+    print(f"[✓] Execução de {execucao['data_execucao']} carregada: {caminho}")
+    output_dir.mkdir(exist_ok=True)
+    pipeline.gerar_relatorios(execucao, output_dir)
+    print("\n✓ Relatórios regerados sem nova otimização.")
+
+
+def _aplicar_opcoes_solver(parametros, perfil: Optional[str], threads: Optional[int], integrado: bool = False,
+                           alternativos: Optional[int] = None, comparar_monolitico: bool = False,
+                           motor: Optional[str] = None):
+    """
+    Sobrescreve o perfil e o teto de threads do solver da configuração, liga o modelo integrado, define
+    quantos cronogramas o Estágio 2 avalia, liga a comparação do horizonte rolante com a resolução
+    monolítica e escolhe o motor do Estágio 1 (opções --perfil, --threads, --integrado, --alternativos,
+    --comparar-monolitico e --motor).
+    """
+    ajustes = {campo: valor for campo, valor in (('perfil_solver', perfil), ('threads_solver', threads),
+                                                 ('modelo_integrado', integrado or None),
+                                                 ('cronogramas_alternativos', alternativos),
+                                                 ('comparar_monolitico', comparar_monolitico or None),
+                                                 ('motor_estagio1', motor))
+               if valor is not None}
+    if not ajustes:
+        return parametros
+    parametros = replace(parametros, **ajustes)
+    print(f"[INFO] Solver desta execução: perfil {parametros.perfil_solver} | "
+          f"threads {parametros.threads_solver or 'todos os núcleos'} | motor {parametros.motor_estagio1}"
+          f"{' | modelo integrado' if parametros.modelo_integrado else ''}"
+          f"{f' | {parametros.cronogramas_alternativos} cronogramas' * (parametros.cronogramas_alternativos > 1)}"
+          f"{' | comparação com a resolução monolítica' if parametros.comparar_monolitico else ''}")
+    return parametros
+
+
+def main(arquivo_replanejamento: Optional[str] = None, perfil_solver: Optional[str] = None,
+         threads_solver: Optional[int] = None, modelo_integrado: bool = False,
+         cronogramas_alternativos: Optional[int] = None, comparar_monolitico: bool = False,
+         motor_estagio1: Optional[str] = None):
+    """
+    Função principal do sistema de otimização.
+    Com `arquivo_replanejamento` (plano JSON salvo ou '1_carga_horaria_detalhada.xlsx'), replaneja
+    com mudança mínima em vez de otimizar do zero. `perfil_solver` e `threads_solver` sobrescrevem os
+    da configuração nesta execução; `modelo_integrado` liga o modelo integrado após os dois estágios e
+    `cronogramas_alternativos` define quantos cronogramas do Estágio 1 o Estágio 2 avalia;
+    `comparar_monolitico` compara o horizonte rolante com a resolução monolítica e `motor_estagio1` escolhe
+    a formulação do Estágio 1.
+    """
     print("=" * 80)
     print("SISTEMA DE OTIMIZAÇÃO DE ALOCAÇÃO DE INSTRUTORES")
     print("Versão 2.6 (Corrigida)")
@@ -39,218 +113,22 @@ def main():
 
         if not (parametros and projetos_config):
             print("\nCriando nova configuração...")
-            parametros = user_input.obter_parametros_usuario()
+            parametros = _aplicar_opcoes_solver(user_input.obter_parametros_usuario(), perfil_solver,
+                                                threads_solver, modelo_integrado, cronogramas_alternativos,
+                                                comparar_monolitico, motor_estagio1)
             projetos_config = user_input.obter_projetos_usuario()
 
             salvar = input("\nDeseja salvar esta configuração? (S/N) [S]: ").strip().upper()
             if salvar in ('', 'S'):
                 config_manager.salvar_configuracao(parametros, projetos_config)
         else:
+            parametros = _aplicar_opcoes_solver(parametros, perfil_solver, threads_solver, modelo_integrado,
+                                                cronogramas_alternativos, comparar_monolitico, motor_estagio1)
             print("\nConfigurações carregadas:")
             user_input.exibir_resumo_parametros(parametros)
             user_input.exibir_resumo_projetos(projetos_config)
 
-        # ===========================
-        # ETAPA 2: PREPARAÇÃO DE DADOS
-        # ===========================
-        print("\n--- Etapa 2: Preparação de Dados ---")
-
-        # Calcular intervalo de datas
-        dt_min = min(datetime.strptime(p.data_inicio, "%d/%m/%Y") for p in projetos_config)
-        dt_max = max(datetime.strptime(p.data_termino, "%d/%m/%Y") for p in projetos_config)
-
-        print(f"Período total: {dt_min.strftime('%d/%m/%Y')} até {dt_max.strftime('%d/%m/%Y')}")
-
-        # Gerar lista de meses
-        meses = gerar_lista_meses(
-            dt_min.strftime("%d/%m/%Y"),
-            dt_max.strftime("%d/%m/%Y")
-        )
-        print(f"Total de meses: {len(meses)}")
-
-        # Identificar índices dos meses de férias
-        meses_ferias_idx = [meses.index(m) for m in parametros.meses_ferias if m in meses]
-        if meses_ferias_idx:
-            print(f"Meses de férias identificados: {len(meses_ferias_idx)}")
-
-        # ===========================
-        # ETAPA 3: CONVERSÃO PARA MODELO OTIMIZADO
-        # ===========================
-        print("\n--- Etapa 3: Conversão de Projetos ---")
-        projetos_modelo = converter_projetos_para_modelo(
-            projetos_config,
-            meses,
-            meses_ferias_idx,
-            parametros
-        )
-        print(f"Projetos convertidos: {len(projetos_modelo)}")
-
-        # ===========================
-        # ETAPA 4: OTIMIZAÇÃO - ESTÁGIO 1 (Nivelamento de Demanda)
-        # ===========================
-        print("\n" + "=" * 80)
-        print("ESTÁGIO 1: OTIMIZAÇÃO DO CRONOGRAMA (Nivelamento de Demanda)")
-        print("=" * 80)
-
-        resultados_estagio1 = stage_1.otimizar_curva_demanda(
-            projetos_modelo,
-            meses,
-            parametros
-        )
-
-        resultados_estagio1['periodo'] = f"{dt_min.strftime('%d/%m/%Y')} a {dt_max.strftime('%d/%m/%Y')}"
-        resultados_estagio1['meses_total'] = len(meses)
-
-
-        if not resultados_estagio1:
-            print("\n[ERRO] Falha no Estágio 1. Verifique as restrições do projeto.")
-            sys.exit(1)
-
-        print("\n✓ Estágio 1 concluído com sucesso!")
-
-        # ===========================
-        # ETAPA 5: OTIMIZAÇÃO - ESTÁGIO 2 (Atribuição de Instrutores)
-        # ===========================
-        print("\n" + "=" * 80)
-        print("ESTÁGIO 2: ATRIBUIÇÃO DE INSTRUTORES E BALANCEAMENTO")
-        print("=" * 80)
-
-        resultados_estagio2 = stage_2.otimizar_atribuicao_e_carga(
-            resultados_estagio1['cronograma'],
-            projetos_modelo,
-            meses,
-            meses_ferias_idx,
-            parametros
-        )
-
-        resultados_estagio2['spread_max_permitido'] = parametros.spread_maximo
-
-        if not resultados_estagio2 or resultados_estagio2.get("status") == "falha":
-            print("\n[ERRO] Falha no Estágio 2. Tente aumentar o spread ou o timeout.")
-            sys.exit(1)
-
-        print("\n✓ Estágio 2 concluído com sucesso!")
-
-        # ===========================
-        # ETAPA 6: PÓS-PROCESSAMENTO
-        # ===========================
-        print("\n--- Etapa 6: Pós-processamento ---")
-
-        resultados_estagio2['atribuicoes'], contagem_instrutores_hab = renumerar_instrutores_ativos(
-            resultados_estagio2['atribuicoes']
-        )
-        print("✓ Instrutores renumerados")
-
-        distribuicao_por_projeto = analisar_distribuicao_instrutores_por_projeto(
-            resultados_estagio2['atribuicoes']
-        )
-        print("✓ Distribuição por projeto calculada")
-
-        # ===========================
-        # ETAPA 7: GERAÇÃO DE RELATÓRIOS
-        # ===========================
-        print("\n" + "=" * 80)
-        print("GERANDO VISUALIZAÇÕES E RELATÓRIOS")
-        print("=" * 80)
-
-        output_dir = Path("resultados_otimizacao")
-        output_dir.mkdir(exist_ok=True)
-        print(f"Diretório de saída: {output_dir.absolute()}")
-
-        print("\n1. Gerando planilhas Excel...")
-        df_consolidada_instrutor = spreadsheets.gerar_planilha_consolidada_instrutor(
-            resultados_estagio2['atribuicoes']
-        )
-        spreadsheets.gerar_planilha_detalhada(
-            resultados_estagio2['atribuicoes'],
-            meses,
-            meses_ferias_idx
-        )
-
-        print("\n2. Gerando gráficos...")
-        graficos = {}
-
-        try:
-            graficos['projeto_mes'] = plotting.gerar_grafico_turmas_projeto_mes(
-                resultados_estagio2['turmas'],
-                projetos_modelo,  # <-- CORRIGIDO: Passando projetos
-                meses,
-                meses_ferias_idx
-            )
-            print("  ✓ Gráfico turmas/projeto/mês")
-        except Exception as e:
-            print(f"  ⚠ Erro no gráfico turmas/projeto/mês: {e}")
-            graficos['projeto_mes'] = None
-
-        try:
-            graficos['instrutor_projeto'] = plotting.gerar_grafico_turmas_instrutor_tipologia_projeto(
-                resultados_estagio2['atribuicoes']
-            )
-            print("  ✓ Gráfico turmas/instrutor/projeto")
-        except Exception as e:
-            print(f"  ⚠ Erro no gráfico turmas/instrutor/projeto: {e}")
-            graficos['instrutor_projeto'] = None
-
-        try:
-            graficos['carga_instrutor'] = plotting.gerar_grafico_carga_por_instrutor(
-                resultados_estagio2['atribuicoes']
-            )
-            print("  ✓ Gráfico carga/instrutor")
-        except Exception as e:
-            print(f"  ⚠ Erro no gráfico carga/instrutor: {e}")
-            graficos['carga_instrutor'] = None
-
-        try:
-            graficos['prog_rob'], serie_temporal_df = plotting.gerar_grafico_demanda_prog_rob(
-                resultados_estagio2['turmas'],
-                projetos_modelo,  # <-- CORRIGIDO: Passando projetos
-                meses,
-                meses_ferias_idx
-            )
-            print("  ✓ Gráfico demanda PROG/ROB")
-        except Exception as e:
-            print(f"  ⚠ Erro no gráfico demanda PROG/ROB: {e}")
-            graficos['prog_rob'] = None
-            serie_temporal_df = pd.DataFrame()
-
-        try:
-            grafico_conclusoes = str(output_dir / "grafico_conclusoes_mes.png")
-            plotting.plotar_conclusoes_por_mes(
-                resultados_estagio2['turmas'],
-                projetos_modelo,
-                dt_min,  # <-- CORRIGIDO: Passando dt_min
-                len(meses),
-                grafico_conclusoes
-            )
-            graficos['conclusoes'] = grafico_conclusoes
-            print("  ✓ Gráfico conclusões/mês")
-        except Exception as e:
-            print(f"  ⚠ Erro no gráfico conclusões/mês: {e}")
-            graficos['conclusoes'] = None
-
-        print("\n3. Gerando relatório PDF...")
-        pdf_generator.gerar_relatorio_pdf(
-            projetos_config=projetos_config,
-            resultados_estagio1=resultados_estagio1,
-            resultados_estagio2=resultados_estagio2,
-            graficos_paths=graficos,
-            serie_temporal_df=serie_temporal_df,
-            df_consolidada_instrutor=df_consolidada_instrutor,
-            contagem_instrutores_hab=contagem_instrutores_hab,
-            distribuicao_por_projeto=distribuicao_por_projeto
-        )
-
-        print("\n4. Limpando arquivos temporários...")
-        for path in graficos.values():
-            if path and os.path.exists(path):
-                try:
-                    os.remove(path)
-                except Exception as e:
-                    print(f"  ⚠ Não foi possível remover {path}: {e}")
-
-        print("\n" + "=" * 80)
-        print("✓✓✓ PROCESSO CONCLUÍDO COM SUCESSO! ✓✓✓")
-        print("=" * 80)
+        executar_otimizacao(parametros, projetos_config, arquivo_replanejamento)
 
     except KeyboardInterrupt:
         print("\n\n[!] Operação cancelada pelo usuário.")
@@ -263,4 +141,48 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Otimização de alocação de instrutores")
+    parser.add_argument("--replanejar", metavar="ARQUIVO",
+                        help="plano anterior (plano_atribuicoes.json ou 1_carga_horaria_detalhada.xlsx) "
+                             "para replanejar com mudança mínima")
+    parser.add_argument("--importar", metavar="ARQUIVO",
+                        help="importa projetos de um CSV/XLSX para uma configuração salva e encerra")
+    parser.add_argument("--nome", help="nome da configuração importada (padrão: nome do arquivo)")
+    parser.add_argument("--relatorio", metavar="ARQUIVO", nargs='?', const='',
+                        help="só regera os relatórios a partir de um arquivo de execução "
+                             "(padrão: o mais recente em resultados_otimizacao)")
+    parser.add_argument("--perfil", choices=PERFIS_SOLVER,
+                        help="perfil do solver desta execução (sobrescreve o da configuração)")
+    parser.add_argument("--threads", type=int, metavar="N",
+                        help="teto de threads do solver desta execução (0 = todos os núcleos)")
+    parser.add_argument("--integrado", action="store_true",
+                        help="após os dois estágios, reotimiza cronograma e atribuição num único modelo e "
+                             "compara instrutores e tempo")
+    parser.add_argument("--alternativos", type=int, metavar="K",
+                        help="avalia no Estágio 2 até K cronogramas do Estágio 1 (o ótimo e alternativos) "
+                             "em paralelo e fica o melhor plano")
+    parser.add_argument("--comparar-monolitico", action="store_true",
+                        help="com horizonte rolante, resolve também o portfólio inteiro de uma vez e compara "
+                             "pico, instrutores e tempo (dobra o tempo da execução)")
+    parser.add_argument("--motor", choices=MOTORES_ESTAGIO1,
+                        help="formulação do Estágio 1 desta execução: 'linear' (somas mensais) ou 'intervalos' "
+                             "(cumulativa; exige o backend cpsat)")
+    parser.add_argument("--historico", metavar="CONFIG", nargs='?', const='',
+                        help="lista o histórico de execuções (opcional: nome ou chave da configuração) e encerra")
+    parser.add_argument("--dias", type=int, help="com --historico: só as execuções dos últimos N dias")
+    parser.add_argument("--exportar", metavar="ARQUIVO", help="com --historico: exporta para CSV ou XLSX")
+    args = parser.parse_args()
+    registro.configurar_console()
+    if args.historico is not None:
+        historico = historico_execucoes.consultar_historico(args.historico, args.dias)
+        historico_execucoes.exibir_historico(historico)
+        if args.exportar:
+            historico_execucoes.exportar_historico(historico, args.exportar)
+        sys.exit(0)
+    if args.importar:
+        sys.exit(0 if importacao_projetos.importar_para_configuracao(args.importar, args.nome) else 1)
+    if args.relatorio is not None:
+        regerar_relatorios(args.relatorio)
+        sys.exit(0)
+    main(args.replanejar, args.perfil, args.threads, args.integrado, args.alternativos, args.comparar_monolitico,
+         args.motor)
\ No newline at end of file
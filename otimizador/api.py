@@ -0,0 +1,66 @@
+# ARQUIVO: otimizador/api.py
+"""
+API do otimizador para uso embutido em outros serviços Python.
+
+`planejar` roda conversão, Estágios 1 e 2, pós-processamento e, opcionalmente, arquivo de execução e
+relatórios no próprio processo, e devolve um ResultadoPlano. Nada é lido do teclado e o processo
+nunca é encerrado: falhas levantam ErroOtimizacao (ou ValueError para entradas inválidas). O pipeline
+registra pelos loggers abaixo de 'otimizador' (inclusive os processos filhos dos estágios), sem
+handler próprio: quem embute configura os seus.
+
+Os arquivos vão para `OpcoesPlano.diretorio_saida` (ou o diretório corrente), passado explicitamente
+a cada etapa; nem a saída padrão nem o diretório corrente do processo são alterados.
+"""
+
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Import relativo para acessar os modelos de dados e o pipeline
+from .data_models import (ParametrosOtimizacao, ConfiguracaoProjeto, OpcoesPlano, ResultadoPlano,
+                          AtribuicaoPlano)
+from .io import historico_execucoes
+from .pipeline import ErroOtimizacao, DIRETORIO_SAIDA, otimizar, arquivar_execucao, gerar_relatorios
+
+
+def planejar(parametros: ParametrosOtimizacao, projetos: List[ConfiguracaoProjeto],
+             opcoes: Optional[OpcoesPlano] = None) -> ResultadoPlano:
+    """
+    Otimiza a configuração e devolve o ResultadoPlano. Levanta ErroOtimizacao se a configuração for
+    inviável ou algum estágio falhar (com as inviabilidades em `conflitos`).
+    """
+    if not isinstance(parametros, ParametrosOtimizacao):
+        raise ValueError(f"parametros deve ser ParametrosOtimizacao. Recebido: {type(parametros).__name__}")
+    if not projetos or not all(isinstance(p, ConfiguracaoProjeto) for p in projetos):
+        raise ValueError("projetos deve ser uma lista não vazia de ConfiguracaoProjeto")
+    opcoes = opcoes or OpcoesPlano()
+    diretorio = Path(opcoes.diretorio_saida or '.').resolve()
+    diretorio.mkdir(parents=True, exist_ok=True)
+
+    inicio = time.perf_counter()
+    arquivos = []
+    execucao = otimizar(parametros, projetos, opcoes.arquivo_replanejamento)
+    if opcoes.arquivar:
+        arquivos.append(arquivar_execucao(execucao, diretorio / DIRETORIO_SAIDA,
+                                          historico_execucoes.caminho_historico(diretorio)))
+    if opcoes.gerar_relatorios:
+        arquivos += gerar_relatorios(execucao, diretorio / DIRETORIO_SAIDA, diretorio)
+
+    est1, est2 = execucao['resultados_estagio1'], execucao['resultados_estagio2']
+    return ResultadoPlano(
+        total_instrutores=est2.get('total_instrutores_flex'),
+        instrutores_por_habilidade=dict(execucao['contagem_instrutores_hab']),
+        pico_max=est1.get('pico_max'),
+        picos=dict(est1.get('picos') or {}),
+        spread_carga=est2.get('spread_carga'),
+        cronograma=est1.get('cronograma'),
+        atribuicoes=[AtribuicaoPlano(atr['turma'], atr['instrutor']) for atr in est2['atribuicoes']],
+        verificacao_ok=est2['verificacao']['ok'] if est2.get('verificacao') else None,
+        arquivos=arquivos,
+        tempo=time.perf_counter() - inicio,
+        execucao=execucao,
+    )
+
+
+# Nome em inglês pedido pelos serviços que integram o otimizador
+plan = planejar
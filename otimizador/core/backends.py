@@ -0,0 +1,383 @@
+# ARQUIVO: otimizador/core/backends.py
+"""
+Backends de solver usados pelos construtores de modelo dos Estágios 1 e 2.
+
+Os estágios montam o modelo por esta interface e o solver é escolhido por
+`ParametrosOtimizacao.backend_solver`: CP-SAT ('cpsat') ou MIP do OR-Tools via pywraplp
+('scip' ou 'cbc', ambos distribuídos com o ortools e executados localmente).
+As restrições lineares usam a sobrecarga de operadores de cada biblioteca; só as
+restrições não lineares (máximo, mínimo condicional, vínculo de uso) têm formulação própria.
+O perfil do solver (`ParametrosOtimizacao.perfil_solver`) define teto de threads, semente,
+determinismo e linearização de cada resolução; `configurar_cpsat` aplica o mesmo perfil aos
+CpSolver montados fora desta interface (vizinhanças do LNS, janelas, replanejamento).
+O perfil padrão, 'ajustado', usa em cada estágio os parâmetros escolhidos pelo ajuste sobre as
+configurações salvas (benchmarks/ajuste_perfil_solver.py); sem ajuste gravado (ou com um arquivo inválido),
+equivale a 'equilibrado'.
+"""
+
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+from ortools.linear_solver import pywraplp
+
+# Import relativo para acessar modelos de dados
+from ..data_models import BACKENDS_SOLVER
+from ..io.config_manager import CONFIGS_DIR
+from ..utils import nucleos_disponiveis
+
+logger = logging.getLogger(__name__)
+
+STATUS_MIP = {
+    pywraplp.Solver.OPTIMAL: 'OPTIMAL',
+    pywraplp.Solver.FEASIBLE: 'FEASIBLE',
+    pywraplp.Solver.INFEASIBLE: 'INFEASIBLE',
+    pywraplp.Solver.UNBOUNDED: 'UNBOUNDED',
+    pywraplp.Solver.ABNORMAL: 'ABNORMAL',
+    pywraplp.Solver.NOT_SOLVED: 'UNKNOWN',
+}
+
+
+# Teto de threads de cada perfil (0 = sem teto) e parâmetros do CP-SAT. Acima de ~8 threads o portfólio
+# do CP-SAT quase não ganha: 'equilibrado' para ali e deixa o resto da máquina para outras execuções.
+CONFIGURACAO_PERFIS = {
+    # Para assim que a solução estiver a 1% do limitante
+    'rapido': {'max_threads': 4, 'cpsat': {'relative_gap_limit': 0.01}},
+    'equilibrado': {'max_threads': 8, 'cpsat': {}},
+    'completo': {'max_threads': 0, 'cpsat': {'linearization_level': 2}},
+    # Uma thread, semente fixa e limite de tempo determinístico: mesma solução a cada execução,
+    # independentemente da carga e do número de núcleos da máquina
+    'deterministico': {'max_threads': 1, 'tempo_deterministico': True, 'cpsat': {'random_seed': 0}},
+    # Sem arquivo de ajuste válido, o mesmo que 'equilibrado'
+    'ajustado': {'max_threads': 8, 'cpsat': {}},
+}
+PERFIL_PADRAO = 'ajustado'
+# Perfil determinístico: unidades de tempo determinístico por segundo de timeout e folga do limite de
+# relógio, que só serve de proteção (se ele parar a busca, o resultado deixa de ser reprodutível)
+FATOR_TEMPO_DETERMINISTICO = 0.5
+FOLGA_TEMPO_DETERMINISTICO = 10.0
+
+# Parâmetros do perfil 'ajustado' por estágio, gravados pelo ajuste junto das configurações salvas (sem
+# .json para não ser listado)
+VARIAVEL_PERFIL_AJUSTADO = 'OTIMIZADOR_PERFIL_AJUSTADO'
+ARQUIVO_PERFIL_AJUSTADO = CONFIGS_DIR / ".perfil_ajustado"
+_perfis_ajustados_lidos: Dict[str, tuple] = {}
+
+
+def caminho_perfil_ajustado() -> Path:
+    """Arquivo do perfil ajustado: o da variável de ambiente, se definida, ou o padrão."""
+    return Path(os.environ.get(VARIAVEL_PERFIL_AJUSTADO) or ARQUIVO_PERFIL_AJUSTADO)
+
+
+def validar_configuracao_perfil(configuracao: Dict) -> Dict:
+    """
+    Configuração de perfil ({'max_threads', 'cpsat'}) normalizada; ValueError se o teto de threads for
+    inválido ou algum parâmetro não existir no CP-SAT ou tiver o tipo errado.
+    """
+    max_threads = configuracao.get('max_threads', 0)
+    if not isinstance(max_threads, int) or max_threads < 0:
+        raise ValueError(f"max_threads deve ser um inteiro >= 0. Recebido: {max_threads}")
+    parametros = cp_model.CpSolver().parameters
+    for nome, valor in configuracao.get('cpsat', {}).items():
+        try:
+            setattr(parametros, nome, valor)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"parâmetro do CP-SAT inválido: {nome}={valor!r} ({e})") from None
+    return {'max_threads': max_threads, 'cpsat': dict(configuracao.get('cpsat', {}))}
+
+
+def _estagios_ajustados() -> Dict[str, Dict]:
+    """Configurações por estágio do arquivo de ajuste ({'estagio1': ..., 'estagio2': ...}); {} se não houver."""
+    caminho = caminho_perfil_ajustado()
+    try:
+        versao = caminho.stat().st_mtime_ns
+    except OSError:
+        return {}
+    lido = _perfis_ajustados_lidos.get(str(caminho))
+    if lido and lido[0] == versao:
+        return lido[1]
+    try:
+        dados = json.loads(caminho.read_text(encoding='utf-8'))
+        estagios = {chave: validar_configuracao_perfil(dados[chave]) for chave in ('estagio1', 'estagio2')
+                    if chave in dados}
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        logger.warning(f"[AVISO] Perfil ajustado inválido em '{caminho}' ({e}). "
+                       f"Usando os parâmetros de 'equilibrado'.")
+        estagios = {}
+    _perfis_ajustados_lidos[str(caminho)] = (versao, estagios)
+    return estagios
+
+
+def configuracao_perfil(perfil: str, estagio: int = 0) -> Dict:
+    """Configuração do perfil; no 'ajustado', a gravada para o estágio (1 ou 2), se houver."""
+    if perfil == 'ajustado':
+        ajustada = _estagios_ajustados().get(f'estagio{estagio}')
+        if ajustada:
+            return ajustada
+    return CONFIGURACAO_PERFIS[perfil]
+
+
+def threads_resolucao(perfil: str, num_workers: int = 0, limite: int = 0, estagio: int = 0) -> int:
+    """
+    Threads de uma resolução: as pedidas pelo chamador (0 = todos os núcleos disponíveis), limitadas pelo
+    teto da execução (`limite`, de ParametrosOtimizacao.threads_solver) e pelo do perfil.
+    """
+    threads = min(num_workers, nucleos_disponiveis(limite)) if num_workers else nucleos_disponiveis(limite)
+    teto = configuracao_perfil(perfil, estagio)['max_threads']
+    return min(threads, teto) if teto else threads
+
+
+def configurar_cpsat(solver: cp_model.CpSolver, perfil: str, tempo_segundos: float, num_workers: int = 0,
+                     limite_threads: int = 0, log: bool = False, estagio: int = 0):
+    """Aplica tempo, threads, parâmetros do perfil (os do `estagio`, no 'ajustado') e log de busca a um CpSolver."""
+    configuracao = configuracao_perfil(perfil, estagio)
+    solver.parameters.num_workers = threads_resolucao(perfil, num_workers, limite_threads, estagio)
+    for nome, valor in configuracao['cpsat'].items(): setattr(solver.parameters, nome, valor)
+    if configuracao.get('tempo_deterministico'):
+        solver.parameters.max_deterministic_time = float(tempo_segundos) * FATOR_TEMPO_DETERMINISTICO
+        solver.parameters.max_time_in_seconds = float(tempo_segundos) * FOLGA_TEMPO_DETERMINISTICO
+    else:
+        solver.parameters.max_time_in_seconds = float(tempo_segundos)
+    solver.parameters.log_search_progress = log
+
+
+# Coletas ativas de `coletar_estatisticas` (neste processo)
+_coletas: List[List[Dict]] = []
+
+
+@contextmanager
+def coletar_estatisticas():
+    """
+    Lista que recebe, para cada resolução do CP-SAT feita dentro do bloco neste processo, um dicionário
+    com status, tempo, tempo até a primeira solução, objetivo, limitante e gap relativo final.
+    """
+    coleta: List[Dict] = []
+    _coletas.append(coleta)
+    try:
+        yield coleta
+    finally:
+        _coletas.remove(coleta)
+
+
+class _PrimeiraSolucao(cp_model.CpSolverSolutionCallback):
+    """Anota o tempo (relógio do solver) da primeira solução encontrada."""
+
+    def __init__(self):
+        super().__init__()
+        self.tempo: Optional[float] = None
+
+    def on_solution_callback(self):
+        if self.tempo is None: self.tempo = self.WallTime()
+
+
+class BackendSolver(ABC):
+    """Interface comum. `resolver` retorna o nome do status no padrão do CP-SAT ('OPTIMAL', 'FEASIBLE', ...)."""
+    nome = ''
+
+    def __init__(self, perfil: str = PERFIL_PADRAO, limite_threads: int = 0, log: bool = False, estagio: int = 0):
+        if perfil not in CONFIGURACAO_PERFIS:
+            raise ValueError(f"Perfil de solver inválido: {perfil}. Use um de {tuple(CONFIGURACAO_PERFIS)}.")
+        self.perfil, self.limite_threads, self.log, self.estagio = perfil, limite_threads, log, estagio
+
+    @abstractmethod
+    def inteiro(self, minimo: int, maximo: int, nome: str): ...
+
+    @abstractmethod
+    def booleano(self, nome: str): ...
+
+    @abstractmethod
+    def adicionar(self, restricao): ...
+
+    @abstractmethod
+    def exatamente_um(self, literais: List): ...
+
+    @abstractmethod
+    def maximo(self, alvo, termos: List):
+        """alvo = max(termos). No MIP vale alvo >= termos, exato quando o alvo é minimizado."""
+
+    @abstractmethod
+    def minimo_dos_usados(self, alvo, cargas: List, usados: List, maximo_cargas, limite: int):
+        """alvo = menor carga entre os instrutores usados (`limite` é um majorante das cargas)."""
+
+    @abstractmethod
+    def vincular_uso(self, carga, usado, limite: int):
+        """usado = 1 se e somente se carga > 0."""
+
+    @abstractmethod
+    def dica(self, var, valor: int): ...
+
+    @abstractmethod
+    def minimizar(self, expressao): ...
+
+    @abstractmethod
+    def resolver(self, tempo_segundos: float, num_workers: int = 0, **parametros_cpsat) -> str: ...
+
+    @abstractmethod
+    def valor(self, expressao) -> int: ...
+
+    @abstractmethod
+    def valores(self, variaveis: List) -> np.ndarray:
+        """Valores de muitas variáveis numa única chamada (array int64 na ordem de `variaveis`)."""
+
+    @abstractmethod
+    def tempo_solver(self) -> float: ...
+
+
+class BackendCpSat(BackendSolver):
+    """CP-SAT. `model` fica exposto para formulações exclusivas (ex.: AddCumulative)."""
+    nome = 'cpsat'
+
+    def __init__(self, **opcoes):
+        super().__init__(**opcoes)
+        self.model = cp_model.CpModel()
+        self.solver = cp_model.CpSolver()
+
+    def inteiro(self, minimo, maximo, nome): return self.model.NewIntVar(minimo, maximo, nome)
+
+    def booleano(self, nome): return self.model.NewBoolVar(nome)
+
+    def adicionar(self, restricao): self.model.Add(restricao)
+
+    def exatamente_um(self, literais): self.model.AddExactlyOne(literais)
+
+    def maximo(self, alvo, termos): self.model.AddMaxEquality(alvo, termos)
+
+    def minimo_dos_usados(self, alvo, cargas, usados, maximo_cargas, limite):
+        # Truque de modelagem: se um instrutor não é usado, sua carga é tratada como o máximo
+        # para que ele não seja escolhido como o mínimo.
+        cargas_ajustadas = []
+        for idx, (carga, usado) in enumerate(zip(cargas, usados)):
+            carga_ajustada = self.model.NewIntVar(0, limite, f'carga_ajustada_{idx}')
+            self.model.Add(carga_ajustada == carga).OnlyEnforceIf(usado)
+            self.model.Add(carga_ajustada == maximo_cargas).OnlyEnforceIf(usado.Not())
+            cargas_ajustadas.append(carga_ajustada)
+        self.model.AddMinEquality(alvo, cargas_ajustadas)
+
+    def vincular_uso(self, carga, usado, limite):
+        self.model.Add(carga > 0).OnlyEnforceIf(usado)
+        self.model.Add(carga == 0).OnlyEnforceIf(usado.Not())
+
+    def dica(self, var, valor): self.model.AddHint(var, valor)
+
+    def minimizar(self, expressao): self.model.Minimize(expressao)
+
+    def resolver(self, tempo_segundos, num_workers=0, **parametros_cpsat):
+        configurar_cpsat(self.solver, self.perfil, tempo_segundos, num_workers, self.limite_threads, self.log,
+                         self.estagio)
+        # Ajustes do construtor do modelo (ex.: linearização exigida pela formulação) valem sobre o perfil
+        for nome, valor in parametros_cpsat.items(): setattr(self.solver.parameters, nome, valor)
+        # O callback da primeira solução só entra quando alguém coleta estatísticas
+        primeira = _PrimeiraSolucao() if _coletas else None
+        status = self.solver.StatusName(self.solver.Solve(self.model, primeira))
+        if primeira is not None:
+            self._registrar_estatisticas(status, primeira.tempo)
+        return status
+
+    def _registrar_estatisticas(self, status: str, tempo_primeira_solucao: Optional[float]):
+        encontrou = status in ('OPTIMAL', 'FEASIBLE')
+        objetivo = self.solver.ObjectiveValue() if encontrou else None
+        limitante = self.solver.BestObjectiveBound() if encontrou else None
+        if status == 'OPTIMAL':
+            gap = 0.0
+        else:
+            gap = abs(objetivo - limitante) / max(1.0, abs(objetivo)) if encontrou else None
+        estatisticas = {"status": status, "tempo": self.solver.WallTime(),
+                        "tempo_primeira_solucao": tempo_primeira_solucao, "objetivo": objetivo,
+                        "limitante": limitante, "gap": gap}
+        for coleta in _coletas: coleta.append(estatisticas)
+
+    def valor(self, expressao): return self.solver.Value(expressao)
+
+    def valores(self, variaveis):
+        # A solução do CP-SAT é um vetor indexado pelo índice interno de cada variável
+        solucao = np.asarray(self.solver.ResponseProto().solution, dtype=np.int64)
+        return solucao[np.fromiter((v.Index() for v in variaveis), dtype=np.int64, count=len(variaveis))]
+
+    def tempo_solver(self): return self.solver.WallTime()
+
+
+class BackendMip(BackendSolver):
+    """MIP via pywraplp (SCIP ou CBC). Do perfil vale só o teto de threads; parâmetros do CP-SAT são ignorados."""
+
+    def __init__(self, nome: str, **opcoes):
+        super().__init__(**opcoes)
+        self.nome = nome
+        self.solver = pywraplp.Solver.CreateSolver(nome.upper())
+        if self.solver is None:
+            raise ValueError(f"Solver MIP '{nome}' indisponível nesta instalação do OR-Tools.")
+        self._dicas: Dict = {}
+        self._tempo_solve = 0.0
+
+    def _nome_unico(self, nome: str) -> str:
+        # O CBC aborta com nomes de variável repetidos (os IDs de turma chegam truncados)
+        return f'{nome}_{self.solver.NumVariables()}'
+
+    def inteiro(self, minimo, maximo, nome): return self.solver.IntVar(minimo, maximo, self._nome_unico(nome))
+
+    def booleano(self, nome): return self.solver.BoolVar(self._nome_unico(nome))
+
+    def adicionar(self, restricao): self.solver.Add(restricao)
+
+    def exatamente_um(self, literais): self.solver.Add(sum(literais) == 1)
+
+    def maximo(self, alvo, termos):
+        for termo in termos: self.solver.Add(alvo >= termo)
+
+    def minimo_dos_usados(self, alvo, cargas, usados, maximo_cargas, limite):
+        for carga, usado in zip(cargas, usados):
+            self.solver.Add(alvo <= carga + limite * (1 - usado))
+
+    def vincular_uso(self, carga, usado, limite):
+        self.solver.Add(carga >= usado)
+        self.solver.Add(carga <= limite * usado)
+
+    def dica(self, var, valor): self._dicas[var] = valor
+
+    def minimizar(self, expressao): self.solver.Minimize(expressao)
+
+    def resolver(self, tempo_segundos, num_workers=0, **parametros_cpsat):
+        self.solver.SetTimeLimit(int(tempo_segundos * 1000))
+        self.solver.SetNumThreads(threads_resolucao(self.perfil, num_workers, self.limite_threads, self.estagio))
+        if self.log: self.solver.EnableOutput()
+        if self._dicas: self.solver.SetHint(list(self._dicas), [float(v) for v in self._dicas.values()])
+        inicio = time.perf_counter()
+        status = self.solver.Solve()
+        self._tempo_solve = time.perf_counter() - inicio
+        return STATUS_MIP.get(status, 'UNKNOWN')
+
+    def valor(self, expressao):
+        if isinstance(expressao, (int, float)): return int(expressao)
+        return int(round(expressao.solution_value()))
+
+    def valores(self, variaveis):
+        return np.rint(np.fromiter((v.solution_value() for v in variaveis), dtype=float,
+                                   count=len(variaveis))).astype(np.int64)
+
+    # wall_time() do pywraplp conta desde a criação do solver e incluiria a montagem
+    def tempo_solver(self): return self._tempo_solve
+
+
+def criar_backend(nome: str, perfil: str = PERFIL_PADRAO, limite_threads: int = 0, log: bool = False,
+                  estagio: int = 0) -> BackendSolver:
+    """
+    Instancia o backend pelo nome configurado em `ParametrosOtimizacao.backend_solver`, com o perfil,
+    o teto de threads e o log de `perfil_solver`, `threads_solver` e `log_solver`. `estagio` (1 ou 2)
+    escolhe os parâmetros do perfil ajustado.
+    """
+    if nome not in BACKENDS_SOLVER:
+        raise ValueError(f"Backend de solver inválido: {nome}. Use um de {BACKENDS_SOLVER}.")
+    opcoes = {"perfil": perfil, "limite_threads": limite_threads, "log": log, "estagio": estagio}
+    return BackendCpSat(**opcoes) if nome == 'cpsat' else BackendMip(nome, **opcoes)
+
+
+def criar_backend_execucao(parametros, estagio: int = 0) -> BackendSolver:
+    """Backend configurado pelos parâmetros da execução (ParametrosOtimizacao) para o `estagio`."""
+    return criar_backend(parametros.backend_solver, parametros.perfil_solver, parametros.threads_solver,
+                         parametros.log_solver, estagio)
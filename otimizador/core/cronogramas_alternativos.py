@@ -0,0 +1,131 @@
+# ARQUIVO: otimizador/core/cronogramas_alternativos.py
+"""
+Avaliação de cronogramas alternativos do Estágio 1 no Estágio 2.
+
+Costuma haver muitos cronogramas com o mesmo pico, e cada um leva a um número de instrutores e a
+um spread diferentes no Estágio 2. O Estágio 1 devolve o cronograma ótimo e até
+`cronogramas_alternativos` - 1 alternativos (pico até o ótimo + `folga_pico_alternativos`); aqui cada
+um passa pelo Estágio 2 em um processo separado e fica o de melhor plano (menos instrutores, depois
+menor spread, depois menor pico).
+
+Orçamento de tempo: no Estágio 1, o ótimo e os alternativos dividem o mesmo timeout. No Estágio 2, os
+candidatos rodam em rodadas de tantos processos quantos os núcleos permitem, e o timeout do Estágio 2 é
+dividido entre as rodadas (mínimo de 10 s por candidato), de modo que a avaliação leve aproximadamente
+o mesmo que um único Estágio 2.
+"""
+
+import logging
+import math
+import time
+from dataclasses import replace
+from typing import List, Dict, Optional, Tuple
+
+# Import relativo para acessar modelos de dados e utils
+from .. import registro
+from ..data_models import Projeto, ParametrosOtimizacao
+from ..utils import nucleos_disponiveis
+from . import stage_1, stage_2, lns
+
+logger = logging.getLogger(__name__)
+
+# Menor timeout do Estágio 2 por candidato (o mínimo aceito por ParametrosOtimizacao)
+TEMPO_MINIMO_CANDIDATO = 10
+
+
+def _avaliar_candidato(args: Tuple) -> Tuple[int, Optional[Dict], float, List[logging.LogRecord]]:
+    """
+    Executa o Estágio 2 para um cronograma candidato (roda em processo separado). Os registros de log
+    são capturados e devolvidos, para serem reemitidos no processo pai só os do candidato escolhido.
+    Retorna (índice, resultado, tempo, registros).
+    """
+    indice, cronograma, projetos, meses, meses_ferias, parametros, threads = args
+    inicio = time.perf_counter()
+    with registro.capturar_registros() as registros:
+        if parametros.estrategia_estagio2 == 'lns':
+            resultado = lns.otimizar_atribuicao_lns(cronograma, projetos, meses, meses_ferias, parametros,
+                                                    max_processos=threads)
+        else:
+            resultado = stage_2.otimizar_atribuicao_e_carga(cronograma, projetos, meses, meses_ferias, parametros,
+                                                             num_workers=threads)
+    return indice, resultado, time.perf_counter() - inicio, registros
+
+
+def _resultado_estagio1(resultados_estagio1: Dict, cronograma: Dict, projetos: List[Projeto],
+                        meses_ferias: List[int], num_meses: int, parametros: ParametrosOtimizacao) -> Dict:
+    """Resultado do Estágio 1 com outro cronograma (picos recalculados)."""
+    demanda = stage_1.calcular_demanda_cronograma(cronograma, projetos, meses_ferias, num_meses)
+    picos = {hab: max(demanda.get(hab, [0])) for hab in resultados_estagio1['picos']}
+    resultado = {**resultados_estagio1, "cronograma": cronograma, "picos": picos,
+                 "pico_max": max(picos.values(), default=0)}
+    if 'picos_grupo' in resultados_estagio1:
+        resultado['picos_grupo'] = stage_1.picos_por_grupo(cronograma, projetos, meses_ferias, num_meses, parametros)
+    return resultado
+
+
+def avaliar_cronogramas(resultados_estagio1: Dict,
+                        projetos: List[Projeto],
+                        meses: List[str],
+                        meses_ferias: List[int],
+                        parametros: ParametrosOtimizacao) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Executa o Estágio 2 para o cronograma ótimo e os alternativos de `resultados_estagio1` e devolve
+    (resultados_estagio1, resultados_estagio2) do melhor plano. Se nenhum candidato tiver solução,
+    devolve o Estágio 1 ótimo e o resultado (com falha) do seu Estágio 2, para a relaxação do spread.
+    Em 'candidatos_cronograma' do Estágio 2 ficam os KPIs de cada candidato.
+    """
+    alternativos = resultados_estagio1.pop('cronogramas_alternativos', [])
+    candidatos = [resultados_estagio1] + [
+        _resultado_estagio1(resultados_estagio1, cronograma, projetos, meses_ferias, len(meses), parametros)
+        for cronograma in alternativos]
+
+    nucleos = nucleos_disponiveis(parametros.threads_solver)
+    processos = max(1, min(len(candidatos), nucleos))
+    threads_por_processo = max(1, nucleos // processos)
+    rodadas = math.ceil(len(candidatos) / processos)
+    tempo_candidato = max(TEMPO_MINIMO_CANDIDATO, parametros.timeout_segundos // rodadas)
+    parametros_candidato = replace(parametros, timeout_segundos=tempo_candidato)
+    logger.info(f"Cronogramas candidatos: {len(candidatos)} (ótimo + {len(alternativos)} alternativos) | "
+                f"Processos: {processos} x {threads_por_processo} threads | Timeout por candidato: {tempo_candidato}s")
+
+    tarefas = [(indice, candidato['cronograma'], projetos, meses, meses_ferias, parametros_candidato,
+                threads_por_processo) for indice, candidato in enumerate(candidatos)]
+    with registro.executor_processos(processos) as pool:
+        avaliacoes = list(pool.map(_avaliar_candidato, tarefas))
+
+    kpis, melhor = [], None
+    for indice, resultado, duracao, _ in avaliacoes:
+        sucesso = bool(resultado) and resultado.get('status') == 'sucesso'
+        kpis.append({
+            'candidato': 'ótimo' if indice == 0 else f'alternativo {indice}',
+            'pico_max': candidatos[indice]['pico_max'],
+            'total_instrutores_flex': resultado['total_instrutores_flex'] if sucesso else None,
+            'spread_carga': resultado['spread_carga'] if sucesso else None,
+            'status_solver': (resultado or {}).get('status_solver', 'N/A'),
+            'tempo_segundos': round(duracao, 1),
+        })
+        chave = (resultado['total_instrutores_flex'], resultado['spread_carga'], candidatos[indice]['pico_max'],
+                 indice) if sucesso else None
+        if sucesso and (melhor is None or chave < melhor[0]):
+            melhor = (chave, indice)
+    escolhido = melhor[1] if melhor else 0
+    for indice, linha in enumerate(kpis):
+        linha['escolhido'] = indice == escolhido
+
+    logger.info(f"\n{'Candidato':<16} | {'Pico':>5} | {'Instrutores':>11} | {'Spread':>6} | "
+                f"{'Status':<10} | {'Tempo':>7}")
+    logger.info("-" * 72)
+    for linha in kpis:
+        logger.info(f"{linha['candidato']:<16} | {linha['pico_max']:>5} | "
+                    f"{linha['total_instrutores_flex'] if linha['total_instrutores_flex'] is not None else '-':>11} | "
+                    f"{linha['spread_carga'] if linha['spread_carga'] is not None else '-':>6} | "
+                    f"{linha['status_solver']:<10} | {linha['tempo_segundos']:>6.1f}s"
+                    f"{'  <- escolhido' if linha['escolhido'] else ''}")
+
+    _, resultado, _, registros = avaliacoes[escolhido]
+    if melhor is None:
+        logger.warning("\n[!] Nenhum cronograma candidato com solução no Estágio 2.")
+        return resultados_estagio1, resultado
+    logger.info(f"\n[✓] Cronograma escolhido: {kpis[escolhido]['candidato']}. Estágio 2 do candidato:")
+    registro.reemitir(registros)
+    resultado['candidatos_cronograma'] = kpis
+    return candidatos[escolhido], resultado
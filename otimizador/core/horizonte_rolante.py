@@ -0,0 +1,292 @@
+# ARQUIVO: otimizador/core/horizonte_rolante.py
+"""
+Planejamento em horizonte rolante para horizontes de vários anos.
+
+Os dois estágios são resolvidos em janelas sobrepostas de `horizonte_janela_meses` meses, em
+sequência. Ao fim de cada janela, as decisões que começam antes da janela seguinte ficam fixas:
+no Estágio 1 viram coortes de início fixo (demanda de fundo) e no Estágio 2 viram uso mensal e
+carga acumulada de cada instrutor. Cada modelo só contém os meses da sua janela (mais a cauda de
+uma turma iniciada no fim dela), então memória e tempo crescem de forma aproximadamente linear
+com o horizonte.
+"""
+
+import logging
+import math
+import time
+from collections import defaultdict, Counter
+from dataclasses import replace
+from typing import List, Dict, Optional, Tuple
+
+# Import relativo para acessar modelos de dados e utils
+from .. import registro
+from ..data_models import Projeto, ParametrosOtimizacao
+from ..utils import calcular_meses_ativos, ordenar_habilidades, nucleos_disponiveis
+from . import stage_1, stage_2
+from .laboratorios import chave_pool
+from .indices import matriz_ativos
+from .stage_2 import criar_turmas, pool_para_turmas, chaves_pool_turmas, montar_resultado
+from .lns import avaliar_atribuicao, solucao_inicial_gulosa, resolver_vizinhanca
+
+logger = logging.getLogger(__name__)
+
+# Maior horizonte em que a comparação com a resolução monolítica ainda é executada
+LIMITE_MESES_COMPARACAO = 48
+
+
+def _janelas(num_meses: int, tamanho: int, sobreposicao: int) -> List[Tuple[int, int, bool]]:
+    """Lista (início, mês limite de fixação, é a última) das janelas que cobrem o horizonte."""
+    janelas, inicio, passo = [], 0, tamanho - sobreposicao
+    while inicio + tamanho < num_meses:
+        janelas.append((inicio, inicio + passo, False))
+        inicio += passo
+    janelas.append((inicio, num_meses, True))
+    return janelas
+
+
+def _tempo_janela(parametros: ParametrosOtimizacao, num_meses: int) -> int:
+    """Timeout de cada janela: a fração do timeout global proporcional ao tamanho da janela."""
+    return max(10, math.ceil(parametros.timeout_segundos * parametros.horizonte_janela_meses / num_meses))
+
+
+def _fim_modelo(projetos: List[Projeto], fim: int, meses_ferias: List[int], num_meses: int) -> int:
+    """
+    Fim (exclusivo) dos meses modelados: a janela mais a cauda de uma turma iniciada no seu último mês,
+    a maior duração em meses letivos a partir de `fim` (só as férias dentro da cauda a estendem).
+    """
+    cauda = calcular_meses_ativos(fim, max(p.duracao for p in projetos), meses_ferias, num_meses)
+    return cauda[-1] + 1 if cauda else min(fim, num_meses)
+
+
+def _projetos_janela(projetos: List[Projeto], restantes: Dict[str, Dict[str, int]], coortes_fixas: List[Tuple],
+                     inicio: int, fim: int, fim_modelo: int, meses_ferias: List[int],
+                     num_meses: int) -> List[Projeto]:
+    """
+    Projetos do modelo de uma janela, em índices locais: as turmas ainda não fixadas dos projetos que
+    podem começar nos meses modelados (a janela e sua cauda, até `fim_modelo`) e, como projetos de
+    início único, os trechos das coortes já fixadas que ficam ativos nesses meses. Inícios na cauda
+    evitam que projetos adiáveis sejam espremidos dentro da janela; eles nunca são fixados.
+    """
+    modelo = []
+    for proj in projetos:
+        restante = restantes[proj.nome]
+        if sum(restante.values()) == 0 or proj.inicio_min >= fim_modelo: continue
+        modelo.append(proj._replace(turmas=dict(restante),
+                                    inicio_min=max(proj.inicio_min, inicio) - inicio,
+                                    inicio_max=min(proj.inicio_max, fim_modelo - 1) - inicio,
+                                    mes_fim_projeto=min(proj.mes_fim_projeto, fim_modelo - 1) - inicio))
+    duracoes = {p.nome: p.duracao for p in projetos}
+    laboratorios = {p.nome: p.laboratorio for p in projetos}
+    for idx, (nome, habilidade, mes_inicio, num_turmas) in enumerate(coortes_fixas):
+        ativos = [m - inicio for m in calcular_meses_ativos(mes_inicio, duracoes[nome], meses_ferias, num_meses)
+                  if inicio <= m < fim_modelo]
+        if not ativos: continue
+        modelo.append(Projeto(f'__fixo{idx}', {habilidade: num_turmas}, len(ativos), ativos[0], ativos[0],
+                              ativos[-1], laboratorios[nome]))
+    return modelo
+
+
+def otimizar_curva_demanda_rolante(projetos_flexiveis: List[Projeto],
+                                   meses: List[str],
+                                   parametros: ParametrosOtimizacao,
+                                   motor: Optional[str] = None) -> Optional[Dict]:
+    """Estágio 1 em janelas sobrepostas. Retorna o mesmo dicionário de `otimizar_curva_demanda`."""
+    logger.info("\n" + "=" * 80 + "\nESTÁGIO 1 (HORIZONTE ROLANTE): Otimização da Curva de Demanda\n" + "=" * 80)
+    inicio_total = time.perf_counter()
+    num_meses = len(meses)
+    meses_ferias_idx = [meses.index(m) for m in parametros.meses_ferias if m in meses]
+    tamanho = parametros.horizonte_janela_meses
+    parametros_janela = replace(parametros, timeout_segundos=_tempo_janela(parametros, num_meses))
+
+    restantes = {p.nome: dict(p.turmas) for p in projetos_flexiveis}
+    coortes_fixas, tempo_solver, statuses = [], 0.0, set()
+    for inicio, limite_fixacao, ultima in _janelas(num_meses, tamanho, parametros.horizonte_sobreposicao_meses):
+        fim = min(num_meses, inicio + tamanho)
+        fim_modelo = _fim_modelo(projetos_flexiveis, fim, meses_ferias_idx, num_meses)
+        modelo = _projetos_janela(projetos_flexiveis, restantes, coortes_fixas, inicio, fim, fim_modelo,
+                                  meses_ferias_idx, num_meses)
+        if not any(not p.nome.startswith('__fixo') for p in modelo): continue
+        with registro.capturar_registros():
+            resultado = stage_1.otimizar_curva_demanda(modelo, meses[inicio:fim_modelo], parametros_janela,
+                                                       motor=motor)
+        if not resultado:
+            logger.error(f"\n[✗] FALHA na janela {meses[inicio]} a {meses[fim - 1]}.")
+            return None
+        tempo_solver += resultado['tempo_solver']
+        statuses.add(resultado['status_solver'])
+        for nome, entradas in resultado['cronograma'].items():
+            if nome.startswith('__fixo'): continue
+            for entrada in entradas:
+                mes_inicio = entrada['mes_inicio'] + inicio
+                if ultima or mes_inicio < limite_fixacao:
+                    coortes_fixas.append((nome, entrada['habilidade'], mes_inicio, entrada['num_turmas']))
+                    restantes[nome][entrada['habilidade']] -= entrada['num_turmas']
+        logger.info(f"   Janela {meses[inicio]} a {meses[fim - 1]}: {len(modelo)} projetos no modelo | "
+                    f"pico local {resultado['pico_max']} | {resultado['status_solver']}")
+
+    pendentes = [nome for nome, r in restantes.items() if sum(r.values()) > 0]
+    if pendentes:
+        logger.error(f"\n[✗] FALHA: turmas sem início definido em {', '.join(pendentes)}.")
+        return None
+
+    agregado = defaultdict(int)
+    for nome, habilidade, mes_inicio, num_turmas in coortes_fixas:
+        agregado[(nome, mes_inicio, habilidade)] += num_turmas
+    cronograma_flexivel = defaultdict(list)
+    for (nome, mes_inicio, habilidade), num_turmas in sorted(agregado.items()):
+        cronograma_flexivel[nome].append({'mes_inicio': mes_inicio, 'num_turmas': num_turmas, 'habilidade': habilidade})
+
+    demanda = stage_1.calcular_demanda_cronograma(cronograma_flexivel, projetos_flexiveis, meses_ferias_idx, num_meses)
+    picos = {hab: max(demanda[hab]) for hab in ordenar_habilidades(demanda)}
+    pico_max = max(picos.values(), default=0)
+    status_solver = 'OPTIMAL' if statuses == {'OPTIMAL'} else 'FEASIBLE'
+    logger.info(f"\n[✓] SUCESSO! Pico {pico_max} | Status das janelas: {status_solver}")
+    resultado = {
+        "cronograma": dict(cronograma_flexivel),
+        "pico_max": pico_max,
+        "picos": picos,
+        "meses_ferias": meses_ferias_idx,
+        "parametros": parametros,
+        "status_solver": status_solver,
+        "tempo_solver": tempo_solver,
+        "tempo_total": time.perf_counter() - inicio_total
+    }
+    if any(p.laboratorio is not None for p in projetos_flexiveis):
+        resultado["picos_grupo"] = stage_1.picos_por_grupo(cronograma_flexivel, projetos_flexiveis, meses_ferias_idx,
+                                                           num_meses, parametros)
+    return resultado
+
+
+def _subproblema_janela(livres: List[int], atrib: List[int], dica: List[Optional[int]], habilidades: List[str],
+                        ativos: List[List[int]], instrutores_por_hab: Dict[str, List[int]], num_instrutores: int,
+                        capacidade: int, inicio: int) -> Dict:
+    """
+    Subproblema do Estágio 2 de uma janela: as turmas livres podem ir para os instrutores já em uso,
+    para os da dica e para novos instrutores suficientes para o pico da janela. As turmas já fixadas
+    entram como uso mensal e carga acumulada de cada instrutor; turmas futuras ficam de fora.
+    """
+    carga_fixa = [0] * num_instrutores
+    for i in atrib:
+        if i >= 0: carga_fixa[i] += 1
+    demanda = defaultdict(Counter)
+    candidatos = defaultdict(set)
+    for t in livres:
+        for m in ativos[t]: demanda[habilidades[t]][m] += 1
+        if dica[t] is not None: candidatos[habilidades[t]].add(dica[t])
+    for hab, demanda_hab in demanda.items():
+        pool = instrutores_por_hab[hab]
+        candidatos[hab].update(i for i in pool if carga_fixa[i] > 0)
+        novos = [i for i in pool if carga_fixa[i] == 0 and i not in candidatos[hab]]
+        candidatos[hab].update(novos[:math.ceil(max(demanda_hab.values()) / capacidade)])
+
+    uso_fixo = {i: Counter() for cands in candidatos.values() for i in cands}
+    for t, i in enumerate(atrib):
+        if i in uso_fixo and ativos[t] and ativos[t][-1] >= inicio:
+            for m in ativos[t]: uso_fixo[i][m] += 1
+    return {
+        "tipo": "janela", "livres": livres, "habilidades": [habilidades[t] for t in livres],
+        "ativos": [ativos[t] for t in livres], "atual": [dica[t] for t in livres],
+        "candidatos": {hab: sorted(c) for hab, c in candidatos.items()}, "uso_fixo": uso_fixo,
+        "carga_fixa": carga_fixa
+    }
+
+
+def otimizar_atribuicao_rolante(cronograma_flexivel: Dict,
+                                projetos: List[Projeto],
+                                meses: List[str],
+                                meses_ferias: List[int],
+                                parametros: ParametrosOtimizacao) -> Optional[Dict]:
+    """
+    Estágio 2 em janelas sobrepostas, levando adiante o uso e a carga de cada instrutor.
+    Retorna o mesmo dicionário de `otimizar_atribuicao_e_carga`.
+    """
+    logger.info("\n" + "=" * 80 + "\nESTÁGIO 2 (HORIZONTE ROLANTE): Alocação de Instrutores\n" + "=" * 80)
+    inicio_total = time.perf_counter()
+    num_meses = len(meses)
+    all_turmas = criar_turmas(cronograma_flexivel, projetos)
+    all_instrutores = pool_para_turmas(all_turmas, parametros)
+    logger.info(f"Total de turmas criadas: {len(all_turmas)} | Pool de instrutores: {len(all_instrutores)}")
+
+    habilidades = chaves_pool_turmas(all_turmas, parametros)
+    ativos = [calcular_meses_ativos(t.mes_inicio, t.duracao, meses_ferias, num_meses) for t in all_turmas]
+    instrutores_por_hab = defaultdict(list)
+    for idx, inst in enumerate(all_instrutores):
+        instrutores_por_hab[chave_pool(inst.habilidade, inst.laboratorio_id)].append(idx)
+    num_instrutores, capacidade = len(all_instrutores), parametros.capacidade_max_instrutor
+
+    # A gulosa global só serve de dica; cada janela sobrescreve a dica das suas turmas
+    dica = solucao_inicial_gulosa(habilidades, ativos, instrutores_por_hab, capacidade, num_meses)
+    dica = list(dica) if dica else [None] * len(all_turmas)
+    atrib = [-1] * len(all_turmas)
+    tempo_janela = _tempo_janela(parametros, num_meses)
+    tamanho = parametros.horizonte_janela_meses
+
+    for inicio, limite_fixacao, ultima in _janelas(num_meses, tamanho, parametros.horizonte_sobreposicao_meses):
+        fim = min(num_meses, inicio + tamanho)
+        livres = [t for t, turma in enumerate(all_turmas) if atrib[t] == -1 and turma.mes_inicio < fim]
+        if not livres: continue
+        sub = _subproblema_janela(livres, atrib, dica, habilidades, ativos, instrutores_por_hab, num_instrutores,
+                                  capacidade, inicio)
+        sub.update(capacidade=capacidade, spread_maximo=parametros.spread_maximo, tempo=float(tempo_janela),
+                   num_workers=nucleos_disponiveis(parametros.threads_solver), semente=0,
+                   perfil=parametros.perfil_solver, log=parametros.log_solver)
+        novas, status = resolver_vizinhanca(sub)
+        if novas is None:
+            logger.error(f"\n[✗] FALHA na janela {meses[inicio]} a {meses[fim - 1]}: {status}")
+            return {"status": "falha", "status_solver": status}
+        for t, i in novas.items():
+            dica[t] = i
+            if ultima or all_turmas[t].mes_inicio < limite_fixacao: atrib[t] = i
+        logger.info(f"   Janela {meses[inicio]} a {meses[fim - 1]}: {len(livres)} turmas livres | "
+                    f"{sum(len(c) for c in sub['candidatos'].values())} instrutores candidatos | {status}")
+
+    _, total, spread, excesso = avaliar_atribuicao(atrib, num_instrutores, parametros.spread_maximo)
+    if excesso > 0:
+        logger.error(f"\n[✗] FALHA na Alocação: spread {spread} acima do máximo {parametros.spread_maximo}.")
+        logger.info("Sugestões: Aumente o 'Spread máximo' ou a janela do horizonte rolante.")
+        return {"status": "falha", "status_solver": "HORIZONTE_ROLANTE"}
+
+    logger.info(f"\n[✓] SUCESSO! {total} instrutores | spread {spread}")
+    resultado = montar_resultado(atrib, all_turmas, all_instrutores, parametros, "HORIZONTE_ROLANTE",
+                                 matriz_ativos(ativos, num_meses))
+    resultado['tempo_total'] = time.perf_counter() - inicio_total
+    return resultado
+
+
+def comparar_com_monolitico(projetos: List[Projeto],
+                            meses: List[str],
+                            meses_ferias: List[int],
+                            parametros: ParametrosOtimizacao,
+                            resultados_estagio1: Dict,
+                            resultados_estagio2: Dict) -> Optional[Dict]:
+    """
+    Resolve o mesmo portfólio de forma monolítica (se o horizonte ainda for tratável) e compara
+    pico, instrutores, spread e tempo com o horizonte rolante. Retorna {métrica: (rolante, monolítico)}.
+    Roda só com `parametros.comparar_monolitico`, pois resolve de novo os dois estágios.
+    """
+    if len(meses) > LIMITE_MESES_COMPARACAO:
+        logger.info(f"\n[INFO] Horizonte de {len(meses)} meses: comparação com a resolução monolítica omitida "
+                    f"(limite: {LIMITE_MESES_COMPARACAO}).")
+        return None
+    logger.info("\n--- Comparação: horizonte rolante x resolução monolítica ---")
+    inicio = time.perf_counter()
+    with registro.capturar_registros():
+        mono1 = stage_1.otimizar_curva_demanda(projetos, meses, parametros)
+        mono2 = stage_2.otimizar_atribuicao_e_carga(mono1['cronograma'], projetos, meses, meses_ferias,
+                                                    parametros) if mono1 else None
+    tempo_mono = time.perf_counter() - inicio
+    sucesso = bool(mono2) and mono2.get('status') == 'sucesso'
+
+    comparacao = {
+        'pico_max': (resultados_estagio1['pico_max'], mono1['pico_max'] if mono1 else None),
+        'total_instrutores_flex': (resultados_estagio2['total_instrutores_flex'],
+                                   mono2['total_instrutores_flex'] if sucesso else None),
+        'spread_carga': (resultados_estagio2['spread_carga'], mono2['spread_carga'] if sucesso else None),
+        'tempo_segundos': (round(resultados_estagio1['tempo_total'] + resultados_estagio2['tempo_total'], 1),
+                           round(tempo_mono, 1))
+    }
+    logger.info(f"{'Métrica':<24} | {'Rolante':>8} | {'Monolítico':>10} | {'Diferença':>9}")
+    logger.info("-" * 62)
+    for metrica, (rolante, mono) in comparacao.items():
+        diferenca = f"{round(rolante - mono, 1):+}" if mono is not None else '-'
+        logger.info(f"{metrica:<24} | {rolante:>8} | {mono if mono is not None else 'falha':>10} | {diferenca:>9}")
+    return comparacao
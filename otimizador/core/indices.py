@@ -0,0 +1,104 @@
+# ARQUIVO: otimizador/core/indices.py
+"""
+Representação compacta do Estágio 2 indexada por inteiros.
+
+Turmas e instrutores viram linhas de tabelas NumPy (posição nas listas de `criar_turmas` e
+`criar_pool_instrutores`); uma atribuição é um array int32 com o índice do instrutor de cada turma.
+Os namedtuples `Turma`/`Instrutor` só são usados pelo adaptador dos relatórios.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Sequence
+
+import numpy as np
+
+# Import relativo para acessar modelos de dados e utils
+from ..data_models import Turma, Instrutor, HABILIDADES_PADRAO
+from ..utils import calcular_meses_ativos
+
+
+@dataclass
+class TabelaTurmas:
+    """Colunas das turmas; `ativos[t, m]` indica se a turma t tem aula no mês m (férias já descontadas)."""
+    habilidade: np.ndarray
+    projeto: np.ndarray
+    mes_inicio: np.ndarray
+    duracao: np.ndarray
+    ativos: np.ndarray
+    nomes_projeto: List[str]
+
+    def __len__(self) -> int:
+        return len(self.habilidade)
+
+
+@dataclass
+class TabelaInstrutores:
+    """Colunas do pool de instrutores."""
+    habilidade: np.ndarray
+    capacidade: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.habilidade)
+
+    def pool(self, habilidade: int) -> np.ndarray:
+        """Índices dos instrutores de uma habilidade, na ordem do pool."""
+        return np.flatnonzero(self.habilidade == habilidade)
+
+
+def tabela_turmas(all_turmas: List[Turma], meses_ferias: List[int], num_meses: int,
+                  habilidades: Sequence[str] = HABILIDADES_PADRAO) -> TabelaTurmas:
+    """
+    Monta a tabela de turmas; a matriz de meses ativos é calculada uma vez por duração e início.
+    O código de cada habilidade é a sua posição em `habilidades` (a mesma usada na tabela de instrutores).
+    """
+    nomes_projeto = sorted({t.projeto for t in all_turmas})
+    codigo_projeto = {nome: idx for idx, nome in enumerate(nomes_projeto)}
+    ativos = np.zeros((len(all_turmas), num_meses), dtype=bool)
+    linhas = {}
+    for idx, t in enumerate(all_turmas):
+        chave = (t.mes_inicio, t.duracao)
+        if chave not in linhas:
+            linhas[chave] = calcular_meses_ativos(t.mes_inicio, t.duracao, meses_ferias, num_meses)
+        ativos[idx, linhas[chave]] = True
+    return TabelaTurmas(
+        habilidade=np.array([habilidades.index(t.habilidade) for t in all_turmas], dtype=np.int8),
+        projeto=np.array([codigo_projeto[t.projeto] for t in all_turmas], dtype=np.int32),
+        mes_inicio=np.array([t.mes_inicio for t in all_turmas], dtype=np.int32),
+        duracao=np.array([t.duracao for t in all_turmas], dtype=np.int32),
+        ativos=ativos, nomes_projeto=nomes_projeto)
+
+
+def matriz_ativos(ativos: Sequence[Sequence[int]], num_meses: int) -> np.ndarray:
+    """Matriz turma x mês a partir das listas de meses ativos usadas pelos modelos do Estágio 2."""
+    matriz = np.zeros((len(ativos), num_meses), dtype=bool)
+    for idx, meses_turma in enumerate(ativos):
+        matriz[idx, list(meses_turma)] = True
+    return matriz
+
+
+def tabela_instrutores(all_instrutores: List[Instrutor],
+                       habilidades: Sequence[str] = HABILIDADES_PADRAO) -> TabelaInstrutores:
+    """Monta a tabela do pool de instrutores (códigos de habilidade como em `tabela_turmas`)."""
+    return TabelaInstrutores(
+        habilidade=np.array([habilidades.index(i.habilidade) for i in all_instrutores], dtype=np.int8),
+        capacidade=np.array([i.capacidade for i in all_instrutores], dtype=np.int32))
+
+
+def indicadores_atribuicao(atribuicao: np.ndarray, ativos: np.ndarray, num_instrutores: int) -> Dict:
+    """
+    Cargas por instrutor, spread entre os instrutores usados e carga mensal (instrutor x mês),
+    calculados de uma vez a partir do array de atribuição e da matriz de meses ativos.
+    """
+    cargas = np.bincount(atribuicao, minlength=num_instrutores)
+    usados = np.flatnonzero(cargas)
+    carga_mensal = np.zeros((num_instrutores, ativos.shape[1]), dtype=np.int32)
+    np.add.at(carga_mensal, atribuicao, ativos)
+    return {"cargas": cargas, "usados": usados,
+            "spread": int(cargas[usados].max() - cargas[usados].min()) if len(usados) else 0,
+            "carga_mensal": carga_mensal}
+
+
+def atribuicoes_para_dicts(atribuicao: Sequence[int], all_turmas: List[Turma],
+                           all_instrutores: List[Instrutor]) -> List[Dict]:
+    """Adaptador para os relatórios: array de índices -> [{'turma': Turma, 'instrutor': Instrutor}]."""
+    return [{'turma': turma, 'instrutor': all_instrutores[i]} for turma, i in zip(all_turmas, atribuicao)]
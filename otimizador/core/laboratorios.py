@@ -0,0 +1,43 @@
+# ARQUIVO: otimizador/core/laboratorios.py
+"""
+Dimensão de laboratórios (sites).
+
+Projetos e turmas pertencem a um laboratório. Instrutores pertencem a um grupo de atendimento: o
+próprio laboratório ou um grupo de laboratórios que compartilham instrutores
+(`ParametrosOtimizacao.compartilhamento_laboratorios`). Grupos distintos só se acoplam pelo spread
+global, então cada grupo (e cada habilidade dentro dele) é um subproblema independente.
+Sem laboratórios configurados, tudo cai no grupo None e o comportamento é o original.
+"""
+
+from typing import List, Dict, Optional, Iterable
+
+# Import relativo para acessar modelos de dados
+from ..data_models import ParametrosOtimizacao
+
+
+def grupo_atendimento(laboratorio: Optional[str], parametros: ParametrosOtimizacao) -> Optional[str]:
+    """Grupo de atendimento de um laboratório: 'LabA+LabB' se compartilha instrutores, senão o próprio nome."""
+    if laboratorio is None: return None
+    for grupo in parametros.compartilhamento_laboratorios:
+        if laboratorio in grupo: return '+'.join(grupo)
+    return laboratorio
+
+
+def ordenar_grupos(grupos: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Grupos distintos em ordem estável (o grupo None, sem laboratório, primeiro)."""
+    distintos = set(grupos)
+    return ([None] if None in distintos else []) + sorted(g for g in distintos if g is not None)
+
+
+def chave_pool(habilidade: str, grupo: Optional[str]) -> str:
+    """Chave do pool de instrutores: a habilidade, prefixada pelo grupo quando há laboratório ('LabA:PROG')."""
+    return habilidade if grupo is None else f'{grupo}:{habilidade}'
+
+
+def salas_por_laboratorio(parametros: ParametrosOtimizacao, meses: List[str]) -> Dict[str, List[Optional[int]]]:
+    """Limite de turmas ativas por laboratório e mês, só para os laboratórios com algum limite."""
+    salas = {}
+    for lab in parametros.laboratorios:
+        limites = [lab.salas_no_mes(mes) for mes in meses]
+        if any(limite is not None for limite in limites): salas[lab.nome] = limites
+    return salas
@@ -0,0 +1,305 @@
+# ARQUIVO: otimizador/core/lns.py
+"""
+Busca em Vizinhança Ampla (LNS) para instâncias muito grandes do Estágio 2.
+
+Parte de uma atribuição viável (gulosa) e, a cada rodada, libera várias vizinhanças
+(janela de meses, um projeto ou um subconjunto de instrutores), re-otimizando cada uma no
+CP-SAT em um processo separado enquanto o restante da atribuição fica fixo. A melhor
+vizinhança da rodada é aplicada. O resultado mantém o formato do Estágio 2.
+"""
+
+import logging
+import math
+import random
+import time
+from collections import defaultdict
+from typing import List, Dict, Optional, Sequence, Tuple
+from ortools.sat.python import cp_model
+
+# Import relativo para acessar modelos de dados e utils
+from .. import registro
+from ..data_models import Projeto, ParametrosOtimizacao
+from ..utils import calcular_meses_ativos, nucleos_disponiveis
+from .backends import configurar_cpsat, PERFIL_PADRAO
+from .laboratorios import chave_pool
+from .indices import matriz_ativos
+from .stage_2 import criar_turmas, pool_para_turmas, chaves_pool_turmas, montar_resultado
+
+logger = logging.getLogger(__name__)
+
+# Pesos do objetivo: excesso de spread (viabilidade) > instrutores > spread, como no Estágio 2
+PESO_EXCESSO_SPREAD = 1_000_000
+PESO_INSTRUTOR = 10_000
+
+TIPOS_VIZINHANCA = ('meses', 'projeto', 'instrutores')
+TEMPO_SUBPROBLEMA = 10.0
+TURMAS_POR_VIZINHANCA = (20, 60, 400)  # mínimo, inicial e máximo de turmas liberadas
+
+
+def avaliar_atribuicao(atrib: List[int], num_instrutores: int, spread_maximo: int) -> Tuple[int, int, int, int]:
+    """Retorna (custo, instrutores usados, spread, excesso de spread) de uma atribuição completa."""
+    carga = [0] * num_instrutores
+    for i in atrib: carga[i] += 1
+    usadas = [c for c in carga if c > 0]
+    spread = max(usadas) - min(usadas) if usadas else 0
+    excesso = max(0, spread - spread_maximo)
+    return excesso * PESO_EXCESSO_SPREAD + len(usadas) * PESO_INSTRUTOR + spread, len(usadas), spread, excesso
+
+
+def solucao_inicial_gulosa(habilidades: List[str], ativos: List[List[int]],
+                           instrutores_por_hab: Dict[str, List[int]], capacidade: int,
+                           num_meses: int) -> Optional[List[int]]:
+    """
+    Gulosa balanceada: abre ceil(pico/capacidade) instrutores por habilidade e atribui cada turma,
+    em ordem de início, ao instrutor menos carregado com capacidade em todos os seus meses ativos.
+    Abre novos instrutores do pool só quando necessário. Retorna None se o pool se esgotar.
+    """
+    atrib = [-1] * len(habilidades)
+    for hab, pool in instrutores_por_hab.items():
+        turmas_hab = sorted((t for t, h in enumerate(habilidades) if h == hab), key=lambda t: ativos[t][:1])
+        if not turmas_hab: continue
+        demanda = [0] * num_meses
+        for t in turmas_hab:
+            for m in ativos[t]: demanda[m] += 1
+        abertos = min(len(pool), max(1, math.ceil(max(demanda) / capacidade)))
+        uso = {i: [0] * num_meses for i in pool}
+        carga = {i: 0 for i in pool}
+        for t in turmas_hab:
+            while True:
+                livres = [i for i in pool[:abertos] if all(uso[i][m] < capacidade for m in ativos[t])]
+                if livres: break
+                if abertos == len(pool): return None
+                abertos += 1
+            escolhido = min(livres, key=lambda i: carga[i])
+            atrib[t] = escolhido
+            carga[escolhido] += 1
+            for m in ativos[t]: uso[escolhido][m] += 1
+    return atrib
+
+
+def _montar_subproblema(tipo: str, rng: random.Random, atrib: List[int], habilidades: List[str],
+                        ativos: List[List[int]], projetos_turma: List[str], instrutores_por_hab: Dict[str, List[int]],
+                        num_instrutores: int, num_meses: int, limite: int) -> Optional[Dict]:
+    """Escolhe as turmas liberadas e os instrutores candidatos de uma vizinhança."""
+    carga = [0] * num_instrutores
+    for i in atrib: carga[i] += 1
+
+    if tipo == 'meses':
+        largura = rng.randint(2, 4)
+        inicio = rng.randrange(max(1, num_meses - largura + 1))
+        janela = set(range(inicio, inicio + largura))
+        livres = [t for t, meses_t in enumerate(ativos) if janela.intersection(meses_t)]
+    elif tipo == 'projeto':
+        projeto = rng.choice(sorted(set(projetos_turma)))
+        livres = [t for t, p in enumerate(projetos_turma) if p == projeto]
+    else:
+        hab = rng.choice(sorted(instrutores_por_hab))
+        usados = [i for i in instrutores_por_hab[hab] if carga[i] > 0]
+        if not usados: return None
+        escolhidos = set(rng.sample(usados, min(len(usados), rng.randint(2, 6))))
+        livres = [t for t, i in enumerate(atrib) if i in escolhidos]
+    if not livres: return None
+    if len(livres) > limite: livres = rng.sample(livres, limite)
+
+    # Candidatos: donos atuais das turmas liberadas, instrutores usados (exceto na vizinhança de
+    # instrutores, que só troca turmas dentro do subconjunto) e um instrutor livre por habilidade
+    candidatos = defaultdict(set)
+    for t in livres: candidatos[habilidades[t]].add(atrib[t])
+    for hab in candidatos:
+        pool = instrutores_por_hab[hab]
+        if tipo != 'instrutores':
+            candidatos[hab].update(i for i in pool if carga[i] > 0)
+        candidatos[hab].update([i for i in pool if carga[i] == 0][:1])
+
+    livres_set = set(livres)
+    todos_candidatos = {i for cands in candidatos.values() for i in cands}
+    uso_fixo = {i: [0] * num_meses for i in todos_candidatos}
+    carga_fixa = list(carga)
+    for t, i in enumerate(atrib):
+        if t in livres_set:
+            carga_fixa[i] -= 1
+        elif i in uso_fixo:
+            for m in ativos[t]: uso_fixo[i][m] += 1
+    return {
+        "tipo": tipo, "livres": livres, "habilidades": [habilidades[t] for t in livres],
+        "ativos": [ativos[t] for t in livres], "atual": [atrib[t] for t in livres],
+        "candidatos": {hab: sorted(c) for hab, c in candidatos.items()}, "uso_fixo": uso_fixo,
+        "carga_fixa": carga_fixa
+    }
+
+
+def resolver_vizinhanca(sub: Dict) -> Tuple[Optional[Dict[int, int]], str]:
+    """Re-otimiza as turmas liberadas de uma vizinhança; as demais entram como uso e carga fixos."""
+    model = cp_model.CpModel()
+    capacidade, spread_maximo = sub['capacidade'], sub['spread_maximo']
+    livres, candidatos = sub['livres'], sub['candidatos']
+    limite_carga = len(sub['carga_fixa']) + len(livres) + max(sub['carga_fixa'])
+
+    x = {}
+    for k, hab in enumerate(sub['habilidades']):
+        for i in candidatos[hab]:
+            x[(k, i)] = model.NewBoolVar(f'x_{k}_{i}')
+        model.AddExactlyOne(x[(k, i)] for i in candidatos[hab])
+        if sub['atual'][k] is not None: model.AddHint(x[(k, sub['atual'][k])], 1)
+
+    cargas, usados = [], []
+    for hab, cands in candidatos.items():
+        turmas_hab = [k for k, h in enumerate(sub['habilidades']) if h == hab]
+        for i in cands:
+            por_mes = defaultdict(list)
+            for k in turmas_hab:
+                for m in sub['ativos'][k]: por_mes[m].append(x[(k, i)])
+            for m, termos in por_mes.items():
+                model.Add(sum(termos) <= capacidade - sub['uso_fixo'][i][m])
+            carga = model.NewIntVar(0, limite_carga, f'carga_{i}')
+            model.Add(carga == sub['carga_fixa'][i] + sum(x[(k, i)] for k in turmas_hab))
+            usado = model.NewBoolVar(f'usado_{i}')
+            model.Add(carga >= 1).OnlyEnforceIf(usado)
+            model.Add(carga == 0).OnlyEnforceIf(usado.Not())
+            cargas.append(carga)
+            usados.append(usado)
+
+    # Instrutores fora da vizinhança entram como constantes no spread e na contagem
+    todos_candidatos = {i for cands in candidatos.values() for i in cands}
+    cargas_fixas = [c for i, c in enumerate(sub['carga_fixa']) if i not in todos_candidatos and c > 0]
+
+    max_carga = model.NewIntVar(0, limite_carga, 'max_carga')
+    min_carga = model.NewIntVar(0, limite_carga, 'min_carga')
+    model.AddMaxEquality(max_carga, cargas + ([max(cargas_fixas)] if cargas_fixas else []))
+    ajustadas = []
+    for idx, (carga, usado) in enumerate(zip(cargas, usados)):
+        ajustada = model.NewIntVar(0, limite_carga, f'carga_ajustada_{idx}')
+        model.Add(ajustada == carga).OnlyEnforceIf(usado)
+        model.Add(ajustada == max_carga).OnlyEnforceIf(usado.Not())
+        ajustadas.append(ajustada)
+    model.AddMinEquality(min_carga, ajustadas + ([min(cargas_fixas)] if cargas_fixas else []))
+
+    spread = model.NewIntVar(0, limite_carga, 'spread')
+    model.Add(spread == max_carga - min_carga)
+    excesso = model.NewIntVar(0, limite_carga, 'excesso')
+    model.Add(excesso >= spread - spread_maximo)
+    total = sum(usados) + len(cargas_fixas)
+    # Pesos opcionais (excesso, mudança, instrutor, spread): mudança conta turmas tiradas do instrutor em 'atual'
+    peso_excesso, peso_mudanca, peso_instrutor, peso_spread = sub.get(
+        'pesos', (PESO_EXCESSO_SPREAD, 0, PESO_INSTRUTOR, 1))
+    mudancas = sum(1 - x[(k, i)] for k, i in enumerate(sub['atual']) if i is not None) if peso_mudanca else 0
+    model.Minimize(excesso * peso_excesso + mudancas * peso_mudanca + total * peso_instrutor + spread * peso_spread)
+
+    solver = cp_model.CpSolver()
+    # Toda vizinhança (LNS, janela ou replanejamento) é uma atribuição: parâmetros do Estágio 2
+    configurar_cpsat(solver, sub.get('perfil', PERFIL_PADRAO), sub['tempo'], sub['num_workers'],
+                     log=sub.get('log', False), estagio=2)
+    solver.parameters.random_seed = sub['semente']
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None, solver.StatusName(status)
+    novas = {}
+    for k, t in enumerate(livres):
+        hab = sub['habilidades'][k]
+        novas[t] = next(i for i in candidatos[hab] if solver.Value(x[(k, i)]))
+    return novas, solver.StatusName(status)
+
+
+def otimizar_atribuicao_lns(cronograma_flexivel: Dict,
+                            projetos: List[Projeto],
+                            meses: List[str],
+                            meses_ferias: List[int],
+                            parametros: ParametrosOtimizacao,
+                            solucao_inicial: Optional[Sequence[int]] = None,
+                            max_processos: Optional[int] = None,
+                            semente: int = 0) -> Optional[Dict]:
+    """
+    Estágio 2 por LNS, limitado por `parametros.timeout_segundos`.
+    `solucao_inicial` (array 'atribuicao' de uma solução do mesmo cronograma) substitui a construção gulosa.
+    Retorna o dicionário do Estágio 2 acrescido de 'historico_lns': [(segundos, instrutores, spread, excesso)].
+    """
+    logger.info("\n" + "=" * 80)
+    logger.info("ESTÁGIO 2 (LNS): Alocação de Instrutores por Vizinhanças")
+    logger.info("=" * 80)
+    inicio = time.perf_counter()
+    num_meses = len(meses)
+    all_turmas = criar_turmas(cronograma_flexivel, projetos)
+    all_instrutores = pool_para_turmas(all_turmas, parametros)
+    logger.info(f"Total de turmas criadas: {len(all_turmas)} | Pool de instrutores: {len(all_instrutores)}")
+
+    habilidades = chaves_pool_turmas(all_turmas, parametros)
+    ativos = [calcular_meses_ativos(t.mes_inicio, t.duracao, meses_ferias, num_meses) for t in all_turmas]
+    projetos_turma = [t.projeto.split('_Onda')[0] for t in all_turmas]
+    instrutores_por_hab = defaultdict(list)
+    for idx, inst in enumerate(all_instrutores):
+        instrutores_por_hab[chave_pool(inst.habilidade, inst.laboratorio_id)].append(idx)
+
+    if solucao_inicial is not None:
+        atrib = [int(i) for i in solucao_inicial]
+    else:
+        atrib = solucao_inicial_gulosa(habilidades, ativos, instrutores_por_hab,
+                                       parametros.capacidade_max_instrutor, num_meses)
+    if atrib is None or -1 in atrib:
+        logger.error("\n[✗] FALHA: não foi possível construir uma atribuição inicial viável.")
+        return {"status": "falha", "status_solver": "LNS"}
+
+    num_instrutores = len(all_instrutores)
+    custo, total, spread, excesso = avaliar_atribuicao(atrib, num_instrutores, parametros.spread_maximo)
+    historico = [(round(time.perf_counter() - inicio, 2), total, spread, excesso)]
+    logger.info(f"Solução inicial: {total} instrutores | spread {spread} (excesso {excesso})")
+
+    nucleos = nucleos_disponiveis(parametros.threads_solver)
+    processos = max(1, min(max_processos or nucleos, nucleos))
+    threads_por_processo = max(1, nucleos // processos)
+    rng = random.Random(semente)
+    limite = TURMAS_POR_VIZINHANCA[1]
+    rodada = 0
+
+    with registro.executor_processos(processos) as pool:
+        while True:
+            restante = parametros.timeout_segundos - (time.perf_counter() - inicio)
+            if restante < 1.0: break
+            subproblemas = []
+            for k in range(processos):
+                tipo = TIPOS_VIZINHANCA[(rodada * processos + k) % len(TIPOS_VIZINHANCA)]
+                sub = _montar_subproblema(tipo, rng, atrib, habilidades, ativos, projetos_turma, instrutores_por_hab,
+                                          num_instrutores, num_meses, limite)
+                if sub is None: continue
+                sub.update(capacidade=parametros.capacidade_max_instrutor, spread_maximo=parametros.spread_maximo,
+                           tempo=min(TEMPO_SUBPROBLEMA, restante), num_workers=threads_por_processo,
+                           semente=rng.randrange(1 << 30), perfil=parametros.perfil_solver,
+                           log=parametros.log_solver)
+                subproblemas.append(sub)
+            rodada += 1
+            if not subproblemas: continue
+
+            melhor = None
+            statuses = []
+            for sub, (novas, status) in zip(subproblemas, pool.map(resolver_vizinhanca, subproblemas)):
+                statuses.append(status)
+                if novas is None: continue
+                candidata = list(atrib)
+                for t, i in novas.items(): candidata[t] = i
+                avaliacao = avaliar_atribuicao(candidata, num_instrutores, parametros.spread_maximo)
+                if avaliacao[0] < custo and (melhor is None or avaliacao[0] < melhor[1][0]):
+                    melhor = (candidata, avaliacao, sub['tipo'])
+
+            # Ajuste adaptativo do tamanho: cresce quando os subproblemas fecham, encolhe quando estouram
+            if all(s == 'OPTIMAL' for s in statuses):
+                limite = min(TURMAS_POR_VIZINHANCA[2], int(limite * 1.25) + 1)
+            elif all(s != 'OPTIMAL' for s in statuses):
+                limite = max(TURMAS_POR_VIZINHANCA[0], int(limite * 0.8))
+
+            if melhor:
+                atrib, (custo, total, spread, excesso), tipo = melhor
+                decorrido = round(time.perf_counter() - inicio, 2)
+                historico.append((decorrido, total, spread, excesso))
+                logger.info(f"   [{decorrido:>7.1f}s] {total} instrutores | spread {spread} (excesso {excesso}) "
+                            f"<- vizinhança '{tipo}'")
+
+    logger.info(f"\nRodadas: {rodada} | Melhorias: {len(historico) - 1}")
+    if excesso > 0:
+        logger.error(f"\n[✗] FALHA na Alocação: spread {spread} acima do máximo {parametros.spread_maximo}.")
+        logger.info("Sugestões: Aumente o 'Spread máximo' ou o 'Timeout do solver'.")
+        return {"status": "falha", "status_solver": "LNS", "historico_lns": historico}
+
+    logger.info(f"\n[✓] SUCESSO! {total} instrutores | spread {spread}")
+    resultado = montar_resultado(atrib, all_turmas, all_instrutores, parametros, "LNS",
+                                 matriz_ativos(ativos, num_meses))
+    resultado['historico_lns'] = historico
+    return resultado
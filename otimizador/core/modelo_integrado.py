@@ -0,0 +1,224 @@
+# ARQUIVO: otimizador/core/modelo_integrado.py
+"""
+Modelo integrado (opcional): meses de início e atribuição de instrutores num único modelo.
+
+Os dois estágios fixam primeiro o cronograma de menor pico e só depois atribuem instrutores; um
+cronograma um pouco diferente pode precisar de menos instrutores ou dar um spread menor. Aqui cada
+turma escolhe o mês de início (dentro da janela do projeto) e o instrutor ao mesmo tempo, com o
+objetivo do Estágio 2. Turmas do mesmo projeto e habilidade são intercambiáveis, então o modelo conta
+turmas por (projeto, habilidade, mês de início, instrutor) em vez de decidir turma a turma. O pool de
+cada unidade (habilidade de um grupo de atendimento) fica limitado aos instrutores usados pela solução
+em dois estágios, que entra completa como dica: o modelo parte dela e só é adotado se a melhorar.
+"""
+
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Import relativo para acessar modelos de dados e utils
+from ..data_models import Projeto, ParametrosOtimizacao
+from ..utils import calcular_meses_ativos, ordenar_habilidades
+from .backends import criar_backend_execucao
+from .indices import tabela_turmas
+from .laboratorios import grupo_atendimento, chave_pool, salas_por_laboratorio
+from . import stage_1, stage_2
+
+logger = logging.getLogger(__name__)
+
+# Acima disto ((projeto, habilidade) x mês de início x instrutor) o modelo integrado não é montado
+LIMITE_VARIAVEIS = 200_000
+
+
+def _montar_modelo(coortes: List[Dict], pools: Dict[str, List[int]], meses_ativos: Dict,
+                   salas: Dict[str, List[Optional[int]]], parametros: ParametrosOtimizacao, spread_maximo: int):
+    """
+    Modelo com y[(coorte, mês de início, k)] = turmas da coorte (projeto e habilidade) que começam no mês
+    com o k-ésimo instrutor da unidade. Retorna (modelo, y).
+    """
+    capacidade = parametros.capacidade_max_instrutor
+    modelo = criar_backend_execucao(parametros, estagio=2)
+    y = {}
+    por_instrutor, por_instrutor_mes, por_sala_mes = defaultdict(list), defaultdict(list), defaultdict(list)
+    for c, coorte in enumerate(coortes):
+        proj, unidade, total = coorte['projeto'], coorte['unidade'], coorte['turmas']
+        variaveis_coorte = []
+        for m in range(proj.inicio_min, proj.inicio_max + 1):
+            ativos = meses_ativos[(proj.nome, m)]
+            # Turmas do mesmo início ficam ativas nos mesmos meses: um instrutor leva no máximo a capacidade
+            limite = min(total, capacidade) if ativos else total
+            for k in range(len(pools[unidade])):
+                y[(c, m, k)] = var = modelo.inteiro(0, limite, f'y_{c}_{m}_{k}')
+                modelo.dica(var, coorte['dica'].get((m, k), 0))
+                variaveis_coorte.append(var)
+                por_instrutor[(unidade, k)].append(var)
+                for mes in ativos:
+                    por_instrutor_mes[(unidade, k, mes)].append(var)
+                    if proj.laboratorio in salas: por_sala_mes[(proj.laboratorio, mes)].append(var)
+        modelo.adicionar(sum(variaveis_coorte) == total)
+
+    # Capacidade mensal de cada instrutor e salas de cada laboratório
+    for ativas in por_instrutor_mes.values():
+        modelo.adicionar(sum(ativas) <= capacidade)
+    for (lab, mes), ativas in por_sala_mes.items():
+        if salas[lab][mes] is not None: modelo.adicionar(sum(ativas) <= salas[lab][mes])
+
+    # Carga, uso e spread, como no Estágio 2; instrutores de uma unidade são usados em ordem (simetria)
+    cargas_totais, instrutores_usados = [], []
+    for unidade, pool in pools.items():
+        anterior = None
+        for k in range(len(pool)):
+            usado = modelo.booleano(f'usado_{unidade}_{k}')
+            carga_total = modelo.inteiro(0, 300, f'carga_{unidade}_{k}')
+            modelo.adicionar(sum(por_instrutor[(unidade, k)]) == carga_total)
+            modelo.vincular_uso(carga_total, usado, 300)
+            if anterior is not None: modelo.adicionar(anterior >= usado)
+            anterior = usado
+            cargas_totais.append(carga_total)
+            instrutores_usados.append(usado)
+    total_instrutores = modelo.inteiro(0, len(instrutores_usados), 'total_instrutores')
+    modelo.adicionar(total_instrutores == sum(instrutores_usados))
+    spread_var = modelo.inteiro(0, 300, 'spread_obj')
+    max_carga = modelo.inteiro(0, 300, 'max_carga')
+    min_carga_usada = modelo.inteiro(0, 300, 'min_carga_usada')
+    modelo.maximo(max_carga, cargas_totais)
+    modelo.minimo_dos_usados(min_carga_usada, cargas_totais, instrutores_usados, max_carga, 300)
+    modelo.adicionar(spread_var == max_carga - min_carga_usada)
+    modelo.adicionar(spread_var <= spread_maximo)
+
+    # Mesmo objetivo do Estágio 2: instrutores, depois o spread
+    modelo.minimizar(total_instrutores * 10000 + spread_var)
+    return modelo, y
+
+
+def _solucao_integrada(quantidades: Dict[Tuple[int, int, int], int], coortes: List[Dict], projetos: List[Projeto],
+                       meses_ferias: List[int], num_meses: int, parametros: ParametrosOtimizacao,
+                       status: str) -> Tuple[Dict, Dict]:
+    """Cronograma e resultado no formato do Estágio 2 a partir das quantidades y[(coorte, mês, k)] > 0."""
+    cronograma, instrutores_por_inicio = defaultdict(list), defaultdict(list)
+    contagem = Counter()
+    for (c, m, k), quantidade in sorted(quantidades.items()):
+        coorte = coortes[c]
+        inicio = (coorte['projeto'].nome, coorte['habilidade'], m)
+        contagem[inicio] += quantidade
+        instrutores_por_inicio[inicio] += [(coorte['unidade'], k)] * quantidade
+    for (nome, habilidade, m), num_turmas in sorted(contagem.items()):
+        cronograma[nome].append({'mes_inicio': m, 'num_turmas': num_turmas, 'habilidade': habilidade})
+
+    all_turmas = stage_2.criar_turmas(dict(cronograma), projetos)
+    all_instrutores = stage_2.pool_para_turmas(all_turmas, parametros)
+    # O k-ésimo instrutor de uma unidade no modelo é o k-ésimo do pool dessa unidade
+    indices_unidade = defaultdict(list)
+    for idx, inst in enumerate(all_instrutores):
+        indices_unidade[chave_pool(inst.habilidade, inst.laboratorio_id)].append(idx)
+    atribuicao = []
+    for turma in all_turmas:
+        unidade, k = instrutores_por_inicio[(turma.projeto, turma.habilidade, turma.mes_inicio)].pop()
+        atribuicao.append(indices_unidade[unidade][k])
+
+    habilidades = ordenar_habilidades(i.habilidade for i in all_instrutores)
+    ativos = tabela_turmas(all_turmas, meses_ferias, num_meses, habilidades).ativos
+    resultado2 = stage_2.montar_resultado(atribuicao, all_turmas, all_instrutores, parametros, status, ativos)
+    return dict(cronograma), resultado2
+
+
+def otimizar_integrado(projetos: List[Projeto],
+                       meses: List[str],
+                       meses_ferias: List[int],
+                       parametros: ParametrosOtimizacao,
+                       resultados_estagio1: Dict,
+                       resultados_estagio2: Dict,
+                       tempo_dois_estagios: float) -> Tuple[Dict, Dict]:
+    """
+    Reotimiza cronograma e atribuição juntos a partir da solução em dois estágios e devolve
+    (resultados_estagio1, resultados_estagio2) com a melhor das duas. Em 'comparacao_integrado' do
+    Estágio 2 ficam {métrica: (dois estágios, integrado)}, incluindo a economia de instrutores e o
+    tempo extra do modelo integrado.
+    """
+    logger.info("\n" + "=" * 80 + "\nMODELO INTEGRADO: Cronograma e Atribuição Juntos\n" + "=" * 80)
+    inicio = time.perf_counter()
+    num_meses = len(meses)
+    spread_maximo = resultados_estagio2.get('spread_max_permitido', parametros.spread_maximo)
+    total_anterior, spread_anterior = resultados_estagio2['total_instrutores_flex'], resultados_estagio2['spread_carga']
+
+    # Coortes (projeto, habilidade) com o início e o instrutor das turmas da solução em dois estágios como dica
+    projetos_por_nome = {p.nome: p for p in projetos}
+    instrutores = resultados_estagio2['instrutores']
+    atribuicao = np.asarray(resultados_estagio2['atribuicao'])
+    pools = defaultdict(list)
+    for i in sorted(set(atribuicao.tolist())):
+        pools[chave_pool(instrutores[i].habilidade, instrutores[i].laboratorio_id)].append(i)
+    posicao = {i: k for pool in pools.values() for k, i in enumerate(pool)}
+    coortes = {}
+    for t, i in zip(resultados_estagio2['turmas'], atribuicao):
+        coorte = coortes.setdefault((t.projeto, t.habilidade), {
+            'projeto': projetos_por_nome[t.projeto], 'habilidade': t.habilidade, 'turmas': 0, 'dica': Counter(),
+            'unidade': chave_pool(t.habilidade, grupo_atendimento(t.laboratorio, parametros))})
+        coorte['turmas'] += 1
+        coorte['dica'][(t.mes_inicio, posicao[int(i)])] += 1
+    coortes = [coortes[chave] for chave in sorted(coortes)]
+
+    num_variaveis = sum((c['projeto'].inicio_max - c['projeto'].inicio_min + 1) * len(pools[c['unidade']])
+                        for c in coortes)
+    logger.info(f"Turmas: {len(atribuicao)} em {len(coortes)} coortes (projeto e habilidade) | Instrutores no pool: "
+                f"{sum(len(p) for p in pools.values())} | Variáveis de decisão: {num_variaveis}")
+    comparacao = {'total_instrutores_flex': (total_anterior, None), 'spread_carga': (spread_anterior, None),
+                  'pico_max': (resultados_estagio1['pico_max'], None),
+                  'tempo_segundos': (round(tempo_dois_estagios, 1), None)}
+    if num_variaveis > LIMITE_VARIAVEIS:
+        logger.warning(f"[AVISO] Modelo integrado omitido: {num_variaveis} variáveis (limite: {LIMITE_VARIAVEIS}).")
+        resultados_estagio2['comparacao_integrado'] = comparacao
+        return resultados_estagio1, resultados_estagio2
+
+    meses_ativos = {(p.nome, m): calcular_meses_ativos(m, p.duracao, meses_ferias, num_meses)
+                    for p in {c['projeto'].nome: c['projeto'] for c in coortes}.values()
+                    for m in range(p.inicio_min, p.inicio_max + 1)}
+    modelo, y = _montar_modelo(coortes, pools, meses_ativos, salas_por_laboratorio(parametros, meses), parametros,
+                               spread_maximo)
+    logger.info(f"Resolvendo modelo integrado (backend: {parametros.backend_solver})...")
+    status = modelo.resolver(parametros.timeout_segundos)
+
+    novo1, novo2 = None, None
+    if status in ('OPTIMAL', 'FEASIBLE'):
+        quantidades = {chave: int(valor) for chave, valor in zip(y, modelo.valores(list(y.values()))) if valor > 0}
+        cronograma, novo2 = _solucao_integrada(quantidades, coortes, projetos, meses_ferias, num_meses, parametros,
+                                               status)
+        demanda = stage_1.calcular_demanda_cronograma(cronograma, projetos, meses_ferias, num_meses)
+        picos = {hab: max(demanda.get(hab, [0])) for hab in resultados_estagio1['picos']}
+        novo1 = {**resultados_estagio1, "cronograma": cronograma, "picos": picos,
+                 "pico_max": max(picos.values(), default=0)}
+        if 'picos_grupo' in resultados_estagio1:
+            novo1['picos_grupo'] = stage_1.picos_por_grupo(cronograma, projetos, meses_ferias, num_meses, parametros)
+    tempo_extra = time.perf_counter() - inicio
+
+    melhorou = novo2 is not None and ((novo2['total_instrutores_flex'], novo2['spread_carga'])
+                                      < (total_anterior, spread_anterior))
+    if novo2 is not None:
+        comparacao.update({'total_instrutores_flex': (total_anterior, novo2['total_instrutores_flex']),
+                           'spread_carga': (spread_anterior, novo2['spread_carga']),
+                           'pico_max': (resultados_estagio1['pico_max'], novo1['pico_max'])})
+    comparacao['tempo_segundos'] = (round(tempo_dois_estagios, 1), round(tempo_extra, 1))
+
+    logger.info(f"\n{'Métrica':<24} | {'2 estágios':>10} | {'Integrado':>10}")
+    logger.info("-" * 50)
+    for metrica, (dois_estagios, integrado) in comparacao.items():
+        logger.info(f"{metrica:<24} | {dois_estagios:>10} | {integrado if integrado is not None else 'falha':>10}")
+    logger.info("(tempo do integrado = tempo extra, além dos dois estágios)")
+
+    if not melhorou:
+        motivo = f"status {status}" if novo2 is None else "sem melhora sobre a solução em dois estágios"
+        logger.info(f"\n[INFO] Modelo integrado ({motivo}): mantida a solução em dois estágios. "
+                    f"Tempo extra: {tempo_extra:.1f}s")
+        resultados_estagio2['comparacao_integrado'] = comparacao
+        return resultados_estagio1, resultados_estagio2
+
+    economia = total_anterior - novo2['total_instrutores_flex']
+    logger.info(f"\n[✓] Modelo integrado adotado: {economia} instrutor(es) a menos, spread {spread_anterior} -> "
+                f"{novo2['spread_carga']}. Tempo extra: {tempo_extra:.1f}s")
+    novo2.update(tempo_solver=modelo.tempo_solver(), comparacao_integrado=comparacao,
+                 spread_max_permitido=spread_maximo)
+    if 'curva_spread' in resultados_estagio2:
+        novo2['curva_spread'] = resultados_estagio2['curva_spread']
+    return novo1, novo2
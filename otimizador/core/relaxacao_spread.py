@@ -0,0 +1,118 @@
+# ARQUIVO: otimizador/core/relaxacao_spread.py
+"""
+Busca automática do menor spread viável quando o Estágio 2 falha.
+
+O cronograma do Estágio 1 fica fixo; cada spread candidato é resolvido em um processo
+separado e a melhor solução encontrada até o momento é reaproveitada como hint das
+rodadas seguintes. Falhas por timeout são tratadas como inviáveis.
+"""
+
+import logging
+import math
+import time
+from collections import defaultdict
+from concurrent.futures import as_completed
+from dataclasses import replace
+from typing import List, Dict, Optional, Sequence, Tuple
+
+# Import relativo para acessar modelos de dados e utils
+from .. import registro
+from ..data_models import Projeto, ParametrosOtimizacao
+from ..utils import calcular_meses_ativos, nucleos_disponiveis
+from . import stage_2
+from .viabilidade import calcular_spread_minimo
+
+logger = logging.getLogger(__name__)
+
+# Limite superior de spread aceito por ParametrosOtimizacao
+SPREAD_LIMITE = 50
+
+
+def _spread_minimo_cronograma(cronograma: Dict, projetos: List[Projeto], num_meses: int, meses_ferias: List[int],
+                              capacidade: int) -> int:
+    """Limite inferior analítico do spread para um cronograma já fixado."""
+    duracoes = {p.nome: p.duracao for p in projetos}
+    turmas_por_hab = defaultdict(int)
+    demanda = defaultdict(lambda: [0] * num_meses)
+    for proj_nome, cronogramas in cronograma.items():
+        for crono in cronogramas:
+            hab = crono.get('habilidade', 'PROG')
+            turmas_por_hab[hab] += crono['num_turmas']
+            for m in calcular_meses_ativos(crono['mes_inicio'], duracoes[proj_nome], meses_ferias, num_meses):
+                demanda[hab][m] += crono['num_turmas']
+    instrutores_min = {hab: max(1, math.ceil(max(d) / capacidade)) for hab, d in demanda.items()}
+    spread_min = calcular_spread_minimo(turmas_por_hab, instrutores_min)
+    return 0 if spread_min is None else spread_min
+
+
+def _escolher_candidatos(inviavel: int, viavel: Optional[int], quantidade: int) -> List[int]:
+    """Pontos igualmente espaçados no intervalo aberto (inviavel, viavel)."""
+    teto = viavel if viavel is not None else SPREAD_LIMITE + 1
+    livres = list(range(inviavel + 1, teto))
+    if len(livres) <= quantidade: return livres
+    passo = len(livres) / (quantidade + 1)
+    return sorted({livres[int(passo * (j + 1))] for j in range(quantidade)})
+
+
+def _sondar_spread(args: Tuple) -> Tuple[int, Dict, float]:
+    """Executa o Estágio 2 para um spread candidato (roda em processo separado, sem saída no console)."""
+    spread, cronograma, projetos, meses, meses_ferias, parametros, dica, num_workers = args
+    parametros_spread = replace(parametros, spread_maximo=spread)
+    inicio = time.perf_counter()
+    with registro.capturar_registros():
+        resultado = stage_2.otimizar_atribuicao_e_carga(cronograma, projetos, meses, meses_ferias,
+                                                         parametros_spread, dica=dica, num_workers=num_workers)
+    return spread, resultado, time.perf_counter() - inicio
+
+
+def buscar_menor_spread_viavel(cronograma: Dict,
+                               projetos: List[Projeto],
+                               meses: List[str],
+                               meses_ferias: List[int],
+                               parametros: ParametrosOtimizacao,
+                               dica: Optional[Sequence[int]] = None,
+                               max_processos: Optional[int] = None) -> Optional[Dict]:
+    """
+    Busca k-ária paralela pelo menor spread viável acima de `parametros.spread_maximo`.
+    Retorna o plano do menor spread viável e a curva spread x número de instrutores
+    (None para spreads sem solução), ou None se nenhum spread até SPREAD_LIMITE for viável.
+    """
+    logger.info("\n" + "=" * 80 + "\nBUSCA DO MENOR SPREAD VIÁVEL\n" + "=" * 80)
+    nucleos = nucleos_disponiveis(parametros.threads_solver)
+    processos = max(1, min(max_processos or nucleos, nucleos))
+    threads_por_processo = max(1, nucleos // processos)
+
+    spread_min = _spread_minimo_cronograma(cronograma, projetos, len(meses), meses_ferias,
+                                           parametros.capacidade_max_instrutor)
+    inviavel, viavel = max(parametros.spread_maximo, spread_min - 1), None
+    melhor, curva = None, {}
+    logger.info(f"Limite inferior analítico: {spread_min} | Processos: {processos} x {threads_por_processo} threads")
+
+    with registro.executor_processos(processos) as pool:
+        while True:
+            candidatos = _escolher_candidatos(inviavel, viavel, processos)
+            if not candidatos: break
+            dica_rodada = melhor['atribuicao'] if melhor else dica
+            futuros = [pool.submit(_sondar_spread, (s, cronograma, projetos, meses, meses_ferias, parametros,
+                                                    dica_rodada, threads_por_processo)) for s in candidatos]
+            for futuro in as_completed(futuros):
+                spread, resultado, duracao = futuro.result()
+                sucesso = bool(resultado) and resultado.get('status') == 'sucesso'
+                curva[spread] = resultado['total_instrutores_flex'] if sucesso else None
+                situacao = (f"{curva[spread]} instrutores (spread real {resultado['spread_carga']})" if sucesso
+                            else f"sem solução ({(resultado or {}).get('status_solver', 'N/A')})")
+                logger.info(f"   Spread {spread:>2}: {situacao} [{duracao:.1f}s]")
+                if not sucesso: continue
+                # A solução encontrada também vale para o seu spread real, que pode ser menor que o testado
+                spread_real = min(spread, resultado['spread_carga'])
+                if curva.get(spread_real) is None: curva[spread_real] = resultado['total_instrutores_flex']
+                if viavel is None or spread_real < viavel:
+                    viavel, melhor = spread_real, resultado
+            falhas = [s for s in candidatos if curva[s] is None and (viavel is None or s < viavel)]
+            if falhas: inviavel = max(inviavel, max(falhas))
+
+    if melhor is None:
+        logger.error(f"\n[✗] Nenhum spread até {SPREAD_LIMITE} produziu solução.")
+        return None
+    logger.info(f"\n[✓] Menor spread viável encontrado: {viavel} ({melhor['total_instrutores_flex']} instrutores)")
+    return {"spread": viavel, "resultado": melhor, "curva": sorted(curva.items())}
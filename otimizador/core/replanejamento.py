@@ -0,0 +1,216 @@
+# ARQUIVO: otimizador/core/replanejamento.py
+"""
+Replanejamento incremental com mudança mínima a partir de um plano publicado.
+
+Estágio 1: as coortes anteriores que continuam válidas (início dentro da nova janela, até o novo
+total do projeto) são mantidas; só as turmas faltantes são agendadas, com as mantidas como demanda fixa.
+Estágio 2: turmas que existiam antes voltam ao mesmo instrutor. Só as turmas novas e as que
+compartilham meses afetados pela mudança são re-otimizadas, minimizando, nesta ordem: excesso
+de spread, turmas trocadas de instrutor, número de instrutores e spread.
+"""
+
+import logging
+import math
+import time
+from collections import defaultdict, Counter
+from typing import List, Dict, Optional
+
+# Import relativo para acessar modelos de dados e utils
+from ..data_models import Projeto, ParametrosOtimizacao, Instrutor
+from ..utils import (calcular_meses_ativos, habilidade_canonica, ordenar_habilidades, nome_instrutor,
+                     nucleos_disponiveis)
+from . import stage_1
+from .laboratorios import chave_pool, grupo_atendimento
+from .indices import matriz_ativos
+from .stage_2 import criar_turmas, pool_para_turmas, chaves_pool_turmas, montar_resultado
+from .lns import avaliar_atribuicao, resolver_vizinhanca
+
+logger = logging.getLogger(__name__)
+
+
+def _cronograma_incremental(plano_anterior: List[Dict], projetos: List[Projeto], meses: List[str],
+                            parametros: ParametrosOtimizacao) -> Optional[Dict]:
+    """Mantém as coortes anteriores válidas e agenda no Estágio 1 apenas as turmas faltantes."""
+    anterior = defaultdict(Counter)
+    for reg in plano_anterior:
+        anterior[(reg['projeto'], habilidade_canonica(reg['habilidade']))][reg['mes_inicio']] += 1
+
+    cronograma, faltantes, fixos = defaultdict(list), [], []
+    for proj in projetos:
+        restante = {}
+        for hab_nome, total in proj.turmas.items():
+            for mes, qtd in sorted(anterior[(proj.nome, hab_nome)].items()):
+                if total == 0: break
+                if not proj.inicio_min <= mes <= proj.inicio_max: continue
+                mantidas = min(total, qtd)
+                total -= mantidas
+                cronograma[proj.nome].append({'mes_inicio': mes, 'num_turmas': mantidas, 'habilidade': hab_nome})
+                fixos.append(Projeto(f'__fixo{len(fixos)}', {hab_nome: mantidas}, proj.duracao, mes, mes,
+                                     proj.mes_fim_projeto, proj.laboratorio))
+            restante[hab_nome] = total
+        if sum(restante.values()) > 0:
+            faltantes.append(proj._replace(turmas=restante))
+
+    logger.info(f"Coortes mantidas do plano anterior: {len(fixos)} | Projetos com turmas a agendar: {len(faltantes)}")
+    if faltantes:
+        resultado = stage_1.otimizar_curva_demanda(faltantes + fixos, meses, parametros)
+        if not resultado: return None
+        for nome, entradas in resultado['cronograma'].items():
+            if not nome.startswith('__fixo'): cronograma[nome].extend(entradas)
+    return dict(cronograma)
+
+
+def _indice_pool(instrutor_id: str, pool: List[int]) -> Optional[int]:
+    """Mapeia o ID renumerado de uma execução anterior ('PROG_3', 'ROB_2') para o pool (posição n - 1)."""
+    try:
+        n = int(str(instrutor_id).rsplit('_', 1)[1]) - 1
+    except (IndexError, ValueError):
+        return None
+    return pool[n] if 0 <= n < len(pool) else None
+
+
+def _nome_instrutor(instrutor: Instrutor, posicao: int) -> Instrutor:
+    """Instrutor com o ID no formato das planilhas, estável entre replanejamentos."""
+    return instrutor._replace(id=nome_instrutor(instrutor.habilidade, instrutor.laboratorio_id, posicao + 1))
+
+
+def replanejar(plano_anterior: List[Dict],
+               projetos: List[Projeto],
+               meses: List[str],
+               meses_ferias: List[int],
+               parametros: ParametrosOtimizacao) -> Optional[Dict]:
+    """
+    Replaneja a partir de `plano_anterior` (ver `io.plano_anterior.carregar_plano_anterior`).
+    Retorna {'estagio1', 'estagio2', 'diferencas'}, com os dois primeiros no formato dos estágios
+    (instrutores já com os IDs das planilhas) e 'diferencas' como lista de turmas novas,
+    reatribuídas e removidas. Retorna None se não houver solução.
+    """
+    logger.info("\n" + "=" * 80 + "\nREPLANEJAMENTO INCREMENTAL (Mudança Mínima)\n" + "=" * 80)
+    inicio = time.perf_counter()
+    num_meses = len(meses)
+    cronograma = _cronograma_incremental(plano_anterior, projetos, meses, parametros)
+    if cronograma is None:
+        logger.error("\n[✗] FALHA: não foi possível agendar as turmas faltantes.")
+        return None
+
+    all_turmas = criar_turmas(cronograma, projetos)
+    all_instrutores = pool_para_turmas(all_turmas, parametros)
+    habilidades = chaves_pool_turmas(all_turmas, parametros)
+    ativos = [calcular_meses_ativos(t.mes_inicio, t.duracao, meses_ferias, num_meses) for t in all_turmas]
+    instrutores_por_hab = defaultdict(list)
+    for idx, inst in enumerate(all_instrutores):
+        instrutores_por_hab[chave_pool(inst.habilidade, inst.laboratorio_id)].append(idx)
+    posicao = {i: pos for pool in instrutores_por_hab.values() for pos, i in enumerate(pool)}
+
+    # Casamento das turmas novas com as anteriores por (projeto, habilidade, primeiro mês ativo)
+    pendentes = defaultdict(list)
+    for reg in plano_anterior:
+        hab = habilidade_canonica(reg['habilidade'])
+        pendentes[(reg['projeto'], hab, reg['mes_inicio'])].append(reg)
+    anterior = [None] * len(all_turmas)
+    for t, turma in enumerate(all_turmas):
+        chave = (turma.projeto, turma.habilidade, ativos[t][0] if ativos[t] else turma.mes_inicio)
+        if pendentes[chave]:
+            anterior[t] = _indice_pool(pendentes[chave].pop()['instrutor'], instrutores_por_hab[habilidades[t]])
+    removidas = [reg for regs in pendentes.values() for reg in regs]
+
+    # Meses afetados: os das turmas novas e os das turmas removidas, por habilidade
+    afetados = defaultdict(set)
+    for t in range(len(all_turmas)):
+        if anterior[t] is None: afetados[habilidades[t]].update(ativos[t])
+    duracoes = {p.nome: p.duracao for p in projetos}
+    laboratorios = {p.nome: p.laboratorio for p in projetos}
+    for reg in removidas:
+        hab = chave_pool(habilidade_canonica(reg['habilidade']),
+                         grupo_atendimento(laboratorios.get(reg['projeto']), parametros))
+        afetados[hab].update(calcular_meses_ativos(reg['mes_inicio'], duracoes.get(reg['projeto'], 1), meses_ferias,
+                                                   num_meses))
+    livres = [t for t in range(len(all_turmas))
+              if anterior[t] is None or afetados[habilidades[t]].intersection(ativos[t])]
+    livres_set = set(livres)
+    logger.info(f"Turmas: {len(all_turmas)} | Mantidas fixas: {len(all_turmas) - len(livres)} | "
+                f"Re-otimizadas: {len(livres)} | Removidas: {len(removidas)}")
+
+    atrib = [anterior[t] if t not in livres_set else -1 for t in range(len(all_turmas))]
+    if livres:
+        carga_fixa = [0] * len(all_instrutores)
+        for i in atrib:
+            if i >= 0: carga_fixa[i] += 1
+        demanda, candidatos = defaultdict(Counter), defaultdict(set)
+        for t in livres:
+            for m in ativos[t]: demanda[habilidades[t]][m] += 1
+            if anterior[t] is not None: candidatos[habilidades[t]].add(anterior[t])
+        for hab, demanda_hab in demanda.items():
+            pool = instrutores_por_hab[hab]
+            candidatos[hab].update(i for i in pool if carga_fixa[i] > 0)
+            novos = [i for i in pool if carga_fixa[i] == 0 and i not in candidatos[hab]]
+            candidatos[hab].update(novos[:math.ceil(max(demanda_hab.values()) / parametros.capacidade_max_instrutor)])
+        uso_fixo = {i: Counter() for cands in candidatos.values() for i in cands}
+        for t, i in enumerate(atrib):
+            if i in uso_fixo:
+                for m in ativos[t]: uso_fixo[i][m] += 1
+
+        # Pesos lexicográficos: cada nível supera o maior valor possível dos níveis abaixo
+        peso_instrutor = len(all_turmas) + 1
+        peso_mudanca = peso_instrutor * (len(all_instrutores) + 1)
+        peso_excesso = peso_mudanca * (len(livres) + 1)
+        sub = {
+            "tipo": "replanejamento", "livres": livres, "habilidades": [habilidades[t] for t in livres],
+            "ativos": [ativos[t] for t in livres], "atual": [anterior[t] for t in livres],
+            "candidatos": {hab: sorted(c) for hab, c in candidatos.items()}, "uso_fixo": uso_fixo,
+            "carga_fixa": carga_fixa, "capacidade": parametros.capacidade_max_instrutor,
+            "spread_maximo": parametros.spread_maximo, "tempo": float(parametros.timeout_segundos),
+            "num_workers": nucleos_disponiveis(parametros.threads_solver), "semente": 0,
+            "perfil": parametros.perfil_solver, "log": parametros.log_solver,
+            "pesos": (peso_excesso, peso_mudanca, peso_instrutor, 1)
+        }
+        novas, status = resolver_vizinhanca(sub)
+        if novas is None:
+            logger.error(f"\n[✗] FALHA no replanejamento: {status}")
+            return None
+        for t, i in novas.items(): atrib[t] = i
+
+    _, total, spread, excesso = avaliar_atribuicao(atrib, len(all_instrutores), parametros.spread_maximo)
+    if excesso > 0:
+        logger.error(f"\n[✗] FALHA: spread {spread} acima do máximo {parametros.spread_maximo} mesmo re-otimizando "
+                     f"os meses afetados. Considere uma execução completa.")
+        return None
+
+    nomeados = [_nome_instrutor(inst, posicao[idx]) for idx, inst in enumerate(all_instrutores)]
+    diferencas = []
+    for t, turma in enumerate(all_turmas):
+        if anterior[t] == atrib[t]: continue
+        diferencas.append({
+            "situacao": "Nova" if anterior[t] is None else "Reatribuída", "projeto": turma.projeto,
+            "habilidade": turma.habilidade, "mes_inicio": meses[turma.mes_inicio], "turma_id": turma.id,
+            "instrutor_anterior": nomeados[anterior[t]].id if anterior[t] is not None else "",
+            "instrutor_novo": nomeados[atrib[t]].id
+        })
+    for reg in removidas:
+        diferencas.append({
+            "situacao": "Removida", "projeto": reg['projeto'], "habilidade": reg['habilidade'],
+            "mes_inicio": meses[reg['mes_inicio']], "turma_id": reg['turma_id'],
+            "instrutor_anterior": reg['instrutor'], "instrutor_novo": ""
+        })
+
+    contagem = Counter(d['situacao'] for d in diferencas)
+    logger.info(f"\n[✓] SUCESSO! {total} instrutores | spread {spread} | "
+                f"Novas: {contagem['Nova']} | Reatribuídas: {contagem['Reatribuída']} | "
+                f"Removidas: {contagem['Removida']} | {time.perf_counter() - inicio:.1f}s")
+
+    demanda = stage_1.calcular_demanda_cronograma(cronograma, projetos, meses_ferias, num_meses)
+    resultado_estagio1 = {
+        "cronograma": cronograma,
+        "pico_max": max((max(d) for d in demanda.values()), default=0),
+        "picos": {hab: max(demanda[hab]) for hab in ordenar_habilidades(demanda)},
+        "meses_ferias": meses_ferias,
+        "parametros": parametros,
+        "status_solver": "REPLANEJAMENTO",
+        "tempo_solver": 0.0
+    }
+    if any(p.laboratorio is not None for p in projetos):
+        resultado_estagio1["picos_grupo"] = stage_1.picos_por_grupo(cronograma, projetos, meses_ferias, num_meses,
+                                                                    parametros)
+    resultado_estagio2 = montar_resultado(atrib, all_turmas, nomeados, parametros, "REPLANEJAMENTO",
+                                          matriz_ativos(ativos, num_meses))
+    return {"estagio1": resultado_estagio1, "estagio2": resultado_estagio2, "diferencas": diferencas}
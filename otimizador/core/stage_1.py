@@ -1,77 +1,399 @@
 # ARQUIVO: otimizador/core/stage_1.py
 
-from collections import defaultdict
-from typing import List, Dict, Optional
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import List, Dict, Optional, Tuple
 from ortools.sat.python import cp_model
 
 # Import relativo para acessar modelos de dados e utils
-from ..data_models import Projeto, ParametrosOtimizacao
-from ..utils import calcular_meses_ativos
+from .. import registro
+from ..data_models import Projeto, ParametrosOtimizacao, MOTORES_ESTAGIO1
+from ..utils import calcular_meses_ativos, ordenar_habilidades, nucleos_disponiveis
+from .backends import BackendSolver, criar_backend_execucao
+from .laboratorios import grupo_atendimento, ordenar_grupos, salas_por_laboratorio
+
+logger = logging.getLogger(__name__)
+
+# Com alternativos, fração do timeout reservada ao cronograma ótimo (o que ele não usar vai para os
+# alternativos) e menor tempo que ainda vale a pena dar a um alternativo
+FRACAO_TEMPO_OTIMO = 0.5
+TEMPO_MINIMO_ALTERNATIVO = 1.0
+
+
+def _agrupar_ondas(projetos: List[Projeto]) -> List[List[Projeto]]:
+    """
+    Agrupa as ondas de um mesmo projeto (ex.: DD2_Onda1, DD2_Onda2): os grupos de `_agrupar_por_assinatura`
+    restritos às ondas de cada projeto, em ordem de onda.
+    """
+    grupos = []
+    for grupo in _agrupar_por_assinatura(projetos):
+        ondas = defaultdict(list)
+        for proj in grupo:
+            base, _, indice = proj.nome.rpartition('_Onda')
+            if base and indice.isdigit(): ondas[base].append((int(indice), proj))
+        grupos += [[proj for _, proj in sorted(membros)] for membros in ondas.values() if len(membros) > 1]
+    return grupos
+
+
+def _agrupar_por_assinatura(projetos: List[Projeto]) -> List[List[Projeto]]:
+    """
+    Pré-solve: agrupa projetos com a mesma assinatura temporal (duração, início mínimo, início máximo)
+    e o mesmo laboratório.
+    Como as férias são globais, a assinatura também determina os meses ativos de cada início possível.
+    """
+    grupos = defaultdict(list)
+    for proj in projetos:
+        grupos[(proj.duracao, proj.inicio_min, proj.inicio_max, proj.laboratorio)].append(proj)
+    return [grupo for grupo in grupos.values() if len(grupo) > 1]
+
+
+def _consolidar_grupos(projetos: List[Projeto], grupos: List[List[Projeto]]) -> Tuple[List[Projeto], Dict]:
+    """
+    Substitui cada grupo de projetos intercambiáveis por um único bloco com os totais somados.
+    Retorna os projetos do modelo e o mapa bloco -> projetos originais (na ordem de preenchimento).
+    """
+    agrupados = {p.nome for grupo in grupos for p in grupo}
+    projetos_modelo = [p for p in projetos if p.nome not in agrupados]
+    membros = {}
+    for idx, grupo in enumerate(grupos):
+        ref = grupo[0]
+        turmas = defaultdict(int)
+        for p in grupo:
+            for hab, qtd in p.turmas.items(): turmas[hab] += qtd
+        bloco = ref._replace(nome=f'__bloco{idx}_{ref.nome}', turmas=dict(turmas),
+                             mes_fim_projeto=max(p.mes_fim_projeto for p in grupo))
+        projetos_modelo.append(bloco)
+        membros[bloco.nome] = grupo
+    return projetos_modelo, membros
+
+
+def _distribuir_inicios(inicios: List[Tuple[int, int]], totais: List[int]) -> List[List[Tuple[int, int]]]:
+    """
+    Reparte inícios agregados [(mes, qtd)] entre projetos com os totais dados, em ordem cronológica:
+    o primeiro projeto recebe os inícios mais cedo. Cada parte é uma lista [(mes, qtd)].
+    """
+    partes, pendentes = [[] for _ in totais], sorted(inicios)
+    pos, restante = 0, (pendentes[0][1] if pendentes else 0)
+    for idx, total in enumerate(totais):
+        while total > 0:
+            qtd = min(total, restante)
+            partes[idx].append((pendentes[pos][0], qtd))
+            total, restante = total - qtd, restante - qtd
+            if restante == 0 and pos + 1 < len(pendentes):
+                pos += 1
+                restante = pendentes[pos][1]
+    return partes
+
+
+def _desagregar_cronograma(cronograma: Dict, membros: Dict[str, List[Projeto]]) -> Dict:
+    """Devolve o cronograma de cada bloco aos projetos originais, respeitando os totais de cada um."""
+    for bloco_nome, grupo in membros.items():
+        entradas = cronograma.pop(bloco_nome, [])
+        for hab_nome in ordenar_habilidades(hab for p in grupo for hab in p.turmas):
+            inicios = [(e['mes_inicio'], e['num_turmas']) for e in entradas if e['habilidade'] == hab_nome]
+            for proj, parte in zip(grupo, _distribuir_inicios(inicios, [p.turmas.get(hab_nome, 0) for p in grupo])):
+                for mes_inicio, num_turmas in parte:
+                    cronograma.setdefault(proj.nome, []).append(
+                        {'mes_inicio': mes_inicio, 'num_turmas': num_turmas, 'habilidade': hab_nome})
+    return cronograma
+
+
+def _demanda_por_somas_mensais(modelo: BackendSolver, projetos_flexiveis: List[Projeto], num_meses: int,
+                               meses_ferias_idx: List[int], inicio_vars: Dict):
+    """Motor 'linear': demanda de cada mês como soma dos inícios ativos nele; pico como máximo das somas."""
+    demanda_total = {}
+    for m in range(num_meses):
+        demanda_m = [inicio_vars[(p.nome, m_i)] for p in projetos_flexiveis for m_i in range(p.inicio_min, p.inicio_max + 1) if m in calcular_meses_ativos(m_i, p.duracao, meses_ferias_idx, num_meses)]
+        demanda_total[m] = modelo.inteiro(0, 300, f'dt_{m}')
+        modelo.adicionar(demanda_total[m] == sum(demanda_m))
+
+    for mes_ferias in meses_ferias_idx:
+        modelo.adicionar(demanda_total[mes_ferias] == 0)
+
+    pico = modelo.inteiro(0, 300, 'pico')
+    modelo.maximo(pico, list(demanda_total.values()))
+    return pico
+
+
+def _trechos_letivos(meses_ativos: List[int]) -> List[Tuple[int, int]]:
+    """Divide os meses ativos de uma turma em trechos contínuos (interrompidos pelas férias): [(inicio, tamanho)]."""
+    trechos = []
+    for m in meses_ativos:
+        if trechos and trechos[-1][0] + trechos[-1][1] == m:
+            trechos[-1] = (trechos[-1][0], trechos[-1][1] + 1)
+        else:
+            trechos.append((m, 1))
+    return trechos
+
+
+def _demanda_por_intervalos(model: cp_model.CpModel, projetos_flexiveis: List[Projeto], num_meses: int,
+                            meses_ferias_idx: List[int], inicio_vars: Dict):
+    """
+    Motor 'intervalos': cada coorte (projeto, mês de início) vira intervalos de início fixo, um por
+    trecho letivo, com comprimento que já desconta as férias e demanda igual ao número de turmas.
+    O pico é a capacidade de um AddCumulative (um limite superior do pico realizado).
+    Exclusivo do CP-SAT.
+    """
+    intervalos, demandas = [], []
+    for proj in projetos_flexiveis:
+        for m_i in range(proj.inicio_min, proj.inicio_max + 1):
+            meses_ativos = calcular_meses_ativos(m_i, proj.duracao, meses_ferias_idx, num_meses)
+            for inicio, tamanho in _trechos_letivos(meses_ativos):
+                intervalos.append(model.NewFixedSizeIntervalVar(inicio, tamanho, f'i_{proj.nome}_{m_i}_{inicio}'))
+                demandas.append(inicio_vars[(proj.nome, m_i)])
+    pico = model.NewIntVar(0, 300, 'pico')
+    if intervalos: model.AddCumulative(intervalos, demandas, pico)
+    return pico
+
+
+def calcular_demanda_cronograma(cronograma: Dict, projetos: List[Projeto], meses_ferias_idx: List[int],
+                                num_meses: int) -> Dict[str, List[int]]:
+    """Demanda mensal de turmas ativas por habilidade de um cronograma já definido."""
+    duracoes = {p.nome: p.duracao for p in projetos}
+    demanda = defaultdict(lambda: [0] * num_meses)
+    for proj_nome, entradas in cronograma.items():
+        for entrada in entradas:
+            for m in calcular_meses_ativos(entrada['mes_inicio'], duracoes[proj_nome], meses_ferias_idx, num_meses):
+                demanda[entrada['habilidade']][m] += entrada['num_turmas']
+    return dict(demanda)
+
+
+def picos_por_grupo(cronograma: Dict, projetos: List[Projeto], meses_ferias_idx: List[int], num_meses: int,
+                    parametros: ParametrosOtimizacao) -> Dict[Optional[str], Dict[str, int]]:
+    """Pico de turmas ativas de cada habilidade em cada grupo de atendimento."""
+    grupo_de = {p.nome: grupo_atendimento(p.laboratorio, parametros) for p in projetos}
+    picos = {}
+    for grupo in ordenar_grupos(grupo_de.values()):
+        demanda = calcular_demanda_cronograma({nome: entradas for nome, entradas in cronograma.items()
+                                               if grupo_de.get(nome) == grupo}, projetos, meses_ferias_idx, num_meses)
+        picos[grupo] = {hab: max(demanda[hab]) for hab in ordenar_habilidades(demanda)}
+    return picos
+
+
+def _resolver_subproblema(args: Tuple) -> Tuple[Optional[str], Tuple[str, ...], str, Dict, float]:
+    """
+    Subproblema de um grupo de atendimento e de uma ou mais habilidades. Habilidades e grupos não
+    compartilham restrições (o pico de cada um é independente), exceto as salas de um laboratório, que
+    acoplam as habilidades dele e as resolvem juntas; aí o objetivo continua sendo o maior pico (o
+    pico_max do plano) e a soma dos picos só desempata. Roda em processo separado quando há mais de um
+    subproblema.
+    Com `num_alternativos` > 1, busca em seguida até num_alternativos - 1 cronogramas alternativos com o
+    pico de cada habilidade até o ótimo + `folga`, cada um evitando os inícios (projeto e mês) já usados.
+    O timeout é um só para o ótimo e os alternativos: o ótimo tem FRACAO_TEMPO_OTIMO dele e o restante
+    é dividido entre os alternativos que faltam.
+    Retorna (grupo, habilidades, status, cronograma, tempo, alternativos).
+    """
+    (grupo, habilidades, projetos_flexiveis, num_meses, meses_ferias_idx, parametros, motor, num_workers, salas,
+     num_alternativos, folga) = args
+    modelo = criar_backend_execucao(parametros, estagio=1)
+
+    inicio_vars, picos = {}, []
+    for habilidade in habilidades:
+        projetos_hab = [p for p in projetos_flexiveis if p.turmas.get(habilidade, 0) > 0]
+        vars_hab = {}
+        for proj in projetos_hab:
+            for m in range(proj.inicio_min, proj.inicio_max + 1):
+                vars_hab[(proj.nome, m)] = modelo.inteiro(0, proj.turmas[habilidade], f'{habilidade[:3]}_{proj.nome}_{m}')
+            modelo.adicionar(sum(vars_hab[(proj.nome, m)] for m in range(proj.inicio_min, proj.inicio_max + 1)) == proj.turmas[habilidade])
+
+        if motor == 'intervalos':
+            picos.append(_demanda_por_intervalos(modelo.model, projetos_hab, num_meses, meses_ferias_idx, vars_hab))
+        else:
+            picos.append(_demanda_por_somas_mensais(modelo, projetos_hab, num_meses, meses_ferias_idx, vars_hab))
+        inicio_vars.update({(habilidade, nome, m): var for (nome, m), var in vars_hab.items()})
+
+    # Salas: turmas ativas de todas as habilidades de cada laboratório, mês a mês
+    projetos = {p.nome: p for p in projetos_flexiveis}
+    for lab, limites in salas.items():
+        ativas_por_mes = defaultdict(list)
+        for (_, nome, m_i), var in inicio_vars.items():
+            if projetos[nome].laboratorio != lab: continue
+            for m in calcular_meses_ativos(m_i, projetos[nome].duracao, meses_ferias_idx, num_meses):
+                ativas_por_mes[m].append(var)
+        for m, ativas in ativas_por_mes.items():
+            if limites[m] is not None: modelo.adicionar(sum(ativas) <= limites[m])
+    if len(picos) == 1:
+        modelo.minimizar(picos[0])
+    else:
+        # Lexicográfico: maior pico primeiro; a soma (menor que `peso`) só desempata
+        peso = sum(p.turmas.get(hab, 0) for p in projetos_flexiveis for hab in habilidades) + 1
+        pico_max = modelo.inteiro(0, peso, 'pico_max')
+        modelo.maximo(pico_max, picos)
+        modelo.minimizar(peso * pico_max + sum(picos))
+
+    # A relaxação linear da cumulativa só entra no LP a partir do nível 2
+    ajustes = {'linearization_level': 2} if motor == 'intervalos' else {}
+    orcamento, inicio = parametros.timeout_segundos, time.perf_counter()
+    status = modelo.resolver(orcamento * FRACAO_TEMPO_OTIMO if num_alternativos > 1 else orcamento, num_workers,
+                             **ajustes)
+
+    if status not in ('OPTIMAL', 'FEASIBLE'):
+        return grupo, habilidades, status, {}, modelo.tempo_solver(), []
+    inicios = _inicios_da_solucao(modelo, inicio_vars)
+    tempo = modelo.tempo_solver()
+
+    # Alternativos: mesmo modelo com o pico limitado ao realizado + folga e um objetivo que penaliza
+    # os inícios já usados (quantas turmas começaram ali), para espalhar os cronogramas
+    alternativos, usados = [], Counter(inicios)
+    if num_alternativos > 1:
+        demanda = calcular_demanda_cronograma(_cronograma_dos_inicios(inicios), projetos_flexiveis,
+                                              meses_ferias_idx, num_meses)
+        for hab, pico in zip(habilidades, picos):
+            modelo.adicionar(pico <= max(demanda.get(hab, [0])) + folga)
+    for restantes in range(num_alternativos - 1, 0, -1):
+        tempo_alternativo = (orcamento - (time.perf_counter() - inicio)) / restantes
+        if tempo_alternativo < TEMPO_MINIMO_ALTERNATIVO:
+            break
+        modelo.minimizar(sum(usados[chave] * var for chave, var in inicio_vars.items() if usados[chave]))
+        if modelo.resolver(tempo_alternativo, num_workers, **ajustes) not in ('OPTIMAL', 'FEASIBLE'):
+            break
+        tempo += modelo.tempo_solver()
+        alternativo = _inicios_da_solucao(modelo, inicio_vars)
+        if alternativo == inicios or alternativo in alternativos:
+            break  # nada novo dentro da folga
+        alternativos.append(alternativo)
+        usados.update(alternativo)
+    return (grupo, habilidades, status, _cronograma_dos_inicios(inicios), tempo,
+            [_cronograma_dos_inicios(alternativo) for alternativo in alternativos])
+
+
+def _inicios_da_solucao(modelo: BackendSolver, inicio_vars: Dict) -> Dict[Tuple[str, str, int], int]:
+    """Turmas que começam em cada (habilidade, projeto, mês) na solução corrente (só as não nulas)."""
+    valores = modelo.valores(list(inicio_vars.values()))
+    return {chave: int(valor) for chave, valor in zip(inicio_vars, valores) if valor > 0}
+
+
+def _cronograma_dos_inicios(inicios: Dict[Tuple[str, str, int], int]) -> Dict:
+    cronograma = defaultdict(list)
+    for (habilidade, proj_nome, m), num_turmas in inicios.items():
+        cronograma[proj_nome].append({'mes_inicio': m, 'num_turmas': num_turmas, 'habilidade': habilidade})
+    return dict(cronograma)
+
+
+def _combinar_alternativos(resultados: List[Tuple], membros: Dict) -> List[Dict]:
+    """
+    Cronogramas completos alternativos: o j-ésimo usa o j-ésimo alternativo de cada subproblema (ou o
+    ótimo, se o subproblema tiver menos), sem repetir cronogramas.
+    """
+    cronogramas = []
+    for j in range(max((len(alternativos) for *_, alternativos in resultados), default=0)):
+        combinado = defaultdict(list)
+        for _, _, _, cronograma_sub, _, alternativos in resultados:
+            for proj_nome, entradas in (alternativos[j] if j < len(alternativos) else cronograma_sub).items():
+                combinado[proj_nome].extend(entradas)
+        cronograma = _desagregar_cronograma(dict(combinado), membros)
+        if cronograma not in cronogramas: cronogramas.append(cronograma)
+    return cronogramas
 
 
 def otimizar_curva_demanda(projetos_flexiveis: List[Projeto],
                            meses: List[str],
-                           parametros: ParametrosOtimizacao) -> Optional[Dict]:
-    """Otimiza o cronograma de início das turmas minimizando pico de demanda."""
-    print("\n" + "=" * 80 + "\nESTÁGIO 1: Otimização da Curva de Demanda\n" + "=" * 80)
-    model = cp_model.CpModel()
+                           parametros: ParametrosOtimizacao,
+                           motor: Optional[str] = None,
+                           num_alternativos: int = 1,
+                           max_processos: Optional[int] = None) -> Optional[Dict]:
+    """
+    Otimiza o cronograma de início das turmas minimizando pico de demanda.
+    Com `parametros.quebrar_simetria_ondas`, as ondas de um projeto (blocos simétricos do modelo)
+    são resolvidas como um único bloco e o cronograma é devolvido às ondas em ordem cronológica,
+    o que equivale a impor um perfil acumulado de inícios não decrescente entre ondas.
+    Com `parametros.agrupar_projetos_equivalentes`, o mesmo vale para quaisquer projetos com a mesma
+    assinatura temporal (inclui as ondas), e cada projeto recebe exatamente os seus totais.
+    `motor` escolhe a formulação da demanda (padrão: `parametros.motor_estagio1`): 'linear' (somas
+    mensais) ou 'intervalos' (coortes como intervalos e restrição cumulativa, só no backend 'cpsat');
+    ambos retornam o mesmo dicionário. O solver vem de `parametros.backend_solver`.
+    Com laboratórios, o pico é minimizado por grupo de atendimento (quem compartilha instrutores), com
+    as salas de cada laboratório limitando as turmas ativas no mês; o resultado inclui 'picos_grupo'.
+    Com `num_alternativos` > 1, 'cronogramas_alternativos' traz até num_alternativos - 1 cronogramas
+    distintos com pico até o ótimo + `parametros.folga_pico_alternativos` em cada subproblema, dentro do
+    mesmo `parametros.timeout_segundos` (FRACAO_TEMPO_OTIMO dele para o ótimo); 'tempo_solver' inclui
+    os alternativos.
+    `max_processos` limita os processos dos subproblemas (1 = todos no processo do chamador).
+    """
+    motor = motor or parametros.motor_estagio1
+    if motor not in MOTORES_ESTAGIO1:
+        raise ValueError(f"Motor do Estágio 1 inválido: {motor}. Use um de {MOTORES_ESTAGIO1}.")
+    if motor == 'intervalos' and parametros.backend_solver != 'cpsat':
+        raise ValueError("O motor 'intervalos' usa AddCumulative e exige o backend 'cpsat'.")
+    logger.info("\n" + "=" * 80 + "\nESTÁGIO 1: Otimização da Curva de Demanda\n" + "=" * 80)
+    grupos, membros = [], {}
+    if parametros.agrupar_projetos_equivalentes:
+        grupos = _agrupar_por_assinatura(projetos_flexiveis)
+    elif parametros.quebrar_simetria_ondas:
+        grupos = _agrupar_ondas(projetos_flexiveis)
+    projetos_originais = projetos_flexiveis
+    if grupos:
+        num_originais = len(projetos_flexiveis)
+        projetos_flexiveis, membros = _consolidar_grupos(projetos_flexiveis, grupos)
+        logger.info(f"Pré-solve: {sum(len(g) for g in grupos)} projetos consolidados em {len(grupos)} blocos "
+                    f"({num_originais} -> {len(projetos_flexiveis)} projetos no modelo)")
+
     num_meses = len(meses)
     meses_ferias_idx = [meses.index(m) for m in parametros.meses_ferias if m in meses]
+    habilidades = ordenar_habilidades(hab for p in projetos_flexiveis for hab, qtd in p.turmas.items() if qtd > 0)
+    grupo_de = {p.nome: grupo_atendimento(p.laboratorio, parametros) for p in projetos_flexiveis}
+    salas = salas_por_laboratorio(parametros, meses)
 
-    inicio_vars_prog, inicio_vars_rob = {}, {}
-    for proj in projetos_flexiveis:
-        for m in range(proj.inicio_min, proj.inicio_max + 1):
-            if proj.prog > 0: inicio_vars_prog[(proj.nome, m)] = model.NewIntVar(0, proj.prog, f'p_{proj.nome}_{m}')
-            if proj.rob > 0: inicio_vars_rob[(proj.nome, m)] = model.NewIntVar(0, proj.rob, f'r_{proj.nome}_{m}')
-
-    for proj in projetos_flexiveis:
-        if proj.prog > 0: model.Add(sum(inicio_vars_prog.get((proj.nome, m), 0) for m in range(proj.inicio_min, proj.inicio_max + 1)) == proj.prog)
-        if proj.rob > 0: model.Add(sum(inicio_vars_rob.get((proj.nome, m), 0) for m in range(proj.inicio_min, proj.inicio_max + 1)) == proj.rob)
+    # Um subproblema por grupo e habilidade; as salas de um laboratório juntam as habilidades do grupo
+    tarefas = []
+    for grupo in ordenar_grupos(grupo_de.values()):
+        projetos_grupo = [p for p in projetos_flexiveis if grupo_de[p.nome] == grupo]
+        habilidades_grupo = ordenar_habilidades(hab for p in projetos_grupo for hab, qtd in p.turmas.items() if qtd > 0)
+        salas_grupo = {lab: salas[lab] for lab in {p.laboratorio for p in projetos_grupo} if lab in salas}
+        unidades = [tuple(habilidades_grupo)] if salas_grupo else [(hab,) for hab in habilidades_grupo]
+        tarefas += [(grupo, unidade, projetos_grupo, num_meses, meses_ferias_idx, parametros, motor, 0, salas_grupo,
+                     num_alternativos, parametros.folga_pico_alternativos) for unidade in unidades]
 
-    demanda_total_prog, demanda_total_rob = {}, {}
-    for m in range(num_meses):
-        demanda_m_prog = [inicio_vars_prog[(p.nome, m_i)] for p in projetos_flexiveis if p.prog > 0 for m_i in range(p.inicio_min, p.inicio_max + 1) if m in calcular_meses_ativos(m_i, p.duracao, meses_ferias_idx, num_meses)]
-        demanda_m_rob = [inicio_vars_rob[(p.nome, m_i)] for p in projetos_flexiveis if p.rob > 0 for m_i in range(p.inicio_min, p.inicio_max + 1) if m in calcular_meses_ativos(m_i, p.duracao, meses_ferias_idx, num_meses)]
-        demanda_total_prog[m] = model.NewIntVar(0, 300, f'dt_prog_{m}')
-        demanda_total_rob[m] = model.NewIntVar(0, 300, f'dt_rob_{m}')
-        model.Add(demanda_total_prog[m] == sum(demanda_m_prog))
-        model.Add(demanda_total_rob[m] == sum(demanda_m_rob))
+    # Em paralelo quando há núcleos para isso
+    nucleos = nucleos_disponiveis(parametros.threads_solver)
+    processos = max(1, min(len(tarefas), nucleos, max_processos or nucleos))
+    if processos > 1:
+        tarefas = [tarefa[:7] + (max(1, nucleos // processos),) + tarefa[8:] for tarefa in tarefas]
+    logger.info(f"Resolvendo modelo (backend: {parametros.backend_solver}) | Habilidades: {', '.join(habilidades)} "
+                f"| Subproblemas: {len(tarefas)} | Processos: {processos}...")
+    if processos > 1:
+        with registro.executor_processos(processos) as pool:
+            resultados = list(pool.map(_resolver_subproblema, tarefas))
+    else:
+        resultados = [_resolver_subproblema(tarefa) for tarefa in tarefas]
 
-    for mes_ferias in meses_ferias_idx:
-        model.Add(demanda_total_prog[mes_ferias] == 0)
-        model.Add(demanda_total_rob[mes_ferias] == 0)
-
-    pico_prog = model.NewIntVar(0, 300, 'pico_prog')
-    pico_rob = model.NewIntVar(0, 300, 'pico_rob')
-    pico_max = model.NewIntVar(0, 300, 'pico_max')
-    model.AddMaxEquality(pico_prog, list(demanda_total_prog.values()))
-    model.AddMaxEquality(pico_rob, list(demanda_total_rob.values()))
-    model.AddMaxEquality(pico_max, [pico_prog, pico_rob])
-    model.Minimize(pico_max)
-
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = float(parametros.timeout_segundos)
-    print("Resolvendo modelo...")
-    status = solver.Solve(model)
-
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        print(f"\n[✓] SUCESSO! Status: {solver.StatusName(status)}")
+    statuses = {(grupo, unidade): status for grupo, unidade, status, _, _, _ in resultados}
+    if all(status in ('OPTIMAL', 'FEASIBLE') for status in statuses.values()):
+        status = 'OPTIMAL' if all(s == 'OPTIMAL' for s in statuses.values()) else 'FEASIBLE'
+        logger.info(f"\n[✓] SUCESSO! Status: {status}")
         cronograma_flexivel = defaultdict(list)
-        for proj in projetos_flexiveis:
-            for hab_flag, vars_dict, hab_nome in [('prog', inicio_vars_prog, 'PROG'), ('rob', inicio_vars_rob, 'ROB')]:
-                if getattr(proj, hab_flag) > 0:
-                    for m in range(proj.inicio_min, proj.inicio_max + 1):
-                        num_turmas = solver.Value(vars_dict.get((proj.nome, m), 0))
-                        if num_turmas > 0:
-                            cronograma_flexivel[proj.nome].append({'mes_inicio': m, 'num_turmas': num_turmas, 'habilidade': hab_nome})
-        return {
-            "cronograma": dict(cronograma_flexivel),
-            "pico_max": solver.Value(pico_max),
-            "pico_prog": solver.Value(pico_prog),
-            "pico_rob": solver.Value(pico_rob),
+        for _, _, _, cronograma_sub, _, _ in resultados:
+            for proj_nome, entradas in cronograma_sub.items(): cronograma_flexivel[proj_nome].extend(entradas)
+        cronograma_final = _desagregar_cronograma(dict(cronograma_flexivel), membros)
+        # Pico realizado: a cumulativa e o máximo do MIP só garantem um limite superior
+        demanda = calcular_demanda_cronograma(cronograma_final, projetos_originais, meses_ferias_idx, num_meses)
+        picos = {hab: max(demanda.get(hab, [0])) for hab in habilidades}
+        tempos = [tempo for _, _, _, _, tempo, _ in resultados]
+        resultado = {
+            "cronograma": cronograma_final,
+            "pico_max": max(picos.values(), default=0),
+            "picos": picos,
             "meses_ferias": meses_ferias_idx,
-            "parametros": parametros
+            "parametros": parametros,
+            "status_solver": status,
+            # Em paralelo, o tempo de parede do solver é o do subproblema mais lento
+            "tempo_solver": max(tempos, default=0.0) if processos > 1 else sum(tempos)
         }
+        if any(grupo is not None for grupo in grupo_de.values()):
+            resultado["picos_grupo"] = picos_por_grupo(cronograma_final, projetos_originais, meses_ferias_idx,
+                                                       num_meses, parametros)
+            for grupo, picos_grupo in resultado["picos_grupo"].items():
+                logger.info(f"   {grupo or 'Sem laboratório'}: "
+                            + ", ".join(f"{hab} {pico}" for hab, pico in picos_grupo.items()))
+        alternativos = _combinar_alternativos(resultados, membros)
+        if num_alternativos > 1:
+            resultado["cronogramas_alternativos"] = alternativos
+            logger.info(f"   Cronogramas alternativos: {len(alternativos)} (pedidos: {num_alternativos - 1}, "
+                        f"folga de pico: {parametros.folga_pico_alternativos})")
+        return resultado
     else:
-        print(f"\n[✗] FALHA: Status {solver.StatusName(status)}")
-        return None
\ No newline at end of file
+        falhas = ', '.join(f"{grupo + ' ' if grupo else ''}{'/'.join(unidade)}: {status}"
+                           for (grupo, unidade), status in statuses.items() if status not in ('OPTIMAL', 'FEASIBLE'))
+        logger.error(f"\n[✗] FALHA: Status {falhas}")
+        return None
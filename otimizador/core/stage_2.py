@@ -1,165 +1,319 @@
 # ARQUIVO: otimizador/core/stage_2.py
 
-from collections import defaultdict
-from typing import List, Dict, Optional
-from ortools.sat.python import cp_model
+import logging
+import time
+from typing import List, Dict, Optional, Sequence, Tuple
+
+import numpy as np
 
 # Import relativo para acessar modelos de dados e utils
-from ..data_models import Projeto, ParametrosOtimizacao, Turma, Instrutor
-from ..utils import calcular_meses_ativos
+from .. import registro
+from ..data_models import Projeto, ParametrosOtimizacao, Turma, Instrutor, HABILIDADES_PADRAO
+from ..utils import ordenar_habilidades, nucleos_disponiveis
+from .backends import criar_backend_execucao
+from .laboratorios import grupo_atendimento, ordenar_grupos, chave_pool
+from .indices import (tabela_turmas, tabela_instrutores, indicadores_atribuicao,
+                      atribuicoes_para_dicts)
 
+logger = logging.getLogger(__name__)
 
-def otimizar_atribuicao_e_carga(cronograma_flexivel: Dict,
-                                projetos: List[Projeto],
-                                meses: List[str],
-                                meses_ferias: List[int],
-                                parametros: ParametrosOtimizacao) -> Optional[Dict]:
-    """
-    Aloca turmas a instrutores com restrição de spread máximo.
-    (Versão Corrigida)
-    """
-    print("\n" + "=" * 80)
-    print("ESTÁGIO 2: Alocação de Instrutores")
-    print("=" * 80)
-    print(f"Capacidade máxima por instrutor: {parametros.capacidade_max_instrutor} turmas/mês")
-    print(f"Spread máximo configurado: {parametros.spread_maximo} turmas\n")
+# Tamanho do pool de instrutores criado para cada habilidade
+NUM_MAX_INSTRUTORES_FLEX = 80
 
-    # 1. Criação de Turmas a partir do cronograma do Estágio 1
+
+def criar_turmas(cronograma_flexivel: Dict, projetos: List[Projeto]) -> List[Turma]:
+    """Cria as turmas a partir do cronograma do Estágio 1 (IDs determinísticos para o mesmo cronograma)."""
     all_turmas, turma_counter = [], 0
     projetos_dict = {p.nome: p for p in projetos}
     for proj_nome, cronogramas in cronograma_flexivel.items():
         proj_details = projetos_dict.get(proj_nome)
         if not proj_details: continue
         for crono in cronogramas:
-            habilidade_str = crono.get('habilidade', 'PROG')
-            habilidade = 'PROG' if habilidade_str == 'PROG' else 'ROBOTICA'
+            habilidade = crono.get('habilidade', 'PROG')
             for _ in range(crono['num_turmas']):
                 all_turmas.append(
                     Turma(f'{proj_nome}_{habilidade[:3]}_{turma_counter}', proj_nome, habilidade,
-                          crono['mes_inicio'], proj_details.duracao)
+                          crono['mes_inicio'], proj_details.duracao, proj_details.laboratorio)
                 )
                 turma_counter += 1
-    print(f"Total de turmas criadas: {len(all_turmas)}")
+    return all_turmas
+
+
+def habilidades_das_turmas(all_turmas: List[Turma]) -> List[str]:
+    """Habilidades do pool para um conjunto de turmas (as padrão sempre presentes, como no pool original)."""
+    return ordenar_habilidades(list(HABILIDADES_PADRAO) + [t.habilidade for t in all_turmas])
 
-    # 2. Criação do Pool de Instrutores
-    num_max_instrutores_flex = 80
-    all_instrutores = [
-        Instrutor(id=f'{hab}_{i}', habilidade=hab, capacidade=parametros.capacidade_max_instrutor, laboratorio_id=None)
-        for hab in ['PROG', 'ROBOTICA'] for i in range(num_max_instrutores_flex)]
-    print(f"Pool de instrutores: {len(all_instrutores)}\n")
 
-    # 3. Construção do Modelo de Otimização
-    model = cp_model.CpModel()
-    num_meses = len(meses)
+def criar_pool_instrutores(parametros: ParametrosOtimizacao,
+                           habilidades: Sequence[str] = HABILIDADES_PADRAO,
+                           grupo: Optional[str] = None) -> List[Instrutor]:
+    """Cria o pool de instrutores flexíveis de cada habilidade (de um grupo de atendimento, se houver)."""
+    prefixo = '' if grupo is None else f'{grupo}_'
+    return [
+        Instrutor(id=f'{prefixo}{hab}_{i}', habilidade=hab, capacidade=parametros.capacidade_max_instrutor,
+                  laboratorio_id=grupo)
+        for hab in habilidades for i in range(NUM_MAX_INSTRUTORES_FLEX)]
 
-    turmas_por_habilidade = defaultdict(list)
-    for t in all_turmas: turmas_por_habilidade[t.habilidade].append(t)
 
-    instrutores_por_habilidade = defaultdict(list)
-    for i in all_instrutores: instrutores_por_habilidade[i.habilidade].append(i)
+def pool_para_turmas(all_turmas: List[Turma], parametros: ParametrosOtimizacao) -> List[Instrutor]:
+    """Pool de instrutores para as turmas: um por grupo de atendimento, com as habilidades das turmas dele."""
+    grupos = [grupo_atendimento(t.laboratorio, parametros) for t in all_turmas]
+    return [inst for grupo in (ordenar_grupos(grupos) or [None])
+            for inst in criar_pool_instrutores(
+                parametros, habilidades_das_turmas([t for t, g in zip(all_turmas, grupos) if g == grupo]), grupo)]
 
-    # Variáveis de Decisão: assign[(turma, instrutor)]
-    assign = {}
-    for habilidade, turmas in turmas_por_habilidade.items():
-        for t in turmas:
-            for i in instrutores_por_habilidade.get(habilidade, []):
-                assign[(t.id, i.id)] = model.NewBoolVar(f'assign_{t.id[:15]}_{i.id}')
+
+def chaves_pool_turmas(all_turmas: List[Turma], parametros: ParametrosOtimizacao) -> List[str]:
+    """Chave do pool ao qual cada turma pode ser atribuída (habilidade e grupo de atendimento)."""
+    return [chave_pool(t.habilidade, grupo_atendimento(t.laboratorio, parametros)) for t in all_turmas]
+
+
+def montar_resultado(atribuicao: Sequence[int], all_turmas: List[Turma], all_instrutores: List[Instrutor],
+                     parametros: ParametrosOtimizacao, status_solver: str,
+                     ativos: Optional[np.ndarray] = None) -> Dict:
+    """
+    Monta o dicionário do Estágio 2 a partir do índice do instrutor de cada turma, com o spread REAL
+    calculado das atribuições. 'atribuicao' é o array compacto; 'atribuicoes' é a lista dos relatórios.
+    Com a matriz `ativos` (turma x mês) inclui 'carga_mensal' (instrutor x mês) e 'utilizacao_mensal'
+    (fração da capacidade dos instrutores usados ocupada em cada mês).
+    """
+    atribuicao = np.asarray(atribuicao, dtype=np.int32)
+    matriz = ativos if ativos is not None else np.zeros((len(atribuicao), 0), dtype=bool)
+    indicadores = indicadores_atribuicao(atribuicao, matriz, len(all_instrutores))
+    cargas, usados = indicadores['cargas'], indicadores['usados']
+
+    resultado = {
+        "status": "sucesso",
+        "status_solver": status_solver,
+        "atribuicao": atribuicao,
+        "atribuicoes": atribuicoes_para_dicts(atribuicao, all_turmas, all_instrutores),
+        "total_instrutores_flex": len(usados),
+        "carga_por_instrutor": {all_instrutores[i].id: int(cargas[i]) for i in usados},
+        "spread_carga": indicadores['spread'],
+        "turmas": all_turmas,
+        "instrutores": all_instrutores,
+        "capacidade_max": parametros.capacidade_max_instrutor
+    }
+    if ativos is not None:
+        resultado["carga_mensal"] = indicadores['carga_mensal']
+        resultado["utilizacao_mensal"] = (indicadores['carga_mensal'][usados].sum(axis=0) /
+                                          max(1, len(usados) * parametros.capacidade_max_instrutor))
+    return resultado
+
+
+def _resolver_atribuicao(args: Tuple) -> Dict:
+    """
+    Monta e resolve o modelo de atribuição para um subconjunto de turmas. Uma unidade é um pool
+    (habilidade e grupo de atendimento): cada turma só pode ir para instrutores da sua unidade.
+    `args` = (unidade de cada turma, meses ativos turma x mês, pools {unidade: índices}, capacidades,
+    parâmetros, timeout, threads, dica em índices globais ou None); tudo picklable, para rodar em outro processo.
+    Retorna {'status', 'atribuicao' (índice global do instrutor de cada turma), 'tempo_solver', 'tempos'}.
+    """
+    unidade_turma, ativos, pools, capacidade, parametros, timeout, num_workers, dica = args
+    inicio_montagem = time.perf_counter()
+    modelo = criar_backend_execucao(parametros, estagio=2)
+    num_turmas, num_meses = ativos.shape
+
+    # Variáveis de Decisão: assign[t][k] = turma t com o k-ésimo instrutor do pool da sua unidade
+    turmas_por_unidade = {h: np.flatnonzero(unidade_turma == h) for h in pools}
+    assign: List[List] = [None] * num_turmas
+    for h, indices in turmas_por_unidade.items():
+        for t in indices:
+            assign[t] = [modelo.booleano(f'x_{t}_{i}') for i in pools[h]]
+
+    # Hint: índice do instrutor de cada turma numa solução anterior (mesmo cronograma)
+    if dica is not None:
+        posicao = {int(i): k for pool in pools.values() for k, i in enumerate(pool)}
+        for t, i in enumerate(dica):
+            k = posicao.get(int(i))
+            if k is not None and k < len(assign[t]): modelo.dica(assign[t][k], 1)
 
     # Restrição: Cada turma é alocada a exatamente um instrutor
-    for t_list in turmas_por_habilidade.values():
-        for t in t_list:
-            model.AddExactlyOne(assign[(t.id, i.id)] for i in instrutores_por_habilidade[t.habilidade])
+    for t in range(num_turmas):
+        modelo.exatamente_um(assign[t])
 
     # Restrição: Capacidade mensal do instrutor não pode ser excedida
-    for i in all_instrutores:
+    for h, indices in turmas_por_unidade.items():
         for m in range(num_meses):
-            carga_mensal = []
-            for t in turmas_por_habilidade[i.habilidade]:
-                meses_ativos = calcular_meses_ativos(t.mes_inicio, t.duracao, meses_ferias, num_meses)
-                if m in meses_ativos:
-                    carga_mensal.append(assign[(t.id, i.id)])
-            if carga_mensal:
-                model.Add(sum(carga_mensal) <= i.capacidade)
+            ativas = indices[ativos[indices, m]]
+            if len(ativas) == 0: continue
+            for k, i in enumerate(pools[h]):
+                modelo.adicionar(sum(assign[t][k] for t in ativas) <= int(capacidade[i]))
 
     # Variáveis de Carga e Spread
     cargas_totais, instrutores_usados = [], []
-    for i in all_instrutores:
-        usado = model.NewBoolVar(f'usado_{i.id}')
-        carga_total = model.NewIntVar(0, 300, f'carga_{i.id}')
-        turmas_do_instrutor = [assign.get((t.id, i.id)) for t in turmas_por_habilidade[i.habilidade] if
-                               assign.get((t.id, i.id)) is not None]
-
-        if turmas_do_instrutor:
-            model.Add(sum(turmas_do_instrutor) == carga_total)
-            model.Add(carga_total > 0).OnlyEnforceIf(usado)
-            model.Add(carga_total == 0).OnlyEnforceIf(usado.Not())
+    for h, indices in turmas_por_unidade.items():
+        if len(indices) == 0: continue
+        for k, i in enumerate(pools[h]):
+            usado = modelo.booleano(f'usado_{i}')
+            carga_total = modelo.inteiro(0, 300, f'carga_{i}')
+            modelo.adicionar(sum(assign[t][k] for t in indices) == carga_total)
+            modelo.vincular_uso(carga_total, usado, 300)
             cargas_totais.append(carga_total)
             instrutores_usados.append(usado)
 
-    total_instrutores = model.NewIntVar(0, len(instrutores_usados), 'total_instrutores')
+    total_instrutores = modelo.inteiro(0, len(instrutores_usados), 'total_instrutores')
     if instrutores_usados:
-        model.Add(total_instrutores == sum(instrutores_usados))
+        modelo.adicionar(total_instrutores == sum(instrutores_usados))
 
     # Modelagem do Spread para o Otimizador
-    spread_var = model.NewIntVar(0, 300, 'spread_obj')
+    spread_var = modelo.inteiro(0, 300, 'spread_obj')
     if cargas_totais:
-        max_carga = model.NewIntVar(0, 300, 'max_carga')
-        min_carga_usada = model.NewIntVar(0, 300, 'min_carga_usada')
-        model.AddMaxEquality(max_carga, cargas_totais)
-
-        # Truque de modelagem: se um instrutor não é usado, sua carga é tratada como um valor alto (max_carga)
-        # para que ele não seja escolhido como o mínimo.
-        cargas_ajustadas = []
-        for i, carga in enumerate(cargas_totais):
-            carga_ajustada = model.NewIntVar(0, 300, f'carga_ajustada_{i}')
-            model.Add(carga_ajustada == carga).OnlyEnforceIf(instrutores_usados[i])
-            model.Add(carga_ajustada == max_carga).OnlyEnforceIf(instrutores_usados[i].Not())
-            cargas_ajustadas.append(carga_ajustada)
-
-        model.AddMinEquality(min_carga_usada, cargas_ajustadas)
-        model.Add(spread_var == max_carga - min_carga_usada)
-        model.Add(spread_var <= parametros.spread_maximo)
+        max_carga = modelo.inteiro(0, 300, 'max_carga')
+        min_carga_usada = modelo.inteiro(0, 300, 'min_carga_usada')
+        modelo.maximo(max_carga, cargas_totais)
+        modelo.minimo_dos_usados(min_carga_usada, cargas_totais, instrutores_usados, max_carga, 300)
+        modelo.adicionar(spread_var == max_carga - min_carga_usada)
+        modelo.adicionar(spread_var <= parametros.spread_maximo)
     else:
-        model.Add(spread_var == 0)
+        modelo.adicionar(spread_var == 0)
 
     # Função Objetivo: Minimizar instrutores, depois o spread
-    model.Minimize(total_instrutores * 10000 + spread_var)
-
-    # 4. Resolução do Modelo
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = float(parametros.timeout_segundos)
-    print("Resolvendo alocação...")
-    status = solver.Solve(model)
-
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        print(f"\n[✓] SUCESSO! Status: {solver.StatusName(status)}")
-
-        atribuicoes = []
-        for t in all_turmas:
-            for i in instrutores_por_habilidade[t.habilidade]:
-                if solver.Value(assign.get((t.id, i.id), 0)):
-                    atribuicoes.append({'turma': t, 'instrutor': i})
-                    break
-
-        # Cálculo do spread REAL a partir dos resultados
-        carga_por_instrutor = defaultdict(int)
-        for atr in atribuicoes:
-            carga_por_instrutor[atr['instrutor'].id] += 1
-
-        cargas_ativas_vals = list(carga_por_instrutor.values())
-        spread_real_calculado = max(cargas_ativas_vals) - min(cargas_ativas_vals) if cargas_ativas_vals else 0
-
-        return {
-            "status": "sucesso",
-            "atribuicoes": atribuicoes,
-            "total_instrutores_flex": len(cargas_ativas_vals),
-            "carga_por_instrutor": dict(carga_por_instrutor),
-            "spread_carga": spread_real_calculado,
-            "turmas": all_turmas,
-            "instrutores": all_instrutores,
-            "capacidade_max": parametros.capacidade_max_instrutor
-        }
+    modelo.minimizar(total_instrutores * 10000 + spread_var)
+
+    inicio_solver = time.perf_counter()
+    status = modelo.resolver(timeout, num_workers)
+    fim_solver = time.perf_counter()
+
+    atribuicao = None
+    if status in ('OPTIMAL', 'FEASIBLE'):
+        # Extração em bloco: um vetor de valores por unidade, reorganizado em turma x instrutor
+        atribuicao = np.empty(num_turmas, dtype=np.int32)
+        for h, indices in turmas_por_unidade.items():
+            if len(indices) == 0: continue
+            valores = modelo.valores([var for t in indices for var in assign[t]])
+            atribuicao[indices] = pools[h][valores.reshape(len(indices), len(pools[h])).argmax(axis=1)]
+    return {"status": status, "atribuicao": atribuicao, "tempo_solver": modelo.tempo_solver(),
+            "tempos": {"montagem": inicio_solver - inicio_montagem, "solver": fim_solver - inicio_solver,
+                       "extracao": time.perf_counter() - fim_solver}}
+
+
+def _spread(atribuicao: np.ndarray) -> int:
+    """Diferença entre a maior e a menor carga dos instrutores usados."""
+    cargas = np.bincount(atribuicao)
+    usados = cargas[cargas > 0]
+    return int(usados.max() - usados.min()) if len(usados) else 0
+
+
+def _resolver_por_unidade(unidade_turma: np.ndarray, ativos: np.ndarray, pools: Dict[int, np.ndarray],
+                          capacidade: np.ndarray, parametros: ParametrosOtimizacao, dica: Optional[np.ndarray],
+                          num_workers: int) -> Tuple[Optional[Dict], bool]:
+    """
+    Resolve cada unidade (habilidade de um grupo de atendimento) como um problema independente, em processos
+    separados quando há núcleos e o chamador não limitou as threads, e junta as atribuições. As unidades só
+    se acoplam pelo spread global: se a junção o respeita, é uma solução do modelo completo.
+    Retorna (resultado ou None, paralelo).
+    """
+    tarefas, subconjuntos = [], []
+    for h in pools:
+        indices = np.flatnonzero(unidade_turma == h)
+        if len(indices) == 0: continue
+        subconjuntos.append(indices)
+        tarefas.append((unidade_turma[indices], ativos[indices], {h: pools[h]}, capacidade, parametros,
+                        parametros.timeout_segundos, num_workers, None if dica is None else dica[indices]))
+
+    nucleos = nucleos_disponiveis(parametros.threads_solver)
+    processos = min(len(tarefas), nucleos) if num_workers == 0 else 1
+    if processos > 1:
+        tarefas = [tarefa[:6] + (max(1, nucleos // processos),) + tarefa[7:] for tarefa in tarefas]
+        with registro.executor_processos(processos) as pool:
+            parciais = list(pool.map(_resolver_atribuicao, tarefas))
     else:
-        print(f"\n[✗] FALHA na Alocação: {solver.StatusName(status)}")
-        print("Sugestões: Aumente o 'Spread máximo' ou o 'Timeout do solver'.")
-        return {"status": "falha"}
+        # Em sequência, o timeout é repartido pelo número de turmas de cada habilidade
+        parciais = [_resolver_atribuicao(tarefa[:5] + (parametros.timeout_segundos * len(indices) / len(unidade_turma),)
+                                         + tarefa[6:]) for tarefa, indices in zip(tarefas, subconjuntos)]
+
+    if any(parcial['atribuicao'] is None for parcial in parciais):
+        return None, processos > 1
+    atribuicao = np.empty(len(unidade_turma), dtype=np.int32)
+    for indices, parcial in zip(subconjuntos, parciais):
+        atribuicao[indices] = parcial['atribuicao']
+    agregar = max if processos > 1 else sum
+    return {"status": 'OPTIMAL' if all(p['status'] == 'OPTIMAL' for p in parciais) else 'FEASIBLE',
+            "atribuicao": atribuicao,
+            "spread_habilidades": [_spread(p['atribuicao']) for p in parciais],
+            "tempo_solver": agregar(p['tempo_solver'] for p in parciais),
+            "tempos": {etapa: agregar(p['tempos'][etapa] for p in parciais) for etapa in parciais[0]['tempos']}
+            }, processos > 1
+
+
+def otimizar_atribuicao_e_carga(cronograma_flexivel: Dict,
+                                projetos: List[Projeto],
+                                meses: List[str],
+                                meses_ferias: List[int],
+                                parametros: ParametrosOtimizacao,
+                                dica: Optional[Sequence[int]] = None,
+                                num_workers: int = 0) -> Optional[Dict]:
+    """
+    Aloca turmas a instrutores com restrição de spread máximo.
+    (Versão Corrigida)
+    `dica` recebe o array 'atribuicao' de uma solução anterior (mesmo cronograma), usado como hint do solver;
+    `num_workers` limita as threads do solver (0 = padrão do solver).
+    O solver vem de `parametros.backend_solver`.
+    Com mais de uma habilidade ou laboratório, cada pool (habilidade de um grupo de atendimento) é resolvido
+    como subproblema independente, em paralelo quando possível; se a junção violar o spread global,
+    o modelo completo é resolvido com ela como dica.
+    """
+    logger.info("\n" + "=" * 80)
+    logger.info("ESTÁGIO 2: Alocação de Instrutores")
+    logger.info("=" * 80)
+    logger.info(f"Capacidade máxima por instrutor: {parametros.capacidade_max_instrutor} turmas/mês")
+    logger.info(f"Spread máximo configurado: {parametros.spread_maximo} turmas\n")
+
+    # 1. Criação de Turmas a partir do cronograma do Estágio 1
+    all_turmas = criar_turmas(cronograma_flexivel, projetos)
+    logger.info(f"Total de turmas criadas: {len(all_turmas)}")
+
+    # 2. Criação do Pool de Instrutores (um por grupo de atendimento quando há laboratórios)
+    all_instrutores = pool_para_turmas(all_turmas, parametros)
+    habilidades = ordenar_habilidades(i.habilidade for i in all_instrutores)
+    logger.info(f"Pool de instrutores: {len(all_instrutores)}\n")
+
+    # 3. Tabelas indexadas por inteiros; a unidade de uma turma é o pool em que ela pode ser atribuída
+    turmas = tabela_turmas(all_turmas, meses_ferias, len(meses), habilidades)
+    instrutores = tabela_instrutores(all_instrutores, habilidades)
+    codigo_unidade = {}
+    for inst in all_instrutores: codigo_unidade.setdefault(chave_pool(inst.habilidade, inst.laboratorio_id),
+                                                           len(codigo_unidade))
+    unidade_instrutor = np.array([codigo_unidade[chave_pool(i.habilidade, i.laboratorio_id)]
+                                  for i in all_instrutores], dtype=np.int32)
+    unidade_turma = np.array([codigo_unidade[chave] for chave in chaves_pool_turmas(all_turmas, parametros)],
+                             dtype=np.int32)
+    pools = {u: np.flatnonzero(unidade_instrutor == u) for u in codigo_unidade.values()}
+    dica = None if dica is None else np.asarray(dica)
+
+    # 4. Resolução: uma unidade (habilidade de um grupo) por subproblema quando há mais de uma com turmas
+    logger.info(f"Resolvendo alocação (backend: {parametros.backend_solver})...")
+    solucao, tempo_previo = None, 0.0
+    if len(set(unidade_turma.tolist())) > 1:
+        solucao, paralelo = _resolver_por_unidade(unidade_turma, turmas.ativos, pools, instrutores.capacidade,
+                                                  parametros, dica, num_workers)
+        if solucao is not None:
+            spread_global = _spread(solucao['atribuicao'])
+            logger.info(f"Subproblemas por habilidade/laboratório ({'em paralelo' if paralelo else 'em sequência'}): "
+                        f"spread global {spread_global}")
+            if spread_global > parametros.spread_maximo:
+                # O spread acopla as unidades: o modelo completo parte da junção como dica
+                logger.warning("[!] Spread global acima do máximo; resolvendo o modelo completo.")
+                dica, tempo_previo, solucao = solucao['atribuicao'], solucao['tempo_solver'], None
+            elif spread_global > max(solucao['spread_habilidades']):
+                solucao['status'] = 'FEASIBLE'
+
+    if solucao is None:
+        completo = _resolver_atribuicao((unidade_turma, turmas.ativos, pools, instrutores.capacidade, parametros,
+                                         parametros.timeout_segundos, num_workers, dica))
+        if completo['atribuicao'] is None:
+            logger.error(f"\n[✗] FALHA na Alocação: {completo['status']}")
+            logger.info("Sugestões: Aumente o 'Spread máximo' ou o 'Timeout do solver'.")
+            return {"status": "falha", "status_solver": completo['status']}
+        completo['tempo_solver'] += tempo_previo
+        solucao = completo
+
+    logger.info(f"\n[✓] SUCESSO! Status: {solucao['status']}")
+    resultado = montar_resultado(solucao['atribuicao'], all_turmas, all_instrutores, parametros, solucao['status'],
+                                 turmas.ativos)
+    resultado["tempo_solver"] = solucao['tempo_solver']
+    resultado["tempos"] = solucao['tempos']
+    logger.info("Tempos do Estágio 2: " + " | ".join(f"{etapa} {segundos:.2f}s"
+                                                      for etapa, segundos in resultado["tempos"].items()))
+    return resultado
@@ -0,0 +1,172 @@
+# ARQUIVO: otimizador/core/verificador.py
+"""
+Verificação independente do plano final contra as regras de negócio.
+
+Não reutiliza o modelo: os meses ativos de cada turma são recalculados por uma regra vetorizada
+(primeiros `duracao` meses fora das férias a partir do início), e os meses do plano, como aparecem
+nos relatórios, são conferidos contra ela. As férias são conferidas direto na carga mensal do plano
+(instrutor x mês) e nos meses de cada turma. As regras são avaliadas com NumPy sobre o array de
+atribuição, em milissegundos mesmo com milhares de turmas.
+"""
+
+import logging
+import time
+from typing import List, Dict, Optional
+
+import numpy as np
+
+# Import relativo para acessar modelos de dados e utils
+from ..data_models import Projeto, RegraVerificada, ParametrosOtimizacao
+from ..utils import ordenar_habilidades
+from .indices import tabela_turmas
+from .laboratorios import grupo_atendimento, salas_por_laboratorio
+
+logger = logging.getLogger(__name__)
+
+# Quantos exemplos de violação são guardados por regra
+MAX_EXEMPLOS = 3
+
+
+def matriz_meses_ativos(mes_inicio: np.ndarray, duracao: np.ndarray, meses_ferias: List[int],
+                        num_meses: int) -> np.ndarray:
+    """Turma x mês: ativa a partir do início, fora das férias, até completar a duração."""
+    letivo = np.ones(num_meses, dtype=bool)
+    letivo[[m for m in meses_ferias if 0 <= m < num_meses]] = False
+    acumulado = np.cumsum(letivo)
+    inicio = np.clip(mes_inicio, 0, num_meses - 1)
+    anteriores = acumulado[inicio] - letivo[inicio]
+    colunas = np.arange(num_meses)[None, :]
+    return ((colunas >= inicio[:, None]) & letivo[None, :] &
+            (acumulado[None, :] - anteriores[:, None] <= duracao[:, None]))
+
+
+def verificar_plano(resultado_estagio2: Dict, projetos: List[Projeto], meses: List[str],
+                    meses_ferias: List[int], spread_maximo: int,
+                    parametros: Optional[ParametrosOtimizacao] = None) -> Dict:
+    """
+    Verifica 'atribuicao' (índice do instrutor de cada turma) do resultado do Estágio 2.
+    Os exemplos usam os IDs de instrutor de 'atribuicoes' (já renumerados, se for o caso).
+    Com `parametros` e laboratórios em uso, também confere o grupo de atendimento e as salas.
+    Retorna {'ok', 'regras': [RegraVerificada], 'tempo_ms'}.
+    """
+    inicio_verificacao = time.perf_counter()
+    all_turmas, all_instrutores = resultado_estagio2['turmas'], resultado_estagio2['instrutores']
+    atribuicao = np.asarray(resultado_estagio2['atribuicao'], dtype=np.int64)
+    num_turmas, num_instrutores, num_meses = len(all_turmas), len(all_instrutores), len(meses)
+    nome_instrutor = {int(i): atr['instrutor'].id for i, atr in zip(atribuicao, resultado_estagio2['atribuicoes'])}
+
+    habilidades = ordenar_habilidades({t.habilidade for t in all_turmas} | {i.habilidade for i in all_instrutores} |
+                                      {h for p in projetos for h in p.turmas})
+    num_hab = len(habilidades)
+    hab_turma = np.array([habilidades.index(t.habilidade) for t in all_turmas], dtype=np.int8)
+    hab_instrutor = np.array([habilidades.index(i.habilidade) for i in all_instrutores], dtype=np.int8)
+    capacidade = np.array([i.capacidade for i in all_instrutores], dtype=np.int64)
+    mes_inicio = np.array([t.mes_inicio for t in all_turmas], dtype=np.int64)
+    duracao = np.array([t.duracao for t in all_turmas], dtype=np.int64)
+    ativos = matriz_meses_ativos(mes_inicio, duracao, meses_ferias, num_meses)
+    regras = []
+
+    # 1. Cada turma atribuída exatamente uma vez, a um instrutor da sua habilidade,
+    #    e o número de turmas de cada projeto igual à demanda
+    exemplos = []
+    if len(atribuicao) != num_turmas:
+        exemplos.append(f"{len(atribuicao)} atribuições para {num_turmas} turmas")
+        atribuicao = np.resize(atribuicao, num_turmas)
+    validas = (atribuicao >= 0) & (atribuicao < num_instrutores)
+    sem_instrutor = np.flatnonzero(~validas)
+    outra_habilidade = np.flatnonzero(validas & (hab_instrutor[np.where(validas, atribuicao, 0)] != hab_turma))
+    exemplos += [f"{all_turmas[t].id} sem instrutor" for t in sem_instrutor[:MAX_EXEMPLOS]]
+    exemplos += [f"{all_turmas[t].id} com instrutor de outra habilidade" for t in outra_habilidade[:MAX_EXEMPLOS]]
+    ids, repeticoes = np.unique([t.id for t in all_turmas], return_counts=True)
+    exemplos += [f"{tid} repetida {n}x" for tid, n in zip(ids[repeticoes > 1][:MAX_EXEMPLOS],
+                                                            repeticoes[repeticoes > 1])]
+    codigo_projeto = {p.nome: k for k, p in enumerate(projetos)}
+    projeto_turma = np.array([codigo_projeto.get(t.projeto, len(projetos)) for t in all_turmas], dtype=np.int64)
+    contagem = np.bincount(projeto_turma * num_hab + hab_turma, minlength=num_hab * (len(projetos) + 1))
+    demanda = np.array([[p.turmas.get(h, 0) for h in habilidades] for p in projetos] + [[0] * num_hab],
+                       dtype=np.int64).ravel()
+    divergentes = np.flatnonzero(contagem != demanda)
+    exemplos += [f"{projetos[k // num_hab].nome if k // num_hab < len(projetos) else 'projeto desconhecido'} "
+                 f"{habilidades[k % num_hab]}: {contagem[k]} turmas para demanda {demanda[k]}"
+                 for k in divergentes[:MAX_EXEMPLOS]]
+    violacoes = (len(sem_instrutor) + len(outra_habilidade) + int((repeticoes > 1).sum()) + len(divergentes) +
+                 int(len(resultado_estagio2['atribuicao']) != num_turmas))
+    regras.append(RegraVerificada("Turma atribuída exatamente uma vez", violacoes, exemplos[:MAX_EXEMPLOS]))
+
+    # 2. Carga mensal de cada instrutor dentro da capacidade
+    carga_mensal = np.zeros((num_instrutores, num_meses), dtype=np.int64)
+    np.add.at(carga_mensal, atribuicao[validas], ativos[validas])
+    excesso = carga_mensal > capacidade[:, None]
+    linhas, colunas = np.nonzero(excesso)
+    regras.append(RegraVerificada("Carga mensal <= capacidade", int(excesso.sum()), [
+        f"{nome_instrutor.get(int(i), all_instrutores[i].id)} em {meses[m]}: {carga_mensal[i, m]} > {capacidade[i]}"
+        for i, m in zip(linhas[:MAX_EXEMPLOS], colunas[:MAX_EXEMPLOS])]))
+
+    # 3. Nenhuma aula nas férias: colunas de férias da carga mensal do plano (a gravada pelo Estágio 2,
+    #    ou a das atribuições com os meses dos relatórios) e meses de cada turma nos relatórios
+    plano = tabela_turmas(all_turmas, meses_ferias, num_meses, habilidades).ativos
+    ferias = sorted({m for m in meses_ferias if 0 <= m < num_meses})
+    carga_plano = resultado_estagio2.get('carga_mensal')
+    if carga_plano is None or np.shape(carga_plano) != (num_instrutores, num_meses):
+        carga_plano = np.zeros((num_instrutores, num_meses), dtype=np.int64)
+        np.add.at(carga_plano, atribuicao[validas], plano[validas])
+    carga_ferias = np.asarray(carga_plano)[:, ferias]
+    instrutores_ferias, colunas_ferias = np.nonzero(carga_ferias)
+    turmas_ferias = np.flatnonzero(plano[:, ferias].any(axis=1))
+    exemplos = [f"{nome_instrutor.get(int(i), all_instrutores[i].id)} em {meses[ferias[j]]}: "
+                f"{carga_ferias[i, j]} turma(s)" for i, j in zip(instrutores_ferias[:MAX_EXEMPLOS],
+                                                              colunas_ferias[:MAX_EXEMPLOS])]
+    exemplos += [all_turmas[t].id for t in turmas_ferias[:MAX_EXEMPLOS]]
+    regras.append(RegraVerificada("Sem aulas nas férias", len(instrutores_ferias) + len(turmas_ferias),
+                                  exemplos[:MAX_EXEMPLOS]))
+
+    # 4. Janela do projeto: início permitido e término (com a duração completa) até o fim do projeto,
+    #    com os meses do plano (os usados nos relatórios) iguais aos da regra independente
+    janelas = np.array([[p.inicio_min, p.inicio_max, p.mes_fim_projeto] for p in projetos] + [[0, -1, -1]],
+                       dtype=np.int64)[projeto_turma]
+    ultimo_mes = num_meses - 1 - np.argmax(ativos[:, ::-1], axis=1)
+    fora_janela = ((mes_inicio < janelas[:, 0]) | (mes_inicio > janelas[:, 1]) |
+                   (ativos.sum(axis=1) != duracao) | (ultimo_mes > janelas[:, 2]) | (plano != ativos).any(axis=1))
+    regras.append(RegraVerificada("Janela do projeto respeitada", int(fora_janela.sum()), [
+        f"{all_turmas[t].id} (início {meses[min(mes_inicio[t], num_meses - 1)]})"
+        for t in np.flatnonzero(fora_janela)[:MAX_EXEMPLOS]]))
+
+    # 5. Spread entre os instrutores usados
+    cargas = np.bincount(atribuicao[validas], minlength=num_instrutores)
+    usados = cargas[cargas > 0]
+    spread = int(usados.max() - usados.min()) if len(usados) else 0
+    regras.append(RegraVerificada("Spread <= máximo", int(spread > spread_maximo),
+                                  [f"spread {spread} > {spread_maximo}"] if spread > spread_maximo else []))
+
+    # 6. Laboratórios: instrutor do grupo de atendimento da turma e turmas ativas dentro das salas
+    if parametros is not None and (parametros.laboratorios or any(t.laboratorio for t in all_turmas)):
+        grupo_turma = np.array([grupo_atendimento(t.laboratorio, parametros) or '' for t in all_turmas])
+        grupo_instrutor = np.array([i.laboratorio_id or '' for i in all_instrutores] + [''])
+        outro_grupo = np.flatnonzero(validas & (grupo_instrutor[np.where(validas, atribuicao, -1)] != grupo_turma))
+        exemplos = [f"{all_turmas[t].id} ({all_turmas[t].laboratorio}) com instrutor de "
+                    f"{grupo_instrutor[atribuicao[t]] or 'sem laboratório'}" for t in outro_grupo[:MAX_EXEMPLOS]]
+        laboratorio_turma = np.array([t.laboratorio or '' for t in all_turmas])
+        acima_salas = 0
+        for lab, limites in salas_por_laboratorio(parametros, meses).items():
+            ocupadas = ativos[laboratorio_turma == lab].sum(axis=0)
+            limite = np.array([np.iinfo(np.int64).max if l is None else l for l in limites])
+            acima_salas += int((ocupadas > limite).sum())
+            exemplos += [f"{lab} em {meses[m]}: {ocupadas[m]} turmas > {limite[m]} salas"
+                         for m in np.flatnonzero(ocupadas > limite)[:MAX_EXEMPLOS]]
+        regras.append(RegraVerificada("Laboratórios e salas respeitados", len(outro_grupo) + acima_salas,
+                                      exemplos[:MAX_EXEMPLOS]))
+
+    return {"ok": all(r.violacoes == 0 for r in regras), "regras": regras,
+            "tempo_ms": (time.perf_counter() - inicio_verificacao) * 1000}
+
+
+def exibir_verificacao(verificacao: Dict) -> None:
+    """Imprime o resultado da verificação no console."""
+    logger.info("\n--- Verificação Independente do Plano ---")
+    for regra in verificacao['regras']:
+        if regra.violacoes == 0:
+            logger.info(f"[✓] {regra.regra}")
+        else:
+            logger.error(f"[✗] {regra.regra}: {regra.violacoes} violação(ões). Ex.: {'; '.join(regra.exemplos)}")
+    situacao = "[✓] Plano válido" if verificacao['ok'] else "[!] PLANO COM VIOLAÇÕES"
+    logger.info(f"{situacao} (verificado em {verificacao['tempo_ms']:.1f} ms)")
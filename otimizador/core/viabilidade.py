@@ -0,0 +1,313 @@
+# ARQUIVO: otimizador/core/viabilidade.py
+"""
+Pré-verificação analítica de viabilidade e diagnóstico de inviabilidade.
+
+A pré-verificação aplica apenas condições necessárias (janelas de início, salas dos laboratórios,
+pico mínimo de demanda e spread mínimo) e roda em milissegundos, antes de qualquer chamada ao solver.
+O diagnóstico monta uma relaxação agregada dos dois estágios no CP-SAT, com uma hipótese
+(literal de assunção) por restrição, e reduz o núcleo de inviabilidade a um conjunto mínimo. Conflitos
+da pré-verificação que já envolvem uma única restrição (janela de um projeto, spread) são o próprio
+conjunto mínimo e dispensam essa busca.
+"""
+
+import logging
+import math
+from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
+from ortools.sat.python import cp_model
+
+# Import relativo para acessar modelos de dados e utils
+from ..data_models import ConfiguracaoProjeto, ParametrosOtimizacao, Conflito
+from ..utils import (calcular_meses_ativos, buscar_janela_inicio, calcular_turmas_por_habilidade,
+                     data_para_indice_mes, nucleos_disponiveis)
+from .stage_2 import NUM_MAX_INSTRUTORES_FLEX
+from .laboratorios import salas_por_laboratorio
+
+logger = logging.getLogger(__name__)
+
+# Conflitos da pré-verificação que, sozinhos, já tornam a configuração inviável (uma única restrição)
+RESTRICOES_DIRETAS = ('janela', 'spread')
+
+
+def _resumir_projetos(projetos_config: List[ConfiguracaoProjeto], meses: List[str],
+                      meses_ferias: List[int]) -> List[Dict]:
+    """Extrai índices, janela e turmas por habilidade de cada projeto sem alterar as configurações."""
+    resumo = []
+    for config in projetos_config:
+        mes_inicio = data_para_indice_mes(config.data_inicio, meses)
+        mes_fim = data_para_indice_mes(config.data_termino, meses)
+        inicio_min, inicio_max = buscar_janela_inicio(mes_inicio, mes_fim, config.duracao_curso, meses_ferias,
+                                                      len(meses))
+        resumo.append({
+            'nome': config.nome, 'duracao': config.duracao_curso, 'mes_inicio': mes_inicio, 'mes_fim': mes_fim,
+            'inicio_min': inicio_min, 'inicio_max': inicio_max, 'turmas': calcular_turmas_por_habilidade(config.num_turmas, config.habilidades),
+            'laboratorio': config.laboratorio
+        })
+    return resumo
+
+
+def _verificar_janelas(resumo: List[Dict], meses: List[str], meses_ferias: List[int]) -> List[Conflito]:
+    """Projetos cujo prazo, descontadas as férias, não comporta a duração do curso."""
+    conflitos = []
+    for p in resumo:
+        if p['inicio_min'] != -1: continue
+        ferias_periodo = [f for f in sorted(meses_ferias) if p['mes_inicio'] <= f <= p['mes_fim']]
+        meses_periodo = p['mes_fim'] - p['mes_inicio'] + 1
+        letivos = meses_periodo - len(ferias_periodo)
+        descricao = (f"'{p['nome']}' não tem janela de início válida: {letivos} meses letivos entre "
+                     f"{meses[p['mes_inicio']]} e {meses[p['mes_fim']]}, mas o curso dura {p['duracao']} meses")
+        if ferias_periodo:
+            descricao += f" (férias no período: {', '.join(meses[f] for f in ferias_periodo)})"
+        parametro = 'meses_ferias' if ferias_periodo and p['duracao'] <= meses_periodo else 'duracao_curso'
+        conflitos.append(Conflito('janela', p['nome'], None, parametro, descricao))
+    return conflitos
+
+
+def _verificar_salas(resumo: List[Dict], meses: List[str], meses_ferias: List[int],
+                     parametros: ParametrosOtimizacao) -> List[Conflito]:
+    """
+    Laboratórios cujas salas não comportam as turmas dos seus projetos: turmas ativas em um mês em
+    qualquer cronograma (meses cobertos por todos os inícios possíveis) acima das salas do mês, ou
+    carga total (turmas x meses letivos) acima das salas somadas nos meses em que pode haver turmas.
+    """
+    num_meses, conflitos = len(meses), []
+    for lab, limites in salas_por_laboratorio(parametros, meses).items():
+        obrigatoria, cobertura, carga_total = [0] * num_meses, set(), 0
+        for p in resumo:
+            if p['laboratorio'] != lab or p['inicio_min'] == -1: continue
+            ativos = [set(calcular_meses_ativos(m, p['duracao'], meses_ferias, num_meses))
+                      for m in range(p['inicio_min'], p['inicio_max'] + 1)]
+            num_turmas = sum(p['turmas'].values())
+            for m in set.intersection(*ativos): obrigatoria[m] += num_turmas
+            cobertura |= set.union(*ativos)
+            carga_total += num_turmas * p['duracao']
+
+        excedidos = [m for m in range(num_meses) if limites[m] is not None and obrigatoria[m] > limites[m]]
+        for m in excedidos:
+            conflitos.append(Conflito(
+                'salas', None, meses[m], 'laboratorios',
+                f"Laboratório '{lab}' tem {limites[m]} salas em {meses[m]}, mas {obrigatoria[m]} turmas estão "
+                f"ativas nesse mês em qualquer cronograma"))
+        if not excedidos and all(limites[m] is not None for m in cobertura):
+            capacidade = sum(limites[m] for m in cobertura)
+            if carga_total > capacidade:
+                conflitos.append(Conflito(
+                    'salas', None, None, 'laboratorios',
+                    f"Laboratório '{lab}' comporta {capacidade} turmas-mês nos meses em que pode haver turmas, "
+                    f"mas os seus projetos somam {carga_total}"))
+    return conflitos
+
+
+def _limite_inferior_pico(resumo: List[Dict], num_meses: int,
+                          meses_ferias: List[int]) -> Dict[str, Tuple[int, Optional[int]]]:
+    """
+    Limite inferior do pico mensal por habilidade, válido para qualquer cronograma.
+    Combina a demanda obrigatória (meses cobertos por todos os inícios possíveis) com a média
+    da carga total sobre os meses que podem ter turmas ativas.
+    """
+    obrigatoria = defaultdict(lambda: [0] * num_meses)
+    cobertura, carga_total = defaultdict(set), defaultdict(int)
+    for p in resumo:
+        if p['inicio_min'] == -1: continue
+        ativos = [set(calcular_meses_ativos(m, p['duracao'], meses_ferias, num_meses))
+                  for m in range(p['inicio_min'], p['inicio_max'] + 1)]
+        comuns, uniao = set.intersection(*ativos), set.union(*ativos)
+        for hab, num_turmas in p['turmas'].items():
+            if num_turmas <= 0: continue
+            for m in comuns: obrigatoria[hab][m] += num_turmas
+            cobertura[hab] |= uniao
+            carga_total[hab] += num_turmas * p['duracao']
+
+    limites = {}
+    for hab, meses_cobertos in cobertura.items():
+        media = math.ceil(carga_total[hab] / len(meses_cobertos))
+        pico_obrigatorio = max(obrigatoria[hab])
+        mes_critico = obrigatoria[hab].index(pico_obrigatorio) if pico_obrigatorio >= media else None
+        limites[hab] = (max(media, pico_obrigatorio), mes_critico)
+    return limites
+
+
+def calcular_spread_minimo(turmas_por_hab: Dict[str, int], instrutores_min_por_hab: Dict[str, int]) -> Optional[int]:
+    """
+    Menor spread compatível apenas com a contagem de turmas por habilidade.
+    Para uma carga mínima comum `a`, cada habilidade usa o maior número de instrutores possível
+    (k <= turmas/a), o que minimiza a maior carga ceil(turmas/k). Retorna None se nenhum `a` serve.
+    """
+    habs = [h for h, t in turmas_por_hab.items() if t > 0]
+    if not habs: return 0
+    melhor = None
+    for a in range(1, max(turmas_por_hab[h] for h in habs) + 1):
+        spread_a = 0
+        for hab in habs:
+            total = turmas_por_hab[hab]
+            k = min(NUM_MAX_INSTRUTORES_FLEX, total // a)
+            if k < instrutores_min_por_hab.get(hab, 1):
+                spread_a = None
+                break
+            spread_a = max(spread_a, math.ceil(total / k) - a)
+        if spread_a is not None and (melhor is None or spread_a < melhor):
+            melhor = spread_a
+    return melhor
+
+
+def verificar_viabilidade(projetos_config: List[ConfiguracaoProjeto], meses: List[str], meses_ferias: List[int],
+                          parametros: ParametrosOtimizacao) -> List[Conflito]:
+    """
+    Pré-verificação analítica (condições necessárias) executada antes do Estágio 1.
+    Retorna a lista de conflitos encontrados; lista vazia não garante viabilidade.
+    """
+    resumo = _resumir_projetos(projetos_config, meses, meses_ferias)
+    conflitos = _verificar_janelas(resumo, meses, meses_ferias)
+    conflitos += _verificar_salas(resumo, meses, meses_ferias, parametros)
+
+    cap = parametros.capacidade_max_instrutor
+    instrutores_min = {}
+    for hab, (pico, mes_critico) in _limite_inferior_pico(resumo, len(meses), meses_ferias).items():
+        instrutores_min[hab] = max(1, math.ceil(pico / cap))
+        if instrutores_min[hab] > NUM_MAX_INSTRUTORES_FLEX:
+            onde = f" em {meses[mes_critico]}" if mes_critico is not None else ""
+            conflitos.append(Conflito(
+                'capacidade', None, meses[mes_critico] if mes_critico is not None else None,
+                'capacidade_max_instrutor',
+                f"Demanda mínima de {pico} turmas/mês de {hab}{onde} exige {instrutores_min[hab]} instrutores "
+                f"com capacidade {cap}, mas o pool do estágio 2 tem {NUM_MAX_INSTRUTORES_FLEX}"))
+
+    if any(c.restricao == 'capacidade' for c in conflitos):
+        return conflitos
+
+    turmas_por_hab = defaultdict(int)
+    for p in resumo:
+        if p['inicio_min'] == -1: continue
+        for hab, num_turmas in p['turmas'].items(): turmas_por_hab[hab] += num_turmas
+    spread_min = calcular_spread_minimo(turmas_por_hab, instrutores_min)
+    if spread_min is not None and spread_min > parametros.spread_maximo:
+        distribuicao = ', '.join(f"{hab}: {t}" for hab, t in sorted(turmas_por_hab.items()) if t > 0)
+        conflitos.append(Conflito(
+            'spread', None, None, 'spread_maximo',
+            f"Spread máximo {parametros.spread_maximo} é inviável para {distribuicao} turmas; "
+            f"o mínimo analítico é {spread_min}"))
+    return conflitos
+
+
+def diagnosticar_inviabilidade(projetos_config: List[ConfiguracaoProjeto], meses: List[str],
+                               meses_ferias: List[int], parametros: ParametrosOtimizacao,
+                               timeout_segundos: float = 10.0,
+                               conflitos: Optional[List[Conflito]] = None) -> List[Conflito]:
+    """
+    Diagnóstico por assunções no CP-SAT: retorna um conjunto mínimo de restrições em conflito
+    (prazos e totais por projeto, férias e capacidade por mês, spread máximo), ou lista vazia se
+    a relaxação agregada for viável. A demanda usa sempre o calendário de férias completo.
+    Se os `conflitos` da pré-verificação já trazem conflitos de uma única restrição (RESTRICOES_DIRETAS),
+    eles são devolvidos sem a busca no CP-SAT, que fica para os conflitos de carga agregada.
+    """
+    diretos = [c for c in conflitos or [] if c.restricao in RESTRICOES_DIRETAS]
+    if diretos:
+        return diretos
+
+    model = cp_model.CpModel()
+    num_meses = len(meses)
+    resumo = _resumir_projetos(projetos_config, meses, meses_ferias)
+    hipoteses = []
+
+    def _hipotese(conflito: Conflito):
+        literal = model.NewBoolVar(f'h_{len(hipoteses)}')
+        hipoteses.append((literal, conflito))
+        return literal
+
+    ferias_lit = {f: _hipotese(Conflito('ferias', None, meses[f], 'meses_ferias', f"Férias em {meses[f]}"))
+                  for f in sorted(meses_ferias)}
+
+    demanda = defaultdict(lambda: defaultdict(list))
+    carga_hab = defaultdict(list)
+    for p in resumo:
+        prazo = _hipotese(Conflito('prazo', p['nome'], meses[p['mes_fim']], 'data_termino',
+                                   f"Término de '{p['nome']}' em {meses[p['mes_fim']]} "
+                                   f"para cursos de {p['duracao']} meses"))
+        total = _hipotese(Conflito('turmas', p['nome'], None, 'num_turmas',
+                                   f"{sum(p['turmas'].values())} turmas de '{p['nome']}'"))
+        inicios = defaultdict(list)
+        for m in range(p['mes_inicio'], min(p['mes_fim'], num_meses - 1) + 1):
+            inicia = model.NewBoolVar(f'b_{p["nome"]}_{m}')
+            ferias_trecho = [ferias_lit[f] for f in ferias_lit if m <= f <= p['mes_fim']]
+            model.Add(sum(ferias_trecho) <= p['mes_fim'] - m + 1 - p['duracao']).OnlyEnforceIf([inicia, prazo])
+            ativos = calcular_meses_ativos(m, p['duracao'], meses_ferias, num_meses)
+            for hab, num_turmas in p['turmas'].items():
+                if num_turmas <= 0: continue
+                x = model.NewIntVar(0, num_turmas, f'x_{p["nome"]}_{hab}_{m}')
+                model.Add(x <= num_turmas * inicia)
+                inicios[hab].append(x)
+                carga_hab[hab].append(x)
+                for m_ativo in ativos: demanda[hab][m_ativo].append(x)
+        for hab, xs in inicios.items():
+            model.Add(sum(xs) == p['turmas'][hab]).OnlyEnforceIf(total)
+
+    # Agregado do Estágio 2: k instrutores por habilidade cobrindo o pico, cargas em [a, a + spread]
+    cap = parametros.capacidade_max_instrutor
+    max_turmas = max([sum(p['turmas'].get(hab, 0) for p in resumo) for hab in carga_hab] or [1])
+    instrutores = {hab: model.NewIntVar(0, NUM_MAX_INSTRUTORES_FLEX, f'k_{hab}') for hab in carga_hab}
+    meses_com_demanda = sorted({m for hab in demanda for m in demanda[hab]})
+    for m in meses_com_demanda:
+        capacidade = _hipotese(Conflito('capacidade', None, meses[m], 'capacidade_max_instrutor',
+                                        f"Capacidade de {cap} turmas/instrutor em {meses[m]}"))
+        for hab, k in instrutores.items():
+            if demanda[hab][m]:
+                model.Add(sum(demanda[hab][m]) <= cap * k).OnlyEnforceIf(capacidade)
+
+    spread = _hipotese(Conflito('spread', None, None, 'spread_maximo',
+                                f"Spread máximo de {parametros.spread_maximo} turmas"))
+    # Carga mínima comum `a` em codificação one-hot, para manter k*a e k*(a + spread) lineares
+    carga_min = [model.NewBoolVar(f'a_{a}') for a in range(1, max_turmas + 1)]
+    model.AddExactlyOne(carga_min)
+    for hab, k in instrutores.items():
+        carga = sum(carga_hab[hab])
+        usado = model.NewBoolVar(f'usado_{hab}')
+        model.Add(k <= carga)
+        model.Add(carga >= 1).OnlyEnforceIf(usado)
+        model.Add(k >= 1).OnlyEnforceIf(usado)
+        model.Add(k == 0).OnlyEnforceIf(usado.Not())
+        for a, literal in enumerate(carga_min, 1):
+            model.Add(a * k <= carga).OnlyEnforceIf([literal, usado])
+            model.Add((a + parametros.spread_maximo) * k >= carga).OnlyEnforceIf([literal, spread])
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(timeout_segundos)
+    solver.parameters.num_workers = nucleos_disponiveis(parametros.threads_solver)
+    conflito_por_indice = {literal.Index(): conflito for literal, conflito in hipoteses}
+
+    def _resolver(indices: List[int]) -> int:
+        model.ClearAssumptions()
+        model.AddAssumptions([model.GetBoolVarFromProtoIndex(i) for i in indices])
+        return solver.Solve(model)
+
+    logger.info("Diagnosticando inviabilidade...")
+    status = _resolver(list(conflito_por_indice))
+    if status != cp_model.INFEASIBLE:
+        if status == cp_model.UNKNOWN:
+            logger.warning("[AVISO] Diagnóstico inconclusivo dentro do tempo limite.")
+        else:
+            logger.info("[INFO] A relaxação agregada é viável; o conflito depende do detalhamento dos estágios.")
+        return []
+
+    # Minimização por remoção: descarta cada hipótese que não é necessária para a inviabilidade
+    nucleo = list(solver.SufficientAssumptionsForInfeasibility())
+    pos = 0
+    while pos < len(nucleo):
+        candidato = nucleo[:pos] + nucleo[pos + 1:]
+        if _resolver(candidato) == cp_model.INFEASIBLE:
+            reduzido = set(solver.SufficientAssumptionsForInfeasibility())
+            nucleo = [i for i in candidato if i in reduzido] or candidato
+        else:
+            pos += 1
+
+    if not nucleo:
+        return [Conflito('estrutura', None, None, None, "Inviável independentemente dos parâmetros configuráveis")]
+    return [conflito_por_indice[i] for i in nucleo]
+
+
+def exibir_conflitos(conflitos: List[Conflito], titulo: str, nivel: int = logging.ERROR):
+    """Exibe conflitos de viabilidade no console; título e itens no mesmo nível de log."""
+    logger.log(nivel, f"\n{'[✗]' if nivel >= logging.ERROR else '[!]'} {titulo}:")
+    for c in conflitos:
+        onde = ', '.join(v for v in (c.projeto and f"projeto {c.projeto}", c.mes and f"mês {c.mes}",
+                                     c.parametro and f"parâmetro '{c.parametro}'") if v)
+        logger.log(nivel, f"   • [{c.restricao}] {c.descricao}" + (f" ({onde})" if onde else ""))
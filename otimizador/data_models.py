@@ -3,20 +3,64 @@
 from collections import namedtuple
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from typing import List, Dict, Optional
+
+# Estratégias aceitas para o Estágio 2
+ESTRATEGIAS_ESTAGIO2 = ('monolitico', 'lns')
+# Formulações da demanda mensal do Estágio 1: somas mensais ou intervalos com restrição cumulativa
+MOTORES_ESTAGIO1 = ('linear', 'intervalos')
+# Backends de solver dos Estágios 1 e 2 (SCIP e CBC via pywraplp, distribuídos com o ortools)
+BACKENDS_SOLVER = ('cpsat', 'scip', 'cbc')
+# Perfis do solver (configuração de cada um em core/backends.py); o 'ajustado', padrão, usa o resultado do
+# ajuste sobre as configurações salvas (benchmarks/ajuste_perfil_solver.py) e, sem ele, é o 'equilibrado'
+PERFIS_SOLVER = ('rapido', 'equilibrado', 'completo', 'deterministico', 'ajustado')
+
+# Habilidades dos cursos: as duas originais vêm primeiro; projetos podem declarar outras no mix
+HABILIDADES_PADRAO = ('PROG', 'ROBOTICA')
+# Prefixo dos IDs de instrutor e abreviação nos relatórios (as demais habilidades usam o próprio nome)
+PREFIXOS_HABILIDADE = {'ROBOTICA': 'ROB'}
 
 # Estruturas de dados para a lógica do otimizador
+# `turmas`: {habilidade: número de turmas}; `laboratorio`: site do projeto (None = sem laboratório)
 Projeto = namedtuple('Projeto', [
-    'nome', 'prog', 'rob', 'duracao',
-    'inicio_min', 'inicio_max', 'mes_fim_projeto'
-])
+    'nome', 'turmas', 'duracao',
+    'inicio_min', 'inicio_max', 'mes_fim_projeto', 'laboratorio'
+], defaults=(None,))
 
+# `laboratorio_id`: grupo de atendimento do instrutor (um laboratório ou laboratórios que o compartilham)
 Instrutor = namedtuple('Instrutor', [
     'id', 'habilidade', 'capacidade', 'laboratorio_id'
 ])
 
 Turma = namedtuple('Turma', [
-    'id', 'projeto', 'habilidade', 'mes_inicio', 'duracao'
+    'id', 'projeto', 'habilidade', 'mes_inicio', 'duracao', 'laboratorio'
+], defaults=(None,))
+
+# Restrição identificada como causa (ou parte da causa) de inviabilidade
+Conflito = namedtuple('Conflito', [
+    'restricao', 'projeto', 'mes', 'parametro', 'descricao'
+])
+
+# Linha rejeitada na importação de projetos por planilha (`linha` conta o cabeçalho como 1)
+ErroImportacao = namedtuple('ErroImportacao', [
+    'linha', 'projeto', 'mensagem'
+])
+
+# Resultado de uma regra de negócio na verificação do plano final
+RegraVerificada = namedtuple('RegraVerificada', [
+    'regra', 'violacoes', 'exemplos'
+])
+
+# Turma do plano final com o instrutor atribuído (API de planejamento)
+AtribuicaoPlano = namedtuple('AtribuicaoPlano', [
+    'turma', 'instrutor'
+])
+
+# Resultado de `otimizador.api.planejar`: KPIs, cronograma do Estágio 1, atribuições finais, arquivos
+# gerados (arquivo de execução e relatórios) e o dicionário completo da execução
+ResultadoPlano = namedtuple('ResultadoPlano', [
+    'total_instrutores', 'instrutores_por_habilidade', 'pico_max', 'picos', 'spread_carga',
+    'cronograma', 'atribuicoes', 'verificacao_ok', 'arquivos', 'tempo', 'execucao'
 ])
 
 
@@ -34,6 +78,11 @@ class ConfiguracaoProjeto:
     # <<< ALTERAÇÃO 1: Adicionado o percentual de programação por projeto >>>
     percentual_prog: float = 60.0
     turmas_min_por_mes: int = 1  # Mantido para compatibilidade com funções de IO
+    # Mix com qualquer número de habilidades ({'PROG': 50, 'ROBOTICA': 30, 'MAKER': 20});
+    # se vazio, o mix é PROG/ROBOTICA definido por percentual_prog
+    mix_habilidades: Optional[Dict[str, float]] = None
+    # Laboratório (site) onde as turmas do projeto acontecem; None = sem dimensão de laboratório
+    laboratorio: Optional[str] = None
 
     # Campos calculados
     mes_inicio_idx: int = field(default=None, init=False)
@@ -64,11 +113,60 @@ class ConfiguracaoProjeto:
         if not isinstance(self.percentual_prog, (int, float)) or not (0 <= self.percentual_prog <= 100):
             raise ValueError(f"Percentual de programação para '{self.nome}' deve estar entre 0 e 100.")
 
+        if self.laboratorio is not None and (not isinstance(self.laboratorio, str) or not self.laboratorio.strip()):
+            raise ValueError(f"Laboratório de '{self.nome}' deve ser um nome não vazio ou None.")
+
+        if self.mix_habilidades:
+            nomes = {prefixo: hab for hab, prefixo in PREFIXOS_HABILIDADE.items()}
+            self.mix_habilidades = {nomes.get(str(hab).strip().upper(), str(hab).strip().upper()): float(pct)
+                                    for hab, pct in self.mix_habilidades.items()}
+            if any(not hab or not (0 <= pct <= 100) for hab, pct in self.mix_habilidades.items()):
+                raise ValueError(f"Mix de habilidades de '{self.nome}' com nome vazio ou percentual fora de 0-100.")
+            if abs(sum(self.mix_habilidades.values()) - 100) > 0.01:
+                raise ValueError(f"Mix de habilidades de '{self.nome}' deve somar 100%. "
+                                 f"Recebido: {sum(self.mix_habilidades.values()):.1f}%")
+            self.percentual_prog = self.mix_habilidades.get('PROG', 0.0)
+
     # <<< ALTERAÇÃO 3: Propriedade para calcular o percentual de robótica >>>
     @property
     def percentual_rob(self) -> float:
         """Calcula percentual de Robótica automaticamente"""
-        return 100.0 - self.percentual_prog
+        return self.habilidades.get('ROBOTICA', 0.0)
+
+    @property
+    def habilidades(self) -> Dict[str, float]:
+        """Percentual de turmas de cada habilidade."""
+        if self.mix_habilidades: return dict(self.mix_habilidades)
+        return {'PROG': self.percentual_prog, 'ROBOTICA': 100.0 - self.percentual_prog}
+
+    @property
+    def descricao_mix(self) -> str:
+        """Mix para exibição, ex.: '60.0% PROG / 40.0% ROB'."""
+        return " / ".join(f"{pct:.1f}% {PREFIXOS_HABILIDADE.get(hab, hab)}" for hab, pct in self.habilidades.items())
+
+
+@dataclass
+class Laboratorio:
+    """
+    Laboratório (site) com salas próprias: `salas` é o máximo de turmas ativas ao mesmo tempo em
+    qualquer mês e `salas_por_mes` ({'Jan/26': 4}) sobrescreve meses específicos. None = sem limite.
+    """
+    nome: str
+    salas: Optional[int] = None
+    salas_por_mes: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Valida os dados após inicialização"""
+        if not self.nome or not isinstance(self.nome, str):
+            raise ValueError("Nome do laboratório deve ser uma string não vazia")
+        for mes, salas in [(None, self.salas)] + list(self.salas_por_mes.items()):
+            if salas is not None and (not isinstance(salas, int) or salas < 0):
+                raise ValueError(f"Salas do laboratório '{self.nome}'{f' em {mes}' if mes else ''} devem ser um "
+                                 f"inteiro >= 0. Recebido: {salas}")
+
+    def salas_no_mes(self, mes: str) -> Optional[int]:
+        """Limite de turmas ativas no mês (None = sem limite)."""
+        return self.salas_por_mes.get(mes, self.salas)
 
 
 @dataclass
@@ -81,6 +179,41 @@ class ParametrosOtimizacao:
     spread_maximo: int = 16
     meses_ferias: List[str] = field(default_factory=lambda: ['Jul/26', 'Dez/26'])
     timeout_segundos: int = 180
+    # Se o Estágio 2 falhar, busca automaticamente o menor spread viável
+    relaxar_spread: bool = False
+    # Estágio 1: resolve as ondas de um mesmo projeto (mesma duração e janela) como um único bloco, com o
+    # cronograma repartido entre as ondas em ordem cronológica (elas passam a dividir o mesmo pool de inícios)
+    quebrar_simetria_ondas: bool = False
+    # Estágio 1: pré-solve que resolve projetos com mesma duração e janela como um único bloco
+    agrupar_projetos_equivalentes: bool = False
+    # Estágio 2: 'monolitico' (modelo CP-SAT único) ou 'lns' (vizinhanças, para portfólios muito grandes)
+    estrategia_estagio2: str = 'monolitico'
+    # Depois dos dois estágios, reotimiza cronograma e atribuição num único modelo (parte da solução obtida)
+    modelo_integrado: bool = False
+    # Estágio 1 devolve até N cronogramas (o ótimo e alternativos com pico até o ótimo + folga), avaliados em
+    # paralelo no Estágio 2; fica o de melhor plano (1 = só o ótimo)
+    cronogramas_alternativos: int = 1
+    folga_pico_alternativos: int = 0
+    # Horizonte rolante: janelas de N meses resolvidas em sequência (0 = desativado) e sobreposição entre elas
+    horizonte_janela_meses: int = 0
+    horizonte_sobreposicao_meses: int = 6
+    # Depois do horizonte rolante, resolve o mesmo portfólio de forma monolítica e compara (dobra o tempo)
+    comparar_monolitico: bool = False
+    # Solver dos construtores de modelo dos Estágios 1 e 2: 'cpsat', 'scip' ou 'cbc'
+    backend_solver: str = 'cpsat'
+    # Formulação da demanda do Estágio 1: 'linear' (somas mensais) ou 'intervalos' (cumulativa, só no 'cpsat')
+    motor_estagio1: str = 'linear'
+    # Perfil do solver: threads, semente, determinismo e linearização ('rapido', 'equilibrado', 'completo',
+    # 'deterministico' ou 'ajustado'); teto de threads da execução (0 = todos os núcleos disponíveis), para
+    # execuções simultâneas dividirem a máquina; e log de busca do CP-SAT no console
+    perfil_solver: str = 'ajustado'
+    threads_solver: int = 0
+    log_solver: bool = False
+    # Laboratórios com limite de salas; projetos podem citar laboratórios que não estão aqui (sem limite)
+    laboratorios: List[Laboratorio] = field(default_factory=list)
+    # Grupos de laboratórios que compartilham instrutores (deslocamento permitido entre eles);
+    # laboratórios fora de qualquer grupo têm pool próprio
+    compartilhamento_laboratorios: List[List[str]] = field(default_factory=list)
 
     def __post_init__(self):
         """Valida os parâmetros após inicialização"""
@@ -88,6 +221,9 @@ class ParametrosOtimizacao:
 
     def _validar_parametros(self):
         """Valida todos os parâmetros."""
+        # Laboratórios vindos de JSON chegam como dicionários
+        self.laboratorios = [lab if isinstance(lab, Laboratorio) else Laboratorio(**lab) for lab in self.laboratorios]
+
         if not isinstance(self.capacidade_max_instrutor, int) or not (1 <= self.capacidade_max_instrutor <= 20):
             raise ValueError(f"Capacidade deve estar entre 1 e 20. Recebido: {self.capacidade_max_instrutor}")
 
@@ -95,4 +231,74 @@ class ParametrosOtimizacao:
             raise ValueError(f"Spread deve estar entre 0 e 50. Recebido: {self.spread_maximo}")
 
         if not isinstance(self.timeout_segundos, int) or not (10 <= self.timeout_segundos <= 3600):
-            raise ValueError(f"Timeout deve estar entre 10 e 3600 segundos. Recebido: {self.timeout_segundos}")
\ No newline at end of file
+            raise ValueError(f"Timeout deve estar entre 10 e 3600 segundos. Recebido: {self.timeout_segundos}")
+
+        for opcao in ('relaxar_spread', 'quebrar_simetria_ondas', 'agrupar_projetos_equivalentes', 'log_solver',
+                      'modelo_integrado', 'comparar_monolitico'):
+            if not isinstance(getattr(self, opcao), bool):
+                raise ValueError(f"{opcao} deve ser booleano. Recebido: {getattr(self, opcao)}")
+
+        if not isinstance(self.cronogramas_alternativos, int) or not (1 <= self.cronogramas_alternativos <= 20):
+            raise ValueError(f"Cronogramas alternativos devem estar entre 1 e 20. "
+                             f"Recebido: {self.cronogramas_alternativos}")
+
+        if not isinstance(self.folga_pico_alternativos, int) or not (0 <= self.folga_pico_alternativos <= 50):
+            raise ValueError(f"Folga de pico dos alternativos deve estar entre 0 e 50. "
+                             f"Recebido: {self.folga_pico_alternativos}")
+
+        if self.estrategia_estagio2 not in ESTRATEGIAS_ESTAGIO2:
+            raise ValueError(f"Estratégia do Estágio 2 deve ser uma de {ESTRATEGIAS_ESTAGIO2}. "
+                             f"Recebido: {self.estrategia_estagio2}")
+
+        if self.backend_solver not in BACKENDS_SOLVER:
+            raise ValueError(f"Backend de solver deve ser um de {BACKENDS_SOLVER}. Recebido: {self.backend_solver}")
+
+        if self.motor_estagio1 not in MOTORES_ESTAGIO1:
+            raise ValueError(f"Motor do Estágio 1 deve ser um de {MOTORES_ESTAGIO1}. Recebido: {self.motor_estagio1}")
+        if self.motor_estagio1 == 'intervalos' and self.backend_solver != 'cpsat':
+            raise ValueError("O motor 'intervalos' do Estágio 1 exige o backend 'cpsat'.")
+
+        if self.perfil_solver not in PERFIS_SOLVER:
+            raise ValueError(f"Perfil do solver deve ser um de {PERFIS_SOLVER}. Recebido: {self.perfil_solver}")
+
+        if not isinstance(self.threads_solver, int) or self.threads_solver < 0:
+            raise ValueError(f"Threads do solver devem ser um inteiro >= 0 (0 = todos os núcleos). "
+                             f"Recebido: {self.threads_solver}")
+
+        if not isinstance(self.horizonte_janela_meses, int) or not (
+                self.horizonte_janela_meses == 0 or 6 <= self.horizonte_janela_meses <= 120):
+            raise ValueError(f"Janela do horizonte rolante deve ser 0 (desativado) ou estar entre 6 e 120 meses. "
+                             f"Recebido: {self.horizonte_janela_meses}")
+
+        nomes_labs = [lab.nome for lab in self.laboratorios]
+        if len(set(nomes_labs)) != len(nomes_labs):
+            raise ValueError(f"Laboratórios com nome repetido: {nomes_labs}")
+
+        compartilhados = [lab for grupo in self.compartilhamento_laboratorios for lab in grupo]
+        if any(len(set(grupo)) < 2 for grupo in self.compartilhamento_laboratorios) or \
+                len(set(compartilhados)) != len(compartilhados):
+            raise ValueError("Cada grupo de compartilhamento deve ter ao menos 2 laboratórios distintos, "
+                             "e cada laboratório pode estar em um só grupo.")
+
+        if self.horizonte_janela_meses and (not isinstance(self.horizonte_sobreposicao_meses, int) or not (
+                0 <= self.horizonte_sobreposicao_meses < self.horizonte_janela_meses)):
+            raise ValueError(f"Sobreposição do horizonte rolante deve estar entre 0 e a janela - 1. "
+                             f"Recebido: {self.horizonte_sobreposicao_meses}")
+
+
+@dataclass
+class OpcoesPlano:
+    """
+    Opções da API de planejamento (`otimizador.api.planejar`). Relatórios e arquivo de execução são
+    gravados em `diretorio_saida` (padrão: diretório corrente, como na linha de comando).
+    """
+    gerar_relatorios: bool = False
+    arquivar: bool = False  # arquivo de execução .npz + registro no histórico
+    diretorio_saida: Optional[str] = None
+    arquivo_replanejamento: Optional[str] = None
+
+    def __post_init__(self):
+        """Valida os dados após inicialização"""
+        for opcao in ('gerar_relatorios', 'arquivar'):
+            if not isinstance(getattr(self, opcao), bool):
+                raise ValueError(f"{opcao} deve ser booleano. Recebido: {getattr(self, opcao)}")
@@ -0,0 +1,171 @@
+# ARQUIVO: otimizador/io/arquivo_execucao.py
+"""
+Arquivo compacto de uma execução, para regerar relatórios sem resolver de novo.
+
+Um único .npz (sem pickle): as turmas e atribuições ficam em colunas NumPy (uma entrada por turma)
+e as entradas, o cronograma, os indicadores e as estatísticas do solver ficam em um JSON de
+metadados guardado no próprio arquivo. `carregar_execucao` reconstrói o mesmo dicionário de
+execução usado pelo pipeline do main.py, lendo o arquivo inteiro de uma vez (ele tem poucos KB).
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Import relativo para acessar os modelos de dados
+from ..data_models import Projeto, Turma, Instrutor, RegraVerificada
+from . import config_manager
+
+logger = logging.getLogger(__name__)
+
+VERSAO_ARQUIVO = 1
+# Entradas dos estágios gravadas como colunas ou tratadas à parte (as demais vão para o JSON se couberem)
+CHAVES_ESTAGIO1_ESPECIAIS = ('parametros', 'picos_grupo')
+CHAVES_ESTAGIO2_ESPECIAIS = ('turmas', 'instrutores', 'atribuicoes', 'atribuicao', 'carga_mensal',
+                             'utilizacao_mensal', 'verificacao')
+
+
+def _converter_numpy(valor):
+    if isinstance(valor, np.generic): return valor.item()
+    if isinstance(valor, np.ndarray): return valor.tolist()
+    raise TypeError(f"{type(valor).__name__} não cabe em JSON")
+
+
+def _entradas_json(dados: Dict, excluir, origem: str) -> Dict:
+    """
+    Entradas de `dados` que cabem em JSON (NumPy convertido). As que não cabem não são gravadas e
+    ficam listadas em um aviso, com a origem (`origem`, p.ex. 'Estágio 1').
+    """
+    saida, descartadas = {}, []
+    for chave, valor in dados.items():
+        if chave in excluir: continue
+        try:
+            saida[chave] = json.loads(json.dumps(valor, default=_converter_numpy))
+        except (TypeError, ValueError) as e:
+            descartadas.append(f"{chave} ({e})")
+    if descartadas:
+        logger.warning(f"[AVISO] Entradas do {origem} não gravadas no arquivo de execução (não cabem em JSON): "
+                       f"{'; '.join(descartadas)}")
+    return saida
+
+
+def _coluna_texto(valores) -> np.ndarray:
+    """Coluna de texto; None vira '' (campos opcionais como o laboratório)."""
+    return np.array(['' if v is None else str(v) for v in valores], dtype=str)
+
+
+def _colunas_instrutores(prefixo: str, instrutores: List[Instrutor]) -> Dict[str, np.ndarray]:
+    return {
+        f"{prefixo}_id": _coluna_texto(i.id for i in instrutores),
+        f"{prefixo}_habilidade": _coluna_texto(i.habilidade for i in instrutores),
+        f"{prefixo}_capacidade": np.array([i.capacidade for i in instrutores], dtype=np.int32),
+        f"{prefixo}_laboratorio": _coluna_texto(i.laboratorio_id for i in instrutores),
+    }
+
+
+def _instrutores_das_colunas(arquivo, prefixo: str) -> List[Instrutor]:
+    return [Instrutor(str(id_), str(hab), int(cap), str(lab) or None) for id_, hab, cap, lab in zip(
+        arquivo[f"{prefixo}_id"], arquivo[f"{prefixo}_habilidade"], arquivo[f"{prefixo}_capacidade"],
+        arquivo[f"{prefixo}_laboratorio"])]
+
+
+def salvar_execucao(execucao: Dict, caminho: Path) -> Path:
+    """Grava a execução (dicionário montado em `main.executar_otimizacao`) em um .npz compactado."""
+    est1, est2 = execucao['resultados_estagio1'], execucao['resultados_estagio2']
+    turmas = est2['turmas']
+    metadados = {
+        "versao": VERSAO_ARQUIVO,
+        "data_execucao": datetime.now().isoformat(timespec='seconds'),
+        **config_manager.configuracao_para_dict(execucao['parametros'], execucao['projetos_config']),
+        "projetos_modelo": [p._asdict() for p in execucao['projetos_modelo']],
+        "meses": execucao['meses'],
+        "meses_ferias_idx": execucao['meses_ferias_idx'],
+        "dt_min": execucao['dt_min'].strftime("%d/%m/%Y"),
+        "contagem_instrutores_hab": execucao['contagem_instrutores_hab'],
+        "diferencas_replanejamento": execucao['diferencas_replanejamento'],
+        "estagio1": _entradas_json(est1, CHAVES_ESTAGIO1_ESPECIAIS, 'Estágio 1'),
+        # Chaves None (sem laboratório) não sobrevivem ao JSON: picos por grupo vão como pares
+        "picos_grupo": list(est1['picos_grupo'].items()) if est1.get('picos_grupo') else None,
+        "estagio2": _entradas_json(est2, CHAVES_ESTAGIO2_ESPECIAIS, 'Estágio 2'),
+        "verificacao": {**est2['verificacao'], "regras": [r._asdict() for r in est2['verificacao']['regras']]}
+        if est2.get('verificacao') else None,
+    }
+
+    colunas = {
+        "turma_id": _coluna_texto(t.id for t in turmas),
+        "turma_projeto": _coluna_texto(t.projeto for t in turmas),
+        "turma_habilidade": _coluna_texto(t.habilidade for t in turmas),
+        "turma_mes_inicio": np.array([t.mes_inicio for t in turmas], dtype=np.int32),
+        "turma_duracao": np.array([t.duracao for t in turmas], dtype=np.int32),
+        "turma_laboratorio": _coluna_texto(t.laboratorio for t in turmas),
+        # Instrutor final (renumerado, como nas planilhas) de cada turma, na ordem das turmas
+        **_colunas_instrutores("atribuido", [atr['instrutor'] for atr in est2['atribuicoes']]),
+    }
+    if 'atribuicao' in est2 and 'instrutores' in est2:
+        colunas["atribuicao"] = np.asarray(est2['atribuicao'], dtype=np.int32)
+        colunas.update(_colunas_instrutores("pool", est2['instrutores']))
+    for chave in ('carga_mensal', 'utilizacao_mensal'):
+        if est2.get(chave) is not None: colunas[chave] = np.asarray(est2[chave])
+
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(caminho, metadados=np.array(json.dumps(metadados, ensure_ascii=False)), **colunas)
+    logger.info(f"Execução arquivada: '{caminho}' ({caminho.stat().st_size / 1024:.0f} KB)")
+    return caminho
+
+
+def carregar_execucao(caminho: Path) -> Dict:
+    """Reconstrói o dicionário de execução gravado por `salvar_execucao` (levanta ValueError se inválido)."""
+    caminho = Path(caminho)
+    if not caminho.exists():
+        raise ValueError(f"Arquivo de execução não encontrado: {caminho}")
+    arquivo = np.load(caminho, allow_pickle=False)
+    metadados = json.loads(str(arquivo["metadados"]))
+    if metadados.get("versao") != VERSAO_ARQUIVO:
+        raise ValueError(f"Versão de arquivo de execução não suportada: {metadados.get('versao')}")
+
+    turmas = [Turma(str(id_), str(proj), str(hab), int(inicio), int(duracao), str(lab) or None)
+              for id_, proj, hab, inicio, duracao, lab in zip(
+                  arquivo["turma_id"], arquivo["turma_projeto"], arquivo["turma_habilidade"],
+                  arquivo["turma_mes_inicio"], arquivo["turma_duracao"], arquivo["turma_laboratorio"])]
+    # Instrutores repetidos viram o mesmo objeto, como na execução original
+    unicos = {}
+    atribuidos = [unicos.setdefault(inst, inst) for inst in _instrutores_das_colunas(arquivo, "atribuido")]
+
+    parametros, projetos_config = config_manager.configuracao_de_dict(metadados)
+    est1 = {**metadados['estagio1'], "parametros": parametros}
+    if metadados['picos_grupo']: est1['picos_grupo'] = dict(metadados['picos_grupo'])
+    est2 = {**metadados['estagio2'], "turmas": turmas,
+            "atribuicoes": [{'turma': t, 'instrutor': i} for t, i in zip(turmas, atribuidos)]}
+    if "atribuicao" in arquivo.files:
+        est2['atribuicao'] = arquivo["atribuicao"]
+        est2['instrutores'] = _instrutores_das_colunas(arquivo, "pool")
+    for chave in ('carga_mensal', 'utilizacao_mensal'):
+        if chave in arquivo.files: est2[chave] = arquivo[chave]
+    if metadados['verificacao']:
+        est2['verificacao'] = {**metadados['verificacao'],
+                               "regras": [RegraVerificada(**r) for r in metadados['verificacao']['regras']]}
+
+    return {
+        "parametros": parametros,
+        "projetos_config": projetos_config,
+        "projetos_modelo": [Projeto(**p) for p in metadados['projetos_modelo']],
+        "meses": metadados['meses'],
+        "meses_ferias_idx": metadados['meses_ferias_idx'],
+        "dt_min": datetime.strptime(metadados['dt_min'], "%d/%m/%Y"),
+        "resultados_estagio1": est1,
+        "resultados_estagio2": est2,
+        "contagem_instrutores_hab": metadados['contagem_instrutores_hab'],
+        "diferencas_replanejamento": metadados['diferencas_replanejamento'],
+        "data_execucao": metadados['data_execucao'],
+    }
+
+
+def execucao_mais_recente(diretorio: Path) -> Optional[Path]:
+    """Arquivo de execução mais recente do diretório, ou None."""
+    arquivos = sorted(Path(diretorio).glob("execucao_*.npz"))
+    return arquivos[-1] if arquivos else None
@@ -1,6 +1,9 @@
 # ARQUIVO: otimizador/io/config_manager.py
 
+import hashlib
 import json
+import os
+from dataclasses import asdict, fields
 from pathlib import Path
 from datetime import datetime
 from typing import List, Tuple, Optional, Dict
@@ -8,7 +11,15 @@ from typing import List, Tuple, Optional, Dict
 # Import relativo para acessar os modelos de dados
 from ..data_models import ParametrosOtimizacao, ConfiguracaoProjeto
 
-CONFIGS_DIR = Path("configuracoes_otimizacao")
+# Na raiz do projeto (ao lado de main.py), qualquer que seja o diretório corrente: o servidor de jobs e
+# a API rodam em outros diretórios e devem ver as mesmas configurações salvas
+CONFIGS_DIR = Path(__file__).resolve().parents[2] / "configuracoes_otimizacao"
+# Índice de metadados das configurações, por arquivo + mtime (sem extensão .json para não ser listado)
+ARQUIVO_INDICE = CONFIGS_DIR / ".indice_configuracoes"
+VERSAO_INDICE = 2
+# Opções só da execução (sobrescritas pela linha de comando): não mudam a configuração identificada pela chave
+CAMPOS_EXECUCAO = ('perfil_solver', 'threads_solver', 'modelo_integrado', 'cronogramas_alternativos',
+                   'comparar_monolitico', 'motor_estagio1')
 
 
 def inicializar_diretorio_configs():
@@ -16,6 +27,29 @@ def inicializar_diretorio_configs():
     CONFIGS_DIR.mkdir(exist_ok=True)
 
 
+def configuracao_para_dict(parametros: ParametrosOtimizacao, projetos: List[ConfiguracaoProjeto]) -> Dict:
+    """Parâmetros e projetos no formato do JSON de configuração (sem os metadados nem os campos calculados)."""
+    return {"parametros": asdict(parametros),
+            "projetos": [{campo.name: getattr(p, campo.name) for campo in fields(p) if campo.init} for p in projetos]}
+
+
+def chave_configuracao(parametros: ParametrosOtimizacao, projetos: List[ConfiguracaoProjeto],
+                       incluir_execucao: bool = False) -> str:
+    """
+    Hash SHA-256 da configuração validada: identifica a mesma configuração independentemente do
+    nome do arquivo, da ordem das chaves ou de campos omitidos com o valor padrão. As opções de
+    CAMPOS_EXECUCAO só entram com `incluir_execucao`, para que a execução com `--perfil`, `--threads`,
+    `--integrado`, `--alternativos`, `--comparar-monolitico` ou `--motor` continue associada à configuração
+    salva (os dois motores do Estágio 1 resolvem o mesmo modelo).
+    """
+    dados = configuracao_para_dict(parametros, projetos)
+    if not incluir_execucao:
+        dados['parametros'] = {campo: valor for campo, valor in dados['parametros'].items()
+                               if campo not in CAMPOS_EXECUCAO}
+    canonica = json.dumps(dados, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonica.encode('utf-8')).hexdigest()
+
+
 def salvar_configuracao(parametros: ParametrosOtimizacao,
                         projetos: List[ConfiguracaoProjeto],
                         nome_config: str = None) -> bool:
@@ -30,8 +64,7 @@ def salvar_configuracao(parametros: ParametrosOtimizacao,
 
         config_data = {
             "metadata": {"nome": nome_config, "data_criacao": datetime.now().isoformat(), "versao": "2.0"},
-            "parametros": parametros.__dict__,
-            "projetos": [p.__dict__ for p in projetos]
+            **configuracao_para_dict(parametros, projetos)
         }
         arquivo = CONFIGS_DIR / f"{nome_config}.json"
         with open(arquivo, 'w', encoding='utf-8') as f:
@@ -43,28 +76,116 @@ def salvar_configuracao(parametros: ParametrosOtimizacao,
         return False
 
 
-def listar_configuracoes_salvas() -> List[Path]:
-    """Lista todas as configurações salvas."""
-    inicializar_diretorio_configs()
-    return sorted(CONFIGS_DIR.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True)
-
-
-def exibir_preview_configuracao(arquivo: Path) -> Optional[Dict]:
-    """Exibe preview de uma configuração."""
+def _metadados_configuracao(arquivo: Path) -> Dict:
+    """Resumo de uma configuração para o índice (a única leitura completa do arquivo)."""
     try:
         with open(arquivo, 'r', encoding='utf-8') as f:
             config_data = json.load(f)
         metadata = config_data.get("metadata", {})
         parametros = config_data.get("parametros", {})
-        print(f"\n   Nome: {metadata.get('nome', 'N/A')}")
-        print(f"   Criado em: {metadata.get('data_criacao', 'N/A')[:19]}")
-        print(f"   Projetos: {len(config_data.get('projetos', []))}")
-        print(
-            f"   Capacidade: {parametros.get('capacidade_max_instrutor', 'N/A')} | Spread: {parametros.get('spread_maximo', 'N/A')}")
-        return config_data
+        projetos = config_data.get("projetos", [])
+        try:
+            chave = chave_configuracao(*configuracao_de_dict(config_data))
+        except (TypeError, ValueError):
+            chave = None  # configuração inválida: listada, mas sem histórico de execuções associado
+        return {
+            "nome": str(metadata.get('nome', arquivo.stem)),
+            "data_criacao": str(metadata.get('data_criacao', 'N/A'))[:19],
+            "num_projetos": len(projetos),
+            "capacidade": parametros.get('capacidade_max_instrutor', 'N/A'),
+            "spread": parametros.get('spread_maximo', 'N/A'),
+            "projetos": [str(p.get('nome', '')) for p in projetos],
+            "laboratorios": sorted({str(p['laboratorio']) for p in projetos if p.get('laboratorio')}),
+            "chave": chave,
+        }
     except Exception as e:
-        print(f"   [ERRO] Não foi possível ler: {e}")
+        return {"nome": arquivo.stem, "erro": str(e)}
+
+
+def _carregar_indice() -> Dict[str, Dict]:
+    """Entradas do índice em disco ({} se ausente, corrompido ou de outra versão)."""
+    try:
+        with open(ARQUIVO_INDICE, 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+        entradas = indice.get("entradas") if indice.get("versao") == VERSAO_INDICE else None
+        if isinstance(entradas, dict) and all(isinstance(e, dict) for e in entradas.values()):
+            return entradas
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def atualizar_indice() -> Dict[str, Dict]:
+    """
+    Sincroniza o índice de metadados com o diretório e devolve {nome do arquivo: entrada}.
+    Só arquivos novos ou com mtime/tamanho diferentes do índice são lidos; entradas de arquivos
+    removidos à mão saem do índice.
+    """
+    inicializar_diretorio_configs()
+    entradas = _carregar_indice()
+    atualizadas, alterado = {}, False
+    with os.scandir(CONFIGS_DIR) as itens:
+        for item in itens:
+            if not item.name.endswith('.json') or not item.is_file(): continue
+            info = item.stat()
+            entrada = entradas.get(item.name)
+            if entrada is None or entrada.get('mtime_ns') != info.st_mtime_ns or entrada.get('tamanho') != info.st_size:
+                entrada = {"mtime_ns": info.st_mtime_ns, "tamanho": info.st_size,
+                           **_metadados_configuracao(Path(item.path))}
+                alterado = True
+            atualizadas[item.name] = entrada
+
+    if alterado or len(atualizadas) != len(entradas):
+        try:
+            temporario = ARQUIVO_INDICE.with_suffix('.tmp')
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({"versao": VERSAO_INDICE, "entradas": atualizadas}, f, ensure_ascii=False)
+            os.replace(temporario, ARQUIVO_INDICE)
+        except OSError as e:
+            print(f"[AVISO] Não foi possível atualizar o índice de configurações: {e}")
+    return atualizadas
+
+
+def listar_configuracoes_salvas(filtro: str = '', indice: Optional[Dict[str, Dict]] = None) -> List[Path]:
+    """
+    Lista as configurações salvas, mais recentes primeiro. `filtro` mantém só as que contêm todos os
+    termos (no nome, no arquivo, nos projetos ou nos laboratórios), sem diferenciar maiúsculas.
+    """
+    indice = atualizar_indice() if indice is None else indice
+    termos = filtro.lower().split()
+
+    def corresponde(nome_arquivo: str, entrada: Dict) -> bool:
+        texto = " ".join([nome_arquivo, entrada.get('nome', ''), *entrada.get('projetos', []),
+                          *entrada.get('laboratorios', [])]).lower()
+        return all(termo in texto for termo in termos)
+
+    nomes = sorted((nome for nome, entrada in indice.items() if corresponde(nome, entrada)),
+                   key=lambda nome: indice[nome]['mtime_ns'], reverse=True)
+    return [CONFIGS_DIR / nome for nome in nomes]
+
+
+def exibir_preview_configuracao(arquivo: Path, entrada: Optional[Dict] = None) -> Optional[Dict]:
+    """Exibe preview de uma configuração a partir do índice de metadados."""
+    entrada = entrada or atualizar_indice().get(arquivo.name)
+    if entrada is None or 'erro' in entrada:
+        print(f"   [ERRO] Não foi possível ler: {entrada['erro'] if entrada else 'arquivo não encontrado'}")
         return None
+    print(f"\n   Nome: {entrada['nome']}")
+    print(f"   Criado em: {entrada['data_criacao']}")
+    print(f"   Projetos: {entrada['num_projetos']}")
+    print(f"   Capacidade: {entrada['capacidade']} | Spread: {entrada['spread']}")
+    if entrada['laboratorios']:
+        print(f"   Laboratórios: {', '.join(entrada['laboratorios'])}")
+    return entrada
+
+
+def configuracao_de_dict(config_data: Dict) -> Tuple[ParametrosOtimizacao, List[ConfiguracaoProjeto]]:
+    """Parâmetros e projetos a partir do conteúdo de um JSON de configuração (TypeError/ValueError se inválido)."""
+    parametros = ParametrosOtimizacao(**config_data.get("parametros", {}))
+    projetos = [ConfiguracaoProjeto(**p) for p in config_data.get("projetos", [])]
+    if not projetos:
+        raise ValueError("Configuração sem projetos.")
+    return parametros, projetos
 
 
 def carregar_configuracao(arquivo: Optional[Path] = None) -> Tuple[
@@ -72,32 +193,41 @@ def carregar_configuracao(arquivo: Optional[Path] = None) -> Tuple[
     """Carrega configuração de arquivo JSON."""
     try:
         if arquivo is None:
-            configs = listar_configuracoes_salvas()
-            if not configs:
+            indice = atualizar_indice()
+            if not indice:
                 print("\n[!] Nenhuma configuração salva encontrada.")
                 return None, None
 
-            print("\n" + "=" * 80 + "\nCONFIGURAÇÕES SALVAS\n" + "=" * 80)
-            for idx, config_path in enumerate(configs, 1):
-                print(f"\n{idx}. {config_path.stem}")
-                exibir_preview_configuracao(config_path)
-
-            while True:
-                escolha = input(f"\nEscolha uma configuração [1-{len(configs)}] ou 'C' para cancelar: ").strip()
-                if escolha.upper() == 'C': return None, None
-                try:
-                    idx = int(escolha) - 1
-                    if 0 <= idx < len(configs):
-                        arquivo = configs[idx]
+            filtro = ''
+            while arquivo is None:
+                configs = listar_configuracoes_salvas(filtro, indice)
+                print("\n" + "=" * 80 + "\nCONFIGURAÇÕES SALVAS" + (f" (busca: '{filtro}')" if filtro else "")
+                      + "\n" + "=" * 80)
+                for idx, config_path in enumerate(configs, 1):
+                    print(f"\n{idx}. {config_path.stem}")
+                    exibir_preview_configuracao(config_path, indice[config_path.name])
+                if not configs:
+                    print("\n[!] Nenhuma configuração corresponde à busca.")
+
+                while True:
+                    escolha = input(f"\nEscolha uma configuração [1-{len(configs)}], 'B' para buscar "
+                                    f"ou 'C' para cancelar: ").strip()
+                    if escolha.upper() == 'C': return None, None
+                    if escolha.upper() == 'B':
+                        filtro = input("Buscar por nome, projeto ou laboratório (vazio = todas): ").strip()
                         break
-                except ValueError:
-                    print("[!] Digite um número válido.")
+                    try:
+                        idx = int(escolha) - 1
+                        if 0 <= idx < len(configs):
+                            arquivo = configs[idx]
+                            break
+                    except ValueError:
+                        print("[!] Digite um número válido.")
 
         with open(arquivo, 'r', encoding='utf-8') as f:
             config_data = json.load(f)
 
-        parametros = ParametrosOtimizacao(**config_data.get("parametros", {}))
-        projetos = [ConfiguracaoProjeto(**p) for p in config_data.get("projetos", [])]
+        parametros, projetos = configuracao_de_dict(config_data)
 
         print(f"\n[✓] Configuração carregada com sucesso: {arquivo.stem}")
         return parametros, projetos
@@ -0,0 +1,229 @@
+# ARQUIVO: otimizador/io/historico_execucoes.py
+"""
+Histórico de execuções em SQLite, para acompanhar instrutores, picos e spread ao longo das rodadas
+de planejamento sem reabrir PDFs nem resolver de novo.
+
+Cada execução vira uma linha em `execucoes` (KPIs gerais) com as tabelas filhas `parametros_execucao`,
+`projetos_execucao`, `kpis_habilidade` e `estatisticas_solver`. A configuração é identificada pela
+chave (hash) de `config_manager.chave_configuracao`, e o nome da configuração salva é resolvido pelo
+índice de configurações, então execuções da mesma configuração são agrupadas mesmo sem nome.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from . import config_manager
+
+logger = logging.getLogger(__name__)
+
+# Variável de ambiente com o caminho do banco (o servidor de jobs aponta todos os jobs para um só)
+VARIAVEL_HISTORICO = 'OTIMIZADOR_HISTORICO'
+ARQUIVO_HISTORICO = Path("resultados_otimizacao") / "historico_execucoes.sqlite"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    chave_configuracao TEXT NOT NULL,
+    nome_configuracao TEXT NOT NULL DEFAULT '',
+    modo TEXT NOT NULL,
+    periodo TEXT,
+    meses_total INTEGER,
+    num_projetos INTEGER,
+    num_turmas INTEGER,
+    total_instrutores INTEGER,
+    pico_max INTEGER,
+    spread_carga INTEGER,
+    verificacao_ok INTEGER,
+    arquivo_execucao TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_execucoes_data ON execucoes (data);
+CREATE INDEX IF NOT EXISTS idx_execucoes_chave_data ON execucoes (chave_configuracao, data);
+CREATE INDEX IF NOT EXISTS idx_execucoes_nome_data ON execucoes (nome_configuracao, data);
+
+CREATE TABLE IF NOT EXISTS parametros_execucao (
+    execucao_id INTEGER NOT NULL REFERENCES execucoes (id) ON DELETE CASCADE,
+    nome TEXT NOT NULL,
+    valor TEXT,
+    PRIMARY KEY (execucao_id, nome)
+);
+CREATE INDEX IF NOT EXISTS idx_parametros_nome_valor ON parametros_execucao (nome, valor);
+
+CREATE TABLE IF NOT EXISTS projetos_execucao (
+    execucao_id INTEGER NOT NULL REFERENCES execucoes (id) ON DELETE CASCADE,
+    nome TEXT NOT NULL,
+    data_inicio TEXT,
+    data_termino TEXT,
+    num_turmas INTEGER,
+    duracao_curso INTEGER,
+    ondas INTEGER,
+    laboratorio TEXT,
+    mix_habilidades TEXT,
+    PRIMARY KEY (execucao_id, nome)
+);
+CREATE INDEX IF NOT EXISTS idx_projetos_nome ON projetos_execucao (nome);
+
+CREATE TABLE IF NOT EXISTS kpis_habilidade (
+    execucao_id INTEGER NOT NULL REFERENCES execucoes (id) ON DELETE CASCADE,
+    habilidade TEXT NOT NULL,
+    instrutores INTEGER,
+    pico_demanda INTEGER,
+    turmas INTEGER,
+    PRIMARY KEY (execucao_id, habilidade)
+);
+CREATE INDEX IF NOT EXISTS idx_kpis_habilidade ON kpis_habilidade (habilidade);
+
+CREATE TABLE IF NOT EXISTS estatisticas_solver (
+    execucao_id INTEGER NOT NULL REFERENCES execucoes (id) ON DELETE CASCADE,
+    estagio INTEGER NOT NULL,
+    status_solver TEXT,
+    tempo_solver REAL,
+    detalhes TEXT,
+    PRIMARY KEY (execucao_id, estagio)
+);
+CREATE INDEX IF NOT EXISTS idx_estatisticas_status ON estatisticas_solver (estagio, status_solver);
+"""
+
+
+def caminho_historico(diretorio: Path = Path('.')) -> Path:
+    """
+    Banco do histórico: o da variável de ambiente, se definida, ou o padrão em resultados_otimizacao,
+    abaixo de `diretorio`.
+    """
+    return Path(os.environ.get(VARIAVEL_HISTORICO) or Path(diretorio) / ARQUIVO_HISTORICO)
+
+
+def _conectar(caminho: Optional[Path] = None) -> sqlite3.Connection:
+    caminho = Path(caminho or caminho_historico())
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    # Jobs simultâneos do servidor gravam no mesmo banco: espera o lock em vez de falhar
+    conexao = sqlite3.connect(caminho, timeout=30)
+    conexao.execute("PRAGMA foreign_keys = ON")
+    conexao.executescript(ESQUEMA)
+    return conexao
+
+
+def _escalares(dados: Dict, excluir=()) -> Dict:
+    """Entradas escalares de um resultado de estágio (as listas e matrizes ficam no arquivo de execução)."""
+    return {chave: valor for chave, valor in dados.items()
+            if chave not in excluir and isinstance(valor, (bool, int, float, str))}
+
+
+def _nome_configuracao(chave: str) -> str:
+    """Nome da configuração salva com a mesma chave ('' se não houver)."""
+    nomes = sorted(entrada['nome'] for entrada in config_manager.atualizar_indice().values()
+                   if entrada.get('chave') == chave)
+    return nomes[0] if nomes else ''
+
+
+def registrar_execucao(execucao: Dict, arquivo_execucao: Optional[Path] = None,
+                       caminho: Optional[Path] = None) -> int:
+    """Grava a execução (dicionário montado em `main.executar_otimizacao`) no histórico. Retorna o id."""
+    parametros, projetos_config = execucao['parametros'], execucao['projetos_config']
+    est1, est2 = execucao['resultados_estagio1'], execucao['resultados_estagio2']
+    chave = config_manager.chave_configuracao(parametros, projetos_config)
+    turmas_por_hab = Counter(t.habilidade for t in est2['turmas'])
+    picos = est1.get('picos') or {}
+
+    with _conectar(caminho) as conexao:
+        cursor = conexao.execute(
+            "INSERT INTO execucoes (data, chave_configuracao, nome_configuracao, modo, periodo, meses_total, "
+            "num_projetos, num_turmas, total_instrutores, pico_max, spread_carga, verificacao_ok, arquivo_execucao) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (execucao.get('data_execucao') or datetime.now().isoformat(timespec='seconds'), chave,
+             _nome_configuracao(chave),
+             'otimizacao' if execucao['diferencas_replanejamento'] is None else 'replanejamento',
+             est1.get('periodo'), len(execucao['meses']), len(projetos_config), len(est2['turmas']),
+             est2.get('total_instrutores_flex'), est1.get('pico_max'), est2.get('spread_carga'),
+             int(est2['verificacao']['ok']) if est2.get('verificacao') else None,
+             str(arquivo_execucao) if arquivo_execucao else None))
+        execucao_id = cursor.lastrowid
+
+        conexao.executemany(
+            "INSERT INTO parametros_execucao (execucao_id, nome, valor) VALUES (?, ?, ?)",
+            [(execucao_id, nome, json.dumps(valor, ensure_ascii=False))
+             for nome, valor in config_manager.configuracao_para_dict(parametros, [])['parametros'].items()])
+        conexao.executemany(
+            "INSERT INTO projetos_execucao VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(execucao_id, p.nome, p.data_inicio, p.data_termino, p.num_turmas, p.duracao_curso, p.ondas,
+              p.laboratorio, json.dumps(p.habilidades)) for p in projetos_config])
+        habilidades = sorted(set(execucao['contagem_instrutores_hab']) | set(picos) | set(turmas_por_hab))
+        conexao.executemany(
+            "INSERT INTO kpis_habilidade VALUES (?, ?, ?, ?, ?)",
+            [(execucao_id, hab, execucao['contagem_instrutores_hab'].get(hab, 0), picos.get(hab),
+              turmas_por_hab.get(hab, 0)) for hab in habilidades])
+        conexao.executemany(
+            "INSERT INTO estatisticas_solver VALUES (?, ?, ?, ?, ?)",
+            [(execucao_id, estagio, dados.get('status_solver'), dados.get('tempo_solver'),
+              json.dumps(_escalares(dados, ('status_solver', 'tempo_solver')), ensure_ascii=False))
+             for estagio, dados in ((1, est1), (2, est2))])
+    conexao.close()
+    return execucao_id
+
+
+def consultar_historico(config: str = '', dias: Optional[int] = None, caminho: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Execuções do histórico, mais recentes primeiro, com uma coluna de instrutores por habilidade.
+    `config` filtra pelo nome da configuração (inclusive configurações salvas com a mesma chave) ou
+    por um prefixo da chave; `dias` mantém só as execuções dos últimos N dias.
+    """
+    filtros, valores = [], []
+    if config:
+        chaves = [entrada['chave'] for arquivo, entrada in config_manager.atualizar_indice().items()
+                  if entrada.get('chave') and config.lower() in f"{arquivo} {entrada.get('nome', '')}".lower()]
+        em_chaves = f" OR e.chave_configuracao IN ({', '.join('?' * len(chaves))})" if chaves else ""
+        filtros.append(f"(e.nome_configuracao LIKE ? OR e.chave_configuracao LIKE ?{em_chaves})")
+        valores += [f"%{config}%", f"{config.lower()}%", *chaves]
+    if dias is not None:
+        filtros.append("e.data >= ?")
+        valores.append((datetime.now() - timedelta(days=dias)).isoformat(timespec='seconds'))
+    where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+
+    conexao = _conectar(caminho)
+    try:
+        df = pd.read_sql_query(
+            f"SELECT e.id, e.data, e.nome_configuracao AS configuracao, substr(e.chave_configuracao, 1, 12) AS chave, "
+            f"e.modo, e.num_projetos, e.num_turmas, e.total_instrutores, e.pico_max, e.spread_carga, "
+            f"s1.tempo_solver AS tempo_estagio1, s2.tempo_solver AS tempo_estagio2, e.verificacao_ok "
+            f"FROM execucoes e "
+            f"LEFT JOIN estatisticas_solver s1 ON s1.execucao_id = e.id AND s1.estagio = 1 "
+            f"LEFT JOIN estatisticas_solver s2 ON s2.execucao_id = e.id AND s2.estagio = 2 "
+            f"{where} ORDER BY e.data DESC, e.id DESC", conexao, params=valores)
+        if df.empty:
+            return df
+        kpis = pd.read_sql_query(
+            f"SELECT k.execucao_id AS id, k.habilidade, k.instrutores FROM kpis_habilidade k "
+            f"JOIN execucoes e ON e.id = k.execucao_id {where}", conexao, params=valores)
+    finally:
+        conexao.close()
+    por_habilidade = kpis.pivot(index='id', columns='habilidade', values='instrutores').add_prefix('instrutores_')
+    return df.merge(por_habilidade, left_on='id', right_index=True, how='left')
+
+
+def exibir_historico(df: pd.DataFrame):
+    """Tabela do histórico no console."""
+    if df.empty:
+        logger.info("\n[INFO] Nenhuma execução no histórico para este filtro.")
+        return
+    logger.info(f"\n[INFO] {len(df)} execuções encontradas")
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        logger.info(df.to_string(index=False))
+
+
+def exportar_historico(df: pd.DataFrame, caminho) -> Path:
+    """Exporta o histórico para CSV ou XLSX (pela extensão)."""
+    caminho = Path(caminho)
+    if caminho.suffix.lower() == '.xlsx':
+        df.to_excel(caminho, index=False, engine='openpyxl')
+    else:
+        df.to_csv(caminho, index=False, encoding='utf-8-sig')
+    logger.info(f"[✓] Histórico exportado: '{caminho}' ({len(df)} execuções)")
+    return caminho
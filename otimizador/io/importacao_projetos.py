@@ -0,0 +1,189 @@
+# ARQUIVO: otimizador/io/importacao_projetos.py
+"""
+Importação de projetos em lote a partir de CSV ou XLSX.
+
+A primeira linha é o cabeçalho, com os campos de `ConfiguracaoProjeto` (nome, data_inicio,
+data_termino, num_turmas, duracao_curso e, opcionalmente, ondas, percentual_prog, mix_habilidades,
+laboratorio) ou apelidos comuns ('Projeto', 'Início', 'Turmas', 'Duração', 'Mix', 'Site'...).
+As linhas são lidas uma a uma e todas são validadas: cada linha inválida é reportada com o número
+da linha em vez de interromper a importação no primeiro erro.
+"""
+
+import csv
+import logging
+import re
+import time
+import unicodedata
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from openpyxl import load_workbook
+
+# Import relativo para acessar os modelos de dados e a gravação de configurações
+from ..data_models import ConfiguracaoProjeto, ParametrosOtimizacao, ErroImportacao
+from . import config_manager
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho normalizado (minúsculas, sem acentos, '_' no lugar de espaços) -> campo de ConfiguracaoProjeto
+APELIDOS_COLUNAS = {
+    'nome': 'nome', 'projeto': 'nome',
+    'data_inicio': 'data_inicio', 'inicio': 'data_inicio',
+    'data_termino': 'data_termino', 'termino': 'data_termino', 'data_fim': 'data_termino', 'fim': 'data_termino',
+    'num_turmas': 'num_turmas', 'turmas': 'num_turmas',
+    'duracao_curso': 'duracao_curso', 'duracao': 'duracao_curso',
+    'ondas': 'ondas',
+    'percentual_prog': 'percentual_prog', 'prog': 'percentual_prog', 'prog_%': 'percentual_prog',
+    'mix_habilidades': 'mix_habilidades', 'mix': 'mix_habilidades',
+    'laboratorio': 'laboratorio', 'lab': 'laboratorio', 'site': 'laboratorio',
+}
+COLUNAS_OBRIGATORIAS = ('nome', 'data_inicio', 'data_termino', 'num_turmas', 'duracao_curso')
+CAMPOS_INTEIROS = ('num_turmas', 'duracao_curso', 'ondas')
+EXTENSOES_SUPORTADAS = ('.csv', '.xlsx')
+
+
+def _normalizar_cabecalho(texto) -> str:
+    sem_acento = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[\s\-]+', '_', sem_acento.strip().lower())
+
+
+def _linhas_planilha(caminho: Path) -> Iterator[Tuple[int, List]]:
+    """Gera (número da linha, valores) do arquivo, sem carregá-lo inteiro na memória."""
+    if caminho.suffix.lower() == '.csv':
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+            amostra = f.read(4096)
+            f.seek(0)
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+            except csv.Error:
+                dialeto = csv.excel
+            leitor = csv.reader(f, dialeto)
+            for valores in leitor:
+                yield leitor.line_num, valores
+    else:
+        livro = load_workbook(caminho, read_only=True, data_only=True)
+        try:
+            for linha, valores in enumerate(livro.active.iter_rows(values_only=True), 1):
+                yield linha, list(valores)
+        finally:
+            livro.close()
+
+
+def _texto(valor) -> str:
+    if isinstance(valor, (datetime, date)): return valor.strftime("%d/%m/%Y")
+    if isinstance(valor, float) and valor.is_integer(): return str(int(valor))
+    return str(valor).strip() if valor is not None else ''
+
+
+def _converter_mix(texto: str) -> Optional[Dict[str, float]]:
+    """'PROG=50;ROBOTICA=30;MAKER=20' (ou separado por vírgulas) -> {'PROG': 50.0, ...}."""
+    if not texto: return None
+    mix = {}
+    for item in (texto.split(';') if ';' in texto else texto.split(',')):
+        if not item.strip(): continue
+        hab, separador, pct = item.partition('=')
+        if not separador:
+            raise ValueError(f"mix '{texto}' fora do formato HABILIDADE=percentual")
+        mix[hab.strip().upper()] = float(pct.strip().replace(',', '.'))
+    return mix
+
+
+def _converter_linha(registro: Dict[str, str]) -> ConfiguracaoProjeto:
+    """Converte os textos de uma linha nos tipos de ConfiguracaoProjeto (que faz a validação de negócio)."""
+    argumentos = {}
+    for campo, texto in registro.items():
+        if not texto: continue
+        if campo in CAMPOS_INTEIROS:
+            try:
+                valor = float(texto.replace(',', '.'))
+            except ValueError:
+                raise ValueError(f"{campo} deve ser um número inteiro. Recebido: '{texto}'")
+            if not valor.is_integer() or valor < 1:
+                raise ValueError(f"{campo} deve ser um inteiro >= 1. Recebido: '{texto}'")
+            argumentos[campo] = int(valor)
+        elif campo == 'percentual_prog':
+            try:
+                argumentos[campo] = float(texto.replace('%', '').replace(',', '.'))
+            except ValueError:
+                raise ValueError(f"percentual_prog deve ser numérico. Recebido: '{texto}'")
+        elif campo == 'mix_habilidades':
+            argumentos[campo] = _converter_mix(texto)
+        else:
+            argumentos[campo] = texto
+    faltantes = [campo for campo in COLUNAS_OBRIGATORIAS if campo not in argumentos]
+    if faltantes:
+        raise ValueError(f"campos obrigatórios vazios: {', '.join(faltantes)}")
+    return ConfiguracaoProjeto(**argumentos)
+
+
+def importar_projetos(caminho) -> Dict:
+    """
+    Lê e valida todos os projetos do CSV/XLSX. Retorna {'projetos', 'erros', 'linhas', 'tempo'}:
+    'projetos' traz só as linhas válidas e 'erros' uma ErroImportacao por linha rejeitada
+    (inclusive nomes de projeto repetidos). Erros de arquivo ou de cabeçalho levantam ValueError.
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        raise ValueError(f"Arquivo não encontrado: {caminho}")
+    if caminho.suffix.lower() not in EXTENSOES_SUPORTADAS:
+        raise ValueError(f"Formato não suportado: {caminho.suffix}. Use {' ou '.join(EXTENSOES_SUPORTADAS)}.")
+
+    inicio = time.perf_counter()
+    linhas = _linhas_planilha(caminho)
+    _, cabecalho = next(linhas, (0, []))
+    colunas = [APELIDOS_COLUNAS.get(_normalizar_cabecalho(c)) for c in cabecalho]
+    faltantes = [campo for campo in COLUNAS_OBRIGATORIAS if campo not in colunas]
+    if faltantes:
+        raise ValueError(f"Cabeçalho sem as colunas obrigatórias {faltantes}. Encontrado: {cabecalho}")
+    ignoradas = [str(c) for c, campo in zip(cabecalho, colunas) if campo is None and _texto(c)]
+    if ignoradas:
+        logger.warning(f"[AVISO] Colunas ignoradas: {', '.join(ignoradas)}")
+
+    projetos, erros, linhas_por_nome, total = [], [], {}, 0
+    for linha, valores in linhas:
+        textos = [_texto(v) for v in valores]
+        if not any(textos): continue
+        total += 1
+        registro = {campo: texto for campo, texto in zip(colunas, textos) if campo is not None}
+        try:
+            projeto = _converter_linha(registro)
+        except (TypeError, ValueError) as e:
+            erros.append(ErroImportacao(linha, registro.get('nome', ''), str(e)))
+            continue
+        if projeto.nome in linhas_por_nome:
+            erros.append(ErroImportacao(linha, projeto.nome,
+                                        f"projeto repetido (já definido na linha {linhas_por_nome[projeto.nome]})"))
+            continue
+        linhas_por_nome[projeto.nome] = linha
+        projetos.append(projeto)
+
+    return {"projetos": projetos, "erros": erros, "linhas": total, "tempo": time.perf_counter() - inicio}
+
+
+def exibir_resultado_importacao(resultado: Dict):
+    """Resumo da importação com todas as linhas rejeitadas."""
+    logger.info(f"\n[INFO] {resultado['linhas']} linhas lidas em {resultado['tempo']:.2f}s: "
+                f"{len(resultado['projetos'])} projetos válidos, {len(resultado['erros'])} linhas com erro")
+    for erro in resultado['erros']:
+        logger.error(f"  [✗] Linha {erro.linha}{f' ({erro.projeto})' if erro.projeto else ''}: {erro.mensagem}")
+
+
+def importar_para_configuracao(caminho, nome_config: Optional[str] = None,
+                               parametros: Optional[ParametrosOtimizacao] = None) -> bool:
+    """
+    Importa a planilha e, se todas as linhas forem válidas, grava direto como configuração salva
+    (nome padrão: o nome do arquivo; parâmetros padrão se não informados).
+    """
+    try:
+        resultado = importar_projetos(caminho)
+    except ValueError as e:
+        logger.error(f"\n[ERRO] {e}")
+        return False
+    exibir_resultado_importacao(resultado)
+    if resultado['erros'] or not resultado['projetos']:
+        logger.error("\n[ERRO] Importação não gravada. Corrija as linhas acima e importe novamente.")
+        return False
+    nome = nome_config or "".join(c for c in Path(caminho).stem if c.isalnum() or c in ('_', '-'))
+    return config_manager.salvar_configuracao(parametros or ParametrosOtimizacao(), resultado['projetos'], nome)
+
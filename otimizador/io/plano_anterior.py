@@ -0,0 +1,78 @@
+# ARQUIVO: otimizador/io/plano_anterior.py
+"""
+Persistência das atribuições de uma execução, usada pelo replanejamento incremental.
+Os meses são gravados pelo nome ('Abr/26'), pois o horizonte pode mudar entre execuções.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import List, Dict
+
+import pandas as pd
+
+# Import relativo para acessar utils
+from ..utils import calcular_meses_ativos, posicao_calendario_mes
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_PLANO = "plano_atribuicoes.json"
+
+
+def salvar_plano(atribuicoes: List[Dict], meses: List[str], caminho: Path) -> None:
+    """Salva as atribuições (já renumeradas, como nas planilhas) em JSON."""
+    registros = [{
+        "turma_id": atr['turma'].id, "projeto": atr['turma'].projeto, "habilidade": atr['turma'].habilidade,
+        "mes_inicio": meses[atr['turma'].mes_inicio], "duracao": atr['turma'].duracao,
+        "instrutor": atr['instrutor'].id
+    } for atr in atribuicoes]
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({"versao": 1, "atribuicoes": registros}, f, indent=2, ensure_ascii=False)
+    logger.info(f"Plano salvo: '{caminho}'")
+
+
+def carregar_plano_anterior(caminho: Path, meses: List[str], meses_ferias: List[int]) -> List[Dict]:
+    """
+    Carrega as atribuições de uma execução anterior a partir do JSON salvo por `salvar_plano` ou da
+    planilha '1_carga_horaria_detalhada.xlsx'. Retorna registros {turma_id, projeto, habilidade,
+    mes_inicio, instrutor}, com `mes_inicio` como o primeiro mês ativo no horizonte atual.
+    Turmas cujo início ficou fora do horizonte atual são ignoradas.
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        raise ValueError(f"Plano anterior não encontrado: {caminho}")
+
+    brutos = []
+    if caminho.suffix.lower() == '.json':
+        with open(caminho, 'r', encoding='utf-8') as f:
+            for reg in json.load(f).get("atribuicoes", []):
+                brutos.append((reg['turma_id'], reg['projeto'], reg['habilidade'], reg['mes_inicio'],
+                               reg['instrutor']))
+    elif caminho.suffix.lower() in ('.xlsx', '.xls'):
+        df = pd.read_excel(caminho, engine='openpyxl')
+        faltantes = {'Instrutor', 'Mes', 'Habilidade', 'Projeto', 'Turma_ID'} - set(df.columns)
+        if faltantes:
+            raise ValueError(f"Planilha sem as colunas {sorted(faltantes)}: {caminho}")
+        # Início = mês mais antigo da turma no calendário, mesmo fora do horizonte atual (a turma é ignorada)
+        df['Posicao_Mes'] = df['Mes'].map(posicao_calendario_mes)
+        for turma_id, linhas in df.groupby('Turma_ID', sort=False):
+            primeira = linhas.loc[linhas['Posicao_Mes'].idxmin()]
+            brutos.append((turma_id, primeira['Projeto'], primeira['Habilidade'], primeira['Mes'],
+                           primeira['Instrutor']))
+    else:
+        raise ValueError(f"Formato de plano não suportado: {caminho.suffix}. Use .json ou .xlsx.")
+
+    registros, ignoradas = [], 0
+    for turma_id, projeto, habilidade, mes, instrutor in brutos:
+        if mes not in meses:
+            ignoradas += 1
+            continue
+        # A planilha só registra meses ativos; normaliza o JSON para o mesmo critério
+        ativos = calcular_meses_ativos(meses.index(mes), 1, meses_ferias, len(meses))
+        registros.append({"turma_id": str(turma_id), "projeto": projeto, "habilidade": habilidade,
+                          "mes_inicio": ativos[0] if ativos else meses.index(mes), "instrutor": str(instrutor)})
+    if ignoradas:
+        logger.warning(f"[AVISO] {ignoradas} turmas do plano anterior começam fora do horizonte atual "
+                       f"e foram ignoradas.")
+    logger.info(f"[✓] Plano anterior carregado: {len(registros)} turmas ({caminho.name})")
+    return registros
@@ -6,6 +6,7 @@ from typing import List, Optional
 
 # Import relativo para acessar os modelos de dados do mesmo pacote
 from ..data_models import ParametrosOtimizacao, ConfiguracaoProjeto
+from . import importacao_projetos
 
 
 def obter_parametros_usuario() -> ParametrosOtimizacao:
@@ -31,10 +32,20 @@ def obter_parametros_usuario() -> ParametrosOtimizacao:
             prompt="Timeout do solver em segundos [padrão: 180]: ",
             valor_padrao=180, minimo=10, maximo=3600, nome_parametro="Timeout"
         )
+        relaxar = input("Buscar o menor spread viável se o Estágio 2 falhar? (S/N) [N]: ").strip().upper()
+        if relaxar == 'SAIR': raise KeyboardInterrupt()
+        usar_lns = input("Usar LNS no Estágio 2 (portfólios muito grandes)? (S/N) [N]: ").strip().upper()
+        if usar_lns == 'SAIR': raise KeyboardInterrupt()
+        agrupar_ondas = input("Resolver as ondas de cada projeto como um único bloco no Estágio 1? (S/N) [N]: "
+                              ).strip().upper()
+        if agrupar_ondas == 'SAIR': raise KeyboardInterrupt()
         parametros = ParametrosOtimizacao(
             capacidade_max_instrutor=capacidade_max,
             spread_maximo=spread_maximo,
-            timeout_segundos=timeout
+            timeout_segundos=timeout,
+            relaxar_spread=relaxar == 'S',
+            quebrar_simetria_ondas=agrupar_ondas == 'S',
+            estrategia_estagio2='lns' if usar_lns == 'S' else 'monolitico'
         )
         exibir_resumo_parametros(parametros)
         return parametros
@@ -54,10 +65,11 @@ def obter_projetos_usuario() -> List[ConfiguracaoProjeto]:
     print("\nEscolha o modo de configuração:")
     print("  [1] Usar configuração PADRÃO (recomendado)")
     print("  [2] Configuração CUSTOMIZADA (avançado)")
+    print("  [3] Importar de planilha (CSV/XLSX)")
     print("  [S] Sair")
 
     while True:
-        escolha = input("\nOpção [1/2/S]: ").strip().upper()
+        escolha = input("\nOpção [1/2/3/S]: ").strip().upper()
         if escolha == 'S' or escolha == 'SAIR':
             raise KeyboardInterrupt()
         elif escolha == '' or escolha == '1':
@@ -69,8 +81,30 @@ def obter_projetos_usuario() -> List[ConfiguracaoProjeto]:
             projetos = _obter_projetos_customizados()
             exibir_resumo_projetos(projetos)
             return projetos
+        elif escolha == '3':
+            projetos = _importar_projetos_planilha()
+            if projetos:
+                exibir_resumo_projetos(projetos)
+                return projetos
         else:
-            print("[!] Opção inválida. Digite 1, 2 ou S.")
+            print("[!] Opção inválida. Digite 1, 2, 3 ou S.")
+
+
+def _importar_projetos_planilha() -> Optional[List[ConfiguracaoProjeto]]:
+    """Importa projetos de CSV/XLSX; com qualquer linha inválida, lista os erros e não importa nada."""
+    caminho = input("Arquivo (CSV ou XLSX): ").strip().strip('"')
+    if not caminho: return None
+    try:
+        resultado = importacao_projetos.importar_projetos(caminho)
+    except ValueError as e:
+        print(f"[ERRO] {e}")
+        return None
+    importacao_projetos.exibir_resultado_importacao(resultado)
+    if resultado['erros'] or not resultado['projetos']:
+        print("[!] Corrija as linhas acima e importe novamente.")
+        return None
+    print(f"\n[✓] {len(resultado['projetos'])} projetos importados.")
+    return resultado['projetos']
 
 
 def _obter_projetos_customizados() -> List[ConfiguracaoProjeto]:
@@ -85,7 +119,7 @@ def _obter_projetos_customizados() -> List[ConfiguracaoProjeto]:
         print(f"Projetos configurados: {len(projetos)}")
         if projetos:
             for idx, proj in enumerate(projetos, 1):
-                print(f"  {idx}. {proj.nome} ({proj.num_turmas} turmas, {proj.percentual_prog:.0f}% PROG)")
+                print(f"  {idx}. {proj.nome} ({proj.num_turmas} turmas, {proj.descricao_mix})")
         print("\nOpções:\n  [A] Adicionar novo projeto")
         if projetos:
             print("  [E] Editar projeto existente\n  [R] Remover projeto\n  [C] Concluir e continuar")
@@ -145,13 +179,26 @@ def _configurar_projeto_interativo(projeto_existente: Optional[ConfiguracaoProje
         perc_prog = _obter_float_usuario(
             f"Percentual PROG (%) [{projeto_existente.percentual_prog if is_editing else 60}]: ",
             projeto_existente.percentual_prog if is_editing else 60.0, 0.0, 100.0, "Percentual PROG")
+        outras = _obter_outras_habilidades(projeto_existente.habilidades if is_editing else {})
+        mix = None
+        if outras:
+            # ROBOTICA fica com o restante, como no mix de duas habilidades
+            mix = {'PROG': perc_prog, 'ROBOTICA': 100.0 - perc_prog - sum(outras.values()), **outras}
+            if mix['ROBOTICA'] < 0:
+                raise ValueError(f"PROG + outras habilidades somam {100.0 - mix['ROBOTICA']:.1f}% (máximo 100%).")
+
+        lab_atual = projeto_existente.laboratorio if is_editing else None
+        laboratorio = input(f"Laboratório (site) [{lab_atual or 'nenhum'}]: ").strip() or lab_atual
+        if laboratorio and laboratorio.lower() == 'nenhum': laboratorio = None
 
         projeto = ConfiguracaoProjeto(
             nome=nome, data_inicio=data_inicio_str, data_termino=data_termino_str,
-            num_turmas=num_turmas, duracao_curso=duracao_curso, ondas=ondas, percentual_prog=perc_prog
+            num_turmas=num_turmas, duracao_curso=duracao_curso, ondas=ondas, percentual_prog=perc_prog,
+            mix_habilidades=mix, laboratorio=laboratorio
         )
         print(
-            f"\nRESUMO DO PROJETO:\n  Nome: {projeto.nome}\n  Período: {projeto.data_inicio} a {projeto.data_termino}\n  Turmas: {projeto.num_turmas}\n  Duração: {projeto.duracao_curso} meses\n  Ondas: {projeto.ondas}\n  Proporção: {projeto.percentual_prog:.1f}% PROG / {projeto.percentual_rob:.1f}% ROB")
+            f"\nRESUMO DO PROJETO:\n  Nome: {projeto.nome}\n  Período: {projeto.data_inicio} a {projeto.data_termino}\n  Turmas: {projeto.num_turmas}\n  Duração: {projeto.duracao_curso} meses\n  Ondas: {projeto.ondas}\n  Proporção: {projeto.descricao_mix}"
+            + (f"\n  Laboratório: {projeto.laboratorio}" if projeto.laboratorio else ""))
         confirma = input("\nConfirmar? (S/N) [S]: ").strip().upper()
         return projeto if confirma in ('', 'S') else None
     except (KeyboardInterrupt, TypeError, ValueError) as e:
@@ -159,6 +206,27 @@ def _configurar_projeto_interativo(projeto_existente: Optional[ConfiguracaoProje
         return None
 
 
+def _obter_outras_habilidades(atuais: dict) -> dict:
+    """Habilidades além de PROG/ROBOTICA no formato 'MAKER=20,DADOS=10' (Enter mantém as atuais)."""
+    atuais = {hab: pct for hab, pct in atuais.items() if hab not in ('PROG', 'ROBOTICA')}
+    padrao = ",".join(f"{hab}={pct:g}" for hab, pct in atuais.items()) or "nenhuma"
+    while True:
+        entrada = input(f"Outras habilidades (ex.: MAKER=20,DADOS=10) [{padrao}]: ").strip()
+        if entrada.upper() == 'SAIR': raise KeyboardInterrupt()
+        if not entrada: return atuais
+        if entrada.lower() == 'nenhuma': return {}
+        try:
+            outras = {}
+            for item in entrada.split(','):
+                hab, pct = item.split('=')
+                outras[hab.strip().upper()] = float(pct.replace(',', '.'))
+            if any(not hab or hab in ('PROG', 'ROBOTICA') or not 0 < pct <= 100 for hab, pct in outras.items()):
+                raise ValueError
+            return outras
+        except ValueError:
+            print("[!] Formato inválido. Use NOME=percentual separados por vírgula (ex.: MAKER=20).")
+
+
 def _editar_projeto_interativo(projetos: List[ConfiguracaoProjeto]) -> List[ConfiguracaoProjeto]:
     """Interface para selecionar e editar um projeto."""
     for idx, proj in enumerate(projetos, 1): print(f"  {idx}. {proj.nome}")
@@ -245,6 +313,29 @@ def exibir_resumo_parametros(params: ParametrosOtimizacao):
     # <<< ALTERAÇÃO: Removido o percentual global >>>
     print(f"  • Spread Máximo: {params.spread_maximo} turmas")
     print(f"  • Timeout do Solver: {params.timeout_segundos} segundos")
+    print(f"  • Relaxação automática do spread: {'Sim' if params.relaxar_spread else 'Não'}")
+    print(f"  • Ondas de cada projeto como bloco único: {'Sim' if params.quebrar_simetria_ondas else 'Não'}")
+    print(f"  • Agrupamento de projetos equivalentes: {'Sim' if params.agrupar_projetos_equivalentes else 'Não'}")
+    print(f"  • Estratégia do Estágio 2: {params.estrategia_estagio2}")
+    print(f"  • Modelo integrado após os dois estágios: {'Sim' if params.modelo_integrado else 'Não'}")
+    if params.cronogramas_alternativos > 1:
+        print(f"  • Cronogramas avaliados no Estágio 2: {params.cronogramas_alternativos} "
+              f"(folga de pico dos alternativos: {params.folga_pico_alternativos})")
+    print(f"  • Backend do solver: {params.backend_solver} | Motor do Estágio 1: {params.motor_estagio1}")
+    print(f"  • Perfil do solver: {params.perfil_solver} | Threads: "
+          f"{params.threads_solver or 'todos os núcleos'}{' | log de busca' if params.log_solver else ''}")
+    if params.horizonte_janela_meses:
+        print(f"  • Horizonte rolante: janelas de {params.horizonte_janela_meses} meses "
+              f"(sobreposição de {params.horizonte_sobreposicao_meses})"
+              f"{' | comparação com a resolução monolítica' if params.comparar_monolitico else ''}")
+    if params.laboratorios:
+        print("  • Laboratórios: " + ", ".join(
+            f"{lab.nome} ({lab.salas if lab.salas is not None else 'sem limite de'} salas"
+            f"{f', {len(lab.salas_por_mes)} meses com limite próprio' if lab.salas_por_mes else ''})"
+            for lab in params.laboratorios))
+    if params.compartilhamento_laboratorios:
+        print(f"  • Instrutores compartilhados entre: "
+              f"{'; '.join(' + '.join(grupo) for grupo in params.compartilhamento_laboratorios)}")
     print(f"  • Meses de Férias: {', '.join(params.meses_ferias)}")
     print("=" * 80)
 
@@ -257,5 +348,6 @@ def exibir_resumo_projetos(projetos: List[ConfiguracaoProjeto]):
         print(f"\n  {proj.nome}:\n"
               f"    - Período: {proj.data_inicio} a {proj.data_termino}\n"
               f"    - Turmas: {proj.num_turmas} | Duração: {proj.duracao_curso} meses | Ondas: {proj.ondas}\n"
-              f"    - Proporção: {proj.percentual_prog:.1f}% PROG / {proj.percentual_rob:.1f}% ROB")
+              f"    - Proporção: {proj.descricao_mix}"
+              + (f"\n    - Laboratório: {proj.laboratorio}" if proj.laboratorio else ""))
     print("\n" + "=" * 80)
\ No newline at end of file
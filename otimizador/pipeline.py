@@ -0,0 +1,420 @@
+# ARQUIVO: otimizador/pipeline.py
+"""
+Pipeline de otimização sem interação com o usuário: preparação dos dados, Estágios 1 e 2,
+pós-processamento, arquivamento e relatórios. Usado pela linha de comando (main.py), pelo servidor
+de jobs e pela API (otimizador.api). Falhas levantam ErroOtimizacao em vez de encerrar o processo.
+"""
+
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import pandas as pd
+
+# Import relativo para acessar os demais módulos do pacote
+from .io import plano_anterior, arquivo_execucao, historico_execucoes
+from .utils import (
+    gerar_lista_meses,
+    converter_projetos_para_modelo,
+    renumerar_instrutores_ativos,
+    analisar_distribuicao_instrutores_por_projeto
+)
+from .core import (stage_1, stage_2, lns, horizonte_rolante, viabilidade, relaxacao_spread, replanejamento,
+                   verificador, modelo_integrado, cronogramas_alternativos)
+from .reporting import plotting, spreadsheets, pdf_generator, cache_relatorios
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_SAIDA = Path("resultados_otimizacao")
+
+
+class ErroOtimizacao(Exception):
+    """Falha do pipeline; `conflitos` traz as inviabilidades detectadas na pré-verificação, se houver."""
+
+    def __init__(self, mensagem: str, conflitos: Optional[List] = None):
+        super().__init__(mensagem)
+        self.conflitos = conflitos or []
+
+
+def executar_estagios(projetos_modelo, meses, meses_ferias_idx, parametros, spread_inviavel: bool = False):
+    """
+    Executa os Estágios 1 e 2 completos e, com `parametros.modelo_integrado`, o modelo integrado a partir
+    deles. Com `parametros.cronogramas_alternativos` > 1, o Estágio 2 avalia o cronograma ótimo e os
+    alternativos do Estágio 1 e fica o melhor plano. Com `spread_inviavel` (a pré-verificação já mostrou
+    que o spread configurado é inviável), o Estágio 2 vai direto à busca do menor spread viável.
+    Levanta ErroOtimizacao se algum estágio falhar.
+    """
+    inicio = time.perf_counter()
+    # ===========================
+    # ETAPA 4: OTIMIZAÇÃO - ESTÁGIO 1 (Nivelamento de Demanda)
+    # ===========================
+    logger.info("\n" + "=" * 80)
+    logger.info("ESTÁGIO 1: OTIMIZAÇÃO DO CRONOGRAMA (Nivelamento de Demanda)")
+    logger.info("=" * 80)
+
+    # Horizonte rolante só faz sentido se o período for maior que uma janela
+    usar_horizonte_rolante = 0 < parametros.horizonte_janela_meses < len(meses)
+    avaliar_alternativos = parametros.cronogramas_alternativos > 1
+    if avaliar_alternativos and spread_inviavel:
+        logger.warning("\n[AVISO] Cronogramas alternativos não se aplicam à relaxação do spread; usado só o ótimo.")
+        avaliar_alternativos = False
+    if usar_horizonte_rolante:
+        if avaliar_alternativos:
+            logger.warning("\n[AVISO] Cronogramas alternativos não se aplicam ao horizonte rolante; "
+                           "usado só o ótimo.")
+            avaliar_alternativos = False
+        resultados_estagio1 = horizonte_rolante.otimizar_curva_demanda_rolante(projetos_modelo, meses, parametros,
+                                                                               motor=parametros.motor_estagio1)
+    else:
+        resultados_estagio1 = stage_1.otimizar_curva_demanda(
+            projetos_modelo,
+            meses,
+            parametros,
+            motor=parametros.motor_estagio1,
+            num_alternativos=parametros.cronogramas_alternativos if avaliar_alternativos else 1
+        )
+
+    if not resultados_estagio1:
+        raise ErroOtimizacao("Falha no Estágio 1. Verifique as restrições do projeto.")
+
+    logger.info("\n✓ Estágio 1 concluído com sucesso!")
+
+    # ===========================
+    # ETAPA 5: OTIMIZAÇÃO - ESTÁGIO 2 (Atribuição de Instrutores)
+    # ===========================
+    logger.info("\n" + "=" * 80)
+    logger.info("ESTÁGIO 2: ATRIBUIÇÃO DE INSTRUTORES E BALANCEAMENTO")
+    logger.info("=" * 80)
+
+    if spread_inviavel:
+        resultados_estagio2 = None
+    elif avaliar_alternativos and resultados_estagio1.get('cronogramas_alternativos'):
+        resultados_estagio1, resultados_estagio2 = cronogramas_alternativos.avaliar_cronogramas(
+            resultados_estagio1, projetos_modelo, meses, meses_ferias_idx, parametros)
+    else:
+        resultados_estagio1.pop('cronogramas_alternativos', None)
+        if usar_horizonte_rolante:
+            otimizar_estagio2 = horizonte_rolante.otimizar_atribuicao_rolante
+        elif parametros.estrategia_estagio2 == 'lns':
+            otimizar_estagio2 = lns.otimizar_atribuicao_lns
+        else:
+            otimizar_estagio2 = stage_2.otimizar_atribuicao_e_carga
+        resultados_estagio2 = otimizar_estagio2(
+            resultados_estagio1['cronograma'],
+            projetos_modelo,
+            meses,
+            meses_ferias_idx,
+            parametros
+        )
+
+    spread_max_permitido = parametros.spread_maximo
+    curva_spread = None
+    falhou = not resultados_estagio2 or resultados_estagio2.get("status") == "falha"
+    if falhou and parametros.relaxar_spread:
+        if spread_inviavel:
+            logger.warning("\n[!] Spread configurado abaixo do mínimo analítico. Iniciando relaxação automática...")
+        else:
+            logger.warning("\n[!] Estágio 2 sem solução com o spread configurado. Iniciando relaxação automática...")
+        busca = relaxacao_spread.buscar_menor_spread_viavel(
+            resultados_estagio1['cronograma'],
+            projetos_modelo,
+            meses,
+            meses_ferias_idx,
+            parametros
+        )
+        if busca:
+            resultados_estagio2 = busca['resultado']
+            spread_max_permitido, curva_spread = busca['spread'], busca['curva']
+            falhou = False
+
+    if falhou:
+        raise ErroOtimizacao("Falha no Estágio 2. Tente aumentar o spread ou o timeout.")
+
+    resultados_estagio2['spread_max_permitido'] = spread_max_permitido
+    if curva_spread:
+        resultados_estagio2['curva_spread'] = curva_spread
+
+    logger.info("\n✓ Estágio 2 concluído com sucesso!")
+
+    if usar_horizonte_rolante and parametros.comparar_monolitico and not curva_spread:
+        horizonte_rolante.comparar_com_monolitico(projetos_modelo, meses, meses_ferias_idx, parametros,
+                                                  resultados_estagio1, resultados_estagio2)
+
+    if parametros.modelo_integrado:
+        if usar_horizonte_rolante:
+            logger.warning("\n[AVISO] Modelo integrado não se aplica ao horizonte rolante; "
+                           "mantida a solução por janelas.")
+        else:
+            resultados_estagio1, resultados_estagio2 = modelo_integrado.otimizar_integrado(
+                projetos_modelo, meses, meses_ferias_idx, parametros, resultados_estagio1, resultados_estagio2,
+                time.perf_counter() - inicio)
+
+    return resultados_estagio1, resultados_estagio2
+
+
+def otimizar(parametros, projetos_config, arquivo_replanejamento: Optional[str] = None) -> Dict:
+    """
+    Executa as Etapas 2 a 6 (preparação, otimização e pós-processamento) para uma configuração já
+    obtida e devolve o dicionário da execução, usado pelos relatórios e pelo arquivo de execução.
+    Levanta ErroOtimizacao se a configuração for inviável ou algum estágio falhar.
+    """
+    # ===========================
+    # ETAPA 2: PREPARAÇÃO DE DADOS
+    # ===========================
+    logger.info("\n--- Etapa 2: Preparação de Dados ---")
+
+    # Calcular intervalo de datas
+    dt_min = min(datetime.strptime(p.data_inicio, "%d/%m/%Y") for p in projetos_config)
+    dt_max = max(datetime.strptime(p.data_termino, "%d/%m/%Y") for p in projetos_config)
+
+    logger.info(f"Período total: {dt_min.strftime('%d/%m/%Y')} até {dt_max.strftime('%d/%m/%Y')}")
+
+    # Gerar lista de meses
+    meses = gerar_lista_meses(
+        dt_min.strftime("%d/%m/%Y"),
+        dt_max.strftime("%d/%m/%Y")
+    )
+    logger.info(f"Total de meses: {len(meses)}")
+
+    # Identificar índices dos meses de férias
+    meses_ferias_idx = [meses.index(m) for m in parametros.meses_ferias if m in meses]
+    if meses_ferias_idx:
+        logger.info(f"Meses de férias identificados: {len(meses_ferias_idx)}")
+
+    # Pré-verificação analítica: evita gastar tempo de solver em configurações impossíveis
+    logger.info("\n--- Verificação de Viabilidade ---")
+    conflitos = viabilidade.verificar_viabilidade(projetos_config, meses, meses_ferias_idx, parametros)
+    # Com a relaxação ligada, spread inviável não impede a otimização: a busca parte do mínimo analítico
+    # (o replanejamento não relaxa o spread)
+    conflitos_spread = [c for c in conflitos if c.restricao == 'spread']
+    spread_inviavel = bool(conflitos_spread) and parametros.relaxar_spread and not arquivo_replanejamento
+    if spread_inviavel:
+        viabilidade.exibir_conflitos(conflitos_spread, "Spread configurado inviável; será relaxado automaticamente",
+                                     logging.WARNING)
+        conflitos = [c for c in conflitos if c.restricao != 'spread']
+    if conflitos:
+        viabilidade.exibir_conflitos(conflitos, "Pré-verificação encontrou inviabilidades")
+        nucleo = viabilidade.diagnosticar_inviabilidade(projetos_config, meses, meses_ferias_idx, parametros,
+                                                        conflitos=conflitos)
+        if nucleo and nucleo != conflitos:
+            viabilidade.exibir_conflitos(nucleo, "Conjunto mínimo de restrições em conflito")
+        raise ErroOtimizacao("Configuração inviável. Ajuste os itens acima antes de otimizar.",
+                             conflitos=nucleo or conflitos)
+    if not spread_inviavel:
+        logger.info("✓ Nenhuma inviabilidade detectada na pré-verificação")
+
+    # ===========================
+    # ETAPA 3: CONVERSÃO PARA MODELO OTIMIZADO
+    # ===========================
+    logger.info("\n--- Etapa 3: Conversão de Projetos ---")
+    projetos_modelo = converter_projetos_para_modelo(
+        projetos_config,
+        meses,
+        meses_ferias_idx,
+        parametros
+    )
+    logger.info(f"Projetos convertidos: {len(projetos_modelo)}")
+
+    # ===========================
+    # ETAPAS 4 e 5: OTIMIZAÇÃO (ou replanejamento a partir de um plano anterior)
+    # ===========================
+    diferencas_replanejamento = None
+    if arquivo_replanejamento:
+        plano = plano_anterior.carregar_plano_anterior(arquivo_replanejamento, meses, meses_ferias_idx)
+        replano = replanejamento.replanejar(plano, projetos_modelo, meses, meses_ferias_idx, parametros)
+        if not replano:
+            raise ErroOtimizacao("Falha no replanejamento. Execute uma otimização completa.")
+        resultados_estagio1, resultados_estagio2 = replano['estagio1'], replano['estagio2']
+        resultados_estagio2['spread_max_permitido'] = parametros.spread_maximo
+        diferencas_replanejamento = replano['diferencas']
+    else:
+        resultados_estagio1, resultados_estagio2 = executar_estagios(projetos_modelo, meses, meses_ferias_idx,
+                                                                      parametros, spread_inviavel)
+
+    resultados_estagio1['periodo'] = f"{dt_min.strftime('%d/%m/%Y')} a {dt_max.strftime('%d/%m/%Y')}"
+    resultados_estagio1['meses_total'] = len(meses)
+
+    # ===========================
+    # ETAPA 6: PÓS-PROCESSAMENTO
+    # ===========================
+    logger.info("\n--- Etapa 6: Pós-processamento ---")
+
+    if diferencas_replanejamento is None:
+        resultados_estagio2['atribuicoes'], contagem_instrutores_hab = renumerar_instrutores_ativos(
+            resultados_estagio2['atribuicoes']
+        )
+        logger.info("✓ Instrutores renumerados")
+    else:
+        # No replanejamento os IDs já seguem o plano anterior e não podem ser renumerados
+        instrutores_ativos = {atr['instrutor'] for atr in resultados_estagio2['atribuicoes']}
+        contagem_instrutores_hab = dict(Counter(inst.habilidade for inst in instrutores_ativos))
+
+    resultados_estagio2['verificacao'] = verificador.verificar_plano(
+        resultados_estagio2, projetos_modelo, meses, meses_ferias_idx,
+        resultados_estagio2['spread_max_permitido'], parametros
+    )
+    verificador.exibir_verificacao(resultados_estagio2['verificacao'])
+
+    return {
+        "parametros": parametros,
+        "projetos_config": projetos_config,
+        "projetos_modelo": projetos_modelo,
+        "meses": meses,
+        "meses_ferias_idx": meses_ferias_idx,
+        "dt_min": dt_min,
+        "resultados_estagio1": resultados_estagio1,
+        "resultados_estagio2": resultados_estagio2,
+        "contagem_instrutores_hab": contagem_instrutores_hab,
+        "diferencas_replanejamento": diferencas_replanejamento,
+    }
+
+
+def arquivar_execucao(execucao: Dict, output_dir: Path = DIRETORIO_SAIDA,
+                      caminho_historico: Optional[Path] = None) -> Path:
+    """
+    Grava o arquivo de execução em `output_dir` e registra a execução no histórico (`caminho_historico`;
+    por padrão, `historico_execucoes.caminho_historico()`).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    caminho_execucao = arquivo_execucao.salvar_execucao(
+        execucao, output_dir / f"execucao_{datetime.now():%Y%m%d_%H%M%S}.npz")
+    caminho_historico = caminho_historico or historico_execucoes.caminho_historico()
+    try:
+        execucao_id = historico_execucoes.registrar_execucao(execucao, caminho_execucao, caminho_historico)
+        logger.info(f"Execução #{execucao_id} registrada no histórico: '{caminho_historico}'")
+    except Exception as e:
+        logger.warning(f"[AVISO] Não foi possível registrar a execução no histórico: {e}")
+    return caminho_execucao
+
+
+def gerar_relatorios(execucao, output_dir: Path, diretorio_relatorios: Path = Path('.')) -> List[Path]:
+    """
+    Gera planilhas, gráficos e o PDF de uma execução: a recém-otimizada ou uma carregada de um
+    arquivo de execução (`--relatorio`), sem resolver de novo. Planilhas e PDF vão para
+    `diretorio_relatorios`; plano, cache e gráficos, para `output_dir`. Retorna os arquivos de relatório.
+    """
+    projetos_config, projetos_modelo = execucao['projetos_config'], execucao['projetos_modelo']
+    meses, meses_ferias_idx, dt_min = execucao['meses'], execucao['meses_ferias_idx'], execucao['dt_min']
+    resultados_estagio1, resultados_estagio2 = execucao['resultados_estagio1'], execucao['resultados_estagio2']
+    contagem_instrutores_hab = execucao['contagem_instrutores_hab']
+    diferencas_replanejamento = execucao['diferencas_replanejamento']
+
+    distribuicao_por_projeto = analisar_distribuicao_instrutores_por_projeto(
+        resultados_estagio2['atribuicoes']
+    )
+    logger.info("✓ Distribuição por projeto calculada")
+
+    logger.info("\n" + "=" * 80)
+    logger.info("GERANDO VISUALIZAÇÕES E RELATÓRIOS")
+    logger.info("=" * 80)
+    logger.info(f"Diretório de saída: {output_dir.absolute()}")
+
+    # Cada artefato só é gerado de novo se as suas entradas (ou o código que o gera) mudaram
+    cache = cache_relatorios.CacheRelatorios(output_dir)
+    fonte_planilhas = cache_relatorios.impressao_modulo(spreadsheets)
+    fonte_graficos = cache_relatorios.impressao_modulo(plotting)
+    atribuicoes, turmas = resultados_estagio2['atribuicoes'], resultados_estagio2['turmas']
+
+    logger.info("\n1. Gerando planilhas Excel...")
+    impressao = cache_relatorios.impressao_digital(fonte_planilhas, atribuicoes)
+    caminho_consolidada = diretorio_relatorios / spreadsheets.ARQUIVO_CONSOLIDADA
+    atualizada = cache.atualizado('planilha_consolidada', impressao, caminho_consolidada)
+    df_consolidada_instrutor = spreadsheets.gerar_planilha_consolidada_instrutor(atribuicoes, salvar=not atualizada,
+                                                                               caminho=caminho_consolidada)
+    if not atualizada:
+        cache.registrar('planilha_consolidada', impressao)
+
+    impressao = cache_relatorios.impressao_digital(fonte_planilhas, atribuicoes, meses, meses_ferias_idx)
+    caminho_detalhada = diretorio_relatorios / spreadsheets.ARQUIVO_DETALHADA
+    if not cache.atualizado('planilha_detalhada', impressao, caminho_detalhada):
+        spreadsheets.gerar_planilha_detalhada(
+            atribuicoes,
+            meses,
+            meses_ferias_idx,
+            caminho=caminho_detalhada
+        )
+        cache.registrar('planilha_detalhada', impressao)
+    arquivos = [caminho_detalhada, caminho_consolidada]
+    if diferencas_replanejamento is not None:
+        caminho_diferencas = diretorio_relatorios / spreadsheets.ARQUIVO_DIFERENCAS
+        arquivos.append(caminho_diferencas)
+        impressao = cache_relatorios.impressao_digital(fonte_planilhas, diferencas_replanejamento)
+        if not cache.atualizado('planilha_diferencas', impressao, caminho_diferencas):
+            spreadsheets.gerar_planilha_diferencas_replanejamento(diferencas_replanejamento, caminho_diferencas)
+            cache.registrar('planilha_diferencas', impressao)
+
+    caminho_plano = output_dir / plano_anterior.ARQUIVO_PLANO
+    impressao = cache_relatorios.impressao_digital(cache_relatorios.impressao_modulo(plano_anterior),
+                                                   atribuicoes, meses)
+    if not cache.atualizado('plano', impressao, caminho_plano):
+        plano_anterior.salvar_plano(atribuicoes, meses, caminho_plano)
+        cache.registrar('plano', impressao)
+    arquivos.append(caminho_plano)
+
+    logger.info("\n2. Gerando gráficos...")
+    graficos, impressoes_graficos = {}, {}
+
+    def _grafico(nome: str, descricao: str, gerar, *entradas):
+        impressoes_graficos[nome] = cache_relatorios.impressao_digital(fonte_graficos, nome, *entradas)
+        try:
+            graficos[nome] = cache.grafico(nome, impressoes_graficos[nome], gerar)
+            logger.info(f"  ✓ Gráfico {descricao}")
+        except Exception as e:
+            logger.warning(f"  ⚠ Erro no gráfico {descricao}: {e}")
+            graficos[nome] = impressoes_graficos[nome] = None
+
+    _grafico('projeto_mes', "turmas/projeto/mês",
+             lambda: plotting.gerar_grafico_turmas_projeto_mes(turmas, projetos_modelo, meses, meses_ferias_idx,
+                                                               str(output_dir / "grafico_turmas_projeto_mes.png")),
+             turmas, projetos_modelo, meses, meses_ferias_idx)
+    _grafico('instrutor_projeto', "turmas/instrutor/projeto",
+             lambda: plotting.gerar_grafico_turmas_instrutor_tipologia_projeto(
+                 atribuicoes, str(output_dir / "grafico_turmas_instrutor_projeto.png")),
+             atribuicoes)
+    _grafico('carga_instrutor', "carga/instrutor",
+             lambda: plotting.gerar_grafico_carga_por_instrutor(atribuicoes,
+                                                                str(output_dir / "grafico_carga_instrutor.png")),
+             atribuicoes)
+    _grafico('prog_rob', "demanda PROG/ROB",
+             lambda: plotting.gerar_grafico_demanda_prog_rob(turmas, projetos_modelo, meses, meses_ferias_idx,
+                                                             str(output_dir / "grafico_demanda_prog_rob.png"))[0],
+             turmas, projetos_modelo, meses, meses_ferias_idx)
+    try:
+        _, serie_temporal_df = plotting.calcular_serie_demanda(turmas, meses)
+    except Exception as e:
+        logger.warning(f"  ⚠ Erro na série de demanda: {e}")
+        serie_temporal_df = pd.DataFrame()
+    _grafico('conclusoes', "conclusões/mês",
+             lambda: plotting.plotar_conclusoes_por_mes(turmas, projetos_modelo, dt_min, len(meses),
+                                                        str(output_dir / "grafico_conclusoes_mes.png")),
+             turmas, projetos_modelo, dt_min, len(meses))
+
+    logger.info("\n3. Gerando relatório PDF...")
+    impressao = cache_relatorios.impressao_digital(
+        cache_relatorios.impressao_modulo(pdf_generator, plotting), projetos_config, resultados_estagio1,
+        resultados_estagio2, impressoes_graficos, serie_temporal_df, df_consolidada_instrutor,
+        contagem_instrutores_hab, distribuicao_por_projeto)
+    caminho_pdf = diretorio_relatorios / pdf_generator.ARQUIVO_PDF
+    if cache.atualizado('pdf', impressao, caminho_pdf):
+        logger.info(f"  ✓ Sem alterações: '{caminho_pdf}' mantido")
+    else:
+        pdf_generator.gerar_relatorio_pdf(
+            projetos_config=projetos_config,
+            resultados_estagio1=resultados_estagio1,
+            resultados_estagio2=resultados_estagio2,
+            graficos_paths=graficos,
+            serie_temporal_df=serie_temporal_df,
+            df_consolidada_instrutor=df_consolidada_instrutor,
+            contagem_instrutores_hab=contagem_instrutores_hab,
+            distribuicao_por_projeto=distribuicao_por_projeto,
+            caminho_saida=str(caminho_pdf)
+        )
+        cache.registrar('pdf', impressao)
+    arquivos.append(caminho_pdf)
+
+    logger.info("\n4. Atualizando cache de relatórios...")
+    cache.salvar()
+    cache.exibir_resumo()
+    return [caminho for caminho in arquivos if caminho.exists()]
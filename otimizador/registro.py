@@ -0,0 +1,100 @@
+# ARQUIVO: otimizador/registro.py
+"""
+Registro (logging) do otimizador.
+
+Pipeline, estágios e relatórios registram pelo logger do próprio módulo (`logging.getLogger(__name__)`),
+todos abaixo do logger 'otimizador': [ERRO]/[✗] viram ERROR, [AVISO]/[!]/⚠ viram WARNING e o resto
+INFO. A linha de comando e o servidor de jobs ligam `configurar_console`, que mostra as mensagens como
+sempre (só o texto, na saída padrão); quem embute o otimizador (otimizador.api) configura os próprios
+handlers. Os pools de processos são criados por `executor_processos`, cujos filhos enviam os registros
+ao processo pai por uma fila, para que cheguem aos handlers de quem chamou; quem precisa escolher que
+saída mostrar (p.ex. só a do melhor candidato) captura com `capturar_registros` e passa a `reemitir`.
+"""
+
+import logging
+import logging.handlers
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable, List
+
+LOGGER_RAIZ = 'otimizador'
+
+
+def configurar_console(nivel: int = logging.INFO) -> logging.Handler:
+    """Liga (uma vez) a saída de console do logger 'otimizador': só a mensagem, na saída padrão."""
+    logger = logging.getLogger(LOGGER_RAIZ)
+    for handler in logger.handlers:
+        if getattr(handler, 'console_otimizador', False):
+            return handler
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler.console_otimizador = True
+    logger.addHandler(handler)
+    logger.setLevel(nivel)
+    return handler
+
+
+class _Coletor(logging.Handler):
+    """Guarda os registros já formatados (sem args nem exceção), para atravessarem processos."""
+
+    def __init__(self, registros: List[logging.LogRecord]):
+        super().__init__()
+        self.registros = registros
+
+    def emit(self, registro: logging.LogRecord):
+        registro.msg, registro.args, registro.exc_info, registro.exc_text = registro.getMessage(), None, None, None
+        self.registros.append(registro)
+
+
+@contextmanager
+def capturar_registros():
+    """
+    Lista que recebe os registros do logger 'otimizador' feitos dentro do bloco, que deixam de passar
+    pelos handlers configurados. Serve para devolver ao processo pai a saída de um processo filho e
+    para calar uma resolução auxiliar (basta descartar a lista).
+    """
+    logger = logging.getLogger(LOGGER_RAIZ)
+    registros: List[logging.LogRecord] = []
+    handlers, propagar = logger.handlers, logger.propagate
+    logger.handlers, logger.propagate = [_Coletor(registros)], False
+    try:
+        yield registros
+    finally:
+        logger.handlers, logger.propagate = handlers, propagar
+
+
+def reemitir(registros: Iterable[logging.LogRecord]):
+    """Passa registros capturados (de outro processo) pelos handlers deste processo."""
+    for registro in registros:
+        logger = logging.getLogger(registro.name)
+        if logger.isEnabledFor(registro.levelno):
+            logger.handle(registro)
+
+
+class _Reemissor(logging.Handler):
+    """Entrega ao logger de origem, no processo pai, os registros recebidos dos processos filhos."""
+
+    def emit(self, registro: logging.LogRecord):
+        reemitir([registro])
+
+
+def _iniciar_filho(fila):
+    """Inicializador dos processos do pool: os registros do logger 'otimizador' vão para a fila do pai."""
+    logger = logging.getLogger(LOGGER_RAIZ)
+    logger.handlers, logger.propagate = [logging.handlers.QueueHandler(fila)], False
+    logger.setLevel(logging.DEBUG)
+
+
+@contextmanager
+def executor_processos(max_workers: int):
+    """ProcessPoolExecutor cujos processos registram pelos handlers do processo pai."""
+    fila = multiprocessing.Queue()
+    ouvinte = logging.handlers.QueueListener(fila, _Reemissor())
+    ouvinte.start()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_iniciar_filho, initargs=(fila,)) as pool:
+            yield pool
+    finally:
+        ouvinte.stop()
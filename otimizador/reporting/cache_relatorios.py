@@ -0,0 +1,137 @@
+# ARQUIVO: otimizador/reporting/cache_relatorios.py
+"""
+Regeração incremental dos relatórios.
+
+Cada artefato (planilha, gráfico, PDF) recebe uma impressão digital das entradas que o geram,
+incluindo o código-fonte do módulo gerador. Se a impressão for a mesma da última geração e o
+arquivo ainda existir, o artefato é reaproveitado. Os gráficos ficam em um cache de imagens no
+diretório de saída (chaveado pela impressão), com limite de tamanho e descarte dos menos usados.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_IMPRESSOES = ".impressoes_relatorios.json"
+DIRETORIO_CACHE_GRAFICOS = ".cache_graficos"
+LIMITE_CACHE_BYTES = 50 * 1024 * 1024
+
+
+def _atualizar_hash(h, valor):
+    """Alimenta o hash com `valor`, percorrendo contêineres; arrays e DataFrames pelo conteúdo."""
+    if isinstance(valor, dict):
+        h.update(b'{')
+        for chave in sorted(valor, key=repr):
+            _atualizar_hash(h, chave)
+            _atualizar_hash(h, valor[chave])
+        h.update(b'}')
+    elif isinstance(valor, (list, tuple)) and not hasattr(valor, '_fields'):
+        h.update(b'[')
+        for item in valor:
+            _atualizar_hash(h, item)
+        h.update(b']')
+    elif isinstance(valor, np.ndarray):
+        h.update(f"nd{valor.dtype}{valor.shape}".encode())
+        h.update(np.ascontiguousarray(valor).tobytes() if valor.dtype != object else repr(valor.tolist()).encode())
+    elif isinstance(valor, pd.DataFrame):
+        h.update(repr(list(valor.columns)).encode())
+        h.update(pd.util.hash_pandas_object(valor, index=True).values.tobytes())
+    else:
+        texto = repr(valor)
+        # Objetos sem repr próprio (modelos do solver etc.) trazem o endereço de memória: só o tipo conta
+        h.update((type(valor).__qualname__ if ' at 0x' in texto else texto).encode())
+
+
+def impressao_digital(*entradas) -> str:
+    """Hash SHA-256 estável das entradas de um artefato."""
+    h = hashlib.sha256()
+    for entrada in entradas:
+        _atualizar_hash(h, entrada)
+    return h.hexdigest()
+
+
+def impressao_modulo(*modulos) -> str:
+    """Hash do código-fonte dos módulos geradores: mudar título, cor ou layout invalida o artefato."""
+    h = hashlib.sha256()
+    for modulo in modulos:
+        h.update(Path(modulo.__file__).read_bytes())
+    return h.hexdigest()
+
+
+class CacheRelatorios:
+    """Impressões da última geração de cada artefato e cache de imagens dos gráficos."""
+
+    def __init__(self, diretorio: Path, limite_bytes: int = LIMITE_CACHE_BYTES):
+        self.diretorio = Path(diretorio)
+        self.arquivo = self.diretorio / ARQUIVO_IMPRESSOES
+        self.dir_graficos = self.diretorio / DIRETORIO_CACHE_GRAFICOS
+        self.limite_bytes = limite_bytes
+        self.gerados, self.reaproveitados = [], []
+        try:
+            self.impressoes: Dict[str, str] = json.loads(self.arquivo.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.impressoes = {}
+
+    def atualizado(self, artefato: str, impressao: str, caminho) -> bool:
+        """True se `caminho` existe e foi gerado com a mesma impressão (o artefato é reaproveitado)."""
+        if self.impressoes.get(artefato) == impressao and os.path.exists(caminho):
+            self.reaproveitados.append(artefato)
+            return True
+        return False
+
+    def registrar(self, artefato: str, impressao: str):
+        """Anota a impressão do artefato recém-gerado."""
+        self.impressoes[artefato] = impressao
+        self.gerados.append(artefato)
+
+    def grafico(self, artefato: str, impressao: str, gerar: Callable[[], str]) -> str:
+        """
+        Caminho do gráfico no cache; chama `gerar()` (que devolve o PNG gerado) só se a impressão
+        não estiver no cache, e move a imagem gerada para lá.
+        """
+        self.dir_graficos.mkdir(parents=True, exist_ok=True)
+        destino = self.dir_graficos / f"{artefato}_{impressao[:16]}.png"
+        if destino.exists():
+            os.utime(destino)  # marca o uso para o descarte por antiguidade
+            self.reaproveitados.append(artefato)
+            return str(destino)
+        shutil.move(gerar(), destino)
+        self.registrar(artefato, impressao)
+        return str(destino)
+
+    def _descartar_excedente(self):
+        """Remove as imagens usadas há mais tempo até o cache caber no limite."""
+        imagens = []
+        for entrada in os.scandir(self.dir_graficos):
+            if entrada.is_file():
+                estado = entrada.stat()
+                imagens.append((estado.st_mtime, estado.st_size, entrada.path))
+        total = sum(tamanho for _, tamanho, _ in imagens)
+        for _, tamanho, caminho in sorted(imagens):
+            if total <= self.limite_bytes: break
+            os.remove(caminho)
+            total -= tamanho
+
+    def salvar(self):
+        """Grava as impressões (troca atômica) e aplica o limite de tamanho do cache de gráficos."""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        temporario = self.arquivo.with_suffix('.tmp')
+        temporario.write_text(json.dumps(self.impressoes, indent=2), encoding='utf-8')
+        os.replace(temporario, self.arquivo)
+        if self.dir_graficos.exists():
+            self._descartar_excedente()
+
+    def exibir_resumo(self):
+        logger.info(f"[INFO] Artefatos gerados: {len(self.gerados)} | reaproveitados sem alteração: "
+                    f"{len(self.reaproveitados)}")
+        if self.reaproveitados:
+            logger.info(f"       Reaproveitados: {', '.join(self.reaproveitados)}")
@@ -3,6 +3,7 @@
 Módulo responsável pela geração de relatórios em PDF.
 """
 
+import logging
 import os
 from pathlib import Path
 from fpdf import FPDF
@@ -11,7 +12,13 @@ import pandas as pd
 from typing import List, Dict
 
 # Import relativo
-from ..data_models import ConfiguracaoProjeto
+from ..data_models import ConfiguracaoProjeto, HABILIDADES_PADRAO
+from ..utils import ordenar_habilidades, prefixo_habilidade
+from .plotting import NOMES_HABILIDADE
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_PDF = "Relatorio_Otimizacao_Completo.pdf"
 
 
 class PDF(FPDF):
@@ -32,9 +39,9 @@ class PDF(FPDF):
             self.add_font('DejaVu', 'I', str(font_dir / 'DejaVuSans-Oblique.ttf'))
             self.font_family = 'DejaVu'
             self.bullet = '•'
-            print("[PDF] Fonte Unicode 'DejaVu' carregada com sucesso.")
+            logger.info("[PDF] Fonte Unicode 'DejaVu' carregada com sucesso.")
         except (FileNotFoundError, RuntimeError) as e:
-            print(f"\n[AVISO PDF] Fontes Unicode não encontradas. Usando fonte padrão. Erro: {e}\n")
+            logger.warning(f"\n[AVISO PDF] Fontes Unicode não encontradas. Usando fonte padrão. Erro: {e}\n")
 
     def header(self):
         """Cabeçalho de cada página."""
@@ -151,12 +158,13 @@ def gerar_relatorio_pdf(
         serie_temporal_df: pd.DataFrame,
         df_consolidada_instrutor: pd.DataFrame,
         contagem_instrutores_hab: Dict[str, int],
-        distribuicao_por_projeto: Dict[str, Dict[str, int]]
+        distribuicao_por_projeto: Dict[str, Dict[str, int]],
+        caminho_saida=ARQUIVO_PDF
 ):
     """
-    Gera o relatório executivo final em PDF.
+    Gera o relatório executivo final em PDF em `caminho_saida`.
     """
-    print("\n--- Gerando Relatório Executivo PDF ---")
+    logger.info("\n--- Gerando Relatório Executivo PDF ---")
 
     pdf = PDF('P', 'mm', 'A4')
     pdf.add_page()
@@ -170,8 +178,8 @@ def gerar_relatorio_pdf(
 
     total_instrutores = resultados_estagio2.get('total_instrutores_flex', 'N/A')
     spread = resultados_estagio2.get('spread_carga', 'N/A')
-    pico_prog = resultados_estagio1.get('pico_prog', 'N/A')
-    pico_rob = resultados_estagio1.get('pico_rob', 'N/A')
+    picos = resultados_estagio1.get('picos', {})
+    habilidades = ordenar_habilidades(list(HABILIDADES_PADRAO) + list(picos) + list(contagem_instrutores_hab))
 
     pdf.metric_box(
         "Total de Instrutores Necessários",
@@ -179,29 +187,32 @@ def gerar_relatorio_pdf(
         "Número total de profissionais necessários para cobrir toda a demanda do planejamento."
     )
 
-    count_prog = contagem_instrutores_hab.get('PROG', 0)
-    count_rob = contagem_instrutores_hab.get('ROBOTICA', 0)
-
     pdf.set_font(pdf.font_family, 'B', 10)
     pdf.cell(0, 6, "Detalhamento por Habilidade:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font(pdf.font_family, '', 10)
-    pdf.multi_cell(0, 5,
-                   f"  {bullet} Instrutores de Programação: {count_prog}\n"
-                   f"  {bullet} Instrutores de Robótica: {count_rob}"
-                   )
+    pdf.multi_cell(0, 5, "\n".join(
+        f"  {bullet} Instrutores de {NOMES_HABILIDADE.get(hab, hab.title())}: {contagem_instrutores_hab.get(hab, 0)}"
+        for hab in habilidades))
     pdf.ln(5)
 
-    pdf.metric_box(
-        "Pico de Demanda - Programação",
-        f"{pico_prog} Turmas/Mês",
-        "Momento de maior necessidade de instrutores de programação no planejamento."
-    )
+    for hab in habilidades:
+        nome_hab = NOMES_HABILIDADE.get(hab, hab.title())
+        pdf.metric_box(
+            f"Pico de Demanda - {nome_hab}",
+            f"{picos.get(hab, 'N/A')} Turmas/Mês",
+            f"Momento de maior necessidade de instrutores de {nome_hab.lower()} no planejamento."
+        )
 
-    pdf.metric_box(
-        "Pico de Demanda - Robótica",
-        f"{pico_rob} Turmas/Mês",
-        "Momento de maior necessidade de instrutores de robótica no planejamento."
-    )
+    picos_grupo = resultados_estagio1.get('picos_grupo')
+    if picos_grupo:
+        pdf.set_font(pdf.font_family, 'B', 10)
+        pdf.cell(0, 6, "Pico de Demanda por Laboratório (Turmas/Mês):", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font(pdf.font_family, '', 10)
+        pdf.multi_cell(0, 5, "\n".join(
+            f"  {bullet} {grupo or 'Sem laboratório'}: "
+            + " / ".join(f"{pico} {prefixo_habilidade(hab)}" for hab, pico in picos_do_grupo.items())
+            for grupo, picos_do_grupo in picos_grupo.items()))
+        pdf.ln(5)
 
     pdf.metric_box(
         "Balanceamento de Carga (Spread)",
@@ -224,6 +235,60 @@ def gerar_relatorio_pdf(
                    )
     pdf.ln(5)
 
+    curva_spread = resultados_estagio2.get('curva_spread')
+    if curva_spread:
+        pdf.set_font(pdf.font_family, 'B', 10)
+        pdf.cell(0, 6, "Relaxação Automática do Spread (spread testado: instrutores):",
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font(pdf.font_family, '', 10)
+        pdf.multi_cell(0, 5, "  " + " | ".join(
+            f"{spread}: {total if total is not None else 'sem solução'}" for spread, total in curva_spread))
+        pdf.ln(5)
+
+    comparacao_integrado = resultados_estagio2.get('comparacao_integrado')
+    if comparacao_integrado:
+        pdf.set_font(pdf.font_family, 'B', 10)
+        pdf.cell(0, 6, "Modelo Integrado (dois estágios -> integrado):", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font(pdf.font_family, '', 10)
+        rotulos = {'total_instrutores_flex': 'Instrutores', 'spread_carga': 'Spread', 'pico_max': 'Pico máximo',
+                   'tempo_segundos': 'Tempo (s; integrado = tempo extra)'}
+        pdf.multi_cell(0, 5, "\n".join(
+            f"  {bullet} {rotulos.get(metrica, metrica)}: {dois_estagios} -> "
+            f"{integrado if integrado is not None else 'sem solução'}"
+            for metrica, (dois_estagios, integrado) in comparacao_integrado.items()))
+        pdf.ln(5)
+
+    candidatos_cronograma = resultados_estagio2.get('candidatos_cronograma')
+    if candidatos_cronograma:
+        pdf.set_font(pdf.font_family, 'B', 10)
+        pdf.cell(0, 6, "Cronogramas Candidatos do Estágio 1 (avaliados no Estágio 2):",
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font(pdf.font_family, '', 10)
+        pdf.multi_cell(0, 5, "\n".join(
+            f"  {bullet} {c['candidato'].capitalize()}: pico {c['pico_max']}, "
+            + (f"{c['total_instrutores_flex']} instrutores, spread {c['spread_carga']}"
+               if c['total_instrutores_flex'] is not None else f"sem solução ({c['status_solver']})")
+            + f", {c['tempo_segundos']}s{' (escolhido)' if c['escolhido'] else ''}"
+            for c in candidatos_cronograma))
+        pdf.ln(5)
+
+    verificacao = resultados_estagio2.get('verificacao')
+    if verificacao:
+        pdf.set_font(pdf.font_family, 'B', 10)
+        pdf.cell(0, 6, "Verificação Independente do Plano "
+                       f"({'válido' if verificacao['ok'] else 'COM VIOLAÇÕES'}):",
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font(pdf.font_family, '', 10)
+        linhas = []
+        for regra in verificacao['regras']:
+            if regra.violacoes == 0:
+                linhas.append(f"  {bullet} {regra.regra}: OK")
+            else:
+                linhas.append(f"  {bullet} {regra.regra}: {regra.violacoes} violação(ões) - "
+                              f"{'; '.join(regra.exemplos)}")
+        pdf.multi_cell(0, 5, "\n".join(linhas))
+        pdf.ln(5)
+
     # ===========================
     # 3. CONFIGURAÇÃO DOS PROJETOS
     # ===========================
@@ -236,20 +301,23 @@ def gerar_relatorio_pdf(
         pdf.set_font(pdf.font_family, '', 10)
 
         # Obter distribuição de instrutores para este projeto
-        distribuicao = distribuicao_por_projeto.get(proj.nome, {'PROG': 0, 'ROBOTICA': 0})
-        total_alocado = distribuicao['PROG'] + distribuicao['ROBOTICA']
+        distribuicao = distribuicao_por_projeto.get(proj.nome, {})
+        total_alocado = sum(distribuicao.values())
 
         # Montar texto consolidado
         texto_projeto = (
             f"    - Período: {proj.data_inicio} a {proj.data_termino}\n"
             f"    - Turmas: {proj.num_turmas} | Duração: {proj.duracao_curso} meses | Ondas: {proj.ondas}\n"
-            f"    - Proporção Alvo: {proj.percentual_prog:.1f}% PROG / {proj.percentual_rob:.1f}% ROB"
+            f"    - Proporção Alvo: {proj.descricao_mix}"
         )
+        if proj.laboratorio:
+            texto_projeto += f"\n    - Laboratório: {proj.laboratorio}"
 
         if total_alocado > 0:
             texto_projeto += (
-                f"\n    - Alocação Resultante: {distribuicao['PROG']} PROG / "
-                f"{distribuicao['ROBOTICA']} ROB ({total_alocado} no total)"
+                f"\n    - Alocação Resultante: "
+                f"{' / '.join(f'{qtd} {prefixo_habilidade(hab)}' for hab, qtd in distribuicao.items())} "
+                f"({total_alocado} no total)"
             )
 
         pdf.multi_cell(0, 5, texto_projeto)
@@ -291,7 +359,7 @@ def gerar_relatorio_pdf(
         pdf.add_image_section(
             "4.4. Demanda Mensal por Habilidade",
             graficos_paths['prog_rob'],
-            "Comparação da demanda mensal entre instrutores de Programação e Robótica, "
+            "Comparação da demanda mensal de instrutores entre as habilidades do plano, "
             "com marcação dos períodos de férias."
         )
 
@@ -340,13 +408,11 @@ def gerar_relatorio_pdf(
     # ===========================
     # SALVAR PDF
     # ===========================
-    caminho_saida = "Relatorio_Otimizacao_Completo.pdf"
-
     try:
         pdf.output(caminho_saida)
-        print(f"\n✓ Relatório PDF gerado com sucesso: {caminho_saida}")
+        logger.info(f"\n✓ Relatório PDF gerado com sucesso: {caminho_saida}")
     except Exception as e:
-        print(f"\n✗ Erro ao salvar PDF: {e}")
+        logger.error(f"\n✗ Erro ao salvar PDF: {e}")
         raise
 
     return caminho_saida
\ No newline at end of file
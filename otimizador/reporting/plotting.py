@@ -15,11 +15,18 @@ import numpy as np
 import pandas as pd
 
 # Import relativo
-from ..data_models import Turma, Projeto
+from ..data_models import Turma, Projeto, HABILIDADES_PADRAO
+from ..utils import ordenar_habilidades
+
+# Cores, rótulos e colunas da série temporal por habilidade (as demais usam o próprio nome)
+CORES_HABILIDADE = ['#2E86AB', '#A23B72', '#F18F01', '#3B8B5A', '#6C5B7B', '#C73E1D']
+NOMES_HABILIDADE = {'PROG': 'Programação', 'ROBOTICA': 'Robótica'}
+COLUNAS_HABILIDADE = {'PROG': 'Programacao', 'ROBOTICA': 'Robotica'}
 
 
 def gerar_grafico_turmas_projeto_mes(turmas: List[Turma], projetos: List[Projeto], meses: List[str],
-                                     meses_ferias: List[int]) -> str:
+                                     meses_ferias: List[int],
+                                     caminho_saida: str = "grafico_turmas_projeto_mes.png") -> str:
     """
     Gera gráfico de turmas por projeto ao longo dos meses.
     """
@@ -36,7 +43,7 @@ def gerar_grafico_turmas_projeto_mes(turmas: List[Turma], projetos: List[Projeto
                 })
 
     if not dados:
-        return _gerar_grafico_vazio("Turmas por Projeto/Mês")
+        return _gerar_grafico_vazio("Turmas por Projeto/Mês", caminho_saida)
 
     df = pd.DataFrame(dados)
     df['Mes'] = pd.Categorical(df['Mes'], categories=meses, ordered=True)
@@ -56,18 +63,19 @@ def gerar_grafico_turmas_projeto_mes(turmas: List[Turma], projetos: List[Projeto
 
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    caminho = "grafico_turmas_projeto_mes.png"
+    caminho = caminho_saida
     plt.savefig(caminho, dpi=300, bbox_inches='tight')
     plt.close()
     return caminho
 
 
-def gerar_grafico_turmas_instrutor_tipologia_projeto(atribuicoes: List[Dict]) -> str:
+def gerar_grafico_turmas_instrutor_tipologia_projeto(
+        atribuicoes: List[Dict], caminho_saida: str = "grafico_turmas_instrutor_projeto.png") -> str:
     """
     Gera gráfico de turmas por instrutor e projeto. (Função já estava correta)
     """
     if not atribuicoes:
-        return _gerar_grafico_vazio("Turmas por Instrutor/Projeto")
+        return _gerar_grafico_vazio("Turmas por Instrutor/Projeto", caminho_saida)
 
     contagem = defaultdict(lambda: defaultdict(int))
     for atr in atribuicoes:
@@ -85,38 +93,51 @@ def gerar_grafico_turmas_instrutor_tipologia_projeto(atribuicoes: List[Dict]) ->
     ax.legend(title='Projetos', bbox_to_anchor=(1.05, 1), loc='upper left')
 
     plt.tight_layout()
-    caminho = "grafico_turmas_instrutor_projeto.png"
+    caminho = caminho_saida
     plt.savefig(caminho, dpi=300, bbox_inches='tight')
     plt.close()
     return caminho
 
 
-def gerar_grafico_demanda_prog_rob(turmas: List[Turma], projetos: List[Projeto], meses: List[str],
-                                   meses_ferias: List[int]) -> Tuple[str, pd.DataFrame]:
-    """
-    Gera gráfico de demanda por habilidade (PROG vs ROBOTICA).
-    """
-    demanda_prog = [0] * len(meses)
-    demanda_rob = [0] * len(meses)
+def _cor_habilidade(habilidades: List[str], habilidade: str) -> str:
+    """Cor fixa de cada habilidade na ordem do plano (PROG e ROBOTICA mantêm as cores originais)."""
+    return CORES_HABILIDADE[habilidades.index(habilidade) % len(CORES_HABILIDADE)]
+
+
+def calcular_serie_demanda(turmas: List[Turma], meses: List[str]) -> Tuple[Dict[str, List[int]], pd.DataFrame]:
+    """Turmas ativas por habilidade e mês: ({habilidade: série}, tabela da série temporal do relatório)."""
+    habilidades = ordenar_habilidades(list(HABILIDADES_PADRAO) + [t.habilidade for t in turmas])
+    demanda = {hab: [0] * len(meses) for hab in habilidades}
 
     for turma in turmas:
         duracao = turma.duracao
 
         for mes_idx in range(turma.mes_inicio, turma.mes_inicio + duracao):
             if mes_idx < len(meses):
-                if turma.habilidade == 'PROG':
-                    demanda_prog[mes_idx] += 1
-                else:
-                    demanda_rob[mes_idx] += 1
+                demanda[turma.habilidade][mes_idx] += 1
 
-    df_serie = pd.DataFrame({'Mes': meses, 'Programacao': demanda_prog, 'Robotica': demanda_rob,
-                             'Total': [p + r for p, r in zip(demanda_prog, demanda_rob)]})
+    df_serie = pd.DataFrame({'Mes': meses, **{COLUNAS_HABILIDADE.get(hab, hab.title()): demanda[hab]
+                                              for hab in habilidades},
+                             'Total': [sum(valores) for valores in zip(*demanda.values())]})
+    return demanda, df_serie
+
+
+def gerar_grafico_demanda_prog_rob(turmas: List[Turma], projetos: List[Projeto], meses: List[str],
+                                   meses_ferias: List[int],
+                                   caminho_saida: str = "grafico_demanda_prog_rob.png") -> Tuple[str, pd.DataFrame]:
+    """
+    Gera gráfico de demanda por habilidade (uma série por habilidade do plano).
+    """
+    demanda, df_serie = calcular_serie_demanda(turmas, meses)
+    habilidades = list(demanda)
 
     fig, ax = plt.subplots(figsize=(16, 8))
     x = np.arange(len(meses))
-    largura = 0.35
-    ax.bar(x - largura / 2, demanda_prog, largura, label='Programação', color='#2E86AB')
-    ax.bar(x + largura / 2, demanda_rob, largura, label='Robótica', color='#A23B72')
+    largura = 0.7 / len(habilidades)
+    for idx, hab in enumerate(habilidades):
+        deslocamento = (idx - (len(habilidades) - 1) / 2) * largura
+        ax.bar(x + deslocamento, demanda[hab], largura, label=NOMES_HABILIDADE.get(hab, hab.title()),
+               color=_cor_habilidade(habilidades, hab))
 
     ax.set_xlabel('Mês', fontsize=12, fontweight='bold')
     ax.set_ylabel('Número de Turmas Ativas', fontsize=12, fontweight='bold')
@@ -135,18 +156,19 @@ def gerar_grafico_demanda_prog_rob(turmas: List[Turma], projetos: List[Projeto],
     ax.legend(handles=handles)
 
     plt.tight_layout()
-    caminho = "grafico_demanda_prog_rob.png"
+    caminho = caminho_saida
     plt.savefig(caminho, dpi=300, bbox_inches='tight')
     plt.close()
     return caminho, df_serie
 
 
-def gerar_grafico_carga_por_instrutor(atribuicoes: List[Dict]) -> str:
+def gerar_grafico_carga_por_instrutor(atribuicoes: List[Dict],
+                                      caminho_saida: str = "grafico_carga_instrutor.png") -> str:
     """
     Gera gráfico de carga de trabalho por instrutor. (Função já estava correta)
     """
     if not atribuicoes:
-        return _gerar_grafico_vazio("Carga por Instrutor")
+        return _gerar_grafico_vazio("Carga por Instrutor", caminho_saida)
 
     carga = defaultdict(int)
     habilidades = {}
@@ -157,7 +179,8 @@ def gerar_grafico_carga_por_instrutor(atribuicoes: List[Dict]) -> str:
 
     instrutores_ordenados = sorted(carga.keys(), key=lambda x: carga[x], reverse=True)
     cargas_ordenadas = [carga[inst] for inst in instrutores_ordenados]
-    cores = ['#2E86AB' if habilidades[inst] == 'PROG' else '#A23B72' for inst in instrutores_ordenados]
+    ordem_habilidades = ordenar_habilidades(list(HABILIDADES_PADRAO) + list(habilidades.values()))
+    cores = [_cor_habilidade(ordem_habilidades, habilidades[inst]) for inst in instrutores_ordenados]
 
     fig, ax = plt.subplots(figsize=(14, max(8, len(instrutores_ordenados) * 0.3)))
     barras = ax.barh(instrutores_ordenados, cargas_ordenadas, color=cores, edgecolor='black', linewidth=0.5)
@@ -172,12 +195,11 @@ def gerar_grafico_carga_por_instrutor(atribuicoes: List[Dict]) -> str:
         ax.text(largura + 0.3, barra.get_y() + barra.get_height() / 2, str(int(carga_val)), va='center', fontsize=9,
                 fontweight='bold')
 
-    prog_patch = mpatches.Patch(color='#2E86AB', label='Programação')
-    rob_patch = mpatches.Patch(color='#A23B72', label='Robótica')
-    ax.legend(handles=[prog_patch, rob_patch])
+    ax.legend(handles=[mpatches.Patch(color=_cor_habilidade(ordem_habilidades, hab),
+                                      label=NOMES_HABILIDADE.get(hab, hab.title())) for hab in ordem_habilidades])
 
     plt.tight_layout()
-    caminho = "grafico_carga_instrutor.png"
+    caminho = caminho_saida
     plt.savefig(caminho, dpi=300, bbox_inches='tight')
     plt.close()
     return caminho
@@ -1,5 +1,6 @@
 # ARQUIVO: otimizador/reporting/spreadsheets.py
 
+import logging
 from collections import defaultdict
 from typing import List, Dict
 import pandas as pd
@@ -8,10 +9,17 @@ import pandas as pd
 from ..data_models import Turma, Instrutor
 from ..utils import calcular_meses_ativos
 
+logger = logging.getLogger(__name__)
 
-def gerar_planilha_detalhada(atribuicoes: List[Dict], meses: List[str], meses_ferias: List[int]) -> pd.DataFrame:
+ARQUIVO_DETALHADA = '1_carga_horaria_detalhada.xlsx'
+ARQUIVO_CONSOLIDADA = '2_consolidado_instrutor_projeto.xlsx'
+ARQUIVO_DIFERENCAS = '3_diferencas_replanejamento.xlsx'
+
+
+def gerar_planilha_detalhada(atribuicoes: List[Dict], meses: List[str], meses_ferias: List[int],
+                             caminho=ARQUIVO_DETALHADA) -> pd.DataFrame:
     """Gera planilha detalhada com a carga horária."""
-    print("\n--- Gerando Planilha Detalhada ---")
+    logger.info("\n--- Gerando Planilha Detalhada ---")
     if not atribuicoes: return pd.DataFrame()
 
     carga_data = []
@@ -21,19 +29,21 @@ def gerar_planilha_detalhada(atribuicoes: List[Dict], meses: List[str], meses_fe
         for mes_idx in calcular_meses_ativos(turma.mes_inicio, turma.duracao, meses_ferias, num_meses):
             carga_data.append({
                 "Instrutor": instrutor.id, "Mes": meses[mes_idx], "Habilidade": instrutor.habilidade,
-                "Projeto": turma.projeto, "Turma_ID": turma.id, "Carga": 1
+                "Projeto": turma.projeto, "Turma_ID": turma.id, "Carga": 1,
+                **({"Laboratorio": turma.laboratorio} if turma.laboratorio else {})
             })
 
     if not carga_data: return pd.DataFrame()
     df = pd.DataFrame(carga_data).sort_values(by=["Instrutor", "Mes"])
-    df.to_excel('1_carga_horaria_detalhada.xlsx', index=False, engine='openpyxl')
-    print("Planilha salva: '1_carga_horaria_detalhada.xlsx'")
+    df.to_excel(caminho, index=False, engine='openpyxl')
+    logger.info(f"Planilha salva: '{caminho}'")
     return df
 
 
-def gerar_planilha_consolidada_instrutor(atribuicoes: List[Dict]) -> pd.DataFrame:
-    """Gera planilha consolidada por instrutor e projeto."""
-    print("\n--- Gerando Planilha Consolidada por Instrutor ---")
+def gerar_planilha_consolidada_instrutor(atribuicoes: List[Dict], salvar: bool = True,
+                                         caminho=ARQUIVO_CONSOLIDADA) -> pd.DataFrame:
+    """Gera planilha consolidada por instrutor e projeto (com `salvar=False`, só a tabela, sem gravar o XLSX)."""
+    logger.info("\n--- Gerando Planilha Consolidada por Instrutor ---")
     if not atribuicoes: return pd.DataFrame()
 
     dados = defaultdict(lambda: defaultdict(int))
@@ -49,6 +59,20 @@ def gerar_planilha_consolidada_instrutor(atribuicoes: List[Dict]) -> pd.DataFram
         rows.append(row)
 
     df = pd.DataFrame(rows)
-    df.to_excel('2_consolidado_instrutor_projeto.xlsx', index=False, engine='openpyxl')
-    print("Planilha salva: '2_consolidado_instrutor_projeto.xlsx'")
-    return df
\ No newline at end of file
+    if salvar:
+        df.to_excel(caminho, index=False, engine='openpyxl')
+        logger.info(f"Planilha salva: '{caminho}'")
+    return df
+
+def gerar_planilha_diferencas_replanejamento(diferencas: List[Dict], caminho=ARQUIVO_DIFERENCAS) -> pd.DataFrame:
+    """Gera planilha com as turmas novas, reatribuídas e removidas em relação ao plano anterior."""
+    logger.info("\n--- Gerando Planilha de Diferenças do Replanejamento ---")
+    colunas = ["Situacao", "Projeto", "Habilidade", "Mes_Inicio", "Turma_ID", "Instrutor_Anterior", "Instrutor_Novo"]
+    df = pd.DataFrame([{
+        "Situacao": d['situacao'], "Projeto": d['projeto'], "Habilidade": d['habilidade'],
+        "Mes_Inicio": d['mes_inicio'], "Turma_ID": d['turma_id'], "Instrutor_Anterior": d['instrutor_anterior'],
+        "Instrutor_Novo": d['instrutor_novo']
+    } for d in diferencas], columns=colunas)
+    df.to_excel(caminho, index=False, engine='openpyxl')
+    logger.info(f"Planilha salva: '{caminho}' ({len(df)} alterações)")
+    return df
@@ -1,11 +1,29 @@
 # ARQUIVO: otimizador/utils.py
 
+import logging
+import os
 from datetime import datetime, timedelta
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterable
 from collections import defaultdict
 
 # Import relativo para acessar os modelos de dados
-from .data_models import Projeto, ConfiguracaoProjeto, ParametrosOtimizacao, Instrutor
+from .data_models import (Projeto, ConfiguracaoProjeto, ParametrosOtimizacao, Instrutor, HABILIDADES_PADRAO,
+                          PREFIXOS_HABILIDADE)
+
+logger = logging.getLogger(__name__)
+
+# Limite de threads de solver por execução (definido pelo servidor de jobs para dividir a máquina)
+VARIAVEL_LIMITE_THREADS = 'OTIMIZADOR_MAX_THREADS'
+
+
+def nucleos_disponiveis(limite: int = 0) -> int:
+    """
+    Núcleos que a execução pode ocupar: o limite de OTIMIZADOR_MAX_THREADS, se definido, ou todos os da
+    máquina; `limite` (ParametrosOtimizacao.threads_solver, 0 = sem limite) reduz ainda mais.
+    """
+    limite_ambiente = os.environ.get(VARIAVEL_LIMITE_THREADS)
+    nucleos = max(1, int(limite_ambiente)) if limite_ambiente else (os.cpu_count() or 1)
+    return min(nucleos, limite) if limite > 0 else nucleos
 
 
 def gerar_lista_meses(data_inicio: str, data_fim: str) -> List[str]:
@@ -28,6 +46,16 @@ def gerar_lista_meses(data_inicio: str, data_fim: str) -> List[str]:
     return lista_meses
 
 
+def posicao_calendario_mes(mes: str) -> int:
+    """Posição de um mês 'Abr/26' no calendário (ano * 12 + mês), também para meses fora do horizonte."""
+    meses_nomes = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+    try:
+        nome, ano = str(mes).split('/')
+        return int(ano) * 12 + meses_nomes.index(nome)
+    except ValueError:
+        raise ValueError(f"Mês inválido: {mes!r}. Use o formato 'Abr/26'.") from None
+
+
 def data_para_indice_mes(data: str, meses: List[str]) -> int:
     """Converte data para índice na lista de meses."""
     try:
@@ -52,80 +80,125 @@ def calcular_meses_ativos(mes_inicio: int, duracao: int, meses_ferias: List[int]
     return meses_ativos
 
 
-def calcular_janela_inicio(mes_inicio_projeto: int, mes_fim_projeto: int, duracao: int, meses_ferias: List[int],
-                           num_meses: int, meses: List[str]) -> Tuple[int, int]:
-    """Calcula a janela válida de início garantindo término dentro do prazo."""
+def buscar_janela_inicio(mes_inicio_projeto: int, mes_fim_projeto: int, duracao: int, meses_ferias: List[int],
+                         num_meses: int) -> Tuple[int, int]:
+    """Busca a janela válida de início sem validar nem exibir. Retorna (-1, -1) se não houver."""
     inicio_min, inicio_max = -1, -1
     for m_inicio in range(mes_inicio_projeto, min(mes_fim_projeto + 1, num_meses)):
         meses_ativos = calcular_meses_ativos(m_inicio, duracao, meses_ferias, num_meses)
         if len(meses_ativos) == duracao and max(meses_ativos) <= mes_fim_projeto:
             if inicio_min == -1: inicio_min = m_inicio
             inicio_max = m_inicio
+    return inicio_min, inicio_max
 
+
+def calcular_janela_inicio(mes_inicio_projeto: int, mes_fim_projeto: int, duracao: int, meses_ferias: List[int],
+                           num_meses: int, meses: List[str]) -> Tuple[int, int]:
+    """Calcula a janela válida de início garantindo término dentro do prazo."""
+    inicio_min, inicio_max = buscar_janela_inicio(mes_inicio_projeto, mes_fim_projeto, duracao, meses_ferias,
+                                                  num_meses)
     if inicio_min == -1:
         raise ValueError("Não há janela válida de início para um dos projetos. Verifique durações e prazos.")
-    print(f"   Janela de início calculada: {meses[inicio_min]} a {meses[inicio_max]}")
+    logger.info(f"   Janela de início calculada: {meses[inicio_min]} a {meses[inicio_max]}")
     return inicio_min, inicio_max
 
 
-def calcular_turmas_por_projeto(limite_total: int, percentual_prog: float) -> Tuple[int, int]:
-    """Calcula número de turmas PROG e ROB baseado nos percentuais."""
-    num_prog = round(limite_total * percentual_prog / 100)
-    return num_prog, limite_total - num_prog
+def prefixo_habilidade(habilidade: str) -> str:
+    """Prefixo dos IDs de instrutor renumerados ('PROG_1', 'ROB_2', 'MAKER_1')."""
+    return PREFIXOS_HABILIDADE.get(habilidade, habilidade)
+
+
+def nome_instrutor(habilidade: str, laboratorio_id, numero: int) -> str:
+    """ID de instrutor das planilhas: 'PROG_3', ou 'LabA_PROG_3' quando o instrutor é de um laboratório."""
+    prefixo = '' if laboratorio_id is None else f'{laboratorio_id}_'
+    return f'{prefixo}{prefixo_habilidade(habilidade)}_{numero}'
+
+
+def habilidade_canonica(nome: str) -> str:
+    """Nome da habilidade a partir do nome ou do prefixo ('ROB' -> 'ROBOTICA'), em maiúsculas."""
+    nome = str(nome).strip().upper()
+    return next((hab for hab, prefixo in PREFIXOS_HABILIDADE.items() if prefixo == nome), nome)
+
+
+def ordenar_habilidades(habilidades: Iterable[str]) -> List[str]:
+    """Habilidades distintas em ordem estável: as padrão (PROG, ROBOTICA) primeiro, depois alfabética."""
+    distintas = set(habilidades)
+    return ([h for h in HABILIDADES_PADRAO if h in distintas] +
+            sorted(h for h in distintas if h not in HABILIDADES_PADRAO))
+
+
+def calcular_turmas_por_habilidade(limite_total: int, mix: Dict[str, float]) -> Dict[str, int]:
+    """
+    Reparte as turmas entre as habilidades pelos percentuais do mix. O arredondamento é feito
+    sobre o percentual acumulado, então o total é sempre preservado (PROG = round(total * %PROG)).
+    """
+    turmas, acumulado, atribuidas = {}, 0.0, 0
+    for hab, pct in mix.items():
+        acumulado += pct
+        limite = min(limite_total, round(limite_total * acumulado / 100))
+        turmas[hab] = max(0, limite - atribuidas)
+        atribuidas += turmas[hab]
+    if mix: turmas[hab] += limite_total - atribuidas
+    return turmas
 
 
 def converter_projetos_para_modelo(projetos_config: List[ConfiguracaoProjeto], meses: List[str],
                                    meses_ferias: List[int], parametros: ParametrosOtimizacao) -> List[Projeto]:
     """Converte configurações de projetos para estrutura do modelo."""
-    print("\n" + "=" * 80 + "\nCONVERSÃO DE PROJETOS PARA MODELO\n" + "=" * 80)
+    logger.info("\n" + "=" * 80 + "\nCONVERSÃO DE PROJETOS PARA MODELO\n" + "=" * 80)
     projetos_modelo = []
     for config in projetos_config:
-        print(f"\nProcessando {config.nome} (PROG: {config.percentual_prog:.1f}% / ROB: {config.percentual_rob:.1f}%)")
+        logger.info(f"\nProcessando {config.nome} ({config.descricao_mix})"
+                    + (f" | Laboratório: {config.laboratorio}" if config.laboratorio else ""))
         config.mes_inicio_idx = data_para_indice_mes(config.data_inicio, meses)
         config.mes_termino_idx = data_para_indice_mes(config.data_termino, meses)
         inicio_min, inicio_max = calcular_janela_inicio(config.mes_inicio_idx, config.mes_termino_idx,
                                                         config.duracao_curso, meses_ferias, len(meses), meses)
 
-        prog_total, rob_total = calcular_turmas_por_projeto(config.num_turmas, config.percentual_prog)
+        totais = calcular_turmas_por_habilidade(config.num_turmas, config.habilidades)
+        resumo_totais = ", ".join(f"{prefixo_habilidade(hab)}: {qtd}" for hab, qtd in totais.items())
 
-        print(f"   Total: {config.num_turmas} turmas (PROG: {prog_total}, ROB: {rob_total}) | Ondas: {config.ondas}")
+        logger.info(f"   Total: {config.num_turmas} turmas ({resumo_totais}) | Ondas: {config.ondas}")
 
         if config.ondas == 1:
             projetos_modelo.append(
-                Projeto(config.nome, prog_total, rob_total, config.duracao_curso, inicio_min, inicio_max,
-                        config.mes_termino_idx))
+                Projeto(config.nome, totais, config.duracao_curso, inicio_min, inicio_max, config.mes_termino_idx,
+                        config.laboratorio))
         else:
-            prog_por_onda, rob_por_onda = prog_total // config.ondas, rob_total // config.ondas
             for onda_idx in range(config.ondas):
-                prog_onda = prog_total - (
-                            prog_por_onda * (config.ondas - 1)) if onda_idx == config.ondas - 1 else prog_por_onda
-                rob_onda = rob_total - (
-                            rob_por_onda * (config.ondas - 1)) if onda_idx == config.ondas - 1 else rob_por_onda
+                # A última onda recebe o resto da divisão de cada habilidade
+                ultima = onda_idx == config.ondas - 1
+                turmas_onda = {hab: total - (total // config.ondas) * (config.ondas - 1) if ultima
+                               else total // config.ondas for hab, total in totais.items()}
                 nome_onda = f"{config.nome}_Onda{onda_idx + 1}"
                 projetos_modelo.append(
-                    Projeto(nome_onda, prog_onda, rob_onda, config.duracao_curso, inicio_min, inicio_max,
-                            config.mes_termino_idx))
-                print(f"   - {nome_onda}: {prog_onda} PROG, {rob_onda} ROB")
-    print("=" * 80)
+                    Projeto(nome_onda, turmas_onda, config.duracao_curso, inicio_min, inicio_max,
+                            config.mes_termino_idx, config.laboratorio))
+                logger.info(f"   - {nome_onda}: " + ", ".join(f"{qtd} {prefixo_habilidade(hab)}"
+                                                              for hab, qtd in turmas_onda.items()))
+    logger.info("=" * 80)
     return projetos_modelo
 
 
 def renumerar_instrutores_ativos(atribuicoes: List[Dict]) -> Tuple[List[Dict], Dict[str, int]]:
     """Renumera apenas os instrutores que receberam turmas e retorna a contagem por habilidade."""
-    print("\n--- Renumerando Instrutores Ativos ---")
+    logger.info("\n--- Renumerando Instrutores Ativos ---")
+    ordem = {hab: idx for idx, hab in enumerate(ordenar_habilidades(atr['instrutor'].habilidade
+                                                                    for atr in atribuicoes))}
     instrutores_usados = sorted(list(set(atr['instrutor'] for atr in atribuicoes)),
-                                key=lambda i: (i.habilidade, int(i.id.split('_')[1])))
-    mapeamento, contador_por_hab = {}, defaultdict(int)
+                                key=lambda i: (i.laboratorio_id is not None, i.laboratorio_id or '',
+                                               ordem[i.habilidade], int(i.id.rsplit('_', 1)[1])))
+    mapeamento, contador_por_hab, contador_por_pool = {}, defaultdict(int), defaultdict(int)
 
     for inst_antigo in instrutores_usados:
         hab = inst_antigo.habilidade
         contador_por_hab[hab] += 1
-        prefixo = 'PROG' if hab == 'PROG' else 'ROB'
-        novo_id = f'{prefixo}_{contador_por_hab[hab]}'
+        contador_por_pool[(inst_antigo.laboratorio_id, hab)] += 1
+        novo_id = nome_instrutor(hab, inst_antigo.laboratorio_id, contador_por_pool[(inst_antigo.laboratorio_id, hab)])
         mapeamento[inst_antigo.id] = Instrutor(novo_id, hab, inst_antigo.capacidade, inst_antigo.laboratorio_id)
 
-    print("Contagem final de instrutores por habilidade:")
-    for hab, count in sorted(contador_por_hab.items()): print(f"   • {hab}: {count} instrutores")
+    logger.info("Contagem final de instrutores por habilidade:")
+    for hab, count in sorted(contador_por_hab.items()): logger.info(f"   • {hab}: {count} instrutores")
 
     atribuicoes_renumeradas = [{'turma': atr['turma'], 'instrutor': mapeamento[atr['instrutor'].id]} for atr in
                                atribuicoes]
@@ -148,12 +221,10 @@ def analisar_distribuicao_instrutores_por_projeto(atribuicoes: List[Dict]) -> Di
         # Adiciona o ID do instrutor ao set daquele projeto/habilidade
         instrutores_vistos[projeto_base_nome][instrutor.habilidade].add(instrutor.id)
 
-    # Converte os sets para contagens (len)
+    # Converte os sets para contagens (len), com todas as habilidades do plano em cada projeto
+    habilidades = ordenar_habilidades(atr['instrutor'].habilidade for atr in atribuicoes)
     contagem_final = {
-        proj: {
-            'PROG': len(hab_sets.get('PROG', set())),
-            'ROBOTICA': len(hab_sets.get('ROBOTICA', set()))
-        }
+        proj: {hab: len(hab_sets.get(hab, set())) for hab in habilidades}
         for proj, hab_sets in instrutores_vistos.items()
     }
     return contagem_final
\ No newline at end of file
@@ -0,0 +1,381 @@
+# ARQUIVO: servidor.py
+"""
+Servidor local de jobs de otimização (HTTP só em 127.0.0.1, apenas biblioteca padrão).
+
+Planejadores que dividem a mesma máquina enviam a configuração (o mesmo JSON salvo em
+configuracoes_otimizacao/) em vez de rodar main.py cada um no seu terminal. Cada job roda o pipeline
+completo em um processo próprio: no máximo --jobs rodam ao mesmo tempo, os demais esperam em fila
+(ordem de chegada), e cada job usa no máximo --threads threads de solver (padrão: núcleos / jobs).
+Submissões idênticas (mesma configuração depois de validada) viram um único job.
+
+Rotas:
+  POST   /jobs                       configuração JSON -> resumo do job (202 novo, 200 se já existia)
+  GET    /jobs                       resumo de todos os jobs
+  GET    /jobs/<id>                  estado, posição na fila e arquivos gerados
+  GET    /jobs/<id>/progresso        log do job em tempo real (chunked; termina junto com o job)
+  GET    /jobs/<id>/arquivos/<nome>  PDF ou planilha gerada
+  DELETE /jobs/<id>                  cancela o job (na fila ou em execução)
+
+Uso: python servidor.py [--porta 8765] [--jobs 2] [--threads N] [--diretorio resultados_servidor]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from otimizador import registro
+from otimizador.io import config_manager, historico_execucoes
+from otimizador.utils import VARIAVEL_LIMITE_THREADS, nucleos_disponiveis
+
+HOST = '127.0.0.1'
+ARQUIVO_CONFIG = 'configuracao.json'
+ARQUIVO_LOG = 'progresso.log'
+# Arquivos que o job pode servir (gerados no diretório do job pelo pipeline do main.py)
+TIPOS_ARQUIVO = {
+    '.pdf': 'application/pdf',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+ESTADOS_FINAIS = ('concluido', 'falhou', 'cancelado')
+INTERVALO_CONSULTA = 0.5  # segundos entre verificações do processo e do log
+TAMANHO_MAX_CORPO = 5 * 1024 * 1024
+
+
+class ErroHttp(Exception):
+    """Erro a devolver ao cliente com o status HTTP correspondente."""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+@dataclass
+class Job:
+    """Job de otimização: uma configuração, seu diretório de saída e o processo que a resolve."""
+    id: str
+    diretorio: Path
+    estado: str = 'na_fila'  # na_fila, executando, concluido, falhou ou cancelado
+    criado_em: float = field(default_factory=time.time)
+    iniciado_em: Optional[float] = None
+    finalizado_em: Optional[float] = None
+    codigo_saida: Optional[int] = None
+    processo: Optional[multiprocessing.process.BaseProcess] = field(default=None, repr=False)
+
+    def arquivos(self) -> List[str]:
+        """Arquivos gerados que podem ser baixados."""
+        if not self.diretorio.is_dir(): return []
+        return sorted(p.name for p in self.diretorio.iterdir() if p.suffix in TIPOS_ARQUIVO)
+
+
+def chave_configuracao(config_data: Dict) -> Tuple[str, Dict]:
+    """
+    Valida a configuração e devolve (hash, configuração normalizada). O hash é calculado sobre a
+    configuração já validada, então diferenças só de formato (ordem das chaves, 'ROB' x 'ROBOTICA',
+    campos omitidos com valor padrão) não criam jobs distintos; perfil e threads do solver, sim.
+    """
+    parametros, projetos = config_manager.configuracao_de_dict(config_data)
+    return (config_manager.chave_configuracao(parametros, projetos, incluir_execucao=True),
+            config_manager.configuracao_para_dict(parametros, projetos))
+
+
+def _executar_job(diretorio: str, threads: int):
+    """Processo do job: roda o pipeline do main.py no diretório do job, com a saída em progresso.log."""
+    # Grupo de processos próprio: o cancelamento encerra também os subprocessos dos estágios
+    if hasattr(os, 'setsid'): os.setsid()
+    os.environ[VARIAVEL_LIMITE_THREADS] = str(threads)
+    os.environ['MPLBACKEND'] = 'Agg'
+    # Um histórico só para todos os jobs, na raiz do diretório do servidor
+    os.environ.setdefault(historico_execucoes.VARIAVEL_HISTORICO,
+                          str(Path(diretorio).resolve().parent / historico_execucoes.ARQUIVO_HISTORICO.name))
+    os.chdir(diretorio)
+
+    # Redireciona os descritores 1 e 2 para que a saída dos subprocessos também vá para o log
+    log = open(ARQUIVO_LOG, 'a', encoding='utf-8')
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    sys.stdout.reconfigure(encoding='utf-8', line_buffering=True)
+    sys.stderr.reconfigure(encoding='utf-8', line_buffering=True)
+    registro.configurar_console()
+
+    try:
+        import main as pipeline
+        with open(ARQUIVO_CONFIG, 'r', encoding='utf-8') as f:
+            parametros, projetos = config_manager.configuracao_de_dict(json.load(f))
+        pipeline.executar_otimizacao(parametros, projetos)
+    except Exception as e:
+        print(f"\n[ERRO CRÍTICO] {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+
+def _encerrar_processo(processo: multiprocessing.process.BaseProcess):
+    """Encerra o processo do job e os subprocessos que ele criou."""
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(processo.pid, signal.SIGTERM)
+            return
+    except (ProcessLookupError, PermissionError):
+        pass
+    processo.terminate()
+
+
+class ServidorJobs:
+    """Fila de jobs com no máximo `max_jobs` processos simultâneos de `threads` threads cada."""
+
+    def __init__(self, diretorio: Path, max_jobs: int, threads: int):
+        self.diretorio = diretorio
+        self.max_jobs = max_jobs
+        self.threads = threads
+        self.jobs: Dict[str, Job] = {}
+        self.vagas = asyncio.Semaphore(max_jobs)
+        self._tarefas = set()  # referências às tarefas em andamento (o loop só guarda referências fracas)
+        self.contexto = multiprocessing.get_context('spawn')
+
+    # ----------------------------------------------------------------- jobs
+
+    def submeter(self, config_data: Dict) -> Tuple[Job, bool]:
+        """Cria o job da configuração, ou devolve o job idêntico existente (segundo valor True)."""
+        chave, normalizada = chave_configuracao(config_data)
+        job_id = chave[:16]
+        existente = self.jobs.get(job_id)
+        if existente and existente.estado not in ('falhou', 'cancelado'):
+            return existente, True
+
+        diretorio = self.diretorio / job_id
+        diretorio.mkdir(parents=True, exist_ok=True)
+        (diretorio / ARQUIVO_LOG).write_text('', encoding='utf-8')
+        with open(diretorio / ARQUIVO_CONFIG, 'w', encoding='utf-8') as f:
+            json.dump(normalizada, f, indent=2, ensure_ascii=False)
+
+        job = Job(id=job_id, diretorio=diretorio)
+        self.jobs[job_id] = job
+        tarefa = asyncio.create_task(self._rodar(job))
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+        print(f"[INFO] Job {job_id} na fila ({len(normalizada['projetos'])} projetos)")
+        return job, False
+
+    async def _rodar(self, job: Job):
+        """Espera uma vaga, roda o job em um processo próprio e registra o resultado."""
+        async with self.vagas:
+            if job.estado == 'cancelado': return
+            job.processo = self.contexto.Process(target=_executar_job, args=(str(job.diretorio), self.threads),
+                                                 name=f'job-{job.id}')
+            job.processo.start()
+            job.estado, job.iniciado_em = 'executando', time.time()
+            print(f"[INFO] Job {job.id} iniciado (pid {job.processo.pid}, {self.threads} threads)")
+
+            while job.processo.exitcode is None:
+                await asyncio.sleep(INTERVALO_CONSULTA)
+
+            job.codigo_saida, job.finalizado_em = job.processo.exitcode, time.time()
+            if job.estado != 'cancelado':
+                job.estado = 'concluido' if job.codigo_saida == 0 else 'falhou'
+            marcador = '[✓]' if job.estado == 'concluido' else '[✗]'
+            print(f"{marcador} Job {job.id} {job.estado} em {job.finalizado_em - job.iniciado_em:.1f}s")
+
+    def cancelar(self, job: Job) -> bool:
+        """Cancela um job na fila ou em execução. False se ele já tinha terminado."""
+        if job.estado in ESTADOS_FINAIS: return False
+        executando = job.estado == 'executando'
+        job.estado = 'cancelado'
+        if executando:
+            _encerrar_processo(job.processo)
+        else:
+            job.finalizado_em = time.time()
+        print(f"[!] Job {job.id} cancelado")
+        return True
+
+    def encerrar(self):
+        """Cancela todos os jobs pendentes (ao desligar o servidor)."""
+        for job in self.jobs.values():
+            self.cancelar(job)
+
+    def resumo(self, job: Job) -> Dict:
+        """Estado do job para a resposta JSON."""
+        fila = sorted((j for j in self.jobs.values() if j.estado == 'na_fila'), key=lambda j: j.criado_em)
+        return {
+            "id": job.id,
+            "estado": job.estado,
+            "posicao_fila": fila.index(job) + 1 if job in fila else None,
+            "criado_em": job.criado_em,
+            "iniciado_em": job.iniciado_em,
+            "finalizado_em": job.finalizado_em,
+            "codigo_saida": job.codigo_saida,
+            "threads": self.threads,
+            "arquivos": job.arquivos(),
+        }
+
+    # ----------------------------------------------------------------- HTTP
+
+    async def atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atende uma conexão HTTP (uma requisição por conexão)."""
+        try:
+            metodo, caminho, corpo = await _ler_requisicao(reader)
+            await self._rotear(metodo, caminho, corpo, writer)
+        except ErroHttp as e:
+            await _responder_json(writer, e.status, {"erro": e.mensagem})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _rotear(self, metodo: str, caminho: str, corpo: bytes, writer: asyncio.StreamWriter):
+        partes = [unquote(p) for p in urlsplit(caminho).path.strip('/').split('/') if p]
+        if not partes or partes[0] != 'jobs':
+            raise ErroHttp(404, "Rota inexistente")
+
+        if len(partes) == 1:
+            if metodo == 'GET':
+                jobs = sorted(self.jobs.values(), key=lambda j: j.criado_em)
+                return await _responder_json(writer, 200, [self.resumo(j) for j in jobs])
+            if metodo == 'POST':
+                try:
+                    config_data = json.loads(corpo.decode('utf-8'))
+                    job, duplicado = self.submeter(config_data)
+                except (UnicodeDecodeError, json.JSONDecodeError, AttributeError, TypeError, ValueError) as e:
+                    raise ErroHttp(400, f"Configuração inválida: {e}")
+                return await _responder_json(writer, 200 if duplicado else 202,
+                                             {**self.resumo(job), "duplicado": duplicado})
+            raise ErroHttp(405, "Use GET ou POST em /jobs")
+
+        job = self.jobs.get(partes[1])
+        if job is None:
+            raise ErroHttp(404, f"Job {partes[1]} não encontrado")
+
+        if len(partes) == 2:
+            if metodo == 'GET':
+                return await _responder_json(writer, 200, self.resumo(job))
+            if metodo == 'DELETE':
+                if not self.cancelar(job):
+                    raise ErroHttp(409, f"Job {job.id} já terminou ({job.estado})")
+                return await _responder_json(writer, 200, self.resumo(job))
+            raise ErroHttp(405, "Use GET ou DELETE em /jobs/<id>")
+
+        if metodo != 'GET':
+            raise ErroHttp(405, "Use GET")
+        if len(partes) == 3 and partes[2] == 'progresso':
+            return await self._transmitir_progresso(job, writer)
+        if len(partes) == 4 and partes[2] == 'arquivos':
+            return await _responder_arquivo(writer, job, partes[3])
+        raise ErroHttp(404, "Rota inexistente")
+
+    async def _transmitir_progresso(self, job: Job, writer: asyncio.StreamWriter):
+        """Envia o log do job em blocos (chunked) conforme ele cresce, até o job terminar."""
+        writer.write(_cabecalho(200, 'text/plain; charset=utf-8', {'Transfer-Encoding': 'chunked'}))
+        posicao = 0
+        while True:
+            finalizado = job.estado in ESTADOS_FINAIS and (job.processo is None or job.processo.exitcode is not None)
+            with open(job.diretorio / ARQUIVO_LOG, 'rb') as f:
+                f.seek(posicao)
+                bloco = f.read()
+            if bloco:
+                posicao += len(bloco)
+                writer.write(f"{len(bloco):x}\r\n".encode() + bloco + b"\r\n")
+                await writer.drain()
+            elif finalizado:
+                break
+            else:
+                await asyncio.sleep(INTERVALO_CONSULTA)
+        fim = f"\n[{job.estado.upper()}]\n".encode('utf-8')
+        writer.write(f"{len(fim):x}\r\n".encode() + fim + b"\r\n0\r\n\r\n")
+        await writer.drain()
+
+
+async def _ler_requisicao(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    """Lê linha de requisição, cabeçalhos e corpo (Content-Length)."""
+    linha = (await reader.readline()).decode('latin-1').split()
+    if len(linha) != 3:
+        raise ErroHttp(400, "Requisição malformada")
+    metodo, caminho, _ = linha
+
+    cabecalhos = {}
+    while True:
+        cabecalho = (await reader.readline()).decode('latin-1').strip()
+        if not cabecalho: break
+        nome, _, valor = cabecalho.partition(':')
+        cabecalhos[nome.strip().lower()] = valor.strip()
+
+    try:
+        tamanho = int(cabecalhos.get('content-length', 0))
+    except ValueError:
+        raise ErroHttp(400, "Content-Length inválido")
+    if tamanho > TAMANHO_MAX_CORPO:
+        raise ErroHttp(413, "Configuração grande demais")
+    corpo = await reader.readexactly(tamanho) if tamanho else b''
+    return metodo.upper(), caminho, corpo
+
+
+def _cabecalho(status: int, tipo: str, extras: Optional[Dict[str, str]] = None) -> bytes:
+    linhas = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", f"Content-Type: {tipo}", "Connection: close"]
+    linhas += [f"{nome}: {valor}" for nome, valor in (extras or {}).items()]
+    return ("\r\n".join(linhas) + "\r\n\r\n").encode('latin-1')
+
+
+async def _responder_json(writer: asyncio.StreamWriter, status: int, dados):
+    corpo = json.dumps(dados, indent=2, ensure_ascii=False).encode('utf-8')
+    writer.write(_cabecalho(status, 'application/json; charset=utf-8', {'Content-Length': str(len(corpo))}) + corpo)
+    await writer.drain()
+
+
+async def _responder_arquivo(writer: asyncio.StreamWriter, job: Job, nome: str):
+    """Serve um arquivo gerado pelo job (só os listados em `Job.arquivos`, sem caminhos)."""
+    if nome not in job.arquivos():
+        raise ErroHttp(404, f"Arquivo {nome} não encontrado no job {job.id}")
+    conteudo = (job.diretorio / nome).read_bytes()
+    writer.write(_cabecalho(200, TIPOS_ARQUIVO[Path(nome).suffix], {
+        'Content-Length': str(len(conteudo)),
+        'Content-Disposition': f'attachment; filename="{nome}"',
+    }) + conteudo)
+    await writer.drain()
+
+
+async def servir(porta: int, max_jobs: int, threads: int, diretorio: Path):
+    """Inicia o servidor e atende até ser interrompido."""
+    servidor = ServidorJobs(diretorio, max_jobs, threads)
+    tcp = await asyncio.start_server(servidor.atender, HOST, porta)
+    print("=" * 80)
+    print("SERVIDOR DE JOBS DE OTIMIZAÇÃO")
+    print("=" * 80)
+    print(f"Endereço: http://{HOST}:{porta}/jobs")
+    print(f"Jobs simultâneos: {max_jobs} | Threads por job: {threads} | Saída: {diretorio.absolute()}")
+    try:
+        # SIGTERM encerra como o Ctrl+C, cancelando os jobs em execução (indisponível no Windows)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, AttributeError):
+        pass
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        servidor.encerrar()
+
+
+if __name__ == "__main__":
+    nucleos = nucleos_disponiveis()
+    parser = argparse.ArgumentParser(description="Servidor local de jobs de otimização")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--jobs", type=int, default=max(1, min(2, nucleos)),
+                        help="jobs executados ao mesmo tempo (os demais esperam na fila)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="threads de solver por job (padrão: núcleos / jobs)")
+    parser.add_argument("--diretorio", default="resultados_servidor", help="diretório dos jobs")
+    args = parser.parse_args()
+
+    max_jobs = max(1, args.jobs)
+    threads = max(1, args.threads or nucleos // max_jobs)
+    try:
+        asyncio.run(servir(args.porta, max_jobs, threads, Path(args.diretorio)))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\n[!] Servidor encerrado. Jobs em execução foram cancelados.")
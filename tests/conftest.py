@@ -0,0 +1,7 @@
+# ARQUIVO: tests/conftest.py
+"""Configuração comum dos testes: torna o pacote `otimizador` importável a partir da raiz do repositório."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
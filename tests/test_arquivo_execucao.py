@@ -0,0 +1,68 @@
+# ARQUIVO: tests/test_arquivo_execucao.py
+"""Ida e volta do arquivo de execução (.npz) com o plano de uma otimização pequena."""
+
+import json
+
+import numpy as np
+import pytest
+
+from otimizador import pipeline
+from otimizador.core.verificador import verificar_plano
+from otimizador.data_models import ConfiguracaoProjeto, ParametrosOtimizacao
+from otimizador.io.arquivo_execucao import carregar_execucao, execucao_mais_recente, salvar_execucao
+
+
+@pytest.fixture(scope="module")
+def execucao():
+    parametros = ParametrosOtimizacao(timeout_segundos=10)
+    projetos = [ConfiguracaoProjeto('Alfa', '01/01/2026', '31/12/2026', 6, 3),
+                ConfiguracaoProjeto('Beta', '01/03/2026', '30/11/2026', 4, 2,
+                                    mix_habilidades={'PROG': 50, 'ROBOTICA': 25, 'MAKER': 25})]
+    return pipeline.otimizar(parametros, projetos)
+
+
+def test_ida_e_volta(execucao, tmp_path):
+    caminho = salvar_execucao(execucao, tmp_path / "execucao_20260101_000000.npz")
+    carregada = carregar_execucao(caminho)
+
+    for chave in ('parametros', 'projetos_modelo', 'meses', 'meses_ferias_idx', 'dt_min',
+                  'contagem_instrutores_hab', 'diferencas_replanejamento'):
+        assert carregada[chave] == execucao[chave], chave
+    assert [(p.nome, p.num_turmas, p.mix_habilidades) for p in carregada['projetos_config']] == \
+           [(p.nome, p.num_turmas, p.mix_habilidades) for p in execucao['projetos_config']]
+
+    original, lido = execucao['resultados_estagio2'], carregada['resultados_estagio2']
+    assert lido['turmas'] == original['turmas']
+    assert lido['instrutores'] == original['instrutores']
+    np.testing.assert_array_equal(lido['atribuicao'], original['atribuicao'])
+    np.testing.assert_array_equal(lido['carga_mensal'], original['carga_mensal'])
+    assert [(a['turma'], a['instrutor']) for a in lido['atribuicoes']] == \
+           [(a['turma'], a['instrutor']) for a in original['atribuicoes']]
+    assert lido['verificacao']['regras'] == original['verificacao']['regras']
+    assert lido['spread_carga'] == original['spread_carga']
+    assert carregada['resultados_estagio1'].get('picos_grupo') == \
+           execucao['resultados_estagio1'].get('picos_grupo')
+
+
+def test_plano_carregado_continua_valido(execucao, tmp_path):
+    carregada = carregar_execucao(salvar_execucao(execucao, tmp_path / "execucao.npz"))
+    verificacao = verificar_plano(carregada['resultados_estagio2'], carregada['projetos_modelo'],
+                                  carregada['meses'], carregada['meses_ferias_idx'],
+                                  carregada['parametros'].spread_maximo, carregada['parametros'])
+    assert verificacao['ok']
+
+
+def test_arquivo_invalido(tmp_path):
+    with pytest.raises(ValueError, match="não encontrado"):
+        carregar_execucao(tmp_path / "faltando.npz")
+    caminho = tmp_path / "antigo.npz"
+    np.savez_compressed(caminho, metadados=np.array(json.dumps({"versao": 0})))
+    with pytest.raises(ValueError, match="Versão"):
+        carregar_execucao(caminho)
+
+
+def test_execucao_mais_recente(execucao, tmp_path):
+    assert execucao_mais_recente(tmp_path) is None
+    for nome in ("execucao_20260102_080000.npz", "execucao_20260315_120000.npz", "execucao_20260101_235959.npz"):
+        salvar_execucao(execucao, tmp_path / nome)
+    assert execucao_mais_recente(tmp_path).name == "execucao_20260315_120000.npz"
@@ -0,0 +1,65 @@
+# ARQUIVO: tests/test_config_manager.py
+"""Estabilidade da chave de configuração usada pelo histórico de execuções."""
+
+from dataclasses import replace
+
+import pytest
+
+from otimizador.data_models import ConfiguracaoProjeto, ParametrosOtimizacao
+from otimizador.io.config_manager import (CAMPOS_EXECUCAO, chave_configuracao, configuracao_de_dict,
+                                          configuracao_para_dict)
+
+
+def _projetos():
+    return [ConfiguracaoProjeto('Alfa', '01/02/2026', '30/11/2026', 12, 4),
+            ConfiguracaoProjeto('Beta', '01/03/2026', '31/10/2026', 6, 3, ondas=2,
+                                mix_habilidades={'PROG': 50, 'ROBOTICA': 50})]
+
+
+def test_mesma_chave_para_a_mesma_configuracao():
+    parametros = ParametrosOtimizacao(spread_maximo=10)
+    chave = chave_configuracao(parametros, _projetos())
+    assert len(chave) == 64
+    assert chave_configuracao(ParametrosOtimizacao(spread_maximo=10), _projetos()) == chave
+
+
+def test_chave_independe_da_ordem_das_chaves_e_dos_padroes_omitidos():
+    parametros = ParametrosOtimizacao(spread_maximo=10, timeout_segundos=60)
+    chave = chave_configuracao(parametros, _projetos())
+
+    dados = configuracao_para_dict(parametros, _projetos())
+    invertido = {"projetos": [dict(reversed(list(p.items()))) for p in dados["projetos"]],
+                 "parametros": dict(reversed(list(dados["parametros"].items())))}
+    assert chave_configuracao(*configuracao_de_dict(invertido)) == chave
+
+    # Só o que difere do padrão, como em um JSON escrito à mão
+    minimo = {"parametros": {"spread_maximo": 10, "timeout_segundos": 60},
+              "projetos": [{"nome": "Alfa", "data_inicio": "01/02/2026", "data_termino": "30/11/2026",
+                            "num_turmas": 12, "duracao_curso": 4},
+                           {"nome": "Beta", "data_inicio": "01/03/2026", "data_termino": "31/10/2026",
+                            "num_turmas": 6, "duracao_curso": 3, "ondas": 2,
+                            "mix_habilidades": {"prog": 50, "robotica": 50}}]}
+    assert chave_configuracao(*configuracao_de_dict(minimo)) == chave
+
+
+@pytest.mark.parametrize("campo, valor", [('perfil_solver', 'rapido'), ('threads_solver', 2),
+                                          ('modelo_integrado', True), ('cronogramas_alternativos', 3),
+                                          ('comparar_monolitico', True)])
+def test_opcoes_de_execucao_so_entram_quando_pedidas(campo, valor):
+    assert campo in CAMPOS_EXECUCAO
+    parametros = ParametrosOtimizacao()
+    alterado = replace(parametros, **{campo: valor})
+    assert chave_configuracao(alterado, _projetos()) == chave_configuracao(parametros, _projetos())
+    assert (chave_configuracao(alterado, _projetos(), incluir_execucao=True) !=
+            chave_configuracao(parametros, _projetos(), incluir_execucao=True))
+
+
+def test_chave_muda_com_parametros_e_projetos():
+    parametros = ParametrosOtimizacao()
+    chave = chave_configuracao(parametros, _projetos())
+    assert chave_configuracao(replace(parametros, spread_maximo=3), _projetos()) != chave
+    assert chave_configuracao(replace(parametros, meses_ferias=['Jan/26']), _projetos()) != chave
+
+    projetos = _projetos()
+    projetos[0].num_turmas = 13
+    assert chave_configuracao(parametros, projetos) != chave
@@ -0,0 +1,80 @@
+# ARQUIVO: tests/test_importacao_projetos.py
+"""Importação de projetos de CSV/XLSX: linhas válidas, erros por linha e erros de arquivo."""
+
+import pytest
+
+from otimizador.io.importacao_projetos import importar_projetos
+
+
+def _gravar_csv(diretorio, *linhas, nome="projetos.csv"):
+    caminho = diretorio / nome
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return caminho
+
+
+def test_linhas_validas_com_apelidos_de_cabecalho(tmp_path):
+    caminho = _gravar_csv(tmp_path,
+                          "Projeto;Início;Término;Turmas;Duração;Mix;Lab",
+                          "Alfa;01/02/2026;30/11/2026;12;4;PROG=50,ROBOTICA=50;",
+                          "Beta;01/03/2026;31/10/2026;6;3;;Centro")
+    resultado = importar_projetos(caminho)
+    assert resultado['erros'] == []
+    assert resultado['linhas'] == 2
+    alfa, beta = resultado['projetos']
+    assert (alfa.nome, alfa.num_turmas, alfa.duracao_curso) == ("Alfa", 12, 4)
+    assert alfa.mix_habilidades == {'PROG': 50.0, 'ROBOTICA': 50.0}
+    assert alfa.laboratorio is None
+    assert beta.laboratorio == "Centro"
+
+
+def test_erros_por_linha_nao_interrompem_a_importacao(tmp_path):
+    caminho = _gravar_csv(tmp_path,
+                          "nome,data_inicio,data_termino,num_turmas,duracao_curso",
+                          "Alfa,01/02/2026,30/11/2026,12,4",
+                          "Beta,01/02/2026,30/11/2026,doze,4",
+                          "Gama,01/02/2026,30/11/2026,0,4",
+                          "Delta,31/12/2026,01/01/2026,5,2",
+                          "Epsilon,01/02/2026,,5,2",
+                          "",
+                          "Alfa,01/03/2026,30/11/2026,3,2",
+                          "Zeta,01/02/2026,30/11/2026,2.5,2")
+    resultado = importar_projetos(caminho)
+    assert [p.nome for p in resultado['projetos']] == ["Alfa"]
+    # A linha em branco não conta, mas a numeração segue a do arquivo
+    assert resultado['linhas'] == 7
+    erros = {erro.linha: erro for erro in resultado['erros']}
+    assert sorted(erros) == [3, 4, 5, 6, 8, 9]
+    assert erros[3].projeto == "Beta" and "num_turmas" in erros[3].mensagem
+    assert ">= 1" in erros[4].mensagem
+    assert "posterior" in erros[5].mensagem
+    assert "data_termino" in erros[6].mensagem
+    assert erros[8].mensagem == "projeto repetido (já definido na linha 2)"
+    assert "inteiro" in erros[9].mensagem
+
+
+def test_xlsx(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    livro = openpyxl.Workbook()
+    livro.active.append(["Nome", "Data Início", "Data Término", "Num Turmas", "Duração Curso", "Ondas"])
+    livro.active.append(["Alfa", "01/02/2026", "30/11/2026", 8.0, 3, 2])
+    livro.active.append(["Beta", "01/02/2026", "30/11/2026", -1, 3, None])
+    caminho = tmp_path / "projetos.xlsx"
+    livro.save(caminho)
+    resultado = importar_projetos(caminho)
+    assert [(p.nome, p.num_turmas, p.ondas) for p in resultado['projetos']] == [("Alfa", 8, 2)]
+    assert [(e.linha, e.projeto) for e in resultado['erros']] == [(3, "Beta")]
+
+
+def test_cabecalho_sem_coluna_obrigatoria(tmp_path):
+    caminho = _gravar_csv(tmp_path, "nome,data_inicio,num_turmas,duracao_curso", "Alfa,01/02/2026,12,4")
+    with pytest.raises(ValueError, match="data_termino"):
+        importar_projetos(caminho)
+
+
+def test_arquivo_inexistente_ou_formato_nao_suportado(tmp_path):
+    with pytest.raises(ValueError, match="não encontrado"):
+        importar_projetos(tmp_path / "faltando.csv")
+    caminho = tmp_path / "projetos.txt"
+    caminho.write_text("nome\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="não suportado"):
+        importar_projetos(caminho)
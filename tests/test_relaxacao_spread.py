@@ -0,0 +1,35 @@
+# ARQUIVO: tests/test_relaxacao_spread.py
+"""Limites da busca do menor spread viável (candidatos sondados e piso analítico)."""
+
+from otimizador.core.relaxacao_spread import SPREAD_LIMITE, _escolher_candidatos
+from otimizador.core.viabilidade import calcular_spread_minimo
+
+
+def test_candidatos_ficam_no_intervalo_aberto():
+    candidatos = _escolher_candidatos(2, 20, 3)
+    assert len(candidatos) == 3
+    assert candidatos == sorted(candidatos)
+    assert all(2 < c < 20 for c in candidatos)
+
+
+def test_candidatos_sem_viavel_param_no_limite():
+    candidatos = _escolher_candidatos(0, None, 4)
+    assert candidatos and max(candidatos) <= SPREAD_LIMITE
+    assert _escolher_candidatos(SPREAD_LIMITE - 2, None, 5) == [SPREAD_LIMITE - 1, SPREAD_LIMITE]
+
+
+def test_intervalo_pequeno_devolve_todos_os_pontos_livres():
+    assert _escolher_candidatos(3, 6, 4) == [4, 5]
+    assert _escolher_candidatos(3, 4, 4) == []
+
+
+def test_spread_minimo_analitico():
+    # 137 e 91 turmas não se dividem por igual: nenhuma carga comum chega a spread 0
+    assert calcular_spread_minimo({'PROG': 137, 'ROBOTICA': 91}, {'PROG': 1, 'ROBOTICA': 1}) == 1
+    assert calcular_spread_minimo({'PROG': 40, 'ROBOTICA': 20}, {'PROG': 1, 'ROBOTICA': 1}) == 0
+    assert calcular_spread_minimo({}, {}) == 0
+
+
+def test_spread_minimo_sem_instrutores_suficientes():
+    # Precisa de 3 instrutores de PROG, mas 2 turmas só ocupam 2
+    assert calcular_spread_minimo({'PROG': 2}, {'PROG': 3}) is None
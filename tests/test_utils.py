@@ -0,0 +1,38 @@
+# ARQUIVO: tests/test_utils.py
+"""Repartição das turmas de um projeto entre as habilidades do mix."""
+
+import pytest
+
+from otimizador.utils import calcular_turmas_por_habilidade
+
+
+def test_reparte_pelos_percentuais():
+    assert calcular_turmas_por_habilidade(10, {'PROG': 60, 'ROBOTICA': 40}) == {'PROG': 6, 'ROBOTICA': 4}
+
+
+def test_arredonda_sobre_o_percentual_acumulado():
+    # 3,33 + 3,33 + 3,34 turmas: cada habilidade recebe a diferença dos acumulados arredondados
+    resultado = calcular_turmas_por_habilidade(10, {'PROG': 33.3, 'ROBOTICA': 33.3, 'MAKER': 33.4})
+    assert resultado == {'PROG': 3, 'ROBOTICA': 4, 'MAKER': 3}
+
+
+@pytest.mark.parametrize("total", [1, 2, 7, 13, 100, 137])
+@pytest.mark.parametrize("mix", [
+    {'PROG': 60, 'ROBOTICA': 40},
+    {'PROG': 50, 'ROBOTICA': 30, 'MAKER': 20},
+    {'PROG': 33.3, 'ROBOTICA': 33.3, 'MAKER': 33.4},
+    {'PROG': 99.5, 'ROBOTICA': 0.5},
+])
+def test_total_sempre_preservado(total, mix):
+    resultado = calcular_turmas_por_habilidade(total, mix)
+    assert list(resultado) == list(mix)
+    assert sum(resultado.values()) == total
+    assert all(n >= 0 for n in resultado.values())
+
+
+def test_habilidade_com_zero_por_cento_fica_sem_turmas():
+    assert calcular_turmas_por_habilidade(8, {'PROG': 100, 'ROBOTICA': 0}) == {'PROG': 8, 'ROBOTICA': 0}
+
+
+def test_mix_vazio():
+    assert calcular_turmas_por_habilidade(5, {}) == {}
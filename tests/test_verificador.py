@@ -0,0 +1,87 @@
+# ARQUIVO: tests/test_verificador.py
+"""Verificador independente do plano final: um plano válido e uma violação injetada por regra."""
+
+import numpy as np
+import pytest
+
+from otimizador.core.verificador import verificar_plano
+from otimizador.data_models import Instrutor, Projeto, Turma
+
+MESES = ['Jan/26', 'Fev/26', 'Mar/26', 'Abr/26', 'Mai/26', 'Jun/26']
+FERIAS = [3]
+PROJETO = Projeto('Alfa', {'PROG': 2, 'ROBOTICA': 1}, duracao=2, inicio_min=0, inicio_max=2, mes_fim_projeto=5)
+TURMAS = [Turma('Alfa_PROG_1', 'Alfa', 'PROG', 0, 2), Turma('Alfa_PROG_2', 'Alfa', 'PROG', 1, 2),
+          Turma('Alfa_ROBOTICA_1', 'Alfa', 'ROBOTICA', 2, 2)]
+INSTRUTORES = [Instrutor('PROG_1', 'PROG', 2, None), Instrutor('PROG_2', 'PROG', 1, None),
+               Instrutor('ROBOTICA_1', 'ROBOTICA', 2, None)]
+
+
+def _resultado(atribuicao, turmas=TURMAS, carga_mensal=None):
+    resultado = {'turmas': list(turmas), 'instrutores': INSTRUTORES, 'atribuicao': np.array(atribuicao),
+                 'atribuicoes': [{'turma': t, 'instrutor': INSTRUTORES[i]} for t, i in zip(turmas, atribuicao)]}
+    if carga_mensal is not None: resultado['carga_mensal'] = carga_mensal
+    return resultado
+
+
+def _violacoes(resultado, projetos=(PROJETO,), spread_maximo=2):
+    verificacao = verificar_plano(resultado, list(projetos), MESES, FERIAS, spread_maximo)
+    return verificacao['ok'], {r.regra: r for r in verificacao['regras']}
+
+
+def test_plano_valido():
+    ok, regras = _violacoes(_resultado([0, 0, 2]))
+    assert ok
+    assert all(r.violacoes == 0 and r.exemplos == [] for r in regras.values())
+    # Sem laboratórios em uso, a regra dos laboratórios não entra
+    assert len(regras) == 5
+
+
+@pytest.mark.parametrize("atribuicao, exemplo", [
+    ([0, 0, 0], "Alfa_ROBOTICA_1 com instrutor de outra habilidade"),
+    ([0, 0, -1], "Alfa_ROBOTICA_1 sem instrutor"),
+    ([0, 0], "2 atribuições para 3 turmas"),
+])
+def test_turma_mal_atribuida(atribuicao, exemplo):
+    ok, regras = _violacoes(_resultado(atribuicao))
+    assert not ok
+    assert regras["Turma atribuída exatamente uma vez"].violacoes >= 1
+    assert exemplo in regras["Turma atribuída exatamente uma vez"].exemplos
+
+
+def test_demanda_do_projeto_diferente_das_turmas():
+    projeto = PROJETO._replace(turmas={'PROG': 3, 'ROBOTICA': 1})
+    ok, regras = _violacoes(_resultado([0, 0, 2]), projetos=[projeto])
+    assert not ok
+    assert regras["Turma atribuída exatamente uma vez"].exemplos == ["Alfa PROG: 2 turmas para demanda 3"]
+
+
+def test_carga_acima_da_capacidade():
+    # PROG_2 tem capacidade 1 e as duas turmas de PROG se sobrepõem em Fev/26
+    ok, regras = _violacoes(_resultado([1, 1, 2]))
+    assert not ok
+    assert regras["Carga mensal <= capacidade"].violacoes == 1
+    assert regras["Carga mensal <= capacidade"].exemplos == ["PROG_2 em Fev/26: 2 > 1"]
+
+
+def test_carga_nas_ferias():
+    carga = np.zeros((len(INSTRUTORES), len(MESES)), dtype=np.int64)
+    carga[2, 3] = 1
+    ok, regras = _violacoes(_resultado([0, 0, 2], carga_mensal=carga))
+    assert not ok
+    assert regras["Sem aulas nas férias"].violacoes == 1
+    assert regras["Sem aulas nas férias"].exemplos == ["ROBOTICA_1 em Abr/26: 1 turma(s)"]
+
+
+def test_turma_fora_da_janela():
+    turmas = TURMAS[:2] + [TURMAS[2]._replace(mes_inicio=4)]
+    ok, regras = _violacoes(_resultado([0, 0, 2], turmas=turmas))
+    assert not ok
+    assert regras["Janela do projeto respeitada"].violacoes == 1
+    assert regras["Janela do projeto respeitada"].exemplos == ["Alfa_ROBOTICA_1 (início Mai/26)"]
+
+
+def test_spread_acima_do_maximo():
+    ok, regras = _violacoes(_resultado([0, 0, 2]), spread_maximo=0)
+    assert not ok
+    assert regras["Spread <= máximo"].violacoes == 1
+    assert regras["Spread <= máximo"].exemplos == ["spread 1 > 0"]